@@ -17,6 +17,7 @@ from .async_logger import (
 from .proxy_strategy import (
     ProxyRotationStrategy,
     RoundRobinProxyStrategy,
+    HealthAwareProxyStrategy,
 )
 from .extraction_strategy import (
     ExtractionStrategy,
@@ -28,7 +29,7 @@ from .extraction_strategy import (
     RegexExtractionStrategy
 )
 from .chunking_strategy import ChunkingStrategy, RegexChunking
-from .markdown_generation_strategy import DefaultMarkdownGenerator
+from .markdown_generation_strategy import DefaultMarkdownGenerator, LXMLMarkdownGenerator
 from .table_extraction import (
     TableExtractionStrategy,
     DefaultTableExtraction,
@@ -43,6 +44,7 @@ from .content_filter_strategy import (
 )
 from .models import CrawlResult, MarkdownGenerationResult, DisplayMode
 from .components.crawler_monitor import CrawlerMonitor
+from .crawl_timing import StageHistograms
 from .link_preview import LinkPreview
 from .async_dispatcher import (
     MemoryAdaptiveDispatcher,
@@ -50,6 +52,9 @@ from .async_dispatcher import (
     RateLimiter,
     BaseDispatcher,
 )
+from .cpu_executor import CPUExecutor
+from .html_document import HTMLDocument
+from .request_interception import InterceptionProfile
 from .docker_client import Crawl4aiDockerClient
 from .hub import CrawlerHub
 from .browser_profiler import BrowserProfiler
@@ -165,6 +170,7 @@ __all__ = [
     "ChunkingStrategy",
     "RegexChunking",
     "DefaultMarkdownGenerator",
+    "LXMLMarkdownGenerator",
     "TableExtractionStrategy",
     "DefaultTableExtraction",
     "NoTableExtraction",
@@ -176,13 +182,18 @@ __all__ = [
     "MemoryAdaptiveDispatcher",
     "SemaphoreDispatcher",
     "RateLimiter",
+    "CPUExecutor",
+    "HTMLDocument",
+    "InterceptionProfile",
     "CrawlerMonitor",
+    "StageHistograms",
     "LinkPreview",
     "DisplayMode",
     "MarkdownGenerationResult",
     "Crawl4aiDockerClient",
     "ProxyRotationStrategy",
     "RoundRobinProxyStrategy",
+    "HealthAwareProxyStrategy",
     "ProxyConfig",
     "start_colab_display_server",
     "setup_colab_environment",
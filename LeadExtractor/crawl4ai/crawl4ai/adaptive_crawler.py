@@ -7,7 +7,7 @@ avoiding unnecessary crawls while ensuring comprehensive coverage.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Set, Tuple, Any, Union
+from typing import Dict, List, Optional, Set, Tuple, Any, Union, Callable, Awaitable
 from dataclasses import dataclass, field
 import asyncio
 import pickle
@@ -21,8 +21,32 @@ from pathlib import Path
 from crawl4ai.async_webcrawler import AsyncWebCrawler
 from crawl4ai.async_configs import CrawlerRunConfig, LinkPreviewConfig, LLMConfig
 from crawl4ai.models import Link, CrawlResult
+from crawl4ai.embedding_index import (
+    BatchedEmbedder,
+    EmbeddingCache,
+    TextEmbedder,
+    VectorIndex,
+    default_cache_path,
+    normalize_rows,
+)
+from crawl4ai.config import CHECKPOINT_COMPACT_RATIO, CHECKPOINT_MAX_DELTAS
 import numpy as np
 
+class _MockMarkdown:
+    def __init__(self, content):
+        self.raw_markdown = content
+
+
+class _MockCrawlResult:
+    """A loaded page, with the minimal CrawlResult interface the strategies need"""
+
+    def __init__(self, url, content, links, metadata):
+        self.url = url
+        self.markdown = _MockMarkdown(content)
+        self.links = links
+        self.metadata = metadata
+
+
 @dataclass
 class CrawlState:
     """Tracks the current state of adaptive crawling"""
@@ -50,13 +74,125 @@ class CrawlState:
     semantic_gaps: List[Tuple[List[float], float]] = field(default_factory=list)  # Serializable
     embedding_model: str = ""
     
-    def save(self, path: Union[str, Path]):
-        """Save state to disk for persistence"""
+    # Checkpoint bookkeeping (see save()), not part of the state
+    _checkpoint: Optional["_Checkpoint"] = field(default=None, init=False, repr=False, compare=False)
+    _new_documents: List[Dict[str, int]] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def add_document_terms(self, terms: List[str]) -> None:
+        """Count the terms of the next document (id `total_documents`) in the term statistics"""
+        counts = dict(Counter(terms))
+        self._apply_document_terms(counts)
+        if self._checkpoint is not None:
+            self._new_documents.append(counts)
+
+    def _apply_document_terms(self, counts: Dict[str, int]) -> None:
+        doc_id = self.total_documents
+        term_frequencies, document_frequencies = self.term_frequencies, self.document_frequencies
+        documents_with_terms = self.documents_with_terms
+        for term, count in counts.items():
+            term_frequencies[term] += count
+            document_frequencies[term] += 1
+            documents_with_terms[term].add(doc_id)
+        self.total_documents += 1
+
+    def save(self, path: Union[str, Path], compact: bool = False):
+        """
+        Checkpoint the state to `path`.
+
+        The file holds JSON lines: a snapshot of the whole state, then one delta
+        per later save with what was added since the previous save (new URLs,
+        pages, links, term counts of new documents, embedding rows, and the
+        small fields that changed), so a save costs the new data rather than
+        the whole crawl. A new snapshot replaces the file when saving to
+        another path, when `compact` is set, when the state changed in a way
+        a delta can't express (e.g. items were removed), or once the deltas
+        outgrow CHECKPOINT_COMPACT_RATIO times the snapshot or number
+        CHECKPOINT_MAX_DELTAS.
+        """
         path = Path(path)
+        checkpoint = self._checkpoint
+        if (
+            not compact
+            and checkpoint is not None
+            and checkpoint.path == path
+            and checkpoint.deltas < CHECKPOINT_MAX_DELTAS
+            and path.exists()
+            and path.stat().st_size == checkpoint.size  # Nobody else wrote to it, and no torn tail
+        ):
+            delta = self._delta(checkpoint)
+            if delta == {'type': 'delta'}:
+                return  # Nothing changed
+            if delta is not None:
+                line = (json.dumps(delta, separators=(',', ':')) + '\n').encode('utf-8')
+                if checkpoint.delta_bytes + len(line) <= CHECKPOINT_COMPACT_RATIO * checkpoint.snapshot_size:
+                    with open(path, 'ab') as f:
+                        f.write(line)
+                    checkpoint.mark(self)
+                    checkpoint.size += len(line)
+                    checkpoint.delta_bytes += len(line)
+                    checkpoint.deltas += 1
+                    self._new_documents = []
+                    return
+
         path.parent.mkdir(parents=True, exist_ok=True)
-        
+        line = (json.dumps({'type': 'snapshot', 'version': 1, 'state': self._to_dict()}, separators=(',', ':')) + '\n').encode('utf-8')
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(line)
+        os.replace(tmp_path, path)
+        self._checkpoint = _Checkpoint(path, self, size=len(line))
+        self._new_documents = []
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'CrawlState':
+        """
+        Load state from disk: a checkpoint's snapshot with its deltas replayed,
+        or a state saved as a single JSON document by earlier versions. A last
+        delta cut short by a crash is ignored.
+        """
+        path = Path(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        lines = data.split(b'\n')
+        try:
+            head = json.loads(lines[0])
+        except ValueError:
+            head = None
+        if not isinstance(head, dict) or head.get('type') != 'snapshot':
+            return cls._from_dict(json.loads(data))
+
+        state = cls._from_dict(head['state'])
+        size = snapshot_size = len(lines[0]) + 1
+        deltas = 0
+        kb_rows = []
+        for number, line in enumerate(lines[1:], start=2):
+            if not line:
+                continue
+            try:
+                delta = json.loads(line)
+            except ValueError:
+                if number == len(lines) or (number == len(lines) - 1 and not lines[-1]):
+                    break  # Torn last write; the next save writes a new snapshot
+                raise ValueError(f"Corrupt checkpoint record at line {number} of {path}")
+            kb_rows.extend(delta.pop('kb_embeddings', None) or [])
+            state._apply_delta(delta)
+            size += len(line) + 1
+            deltas += 1
+        if kb_rows:
+            rows = np.array(kb_rows)
+            state.kb_embeddings = rows if state.kb_embeddings is None else np.vstack([state.kb_embeddings, rows])
+
+        checkpoint = _Checkpoint(path, state, size=size)  # Differs from the file after a torn write
+        checkpoint.snapshot_size = snapshot_size
+        checkpoint.delta_bytes = size - snapshot_size
+        checkpoint.deltas = deltas
+        state._checkpoint = checkpoint
+        return state
+
+    def _to_dict(self) -> Dict[str, Any]:
         # Convert CrawlResult objects to dicts for serialization
-        state_dict = {
+        return {
             'crawled_urls': list(self.crawled_urls),
             'knowledge_base': [self._crawl_result_to_dict(cr) for cr in self.knowledge_base],
             'pending_links': [link.model_dump() for link in self.pending_links],
@@ -75,17 +211,9 @@ class CrawlState:
             'semantic_gaps': self.semantic_gaps,
             'embedding_model': self.embedding_model
         }
-        
-        with open(path, 'w') as f:
-            json.dump(state_dict, f, indent=2)
-    
+
     @classmethod
-    def load(cls, path: Union[str, Path]) -> 'CrawlState':
-        """Load state from disk"""
-        path = Path(path)
-        with open(path, 'r') as f:
-            state_dict = json.load(f)
-        
+    def _from_dict(cls, state_dict: Dict[str, Any]) -> 'CrawlState':
         state = cls()
         state.crawled_urls = set(state_dict['crawled_urls'])
         state.knowledge_base = [cls._dict_to_crawl_result(d) for d in state_dict['knowledge_base']]
@@ -108,7 +236,65 @@ class CrawlState:
         state.embedding_model = state_dict.get('embedding_model', '')
         
         return state
-    
+
+    def _delta(self, checkpoint: "_Checkpoint") -> Optional[Dict[str, Any]]:
+        """What changed since `checkpoint`, or None when only a snapshot can express it"""
+        kb, links = self.knowledge_base, self.pending_links
+        if (
+            len(kb) < checkpoint.knowledge_base
+            or (checkpoint.knowledge_base and kb[checkpoint.knowledge_base - 1] is not checkpoint.last_result)
+            or len(links) < checkpoint.pending_links
+            or (checkpoint.pending_links and links[checkpoint.pending_links - 1] is not checkpoint.last_link)
+            or len(self.new_terms_history) < checkpoint.new_terms_history
+            or len(self.crawl_order) < checkpoint.crawl_order
+            # Term statistics are only recorded through add_document_terms()
+            or self.total_documents != checkpoint.total_documents + len(self._new_documents)
+        ):
+            return None
+        new_urls = self.crawled_urls - checkpoint.crawled_urls
+        if len(self.crawled_urls) - len(new_urls) != len(checkpoint.crawled_urls):
+            return None
+
+        kb_rows = len(self.kb_embeddings) if self.kb_embeddings is not None else 0
+        if kb_rows < checkpoint.kb_rows or (checkpoint.kb_rows and self.kb_embeddings.shape[1:] != checkpoint.kb_shape):
+            return None
+
+        delta: Dict[str, Any] = {'type': 'delta'}
+        if new_urls:
+            delta['crawled_urls'] = list(new_urls)
+        if len(kb) > checkpoint.knowledge_base:
+            delta['knowledge_base'] = [self._crawl_result_to_dict(cr) for cr in kb[checkpoint.knowledge_base:]]
+        if len(links) > checkpoint.pending_links:
+            delta['pending_links'] = [link.model_dump() for link in links[checkpoint.pending_links:]]
+        if self._new_documents:
+            delta['documents'] = self._new_documents
+        if len(self.new_terms_history) > checkpoint.new_terms_history:
+            delta['new_terms_history'] = self.new_terms_history[checkpoint.new_terms_history:]
+        if len(self.crawl_order) > checkpoint.crawl_order:
+            delta['crawl_order'] = self.crawl_order[checkpoint.crawl_order:]
+        if kb_rows > checkpoint.kb_rows:
+            delta['kb_embeddings'] = self.kb_embeddings[checkpoint.kb_rows:].tolist()
+        if self.query_embeddings is not checkpoint.query_embeddings:
+            delta['query_embeddings'] = self.query_embeddings.tolist() if self.query_embeddings is not None else None
+        for name, encoded in checkpoint.encode_fields(self).items():
+            if encoded != checkpoint.fields.get(name):
+                delta[name] = getattr(self, name)
+        return delta
+
+    def _apply_delta(self, delta: Dict[str, Any]) -> None:
+        self.crawled_urls.update(delta.get('crawled_urls', ()))
+        self.knowledge_base.extend(self._dict_to_crawl_result(d) for d in delta.get('knowledge_base', ()))
+        self.pending_links.extend(Link(**link_dict) for link_dict in delta.get('pending_links', ()))
+        for counts in delta.get('documents', ()):
+            self._apply_document_terms(counts)
+        self.new_terms_history.extend(delta.get('new_terms_history', ()))
+        self.crawl_order.extend(delta.get('crawl_order', ()))
+        if 'query_embeddings' in delta:
+            self.query_embeddings = np.array(delta['query_embeddings']) if delta['query_embeddings'] is not None else None
+        for name in _Checkpoint.FIELDS:
+            if name in delta:
+                setattr(self, name, delta[name])
+
     @staticmethod
     def _crawl_result_to_dict(cr: CrawlResult) -> Dict:
         """Convert CrawlResult to serializable dict"""
@@ -130,19 +316,7 @@ class CrawlState:
     @staticmethod
     def _dict_to_crawl_result(d: Dict):
         """Convert dict back to CrawlResult"""
-        # Create a mock object that has the minimal interface we need
-        class MockMarkdown:
-            def __init__(self, content):
-                self.raw_markdown = content
-        
-        class MockCrawlResult:
-            def __init__(self, url, content, links, metadata):
-                self.url = url
-                self.markdown = MockMarkdown(content)
-                self.links = links
-                self.metadata = metadata
-        
-        return MockCrawlResult(
+        return _MockCrawlResult(
             url=d['url'],
             content=d.get('content', ''),
             links=d.get('links', {}),
@@ -150,6 +324,41 @@ class CrawlState:
         )
 
 
+class _Checkpoint:
+    """What the last save of a CrawlState wrote to `path`, for the next save to append only the changes"""
+
+    # Small fields written whole whenever they change
+    FIELDS = ('query', 'metrics', 'expanded_queries', 'semantic_gaps', 'embedding_model')
+
+    def __init__(self, path: Path, state: CrawlState, size: int):
+        self.path = path
+        self.size = size  # Bytes in the file after the last save
+        self.snapshot_size = size
+        self.delta_bytes = 0
+        self.deltas = 0
+        self.crawled_urls: Set[str] = set()
+        self.mark(state)
+
+    def mark(self, state: CrawlState) -> None:
+        """Remember how far `state` has been written"""
+        self.crawled_urls |= state.crawled_urls
+        self.knowledge_base = len(state.knowledge_base)
+        self.last_result = state.knowledge_base[-1] if state.knowledge_base else None
+        self.pending_links = len(state.pending_links)
+        self.last_link = state.pending_links[-1] if state.pending_links else None
+        self.new_terms_history = len(state.new_terms_history)
+        self.crawl_order = len(state.crawl_order)
+        self.total_documents = state.total_documents
+        self.kb_rows = len(state.kb_embeddings) if state.kb_embeddings is not None else 0
+        self.kb_shape = state.kb_embeddings.shape[1:] if state.kb_embeddings is not None else None
+        self.query_embeddings = state.query_embeddings
+        self.fields = self.encode_fields(state)
+
+    @classmethod
+    def encode_fields(cls, state: CrawlState) -> Dict[str, str]:
+        return {name: json.dumps(getattr(state, name), sort_keys=True) for name in cls.FIELDS}
+
+
 @dataclass
 class AdaptiveConfig:
     """Configuration for adaptive crawling"""
@@ -180,6 +389,9 @@ class AdaptiveConfig:
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     embedding_llm_config: Optional[Union[LLMConfig, Dict]] = None  # Separate config for embeddings
     n_query_variations: int = 10
+    embedding_batch_size: int = 32  # Texts per embedding call
+    embedding_cache: bool = True  # Keep embeddings by content hash across runs; False: for this run only
+    embedding_cache_path: Optional[str] = None  # SQLite file; None: ~/.crawl4ai/embeddings.db
     coverage_threshold: float = 0.85
     alpha_shape_alpha: float = 0.5
     
@@ -250,6 +462,7 @@ class AdaptiveConfig:
         assert 0 <= self.embedding_quality_max_confidence <= 1, "embedding_quality_max_confidence must be between 0 and 1"
         assert self.embedding_quality_scale_factor > 0, "embedding_quality_scale_factor must be positive"
         assert 0 <= self.embedding_min_confidence_threshold <= 1, "embedding_min_confidence_threshold must be between 0 and 1"
+        assert self.embedding_batch_size > 0, "embedding_batch_size must be positive"
     
     @property
     def _embedding_llm_config_dict(self) -> Optional[Dict]:
@@ -573,27 +786,14 @@ class StatisticalStrategy(CrawlStrategy):
                 
             terms = self._tokenize(content.lower())
             
-            # Update term frequencies
-            term_set = set()
-            for term in terms:
-                state.term_frequencies[term] += 1
-                term_set.add(term)
-            
-            # Update document frequencies
-            doc_id = state.total_documents
-            for term in term_set:
-                if term not in state.documents_with_terms[term]:
-                    state.document_frequencies[term] += 1
-                    state.documents_with_terms[term].add(doc_id)
+            # Update term and document frequencies and the document count
+            state.add_document_terms(terms)
             
             # Track new terms discovered
             new_term_count = len(state.term_frequencies)
             new_terms = new_term_count - old_term_count
             state.new_terms_history.append(new_terms)
             
-            # Update document count
-            state.total_documents += 1
-            
             # Add to crawl order
             state.crawl_order.append(result.url)
     
@@ -615,18 +815,40 @@ class StatisticalStrategy(CrawlStrategy):
 
 
 class EmbeddingStrategy(CrawlStrategy):
-    """Embedding-based adaptive crawling using semantic space coverage"""
+    """
+    Embedding-based adaptive crawling using semantic space coverage.
+
+    Texts are embedded in batches and cached by content hash (see
+    embedding_index), and the knowledge base is kept in a VectorIndex that
+    updates each query point's coverage as documents are added.
+
+    Args:
+        embedding_model: Model of get_text_embeddings.
+        llm_config: LLM used to expand the query.
+        embedder: Async function from a list of texts to an (n, dim) array to
+            use instead of get_text_embeddings, e.g. a local model or
+            HashingEmbedder in tests.
+        embedding_cache: EmbeddingCache to use instead of the one configured by
+            AdaptiveConfig.embedding_cache / embedding_cache_path.
+    """
     
-    def __init__(self, embedding_model: str = None, llm_config: Union[LLMConfig, Dict] = None):
+    def __init__(
+        self,
+        embedding_model: str = None,
+        llm_config: Union[LLMConfig, Dict] = None,
+        embedder: Optional[Callable[[List[str]], Awaitable[Any]]] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+    ):
         self.embedding_model = embedding_model or "sentence-transformers/all-MiniLM-L6-v2"
         self.llm_config = llm_config
-        self._embedding_cache = {}
-        self._link_embedding_cache = {}  # Cache for link embeddings
+        self.embedder = embedder
+        self._embedding_cache = embedding_cache
+        self._batched_embedder: Optional[BatchedEmbedder] = None  # Built on first use, once config is set
         self._validation_passed = False  # Track if validation passed
         
         # Performance optimization caches
-        self._distance_matrix_cache = None  # Cache for query-KB distances
-        self._kb_embeddings_hash = None  # Track KB changes
+        self._kb_index = VectorIndex()  # Normalised KB vectors and query coverage
+        self._kb_index_source = None  # The kb_embeddings array the index holds
         self._validation_embeddings_cache = None  # Cache validation query embeddings
         self._kb_similarity_threshold = 0.95  # Threshold for deduplication
     
@@ -644,14 +866,30 @@ class EmbeddingStrategy(CrawlStrategy):
         }
         
     async def _get_embeddings(self, texts: List[str]) -> Any:
-        """Get embeddings using configured method"""
-        from .utils import get_text_embeddings
-        embedding_llm_config = self._get_embedding_llm_config_dict()
-        return await get_text_embeddings(
-            texts, 
-            embedding_llm_config,
-            self.embedding_model
-        )
+        """Get embeddings using configured method, in batches, through the cache"""
+        if self._batched_embedder is None:
+            config = getattr(self, 'config', None)
+            embed = self.embedder or TextEmbedder(self._get_embedding_llm_config_dict(), self.embedding_model)
+            cache = self._embedding_cache
+            if cache is None:
+                # Kept on disk across runs unless disabled, in memory for this run otherwise
+                persistent = config is None or config.embedding_cache
+                cache = self._embedding_cache = EmbeddingCache(
+                    ((config and config.embedding_cache_path) or default_cache_path()) if persistent else None
+                )
+            self._batched_embedder = BatchedEmbedder(
+                embed, cache=cache, batch_size=config.embedding_batch_size if config else 32
+            )
+        return await self._batched_embedder(texts)
+
+    def _index(self, kb_embeddings: Any) -> VectorIndex:
+        """The VectorIndex of `kb_embeddings`, rebuilt only if it holds another array"""
+        if kb_embeddings is not self._kb_index_source:
+            self._kb_index = VectorIndex()
+            if kb_embeddings is not None and len(kb_embeddings):
+                self._kb_index.add(kb_embeddings)
+            self._kb_index_source = kb_embeddings
+        return self._kb_index
     
     def _compute_distance_matrix(self, query_embeddings: Any, kb_embeddings: Any) -> Any:
         """Compute distance matrix using vectorized operations"""
@@ -679,24 +917,6 @@ class EmbeddingStrategy(CrawlStrategy):
         
         return distance_matrix
     
-    def _get_cached_distance_matrix(self, query_embeddings: Any, kb_embeddings: Any) -> Any:
-        """Get distance matrix with caching"""
-        
-        
-        if kb_embeddings is None or len(kb_embeddings) == 0:
-            return None
-            
-        # Check if KB has changed
-        kb_hash = hash(kb_embeddings.tobytes()) if kb_embeddings is not None else None
-        
-        if (self._distance_matrix_cache is None or 
-            kb_hash != self._kb_embeddings_hash):
-            # Recompute matrix
-            self._distance_matrix_cache = self._compute_distance_matrix(query_embeddings, kb_embeddings)
-            self._kb_embeddings_hash = kb_hash
-            
-        return self._distance_matrix_cache
-        
     async def map_query_semantic_space(self, query: str, n_synthetic: int = 10) -> Any:
         """Generate a point cloud representing the semantic neighborhood of the query"""
         from .utils import perform_completion_with_backoff
@@ -829,17 +1049,8 @@ class EmbeddingStrategy(CrawlStrategy):
                 gaps.append((q_emb, 1.0))
             return gaps
         
-        # Use cached distance matrix
-        distance_matrix = self._get_cached_distance_matrix(query_embeddings, kb_embeddings)
-        
-        if distance_matrix is None:
-            # Fallback
-            for q_emb in query_embeddings:
-                gaps.append((q_emb, 1.0))
-            return gaps
-            
-        # Find minimum distance for each query (vectorized)
-        min_distances = np.min(distance_matrix, axis=1)
+        # Minimum distance for each query, kept up to date by the index
+        min_distances = (1.0 - self._index(kb_embeddings).coverage(query_embeddings)).astype(float)
         
         # Create gaps list
         for i, q_emb in enumerate(query_embeddings):
@@ -854,17 +1065,8 @@ class EmbeddingStrategy(CrawlStrategy):
         kb_embeddings: Any
     ) -> List[Tuple[Link, float]]:
         """Select links that most efficiently fill the gaps"""
-        from .utils import cosine_distance, cosine_similarity, get_text_embeddings
-        
-        import hashlib
-        
-        scored_links = []
-        
-        # Prepare for embedding - separate cached vs uncached
-        links_to_embed = []
-        texts_to_embed = []
-        link_embeddings_map = {}
-        
+        links_with_text = []
+        link_texts = []
         for link in candidate_links:
             # Extract text from link
             link_text = ' '.join(filter(None, [
@@ -876,85 +1078,55 @@ class EmbeddingStrategy(CrawlStrategy):
             
             if not link_text.strip():
                 continue
-            
-            # Create cache key from URL + text content
-            cache_key = hashlib.md5(f"{link.href}:{link_text}".encode()).hexdigest()
-            
-            # Check cache
-            if cache_key in self._link_embedding_cache:
-                link_embeddings_map[link.href] = self._link_embedding_cache[cache_key]
-            else:
-                links_to_embed.append(link)
-                texts_to_embed.append(link_text)
-        
-        # Batch embed only uncached links
-        if texts_to_embed:
-            embedding_llm_config = self._get_embedding_llm_config_dict()
-            new_embeddings = await get_text_embeddings(texts_to_embed, embedding_llm_config, self.embedding_model)
+            links_with_text.append(link)
+            link_texts.append(link_text)
 
-            # Cache the new embeddings
-            for link, text, embedding in zip(links_to_embed, texts_to_embed, new_embeddings):
-                cache_key = hashlib.md5(f"{link.href}:{text}".encode()).hexdigest()
-                self._link_embedding_cache[cache_key] = embedding
-                link_embeddings_map[link.href] = embedding
+        if not links_with_text:
+            return []
+
+        # Batch embed (texts embedded before come from the cache)
+        link_embeddings = await self._get_embeddings(link_texts)
         
         # Get coverage radius from config
         coverage_radius = self.config.embedding_coverage_radius if hasattr(self, 'config') else 0.2
-        
-        # Score each link
-        for link in candidate_links:
-            if link.href not in link_embeddings_map:
-                continue  # Skip links without embeddings
-                
-            link_embedding = link_embeddings_map[link.href]
-            
+        overlap_threshold = self.config.embedding_overlap_threshold if hasattr(self, 'config') else 0.85
+
+        if gaps:
+            # Only consider gaps that actually need filling (outside coverage radius)
+            gap_distances = np.array([d for _, d in gaps], dtype=np.float32)
+            needs_help = gap_distances > coverage_radius
+            gaps_needing_help = int(needs_help.sum())
+            gap_reduction_scores = np.zeros(len(links_with_text))
+            if gaps_needing_help:
+                gap_points = normalize_rows(np.array([g for g, _ in gaps])[needs_help])
+                gap_distances = gap_distances[needs_help]
+                # Distances of all links to all gaps at once
+                new_distances = 1.0 - normalize_rows(link_embeddings) @ gap_points.T
+                # Scale improvement - moving from 0.5 to 0.3 is valuable
+                improvements = np.where(new_distances < gap_distances, gap_distances - new_distances, 0.0) * 2
+                # Average improvement per gap that needs help
+                gap_reduction_scores = improvements.sum(axis=1) / gaps_needing_help
+
+            # Overlap with existing KB: best similarity of each link to the index
+            if kb_embeddings is not None and len(kb_embeddings) > 0:
+                max_similarities = self._index(kb_embeddings).max_similarity(link_embeddings)
+            else:
+                max_similarities = np.full(len(links_with_text), -1.0)
+
+        scored_links = []
+        for i, link in enumerate(links_with_text):
             if not gaps:
                 score = 0.0
             else:
-                # Calculate how many gaps this link helps with
-                gaps_helped = 0
-                total_improvement = 0
-                
-                for gap_point, gap_distance in gaps:
-                    # Only consider gaps that actually need filling (outside coverage radius)
-                    if gap_distance > coverage_radius:
-                        new_distance = cosine_distance(link_embedding, gap_point)
-                        if new_distance < gap_distance:
-                            # This link helps this gap
-                            improvement = gap_distance - new_distance
-                            # Scale improvement - moving from 0.5 to 0.3 is valuable
-                            scaled_improvement = improvement * 2  # Amplify the signal
-                            total_improvement += scaled_improvement
-                            gaps_helped += 1
-                
-                # Average improvement per gap that needs help
-                gaps_needing_help = sum(1 for _, d in gaps if d > coverage_radius)
-                if gaps_needing_help > 0:
-                    gap_reduction_score = total_improvement / gaps_needing_help
-                else:
-                    gap_reduction_score = 0
-                
-                # Check overlap with existing KB (vectorized)
-                if kb_embeddings is not None and len(kb_embeddings) > 0:
-                    # Normalize embeddings
-                    link_norm = link_embedding / np.linalg.norm(link_embedding)
-                    kb_norm = kb_embeddings / np.linalg.norm(kb_embeddings, axis=1, keepdims=True)
-                    
-                    # Compute all similarities at once
-                    similarities = np.dot(kb_norm, link_norm)
-                    max_similarity = np.max(similarities)
-                    
-                    # Only penalize if very similar (above threshold)
-                    overlap_threshold = self.config.embedding_overlap_threshold if hasattr(self, 'config') else 0.85
-                    if max_similarity > overlap_threshold:
-                        overlap_penalty = (max_similarity - overlap_threshold) * 2  # 0 to 0.3 range
-                    else:
-                        overlap_penalty = 0
+                # Only penalize if very similar (above threshold)
+                max_similarity = float(max_similarities[i])
+                if max_similarity > overlap_threshold:
+                    overlap_penalty = (max_similarity - overlap_threshold) * 2  # 0 to 0.3 range
                 else:
                     overlap_penalty = 0
                 
                 # Final score - emphasize gap reduction
-                score = gap_reduction_score * (1 - overlap_penalty)
+                score = float(gap_reduction_scores[i]) * (1 - overlap_penalty)
                 
                 # Add contextual score boost if available
                 if hasattr(link, 'contextual_score') and link.contextual_score:
@@ -972,14 +1144,8 @@ class EmbeddingStrategy(CrawlStrategy):
         if len(state.kb_embeddings) == 0 or len(state.query_embeddings) == 0:
             return 0.0
 
-        # Prepare L2-normalised arrays
-        Q = np.asarray(state.query_embeddings, dtype=np.float32)
-        D = np.asarray(state.kb_embeddings, dtype=np.float32)
-        Q /= np.linalg.norm(Q, axis=1, keepdims=True) + 1e-8
-        D /= np.linalg.norm(D, axis=1, keepdims=True) + 1e-8
-
-        # Best cosine per query
-        best = (Q @ D.T).max(axis=1)
+        # Best cosine per query, updated by the index as documents were added
+        best = self._index(state.kb_embeddings).coverage(state.query_embeddings)
 
         # Mean similarity or hit-rate above tau
         tau = getattr(self.config, 'coverage_tau', None)
@@ -1112,21 +1278,14 @@ class EmbeddingStrategy(CrawlStrategy):
         if state.kb_embeddings is None or len(state.kb_embeddings) == 0:
             return 0.0
             
-        # Compute distance matrix for validation queries
-        distance_matrix = self._compute_distance_matrix(val_embeddings, state.kb_embeddings)
-        
-        if distance_matrix is None:
-            return 0.0
-            
-        # Find minimum distance for each validation query (vectorized)
-        min_distances = np.min(distance_matrix, axis=1)
-        scores = 1.0 - min_distances  # Convert distances to scores (0-1 range)
+        # Best similarity of each validation query (distance converted to a 0-1 score)
+        scores = self._index(state.kb_embeddings).coverage(val_embeddings, name="validation")
         
         # Compute scores using same exponential as training
         # k_exp = self.config.embedding_k_exp if hasattr(self, 'config') else 1.0
         # scores = np.exp(-k_exp * min_distances)
         
-        validation_confidence = np.mean(scores)
+        validation_confidence = float(np.mean(scores))
         state.metrics['validation_confidence'] = validation_confidence
         
         return validation_confidence
@@ -1211,9 +1370,6 @@ class EmbeddingStrategy(CrawlStrategy):
     
     async def update_state(self, state: CrawlState, new_results: List[CrawlResult]) -> None:
         """Update embeddings and coverage metrics with deduplication"""
-        from .utils import get_text_embeddings
-        
-        
         # Extract text from results
         new_texts = []
         valid_results = []
@@ -1226,9 +1382,9 @@ class EmbeddingStrategy(CrawlStrategy):
         if not new_texts:
             return
             
-        # Get embeddings for new texts
-        embedding_llm_config = self._get_embedding_llm_config_dict()      
-        new_embeddings = await get_text_embeddings(new_texts, embedding_llm_config, self.embedding_model)
+        # Get embeddings for new texts (pages seen before come from the cache)
+        new_embeddings = await self._get_embeddings(new_texts)
+        index = self._index(state.kb_embeddings)
 
         # Deduplicate embeddings before adding to KB
         if state.kb_embeddings is None:
@@ -1236,32 +1392,20 @@ class EmbeddingStrategy(CrawlStrategy):
             state.kb_embeddings = new_embeddings
             deduplicated_indices = list(range(len(new_embeddings)))
         else:
-            # Check for duplicates using vectorized similarity
-            deduplicated_embeddings = []
-            deduplicated_indices = []
-            
-            for i, new_emb in enumerate(new_embeddings):
-                # Compute similarities with existing KB
-                new_emb_normalized = new_emb / np.linalg.norm(new_emb)
-                kb_normalized = state.kb_embeddings / np.linalg.norm(state.kb_embeddings, axis=1, keepdims=True)
-                similarities = np.dot(kb_normalized, new_emb_normalized)
-                
-                # Only add if not too similar to existing content
-                if np.max(similarities) < self._kb_similarity_threshold:
-                    deduplicated_embeddings.append(new_emb)
-                    deduplicated_indices.append(i)
-            
-            # Add deduplicated embeddings
-            if deduplicated_embeddings:
-                state.kb_embeddings = np.vstack([state.kb_embeddings, np.array(deduplicated_embeddings)])
+            # Only add what is not too similar to existing content
+            similarities = index.max_similarity(new_embeddings)
+            deduplicated_indices = [int(i) for i in np.flatnonzero(similarities < self._kb_similarity_threshold)]
+            if deduplicated_indices:
+                state.kb_embeddings = np.vstack([state.kb_embeddings, new_embeddings[deduplicated_indices]])
         
         # Update crawl order only for non-duplicate results
         for idx in deduplicated_indices:
             state.crawl_order.append(valid_results[idx].url)
         
-        # Invalidate distance matrix cache since KB changed
-        self._kb_embeddings_hash = None
-        self._distance_matrix_cache = None
+        # The index only takes the new vectors; query coverage is updated with them
+        if deduplicated_indices:
+            index.add(new_embeddings[deduplicated_indices])
+        self._kb_index_source = state.kb_embeddings
             
         # Update coverage shape if needed
         if hasattr(state, 'query_embeddings') and state.query_embeddings is not None:
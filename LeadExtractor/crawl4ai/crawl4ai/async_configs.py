@@ -11,6 +11,7 @@ from .config import (
     PROVIDER_MODELS_PREFIXES,
     SCREENSHOT_HEIGHT_TRESHOLD,
     PAGE_TIMEOUT,
+    SITEMAP_CONCURRENCY,
     IMAGE_SCORE_THRESHOLD,
     SOCIAL_MEDIA_DOMAINS,
 )
@@ -26,6 +27,7 @@ from .table_extraction import TableExtractionStrategy, DefaultTableExtraction
 
 from .cache_context import CacheMode
 from .proxy_strategy import ProxyRotationStrategy
+from .request_interception import InterceptionProfile
 
 import inspect
 from typing import Any, Callable, Dict, List, Optional, Union
@@ -432,6 +434,15 @@ class BrowserConfig:
                            Default: [].
         enable_stealth (bool): If True, applies playwright-stealth to bypass basic bot detection.
                               Cannot be used with use_undetected browser mode. Default: False.
+        page_pool_size (int): Number of ready (stealth-applied) pages kept per browser context. Pages are
+                              reset (storage cleared, about:blank) and reused between crawls instead of being
+                              opened and closed for every URL. Crawls with a session_id keep their own page.
+                              0 disables the pool. Default: 0.
+        max_navigations_per_page (int): Crawls a pooled page serves before it is closed and replaced.
+                                        0 means no limit. Default: 50.
+        max_navigations_per_context (int): Pages a pooled browser context hands out before it is replaced
+                                           by a fresh context (closed once its pages are returned).
+                                           0 means no limit. Default: 0.
     """
 
     def __init__(
@@ -478,6 +489,9 @@ class BrowserConfig:
         host: str = "localhost",
         enable_stealth: bool = False,
         init_scripts: List[str] = None,
+        page_pool_size: int = 0,
+        max_navigations_per_page: int = 50,
+        max_navigations_per_context: int = 0,
     ):
         
         self.browser_type = browser_type
@@ -538,6 +552,9 @@ class BrowserConfig:
         self.host = host
         self.enable_stealth = enable_stealth
         self.init_scripts = init_scripts if init_scripts is not None else []
+        self.page_pool_size = page_pool_size
+        self.max_navigations_per_page = max_navigations_per_page
+        self.max_navigations_per_context = max_navigations_per_context
 
         fa_user_agenr_generator = ValidUAGenerator()
         if self.user_agent_mode == "random":
@@ -618,6 +635,9 @@ class BrowserConfig:
             host=kwargs.get("host", "localhost"),
             enable_stealth=kwargs.get("enable_stealth", False),
             init_scripts=kwargs.get("init_scripts", []),
+            page_pool_size=kwargs.get("page_pool_size", 0),
+            max_navigations_per_page=kwargs.get("max_navigations_per_page", 50),
+            max_navigations_per_context=kwargs.get("max_navigations_per_context", 0),
         )
 
     def to_dict(self):
@@ -658,6 +678,9 @@ class BrowserConfig:
             "host": self.host,
             "enable_stealth": self.enable_stealth,
             "init_scripts": self.init_scripts,
+            "page_pool_size": self.page_pool_size,
+            "max_navigations_per_page": self.max_navigations_per_page,
+            "max_navigations_per_context": self.max_navigations_per_context,
         }
 
 
@@ -1116,6 +1139,11 @@ class CrawlerRunConfig():
                               Default: 0.2.
         max_scroll_steps (Optional[int]): Maximum number of scroll steps to perform during full page scan.
                                          If None, scrolls until the entire page is loaded. Default: None.
+        adaptive_scroll (bool): If True, the full page scan runs in the page: steps scale with the page height,
+                                each step waits only until new content stops appearing, and scrolling stops once
+                                the page stops growing at the bottom. Default: False.
+        scroll_time_budget (Optional[float]): Seconds after which the full page scan stops. If None, no limit
+                                              (adaptive scans stop after DEFAULT_SCROLL_TIME_BUDGET). Default: None.
         process_iframes (bool): If True, attempts to process and inline iframe content.
                                 Default: False.
         remove_overlay_elements (bool): If True, remove overlays/popups before extracting HTML.
@@ -1155,6 +1183,14 @@ class CrawlerRunConfig():
                                                                      scrolling (e.g., Twitter, Instagram feeds).
                                                                      Default: None.
 
+        # Request Interception Parameters
+        interception_profile (InterceptionProfile or str or dict or None): Requests the page may make during the crawl:
+                                                                           resource types and domains to block, first-party
+                                                                           scripts to keep and a cap on body size. A string
+                                                                           names a preset ("text", "light", "no_analytics").
+                                                                           Stats accumulate on the profile object.
+                                                                           Default: None.
+
         # Link and Domain Handling Parameters
         exclude_social_media_domains (list of str): List of domains to exclude for social media links.
                                                     Default: SOCIAL_MEDIA_DOMAINS (from config).
@@ -1278,6 +1314,8 @@ class CrawlerRunConfig():
         scan_full_page: bool = False,
         scroll_delay: float = 0.2,
         max_scroll_steps: Optional[int] = None,
+        adaptive_scroll: bool = False,
+        scroll_time_budget: Optional[float] = None,
         process_iframes: bool = False,
         remove_overlay_elements: bool = False,
         simulate_user: bool = False,
@@ -1327,6 +1365,8 @@ class CrawlerRunConfig():
         link_preview_config: Union[LinkPreviewConfig, Dict[str, Any]] = None,
         # Virtual Scroll Parameters
         virtual_scroll_config: Union[VirtualScrollConfig, Dict[str, Any]] = None,
+        # Request Interception Parameters
+        interception_profile: Union[InterceptionProfile, str, Dict[str, Any]] = None,
         # URL Matching Parameters
         url_matcher: Optional[UrlMatcher] = None,
         match_mode: MatchMode = MatchMode.OR,
@@ -1405,6 +1445,8 @@ class CrawlerRunConfig():
         self.scan_full_page = scan_full_page
         self.scroll_delay = scroll_delay
         self.max_scroll_steps = max_scroll_steps
+        self.adaptive_scroll = adaptive_scroll
+        self.scroll_time_budget = scroll_time_budget
         self.process_iframes = process_iframes
         self.remove_overlay_elements = remove_overlay_elements
         self.simulate_user = simulate_user
@@ -1505,6 +1547,16 @@ class CrawlerRunConfig():
             self.virtual_scroll_config = VirtualScrollConfig.from_dict(virtual_scroll_config)
         else:
             raise ValueError("virtual_scroll_config must be VirtualScrollConfig object or dict")
+
+        # Request Interception Parameters
+        if interception_profile is None or isinstance(interception_profile, InterceptionProfile):
+            self.interception_profile = interception_profile
+        elif isinstance(interception_profile, str):
+            self.interception_profile = InterceptionProfile.preset(interception_profile)
+        elif isinstance(interception_profile, dict):
+            self.interception_profile = InterceptionProfile.from_dict(interception_profile)
+        else:
+            raise ValueError("interception_profile must be InterceptionProfile object, preset name or dict")
         
         # URL Matching Parameters
         self.url_matcher = url_matcher
@@ -1685,6 +1737,8 @@ class CrawlerRunConfig():
             scan_full_page=kwargs.get("scan_full_page", False),
             scroll_delay=kwargs.get("scroll_delay", 0.2),
             max_scroll_steps=kwargs.get("max_scroll_steps"),
+            adaptive_scroll=kwargs.get("adaptive_scroll", False),
+            scroll_time_budget=kwargs.get("scroll_time_budget"),
             process_iframes=kwargs.get("process_iframes", False),
             remove_overlay_elements=kwargs.get("remove_overlay_elements", False),
             simulate_user=kwargs.get("simulate_user", False),
@@ -1739,6 +1793,8 @@ class CrawlerRunConfig():
             deep_crawl_strategy=kwargs.get("deep_crawl_strategy"),
             # Link Extraction Parameters
             link_preview_config=kwargs.get("link_preview_config"),
+            # Request Interception Parameters
+            interception_profile=kwargs.get("interception_profile"),
             url=kwargs.get("url"),
             base_url=kwargs.get("base_url"),
             # URL Matching Parameters
@@ -1809,6 +1865,8 @@ class CrawlerRunConfig():
             "scan_full_page": self.scan_full_page,
             "scroll_delay": self.scroll_delay,
             "max_scroll_steps": self.max_scroll_steps,
+            "adaptive_scroll": self.adaptive_scroll,
+            "scroll_time_budget": self.scroll_time_budget,
             "process_iframes": self.process_iframes,
             "remove_overlay_elements": self.remove_overlay_elements,
             "simulate_user": self.simulate_user,
@@ -1847,6 +1905,8 @@ class CrawlerRunConfig():
             "user_agent_generator_config": self.user_agent_generator_config,
             "deep_crawl_strategy": self.deep_crawl_strategy,
             "link_preview_config": self.link_preview_config.to_dict() if self.link_preview_config else None,
+            # The profile object itself, so clones share its stats
+            "interception_profile": self.interception_profile,
             "url": self.url,
             "url_matcher": self.url_matcher,
             "match_mode": self.match_mode,
@@ -1895,8 +1955,17 @@ class LLMConfig:
         backoff_base_delay: Optional[int] = None,
         backoff_max_attempts: Optional[int] = None,
         backoff_exponential_factor: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        cache_responses: bool = False,
     ):
-        """Configuaration class for LLM provider and API token."""
+        """Configuaration class for LLM provider and API token.
+
+        max_concurrency and tokens_per_minute limit the requests to this provider
+        across all strategies (see llm_scheduler.py; defaults come from
+        LLM_PROVIDER_LIMITS). With cache_responses, responses are cached on disk
+        by model, prompt and request options.
+        """
         self.provider = provider
         if api_token and not api_token.startswith("env:"):
             self.api_token = api_token
@@ -1926,6 +1995,9 @@ class LLMConfig:
         self.backoff_base_delay = backoff_base_delay if backoff_base_delay is not None else 2
         self.backoff_max_attempts = backoff_max_attempts if backoff_max_attempts is not None else 3
         self.backoff_exponential_factor = backoff_exponential_factor if backoff_exponential_factor is not None else 2
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.cache_responses = cache_responses
 
     @staticmethod
     def from_kwargs(kwargs: dict) -> "LLMConfig":
@@ -1942,7 +2014,10 @@ class LLMConfig:
             n=kwargs.get("n"),
             backoff_base_delay=kwargs.get("backoff_base_delay"),
             backoff_max_attempts=kwargs.get("backoff_max_attempts"),
-            backoff_exponential_factor=kwargs.get("backoff_exponential_factor")
+            backoff_exponential_factor=kwargs.get("backoff_exponential_factor"),
+            max_concurrency=kwargs.get("max_concurrency"),
+            tokens_per_minute=kwargs.get("tokens_per_minute"),
+            cache_responses=kwargs.get("cache_responses", False),
         )
 
     def to_dict(self):
@@ -1959,7 +2034,10 @@ class LLMConfig:
             "n": self.n,
             "backoff_base_delay": self.backoff_base_delay,
             "backoff_max_attempts": self.backoff_max_attempts,
-            "backoff_exponential_factor": self.backoff_exponential_factor
+            "backoff_exponential_factor": self.backoff_exponential_factor,
+            "max_concurrency": self.max_concurrency,
+            "tokens_per_minute": self.tokens_per_minute,
+            "cache_responses": self.cache_responses,
         }
 
     def clone(self, **kwargs):
@@ -1998,6 +2076,9 @@ class SeedingConfig:
         filter_nonsense_urls: bool = True,
         cache_ttl_hours: int = 24,
         validate_sitemap_lastmod: bool = True,
+        sitemap_concurrency: int = SITEMAP_CONCURRENCY,
+        top_k: Optional[int] = None,
+        on_top_k: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
     ):
         """
         Initialize URL seeding configuration.
@@ -2017,8 +2098,8 @@ class SeedingConfig:
                         Default: 1000
             hits_per_sec: Rate limit in requests per second to avoid overwhelming servers. 
                          Default: 5
-            force: If True, bypasses the AsyncUrlSeeder's internal .jsonl cache and 
-                  re-fetches URLs. Default: False
+            force: If True, bypasses the AsyncUrlSeeder's caches (sitemap URL lists, head and
+                  live-check results) and re-fetches URLs; the caches are still updated. Default: False
             base_directory: Base directory for UrlSeeder's cache files (.jsonl). 
                            If None, uses default ~/.crawl4ai/. Default: None
             llm_config: LLM configuration for future features (e.g., semantic scoring). 
@@ -2037,6 +2118,13 @@ class SeedingConfig:
                             (only lastmod validation). Default: 24
             validate_sitemap_lastmod: If True, compares sitemap's <lastmod> with cache
                                      timestamp and refetches if sitemap is newer. Default: True
+            sitemap_concurrency: Maximum child sitemaps of a sitemap index downloaded
+                                at the same time. Default: SITEMAP_CONCURRENCY (8)
+            top_k: With a query, return only the top_k most relevant URLs. Default: None
+            on_top_k: Function (sync or async) called with the current top_k results
+                     (10 if top_k is None) while heads are still being fetched, every
+                     SEED_TOP_K_INTERVAL scored heads, and once scoring is complete.
+                     Only used with a query. Default: None
         """
         self.source = source
         self.pattern = pattern
@@ -2055,6 +2143,9 @@ class SeedingConfig:
         self.filter_nonsense_urls = filter_nonsense_urls
         self.cache_ttl_hours = cache_ttl_hours
         self.validate_sitemap_lastmod = validate_sitemap_lastmod
+        self.sitemap_concurrency = sitemap_concurrency
+        self.top_k = top_k
+        self.on_top_k = on_top_k
 
     # Add to_dict, from_kwargs, and clone methods for consistency
     def to_dict(self) -> Dict[str, Any]:
@@ -15,7 +15,14 @@ import hashlib
 import uuid
 from .js_snippet import load_js_script
 from .models import AsyncCrawlResponse
-from .config import SCREENSHOT_HEIGHT_TRESHOLD
+from .crawl_timing import Laps
+from .config import (
+    SCREENSHOT_HEIGHT_TRESHOLD,
+    DEFAULT_SCROLL_TIME_BUDGET,
+    ADAPTIVE_SCROLL_QUIET_MS,
+    ADAPTIVE_SCROLL_PLATEAU_CHECKS,
+    ADAPTIVE_SCROLL_MAX_STEP_VIEWPORTS,
+)
 from .async_configs import BrowserConfig, CrawlerRunConfig, HTTPCrawlerConfig
 from .async_logger import AsyncLogger
 from .ssl_certificate import SSLCertificate
@@ -537,8 +544,12 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                 **(config.user_agent_generator_config or {})
             )
 
+        # Charges the steps below to the fetch.* stages of the crawl's timings
+        laps = Laps()
+
         # Get page for session
         page, context = await self.browser_manager.get_page(crawlerRunConfig=config)
+        laps.lap("fetch.page_setup")
 
         # await page.goto(URL)
 
@@ -554,6 +565,15 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
         # Call hook after page creation
         await self.execute_hook("on_page_context_created", page, context=context, config=config)
 
+        # Request interception profile (removed again in `finally`)
+        interceptor = None
+        if config.interception_profile is not None:
+            # text_mode blocks extensions with context routes, reached only through fallback()
+            interceptor = config.interception_profile.interceptor(
+                url, logger=self.logger, fallback_routes=self.browser_config.text_mode
+            )
+            await interceptor.install(page)
+
         # Network Request Capturing
         if config.capture_network_requests:
             async def handle_request_capture(request):
@@ -647,6 +667,9 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
         # Note: For undetected browsers, console logging won't work directly
         # but captured messages can still be logged after retrieval
 
+        def handle_download(download):
+            asyncio.create_task(self._handle_download(download))
+
         try:
             # Get SSL certificate information if requested and URL is HTTPS
             ssl_cert = None
@@ -655,12 +678,7 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
 
             # Set up download handling
             if self.browser_config.accept_downloads:
-                page.on(
-                    "download",
-                    lambda download: asyncio.create_task(
-                        self._handle_download(download)
-                    ),
-                )
+                page.on("download", handle_download)
 
             # Handle page navigation and content loading
             if not config.js_only:
@@ -746,6 +764,7 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
             else:
                 status_code = 200
                 response_headers = {}
+            laps.lap("fetch.navigate")
 
             # Wait for body element and visibility
             try:
@@ -883,14 +902,23 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                         params={"error": str(e)},
                     )
 
+            laps.lap("fetch.wait")
+
             # Handle full page scanning
             if config.scan_full_page:
                 # await self._handle_full_page_scan(page, config.scroll_delay)
-                await self._handle_full_page_scan(page, config.scroll_delay, config.max_scroll_steps)
+                await self._handle_full_page_scan(
+                    page,
+                    config.scroll_delay,
+                    config.max_scroll_steps,
+                    adaptive=config.adaptive_scroll,
+                    time_budget=config.scroll_time_budget,
+                )
 
             # Handle virtual scroll if configured
             if config.virtual_scroll_config:
                 await self._handle_virtual_scroll(page, config.virtual_scroll_config)
+            laps.lap("fetch.scroll")
 
             # Execute JavaScript if provided
             # if config.js_code:
@@ -922,6 +950,7 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                 await page.mouse.down()
                 await page.mouse.up()
                 await page.keyboard.press("ArrowDown")
+            laps.lap("fetch.js")
 
             # Handle wait_for condition
             # Todo: Decide how to handle this
@@ -967,6 +996,7 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
             # Handle overlay removal
             if config.remove_overlay_elements:
                 await self.remove_overlay_elements(page)
+            laps.lap("fetch.wait")
 
             if config.css_selector:
                 try:
@@ -991,6 +1021,7 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                     raise RuntimeError(f"Failed to extract HTML content: {str(e)}")
             else:
                 html = await page.content()
+            laps.lap("fetch.content")
             
             # # Get final HTML content
             # html = await page.content()
@@ -1023,6 +1054,7 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                     tag="EXPORT",
                     params={"duration": time.perf_counter() - start_export_time},
                 )
+            laps.lap("fetch.export")
 
             # Define delayed content getter
             async def get_delayed_content(delay: float = 5.0) -> str:
@@ -1069,15 +1101,26 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
             raise e
 
         finally:
+            if interceptor is not None:
+                await interceptor.uninstall(page)
+                self.logger.debug(
+                    message="Interception profile '{name}' blocked {blocked} requests",
+                    tag="INTERCEPT",
+                    params={"name": config.interception_profile.name, "blocked": interceptor.blocked},
+                )
+
             # If no session_id is given we should close the page
             all_contexts = page.context.browser.contexts
             total_pages = sum(len(context.pages) for context in all_contexts)                
             if config.session_id:
                 pass
-            elif total_pages <= 1 and (self.browser_config.use_managed_browser or self.browser_config.headless):
+            elif total_pages <= 1 and (self.browser_config.use_managed_browser or self.browser_config.headless) \
+                    and not self.browser_manager.is_pooled(page):
                 pass
             else:
                 # Detach listeners before closing to prevent potential errors during close
+                if self.browser_config.accept_downloads:
+                    page.remove_listener("download", handle_download)
                 if config.capture_network_requests:
                     page.remove_listener("request", handle_request_capture)
                     page.remove_listener("response", handle_response_capture)
@@ -1091,11 +1134,18 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                     # Clean up console capture
                     await self.adapter.cleanup_console_capture(page, handle_console, handle_error)
                 
-                # Close the page
-                await page.close()
+                # Close the page, or reset it for the next crawl if it is pooled
+                await self.browser_manager.release_page(page)
 
     # async def _handle_full_page_scan(self, page: Page, scroll_delay: float = 0.1):
-    async def _handle_full_page_scan(self, page: Page, scroll_delay: float = 0.1, max_scroll_steps: Optional[int] = None):
+    async def _handle_full_page_scan(
+        self,
+        page: Page,
+        scroll_delay: float = 0.1,
+        max_scroll_steps: Optional[int] = None,
+        adaptive: bool = False,
+        time_budget: Optional[float] = None,
+    ) -> Dict[str, Any]:
         """
         Helper method to handle full page scanning.
 
@@ -1107,12 +1157,32 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
         5. Scroll to the bottom of the page again.
         6. Continue scrolling until the bottom of the page is reached.
 
+        With `adaptive`, the scan runs inside the page instead (see
+        `_handle_adaptive_page_scan`): steps grow with the page height, each step
+        waits only until the DOM goes quiet, and the scan stops once the page stops
+        growing at the bottom.
+
         Args:
             page (Page): The Playwright page object
             scroll_delay (float): The delay between page scrolls
             max_scroll_steps (Optional[int]): Maximum number of scroll steps to perform. If None, scrolls until end.
+            adaptive (bool): Use the adaptive in-page scanner
+            time_budget (Optional[float]): Seconds after which scrolling stops. If None, no limit
+                                           (adaptive scans use DEFAULT_SCROLL_TIME_BUDGET).
 
+        Returns:
+            Dict with steps, elapsed (seconds), height and the reason the scan stopped
+            ("end", "plateau", "max_steps", "time_budget" or "error").
         """
+        if adaptive:
+            return await self._handle_adaptive_page_scan(
+                page, scroll_delay, max_scroll_steps, time_budget or DEFAULT_SCROLL_TIME_BUDGET
+            )
+
+        started = time.perf_counter()
+        scroll_step_count = 0
+        total_height = 0
+        reason = "end"
         try:
             viewport_size = page.viewport_size
             if viewport_size is None:
@@ -1135,7 +1205,6 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
             dimensions = await self.get_page_dimensions(page)
             total_height = dimensions["height"]
 
-            scroll_step_count = 0
             while current_position < total_height:
                 #### 
                 # NEW FEATURE: Check if we've reached the maximum allowed scroll steps
@@ -1143,6 +1212,10 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                 # If max_scroll_steps is None, this check is skipped (unlimited scrolling - original behavior)
                 ####
                 if max_scroll_steps is not None and scroll_step_count >= max_scroll_steps:
+                    reason = "max_steps"
+                    break
+                if time_budget is not None and time.perf_counter() - started >= time_budget:
+                    reason = "time_budget"
                     break
                 current_position = min(current_position + viewport_height, total_height)
                 await self.safe_scroll(page, 0, current_position, delay=scroll_delay)
@@ -1164,6 +1237,7 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
             await self.safe_scroll(page, 0, 0)
 
         except Exception as e:
+            reason = "error"
             self.logger.warning(
                 message="Failed to perform full page scan: {error}",
                 tag="PAGE_SCAN",
@@ -1173,6 +1247,60 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
             # await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
             await self.safe_scroll(page, 0, total_height)
 
+        return self._report_page_scan(scroll_step_count, time.perf_counter() - started, total_height, reason)
+
+    async def _handle_adaptive_page_scan(
+        self,
+        page: Page,
+        scroll_delay: float,
+        max_scroll_steps: Optional[int],
+        time_budget: float,
+    ) -> Dict[str, Any]:
+        """
+        Scan the page in a single in-page script (js_snippet/adaptive_scroll.js).
+
+        A MutationObserver tracks when nodes are being added: after each scroll the
+        script waits `scroll_delay`, then until no nodes were added for
+        ADAPTIVE_SCROLL_QUIET_MS (capped at 4 * scroll_delay). Steps are 1/20 of the
+        page height, between one and ADAPTIVE_SCROLL_MAX_STEP_VIEWPORTS viewports.
+        Once at the bottom, the scan stops after ADAPTIVE_SCROLL_PLATEAU_CHECKS
+        checks without the page growing, or when the time budget runs out.
+        """
+        started = time.perf_counter()
+        try:
+            result = await self.adapter.evaluate(
+                page,
+                load_js_script("adaptive_scroll"),
+                {
+                    "delay": scroll_delay * 1000,
+                    "maxSteps": max_scroll_steps,
+                    "timeBudget": time_budget * 1000,
+                    "quietPeriod": ADAPTIVE_SCROLL_QUIET_MS,
+                    "plateauChecks": ADAPTIVE_SCROLL_PLATEAU_CHECKS,
+                    "maxStepViewports": ADAPTIVE_SCROLL_MAX_STEP_VIEWPORTS,
+                },
+            )
+        except Exception as e:
+            self.logger.warning(
+                message="Failed to perform full page scan: {error}",
+                tag="PAGE_SCAN",
+                params={"error": str(e)},
+            )
+            return self._report_page_scan(0, time.perf_counter() - started, 0, "error")
+
+        # Leave the page scrolled to the bottom, like the step-by-step scan
+        await self.safe_scroll(page, 0, 0)
+        await self.safe_scroll(page, 0, result["height"])
+        return self._report_page_scan(result["steps"], result["elapsed"], result["height"], result["reason"])
+
+    def _report_page_scan(self, steps: int, elapsed: float, height: int, reason: str) -> Dict[str, Any]:
+        self.logger.debug(
+            message="Full page scan: {steps} steps in {elapsed:.2f}s, height {height}px ({reason})",
+            tag="PAGE_SCAN",
+            params={"steps": steps, "elapsed": elapsed, "height": height, "reason": reason},
+        )
+        return {"steps": steps, "elapsed": elapsed, "height": height, "reason": reason}
+
     async def _handle_virtual_scroll(self, page: Page, config: "VirtualScrollConfig"):
         """
         Handle virtual scroll containers (e.g., Twitter-like feeds) by capturing
@@ -1608,7 +1736,7 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
             # Clean up the page
             if page:
                 try:
-                    await page.close()
+                    await self.browser_manager.release_page(page)
                 except Exception:
                     pass
 
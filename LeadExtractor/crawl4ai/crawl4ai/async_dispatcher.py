@@ -8,6 +8,7 @@ from .models import (
 )
 
 from .components.crawler_monitor import CrawlerMonitor
+from .crawl_timing import StageHistograms
 
 from .types import AsyncWebCrawler
 
@@ -97,6 +98,15 @@ class BaseDispatcher(ABC):
         self.concurrent_sessions = 0
         self.rate_limiter = rate_limiter
         self.monitor = monitor
+        # Per-stage timings of the crawls run through this dispatcher
+        self.timings = StageHistograms()
+
+    def record_timings(self, result: CrawlResult) -> None:
+        """Add the stage timings of a finished crawl to the dispatcher's (and monitor's) histograms."""
+        timings = getattr(result, "timings", None)
+        self.timings.observe_timings(timings, result.success)
+        if self.monitor:
+            self.monitor.record_timings(timings, result.success)
 
     def select_config(self, url: str, configs: Union[CrawlerRunConfig, List[CrawlerRunConfig]]) -> Optional[CrawlerRunConfig]:
         """Select the appropriate config for a given URL.
@@ -205,6 +215,11 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
                     self.monitor.update_memory_status("NORMAL")
             elif self.current_memory_percent < self.memory_threshold_percent:
                 self._high_memory_start_time = None
+
+            # Throttle the crawler's CPU executor (if any) along with new crawls
+            cpu_executor = self._get_cpu_executor()
+            if cpu_executor is not None:
+                cpu_executor.set_memory_pressure(self.memory_pressure_mode)
             
             # In critical mode, we might need to take more drastic action
             if self.current_memory_percent >= self.critical_threshold_percent:
@@ -214,6 +229,16 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
                 
             await asyncio.sleep(self.check_interval)
     
+    def _get_cpu_executor(self):
+        return getattr(getattr(self, "crawler", None), "cpu_executor", None)
+
+    def _can_start_tasks(self) -> bool:
+        """New crawls start only without memory pressure and while the CPU executor keeps up"""
+        if self.memory_pressure_mode:
+            return False
+        cpu_executor = self._get_cpu_executor()
+        return cpu_executor is None or not cpu_executor.saturated
+
     def _get_priority_score(self, wait_time: float, retry_count: int) -> float:
         """Calculate priority score (lower is higher priority)
         - URLs waiting longer than fairness_timeout get higher priority
@@ -318,6 +343,7 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
             
             # Execute the crawl with selected config
             result = await self.crawler.arun(url, config=selected_config, session_id=task_id)
+            self.record_timings(result)
             
             # Measure memory usage
             end_memory = process.memory_info().rss / (1024 * 1024)
@@ -407,8 +433,8 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
                             t.cancel()
                         raise exc
 
-                # If memory pressure is low, greedily fill all available slots
-                if not self.memory_pressure_mode:
+                # If memory pressure is low (and post-processing keeps up), greedily fill all available slots
+                if self._can_start_tasks():
                     slots = self.max_session_permit - len(active_tasks)
                     while slots > 0:
                         try:
@@ -560,8 +586,8 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
                         for t in active_tasks:
                             t.cancel()
                         raise exc
-                # If memory pressure is low, greedily fill all available slots
-                if not self.memory_pressure_mode:
+                # If memory pressure is low (and post-processing keeps up), greedily fill all available slots
+                if self._can_start_tasks():
                     slots = self.max_session_permit - len(active_tasks)
                     while slots > 0:
                         try:
@@ -685,6 +711,7 @@ class SemaphoreDispatcher(BaseDispatcher):
                 process = psutil.Process()
                 start_memory = process.memory_info().rss / (1024 * 1024)
                 result = await self.crawler.arun(url, config=selected_config, session_id=task_id)
+                self.record_timings(result)
                 end_memory = process.memory_info().rss / (1024 * 1024)
 
                 memory_usage = peak_memory = end_memory - start_memory
@@ -1,11 +1,23 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
+import atexit
 import os
+import queue
+import re
+import sys
+import threading
+import time
+import weakref
 from datetime import datetime
 from urllib.parse import unquote
 from rich.console import Console
 from rich.text import Text
+try:
+    from rich._emoji_replace import _emoji_replace
+except ImportError:  # pragma: no cover - private module of rich
+    _emoji_replace = None
+from .config import LOG_FLUSH_INTERVAL, LOG_FLUSH_SIZE
 from .utils import create_box_message
 
 
@@ -46,6 +58,196 @@ class LogColor(str, Enum):
         return self.value
 
 
+class LogFileWriter:
+    """
+    Appends log records to a file from a background thread.
+
+    `write()` only puts the record on a queue, so logging never waits for the
+    disk. The thread keeps the file open, formats the records, and writes them
+    in batches once `flush_size` characters are pending or `flush_interval`
+    seconds have passed, and on `flush()` / `close()` (also called at exit).
+    With `max_bytes`, the file is rotated to `<log_file>.1` ... `.<backup_count>`
+    when it would grow past that size.
+
+    Args:
+        path: Log file
+        format: Turns a record into a line (with its newline); records are
+            written as they are when not given
+        max_bytes: Rotate the file at this size; 0 never rotates
+        backup_count: Rotated files to keep
+        flush_interval: Longest time, in seconds, a record waits to be written
+        flush_size: Pending characters that trigger a write
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        path: str,
+        format: Optional[Callable[[Any], str]] = None,
+        max_bytes: int = 0,
+        backup_count: int = 5,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+        flush_size: int = LOG_FLUSH_SIZE,
+    ):
+        self.path = path
+        self.format = format or str
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._file = None
+        self._failed = False
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        _open_writers.add(self)
+
+    def write(self, record: Any) -> None:
+        """Queue a record to be written."""
+        if self._thread is None or not self._thread.is_alive():
+            self._start()
+        self._queue.put(record)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until the records queued so far are written."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write what is queued and close the file. Later writes reopen it."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(self._STOP)
+        thread.join(timeout)
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            # Not alive: never started, closed, or lost across a fork
+            self._thread = threading.Thread(target=self._run, name="crawl4ai-log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        pending: List[str] = []
+        size = 0
+        last_write = time.monotonic()
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0.0, self.flush_interval - (time.monotonic() - last_write))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            # Take everything that's queued, then write it in one go
+            stop = False
+            waiters = []
+            while item is not None:
+                if item is self._STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    line = self._format(item)
+                    pending.append(line)
+                    size += len(line)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if pending and (
+                stop or waiters or size >= self.flush_size
+                or time.monotonic() - last_write >= self.flush_interval
+            ):
+                self._write(pending)
+                pending = []
+                size = 0
+                last_write = time.monotonic()
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _format(self, record: Any) -> str:
+        try:
+            return self.format(record)
+        except Exception:
+            return f"{record}\n"
+
+    def _write(self, lines: List[str]) -> None:
+        try:
+            text = "".join(lines)
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            if self.max_bytes and self._file.tell() and self._file.tell() + len(text) > self.max_bytes:
+                self._rotate()
+            self._file.write(text)
+            self._file.flush()
+        except Exception as e:
+            # Logging must not take the crawl down; report the first failure only
+            if not self._failed:
+                self._failed = True
+                print(f"crawl4ai: could not write to log file {self.path}: {e}", file=sys.stderr)
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                if os.path.exists(f"{self.path}.{i}"):
+                    os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+
+
+# Writers to flush at interpreter exit (weak, so loggers can still be collected)
+_open_writers: "weakref.WeakSet[LogFileWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_log_writers() -> None:
+    for writer in list(_open_writers):
+        writer.close()
+
+
+# Console markup tags, as rich.markup recognizes them
+_markup_tag_rx = re.compile(r"\[[a-z#/@][^[]*?]")
+
+
+def _plain_text(markup: str) -> str:
+    """Text.from_markup(markup).plain, without building the styled Text."""
+    if "\\" in markup or _emoji_replace is None:
+        # Escaped tags: leave them to rich
+        return Text.from_markup(markup).plain
+    plain = _markup_tag_rx.sub("", markup)
+    return _emoji_replace(plain) if ":" in plain else plain
+
+
+def _format_markup_line(record) -> str:
+    timestamp, markup = record
+    plain_text = _plain_text(markup)
+    return f"[{datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}] {plain_text}\n"
+
+
+def _format_file_line(record) -> str:
+    timestamp, level, tag, message = record
+    return f"[{datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}] [{level}] [{tag}] {message}\n"
+
+
 class AsyncLoggerBase(ABC):
     @abstractmethod
     def debug(self, message: str, tag: str = "DEBUG", **kwargs):
@@ -118,6 +320,8 @@ class AsyncLogger(AsyncLoggerBase):
         icons: Optional[Dict[str, str]] = None,
         colors: Optional[Dict[LogLevel, LogColor]] = None,
         verbose: bool = True,
+        log_max_bytes: int = 0,
+        log_backup_count: int = 5,
     ):
         """
         Initialize the logger.
@@ -129,6 +333,8 @@ class AsyncLogger(AsyncLoggerBase):
             icons: Custom icons for different tags
             colors: Custom colors for different log levels
             verbose: Whether to output to console
+            log_max_bytes: Rotate the log file at this size (0 never rotates)
+            log_backup_count: Rotated log files to keep
         """
         self.log_file = log_file
         self.log_level = log_level
@@ -136,11 +342,16 @@ class AsyncLogger(AsyncLoggerBase):
         self.icons = icons or self.DEFAULT_ICONS
         self.colors = colors or self.DEFAULT_COLORS
         self.verbose = verbose
+        self.log_max_bytes = log_max_bytes
+        self.log_backup_count = log_backup_count
         self.console = Console()
 
-        # Create log file directory if needed
+        # File output goes through a background writer (creates the directory)
+        self._writer = None
         if log_file:
-            os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+            self._writer = LogFileWriter(
+                log_file, _format_markup_line, max_bytes=log_max_bytes, backup_count=log_backup_count
+            )
 
     def _format_tag(self, tag: str) -> str:
         """Format a tag with consistent width."""
@@ -159,13 +370,19 @@ class AsyncLogger(AsyncLoggerBase):
         return shortened.ljust(length)  # Also pad shortened text to consistent length
 
     def _write_to_file(self, message: str):
-        """Write a message to the log file if configured."""
-        if self.log_file:
-            text = Text.from_markup(message)
-            plain_text = text.plain
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] {plain_text}\n")
+        """Queue a message for the log file if configured; markup is stripped by the writer."""
+        if self._writer is not None:
+            self._writer.write((time.time(), message))
+
+    def flush(self):
+        """Wait until the queued messages are in the log file."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        """Write the queued messages and close the log file."""
+        if self._writer is not None:
+            self._writer.close()
 
     def _log(
         self,
@@ -326,21 +543,33 @@ class AsyncFileLogger(AsyncLoggerBase):
     File-only asynchronous logger that writes logs to a specified file.
     """
 
-    def __init__(self, log_file: str):
+    def __init__(self, log_file: str, log_max_bytes: int = 0, log_backup_count: int = 5):
         """
         Initialize the file logger.
 
         Args:
             log_file: File path for logging
+            log_max_bytes: Rotate the log file at this size (0 never rotates)
+            log_backup_count: Rotated log files to keep
         """
         self.log_file = log_file
-        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        self.log_max_bytes = log_max_bytes
+        self.log_backup_count = log_backup_count
+        self._writer = LogFileWriter(
+            log_file, _format_file_line, max_bytes=log_max_bytes, backup_count=log_backup_count
+        )
 
     def _write_to_file(self, level: str, message: str, tag: str):
-        """Write a message to the log file."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}] [{level}] [{tag}] {message}\n")
+        """Queue a message for the log file."""
+        self._writer.write((time.time(), level, tag, message))
+
+    def flush(self):
+        """Wait until the queued messages are in the log file."""
+        self._writer.flush()
+
+    def close(self):
+        """Write the queued messages and close the log file."""
+        self._writer.close()
 
     def debug(self, message: str, tag: str = "DEBUG", **kwargs):
         """Log a debug message to file."""
@@ -6,33 +6,38 @@ Features
 --------
 * Common-Crawl streaming via httpx.AsyncClient (HTTP/2, keep-alive)
 * robots.txt → sitemap chain (.gz + nested indexes) via async httpx
+* Sitemap URL lists and head / live-check results cached in one SQLite store
 * Per-domain CDX result cache on disk (~/.crawl4ai/<index>_<domain>_<hash>.jsonl)
 * Optional HEAD-only liveness check
 * Optional partial <head> download + meta parsing
 * Global hits-per-second rate-limit via asyncio.Semaphore
+* BM25 relevance updated as heads arrive, with top-k reports before discovery ends
 * Concurrency in the thousands — fine on a single event-loop
 """
 
 from __future__ import annotations
 import aiofiles
 import asyncio
-import gzip
+import contextlib
 import hashlib
+import heapq
+import inspect
 import io
 import json
 import os
 import pathlib
 import re
 import time
-from datetime import datetime, timedelta, timezone
+import zlib
+from datetime import timedelta
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
 from urllib.parse import quote, urljoin
 
 import httpx
 import fnmatch
+import numpy as np
 try:
-    from lxml import html as lxml_html
     from lxml import etree
     LXML = True
 except ImportError:
@@ -42,17 +47,20 @@ try:
     HAS_BROTLI = True
 except ImportError:
     HAS_BROTLI = False
-try:
-    import rank_bm25
-    HAS_BM25 = True
-except ImportError:
-    HAS_BM25 = False
 
 # Import AsyncLoggerBase from crawl4ai's logger module
 # Assuming crawl4ai/async_logger.py defines AsyncLoggerBase
 # You might need to adjust this import based on your exact file structure
 # Import AsyncLogger for default if needed
 from .async_logger import AsyncLoggerBase, AsyncLogger
+from .bm25 import BM25Index, bm25_scores
+from .config import (
+    SEED_TOP_K_INTERVAL,
+    SEEDER_CACHE_BATCH_SIZE,
+    SITEMAP_CONCURRENCY,
+    SITEMAP_QUEUE_BATCHES,
+)
+from .seeder_cache import SeederCache
 
 # Import SeedingConfig for type hints
 from typing import TYPE_CHECKING
@@ -74,6 +82,8 @@ _charset_rx = re.compile(r'<meta\s+[^>]*charset=["\']?([^"\' >]+)', re.I)
 _title_rx = re.compile(r'<title>(.*?)</title>', re.I | re.S)
 _link_rx = re.compile(
     r'<link\s+[^>]*rel=["\']?([^"\' >]+)[^>]*href=["\']?([^"\' >]+)', re.I)
+# End of the <head>: its end tag, or the start of the body when the end tag is omitted
+_head_end_rx = re.compile(rb'</head>|<body[\s>]', re.I)
 
 # ────────────────────────────────────────────────────────────────────────── helpers
 
@@ -93,88 +103,6 @@ def _parse_sitemap_lastmod(xml_content: bytes) -> Optional[str]:
     return None
 
 
-def _is_cache_valid(
-    cache_path: pathlib.Path,
-    ttl_hours: int,
-    validate_lastmod: bool,
-    current_lastmod: Optional[str] = None
-) -> bool:
-    """
-    Check if sitemap cache is still valid.
-
-    Returns False (invalid) if:
-    - File doesn't exist
-    - File is corrupted/unreadable
-    - TTL expired (if ttl_hours > 0)
-    - Sitemap lastmod is newer than cache (if validate_lastmod=True)
-    """
-    if not cache_path.exists():
-        return False
-
-    try:
-        with open(cache_path, "r") as f:
-            data = json.load(f)
-
-        # Check version
-        if data.get("version") != 1:
-            return False
-
-        # Check TTL
-        if ttl_hours > 0:
-            created_at = datetime.fromisoformat(data["created_at"].replace("Z", "+00:00"))
-            age_hours = (datetime.now(timezone.utc) - created_at).total_seconds() / 3600
-            if age_hours > ttl_hours:
-                return False
-
-        # Check lastmod
-        if validate_lastmod and current_lastmod:
-            cached_lastmod = data.get("sitemap_lastmod")
-            if cached_lastmod and current_lastmod > cached_lastmod:
-                return False
-
-        # Check URL count (sanity check - if 0, likely corrupted)
-        if data.get("url_count", 0) == 0:
-            return False
-
-        return True
-
-    except (json.JSONDecodeError, KeyError, ValueError, IOError):
-        # Corrupted cache - return False to trigger refetch
-        return False
-
-
-def _read_cache(cache_path: pathlib.Path) -> List[str]:
-    """Read URLs from cache file. Returns empty list on error."""
-    try:
-        with open(cache_path, "r") as f:
-            data = json.load(f)
-        return data.get("urls", [])
-    except Exception:
-        return []
-
-
-def _write_cache(
-    cache_path: pathlib.Path,
-    urls: List[str],
-    sitemap_url: str,
-    sitemap_lastmod: Optional[str]
-) -> None:
-    """Write URLs to cache with metadata."""
-    data = {
-        "version": 1,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "sitemap_lastmod": sitemap_lastmod,
-        "sitemap_url": sitemap_url,
-        "url_count": len(urls),
-        "urls": urls
-    }
-    try:
-        with open(cache_path, "w") as f:
-            json.dump(data, f)
-    except Exception:
-        pass  # Fail silently - cache is optional
-
-
 def _match(url: str, pattern: str) -> bool:
     if fnmatch.fnmatch(url, pattern):
         return True
@@ -185,49 +113,27 @@ def _match(url: str, pattern: str) -> bool:
 
 def _parse_head(src: str) -> Dict[str, Any]:
     if LXML:
-        try:
-            if isinstance(src, str):
-                # strip Unicode, let lxml decode
-                src = src.encode("utf-8", "replace")
-            doc = lxml_html.fromstring(src)
-        except (ValueError, etree.ParserError):
-            return {}        # malformed, bail gracefully
+        if isinstance(src, str):
+            # strip Unicode, let lxml decode
+            src = src.encode("utf-8", "replace")
         info: Dict[str, Any] = {
-            "title": (doc.find(".//title").text or "").strip()
-            if doc.find(".//title") is not None else None,
+            "title": None,
             "charset": None,
             "meta": {}, "link": {}, "jsonld": []
         }
-        for el in doc.xpath(".//meta"):
-            k = el.attrib.get("name") or el.attrib.get(
-                "property") or el.attrib.get("http-equiv")
-            if k:
-                info["meta"][k.lower()] = el.attrib.get("content", "")
-            elif "charset" in el.attrib:
-                info["charset"] = el.attrib["charset"].lower()
-        for el in doc.xpath(".//link"):
-            rel_attr = el.attrib.get("rel", "")
-            if not rel_attr:
-                continue
-            # Handle multiple space-separated rel values
-            rel_values = rel_attr.lower().split()
-            entry = {a: el.attrib[a] for a in (
-                "href", "as", "type", "hreflang") if a in el.attrib}
-            # Add entry for each rel value
-            for rel in rel_values:
-                info["link"].setdefault(rel, []).append(entry)
-        # Extract JSON-LD structured data
-        for script in doc.xpath('.//script[@type="application/ld+json"]'):
-            if script.text:
-                try:
-                    jsonld_data = json.loads(script.text.strip())
-                    info["jsonld"].append(jsonld_data)
-                except json.JSONDecodeError:
-                    pass
-        # Extract html lang attribute
-        html_elem = doc.find(".//html")
-        if html_elem is not None:
-            info["lang"] = html_elem.attrib.get("lang", "")
+        # One pass over the elements as they are parsed; parsing stops at the end of <head>
+        parser = etree.HTMLPullParser(events=("start", "end"))
+        try:
+            for start in range(0, len(src), 8192):
+                parser.feed(src[start:start + 8192])
+                if _read_head_events(parser, info):
+                    return info
+            parser.close()
+        except (ValueError, etree.ParserError, etree.XMLSyntaxError):
+            pass
+        _read_head_events(parser, info)
+        if "lang" not in info:
+            return {}        # no elements: malformed or empty, bail gracefully
         return info
     # regex fallback
     info: Dict[str, Any] = {"title": None, "charset": None,
@@ -255,6 +161,330 @@ def _parse_head(src: str) -> Dict[str, Any]:
         info["lang"] = lang_match.group(1)
     return info
 
+def _read_head_events(parser, info: Dict[str, Any]) -> bool:
+    """Collect the metadata of parsed elements into `info`; returns True at the end of <head>."""
+    for event, el in parser.read_events():
+        tag = el.tag
+        if event == "start":
+            if tag == "html":
+                info["lang"] = el.get("lang", "")
+            continue
+        if tag == "meta":
+            attrs = el.attrib
+            k = attrs.get("name") or attrs.get("property") or attrs.get("http-equiv")
+            if k:
+                info["meta"][k.lower()] = attrs.get("content", "")
+            elif "charset" in attrs:
+                info["charset"] = attrs["charset"].lower()
+        elif tag == "link":
+            attrs = el.attrib
+            rel_attr = attrs.get("rel", "")
+            if not rel_attr:
+                continue
+            entry = {a: attrs[a] for a in (
+                "href", "as", "type", "hreflang") if a in attrs}
+            # Add entry for each of the space-separated rel values
+            for rel in rel_attr.lower().split():
+                info["link"].setdefault(rel, []).append(entry)
+        elif tag == "title":
+            if info["title"] is None:
+                info["title"] = (el.text or "").strip()
+        elif tag == "script":
+            # Extract JSON-LD structured data
+            if el.get("type") == "application/ld+json" and el.text:
+                try:
+                    info["jsonld"].append(json.loads(el.text.strip()))
+                except json.JSONDecodeError:
+                    pass
+        elif tag == "head":
+            return True
+    return False
+
+
+class _HeadReader:
+    """
+    Collects the start of a page up to the end of its <head>.
+
+    Compressed bodies (gzip, deflate, br) are decompressed as they arrive. Only the
+    bytes of each new chunk are searched for the end of the head, plus the few
+    before them that could hold the start of a tag split between chunks. A
+    Content-Encoding the payload doesn't match is ignored (`bogus_encoding`).
+
+    Args:
+        encoding: Content-Encoding of the response.
+        max_bytes: Stop after this many (decompressed) bytes even without </head>.
+    """
+
+    _OVERLAP = len(b"</head>") - 1
+    _SLICE = 4096  # Compressed bytes inflated at a time
+
+    def __init__(self, encoding: str = "", max_bytes: int = 65_536):
+        self.encoding = encoding.strip().lower()
+        self.max_bytes = max_bytes
+        self.buffer = bytearray()
+        self.end: Optional[int] = None  # Where the head ends in buffer, once found
+        self.bogus_encoding = False
+        self._decompress = None
+        self._started = False
+
+    def _start(self, chunk: bytes) -> None:
+        self._started = True
+        if self.encoding in ("gzip", "x-gzip"):
+            if chunk[:2] == b"\x1f\x8b":
+                self._decompress = self._inflater(16 + zlib.MAX_WBITS)
+            else:
+                self.bogus_encoding = True
+        elif self.encoding == "deflate":
+            # zlib-wrapped as the spec says, or raw deflate as some servers send it
+            zlib_header = len(chunk) > 1 and (chunk[0] * 256 + chunk[1]) % 31 == 0
+            self._decompress = self._inflater(zlib.MAX_WBITS if zlib_header else -zlib.MAX_WBITS)
+        elif self.encoding == "br" and HAS_BROTLI:
+            self._decompress = brotli.Decompressor().process
+
+    def _inflater(self, wbits: int):
+        decompressor = zlib.decompressobj(wbits)
+        # A chunk never inflates past max_bytes; what's left over isn't needed
+        return lambda data: decompressor.decompress(data, self.max_bytes)
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add a chunk of the response body; returns True once enough was read."""
+        if not chunk:
+            return self.end is not None
+        if not self._started:
+            self._start(chunk)
+        if self._decompress is None:
+            return self._append(chunk)
+        # Inflate a slice at a time, so what follows the head isn't decompressed
+        for start in range(0, len(chunk), self._SLICE):
+            piece = chunk[start:start + self._SLICE]
+            try:
+                piece = self._decompress(piece)
+            except Exception:
+                if self.buffer:
+                    raise
+                # Header says compressed but the payload is plain
+                self._decompress = None
+                self.bogus_encoding = True
+                return self._append(chunk)
+            if self._append(piece):
+                return True
+        return False
+
+    def _append(self, data: bytes) -> bool:
+        scan_from = max(0, len(self.buffer) - self._OVERLAP)
+        self.buffer += data
+        match = _head_end_rx.search(self.buffer, scan_from)
+        if match:
+            self.end = match.end() if match.group().startswith(b"</") else match.start()
+            return True
+        return len(self.buffer) >= self.max_bytes
+
+    def head(self) -> bytes:
+        """The bytes up to the end of the head, or the first 10 kB if it wasn't found."""
+        if self.end is not None:
+            return bytes(self.buffer[:self.end])
+        return bytes(self.buffer[:10240])
+
+
+class _SitemapStreamParser:
+    """
+    Incremental sitemap parser: bytes in, ("url" | "sitemap", location) pairs out.
+
+    Gzip is recognized by its magic bytes and decompressed chunk by chunk, and the
+    XML goes through a pull parser. Each <url>/<sitemap> element is dropped from
+    the tree once read, so memory doesn't grow with the size of the sitemap.
+    Element names are matched without their namespace. The newest <lastmod> of
+    the entries is kept in `lastmod`, as _parse_sitemap_lastmod reads it.
+    """
+
+    _GZIP_MAGIC = b"\x1f\x8b"
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.counts = {"url": 0, "sitemap": 0}
+        self.lastmod: Optional[str] = None
+        self._head = b""
+        self._decompressor = None
+        self._detected = False
+        self._root = None
+        if LXML:
+            self._parser = etree.XMLPullParser(events=("end",), recover=True)
+        else:
+            import xml.etree.ElementTree as ET
+            # ElementTree elements don't know their parent: remember the root
+            self._parser = ET.XMLPullParser(events=("start", "end"))
+
+    def feed(self, chunk: bytes) -> List[tuple]:
+        if not self._detected:
+            self._head += chunk
+            if len(self._head) < len(self._GZIP_MAGIC):
+                return []
+            chunk, self._head = self._head, b""
+            self._detected = True
+            if chunk.startswith(self._GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._decompressor is not None:
+            chunk = self._decompressor.decompress(chunk)
+        if chunk:
+            self._parser.feed(chunk)
+        return self._read()
+
+    def close(self) -> List[tuple]:
+        if self._head:
+            self._detected = True
+            self._parser.feed(self._head)
+            self._head = b""
+        if self._decompressor is not None:
+            tail = self._decompressor.flush()
+            if tail:
+                self._parser.feed(tail)
+        try:
+            self._parser.close()
+        except Exception:
+            # Truncated documents: keep what was read
+            pass
+        return self._read()
+
+    def _read(self) -> List[tuple]:
+        items = []
+        for event, element in self._parser.read_events():
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue
+            if event == "start":
+                if self._root is None:
+                    self._root = element
+                continue
+            kind = tag.rsplit("}", 1)[-1]
+            if kind not in ("url", "sitemap"):
+                continue
+            found_loc = False
+            for child in element:
+                if not isinstance(child.tag, str):
+                    continue
+                name = child.tag.rsplit("}", 1)[-1]
+                if name == "lastmod":
+                    if child.text and (self.lastmod is None or child.text > self.lastmod):
+                        self.lastmod = child.text
+                elif name == "loc" and not found_loc:
+                    found_loc = True
+                    loc = (child.text or "").strip()
+                    if loc and not loc.startswith(("https://", "http://")):
+                        loc = urljoin(self.base_url, loc)
+                    if loc:
+                        items.append((kind, loc))
+                        self.counts[kind] += 1
+            self._drop(element)
+        return items
+
+    def _drop(self, element) -> None:
+        element.clear()
+        if LXML:
+            parent = element.getparent()
+            if parent is not None:
+                parent.remove(element)
+        elif self._root is not None and element is not self._root:
+            try:
+                self._root.remove(element)
+            except ValueError:
+                pass
+
+
+def _normalize_scores(scores: np.ndarray) -> np.ndarray:
+    """Min-max normalize scores to 0-1; if all scores are equal they all become 0.5."""
+    if len(scores) == 0:
+        return scores
+    low, high = scores.min(), scores.max()
+    if high == low:
+        return np.full(len(scores), 0.5)
+    return (scores - low) / (high - low)
+
+
+class _HeadScorer:
+    """
+    BM25 relevance of seeded URLs, updated as their heads arrive.
+
+    Valid results with head text are added to a `BM25Index` of the query, other
+    valid results get the URL-based score. Scores are normalized over everything
+    added so far, so after the last result they equal one BM25 pass over all results.
+    With `on_top_k`, the best `top_k` (10 if unset) results are reported every
+    `interval` indexed heads.
+    """
+
+    def __init__(self, seeder: "AsyncUrlSeeder", query: str, top_k: Optional[int] = None,
+                 on_top_k=None, interval: Optional[int] = None):
+        self._seeder = seeder
+        self.query = query
+        self.index = BM25Index(query.lower().split())
+        self._indexed: List[Dict[str, Any]] = []  # results in the index, by position
+        self._url_scored: List[tuple] = []  # (result, score) of results without head text
+        self._tokens = 0
+        self._consumed = 0
+        self._top_k = top_k or 10
+        self._on_top_k = on_top_k
+        self._interval = interval or SEED_TOP_K_INTERVAL
+        self._next_report = self._interval
+
+    def add(self, result: Dict[str, Any]) -> None:
+        if result.get("status") != "valid":
+            return
+        text = self._seeder._extract_text_context(result["head_data"]) if result.get("head_data") else ""
+        if text:
+            tokens = text.lower().split()
+            self._tokens += len(tokens)
+            self.index.add(tokens)
+            self._indexed.append(result)
+        else:
+            score = self._seeder._calculate_url_relevance_score(self.query, result["url"])
+            self._url_scored.append((result, float(score)))
+
+    def consume(self, results: List[Dict[str, Any]]) -> None:
+        """Add the results appended to `results` since the last call."""
+        for result in results[self._consumed:]:
+            self.add(result)
+        self._consumed = len(results)
+
+    async def update(self, results: List[Dict[str, Any]]) -> None:
+        """`consume`, then report the top results if another `interval` heads were indexed."""
+        self.consume(results)
+        if self._on_top_k and len(self.index) >= self._next_report:
+            self._next_report = len(self.index) + self._interval
+            await self.report()
+
+    def bm25_scores(self) -> np.ndarray:
+        if not self._tokens:
+            return np.zeros(len(self.index))
+        return _normalize_scores(self.index.scores())
+
+    def apply(self) -> None:
+        """Set `relevance_score` on every result added so far."""
+        for result, score in self._url_scored:
+            result["relevance_score"] = score
+        for result, score in zip(self._indexed, self.bm25_scores().tolist()):
+            result["relevance_score"] = score
+
+    def top(self, k: int) -> List[Dict[str, Any]]:
+        """Copies of the `k` best results so far with their relevance_score, best first."""
+        scores = self.bm25_scores()
+        candidates = [(float(scores[i]), self._indexed[i]) for i in self.index.top_k(k, scores)]
+        candidates += [
+            (score, result)
+            for result, score in heapq.nlargest(k, self._url_scored, key=lambda item: item[1])
+        ]
+        candidates.sort(key=lambda item: item[0], reverse=True)
+        return [dict(result, relevance_score=score) for score, result in candidates[:k]]
+
+    async def report(self) -> None:
+        if not self._on_top_k:
+            return
+        try:
+            outcome = self._on_top_k(self.top(self._top_k))
+            if inspect.isawaitable(outcome):
+                await outcome
+        except Exception as e:
+            self._seeder._log("error", "Top-k callback failed: {error}",
+                              params={"error": str(e)}, tag="URL_SEED")
+
 # ────────────────────────────────────────────────────────────────────────── class
 
 
@@ -319,11 +549,10 @@ class AsyncUrlSeeder:
         self.index_id: Optional[str] = None
         self._rate_sem: Optional[asyncio.Semaphore] = None
 
-        # ───────── cache dirs ─────────
+        # ───────── cache store ─────────
         self.cache_root = Path(os.path.expanduser(
             cache_root or "~/.cache/url_seeder"))
-        (self.cache_root / "live").mkdir(parents=True, exist_ok=True)
-        (self.cache_root / "head").mkdir(exist_ok=True)
+        self._cache = SeederCache(self.cache_root / "seeder.db")
 
     def _log(self, level: str, message: str, tag: str = "URL_SEED", **kwargs: Any):
         """Helper to log messages using the provided logger, if available."""
@@ -336,28 +565,43 @@ class AsyncUrlSeeder:
             #     print(f"[{tag}] {level.upper()}: {message.format(**kwargs)}")
 
     # ───────── cache helpers ─────────
-    def _cache_path(self, kind: str, url: str) -> Path:
-        h = hashlib.sha1(url.encode()).hexdigest()
-        return self.cache_root / kind / f"{h}.json"
-
     async def _cache_get(self, kind: str, url: str) -> Optional[Dict[str, Any]]:
-        p = self._cache_path(kind, url)
-        if not p.exists():
-            return None
-        if time.time()-p.stat().st_mtime > self.ttl.total_seconds():
-            return None
         try:
-            async with aiofiles.open(p, "r") as f:
-                return json.loads(await f.read())
+            return await asyncio.to_thread(self._cache.get, kind, url, self.ttl.total_seconds())
         except Exception:
             return None
 
+    async def _cache_get_many(self, kind: str, urls: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Cache entries of a batch of URLs, None for misses, in one lookup."""
+        try:
+            found = await asyncio.to_thread(self._cache.get_many, kind, urls, self.ttl.total_seconds())
+        except Exception:
+            found = {}
+        return {url: found.get(url) for url in urls}
+
     async def _cache_set(self, kind: str, url: str, data: Dict[str, Any]) -> None:
+        # Buffered on the loop; full batches are committed in a thread
         try:
-            async with aiofiles.open(self._cache_path(kind, url), "w") as f:
-                await f.write(json.dumps(data, separators=(",", ":")))
+            due = self._cache.buffer(kind, url, data)
         except Exception:
-            pass
+            return
+        if due:
+            await self._cache_flush()
+
+    async def _cache_flush(self) -> None:
+        try:
+            await asyncio.to_thread(self._cache.flush)
+        except Exception as e:
+            self._log("warning", "Failed to write the seeder cache: {error}",
+                      params={"error": str(e)}, tag="URL_SEED")
+
+    async def _enqueue_batch(self, queue: asyncio.Queue, batch: List[str], kind: str,
+                             prefetched: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Queue URLs for the workers after looking up their cache entries together (see _validate)."""
+        if not getattr(self, "force", False):
+            prefetched.update(await self._cache_get_many(kind, batch))
+        for url in batch:
+            await queue.put(url)  # Will block if queue is full, providing backpressure
 
     # ─────────────────────────────── discovery entry
 
@@ -395,6 +639,7 @@ class AsyncUrlSeeder:
         # Store cache config for use in _from_sitemaps
         self._cache_ttl_hours = getattr(config, 'cache_ttl_hours', 24)
         self._validate_sitemap_lastmod = getattr(config, 'validate_sitemap_lastmod', True)
+        self._sitemap_concurrency = getattr(config, 'sitemap_concurrency', SITEMAP_CONCURRENCY)
 
         # Ensure seeder's logger verbose matches the config's verbose if it's set
         if self.logger and hasattr(self.logger, 'verbose') and config.verbose is not None:
@@ -444,8 +689,16 @@ class AsyncUrlSeeder:
         stop_event = asyncio.Event()
         seen: set[str] = set()
         filter_nonsense = config.filter_nonsense_urls  # Extract this for passing to workers
+        cache_kind = "head" if extract_head else "live"
+        prefetched: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        # Score heads as they arrive, so top results can be reported before discovery ends
+        scorer = None
+        if query and extract_head and scoring_method == "bm25":
+            scorer = _HeadScorer(self, query, top_k=config.top_k, on_top_k=config.on_top_k)
 
         async def producer():
+            batch: List[str] = []
             try:
                 async for u in gen():
                     if u in seen:
@@ -455,9 +708,16 @@ class AsyncUrlSeeder:
                     if stop_event.is_set():
                         self._log(
                             "info", "Producer stopping due to max_urls limit.", tag="URL_SEED")
+                        batch = []
                         break
                     seen.add(u)
-                    await queue.put(u)  # Will block if queue is full, providing backpressure
+                    batch.append(u)
+                    # Batches grow while the workers are busy; idle workers get URLs right away
+                    if len(batch) >= SEEDER_CACHE_BATCH_SIZE or queue.empty():
+                        await self._enqueue_batch(queue, batch, cache_kind, prefetched)
+                        batch = []
+                if batch:
+                    await self._enqueue_batch(queue, batch, cache_kind, prefetched)
             except Exception as e:
                 self._log("error", "Producer encountered an error: {error}", params={
                           "error": str(e)}, tag="URL_SEED")
@@ -505,11 +765,13 @@ class AsyncUrlSeeder:
                     async with self._rate_sem:
                         await self._validate(url, res_list, live_check, extract_head,
                                              head_timeout, verbose, query, score_threshold, scoring_method,
-                                             filter_nonsense)
+                                             filter_nonsense, prefetched)
                 else:
                     await self._validate(url, res_list, live_check, extract_head,
                                          head_timeout, verbose, query, score_threshold, scoring_method,
-                                         filter_nonsense)
+                                         filter_nonsense, prefetched)
+                if scorer:
+                    await scorer.update(res_list)
                 queue.task_done()  # Mark task as done for queue.join() if ever used
 
         # launch
@@ -518,9 +780,22 @@ class AsyncUrlSeeder:
         workers = [asyncio.create_task(worker(results))
                    for _ in range(concurrency)]
 
-        # Wait for all workers to finish
-        await asyncio.gather(prod_task, *workers)
-        await queue.join()  # Ensure all queued items are processed
+        # Wait until every queued URL is processed (or the workers stopped at max_urls),
+        # then stop the idle workers instead of letting them time out
+        await prod_task
+        joined = asyncio.create_task(queue.join())
+        running = {joined, *workers}
+        try:
+            while not joined.done() and any(not task.done() for task in workers):
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is not joined and task.exception():
+                        raise task.exception()
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+        await self._cache_flush()
 
         self._log("info", "Finished URL seeding for {domain}. Total URLs: {count}",
                   params={"domain": domain, "count": len(results)}, tag="URL_SEED")
@@ -528,7 +803,7 @@ class AsyncUrlSeeder:
         # Apply BM25 scoring if query was provided
         if query and extract_head and scoring_method == "bm25":
             # Apply collective BM25 scoring across all documents
-            results = await self._apply_bm25_scoring(results, config)
+            results = await self._apply_bm25_scoring(results, config, scorer)
             
             # Filter by score threshold if specified
             if score_threshold is not None:
@@ -542,6 +817,8 @@ class AsyncUrlSeeder:
             results.sort(key=lambda x: x.get("relevance_score", 0.0), reverse=True)
             self._log("info", "Sorted {count} URLs by relevance score for query: '{query}'",
                       params={"count": len(results), "query": query}, tag="URL_SEED")
+            if config.top_k:
+                results = results[:config.top_k]
         elif query and not extract_head:
             self._log(
                 "warning", "Query provided but extract_head is False. Enable extract_head for relevance scoring.", tag="URL_SEED")
@@ -648,9 +925,14 @@ class AsyncUrlSeeder:
         
         # Results collection
         results: List[Dict[str, Any]] = []
+        prefetched: Dict[str, Optional[Dict[str, Any]]] = {}
+        scorer = None
+        if config.query and config.scoring_method == "bm25":
+            scorer = _HeadScorer(self, config.query, top_k=config.top_k, on_top_k=config.on_top_k)
         
         async def producer():
             """Producer to feed URLs into the queue."""
+            batch: List[str] = []
             try:
                 for url in urls:
                     if url in seen:
@@ -658,9 +940,15 @@ class AsyncUrlSeeder:
                                   params={"url": url}, tag="URL_SEED")
                         continue
                     if stop_event.is_set():
+                        batch = []
                         break
                     seen.add(url)
-                    await queue.put(url)
+                    batch.append(url)
+                    if len(batch) >= SEEDER_CACHE_BATCH_SIZE or queue.empty():
+                        await self._enqueue_batch(queue, batch, "head", prefetched)
+                        batch = []
+                if batch:
+                    await self._enqueue_batch(queue, batch, "head", prefetched)
             finally:
                 producer_done.set()
         
@@ -686,8 +974,11 @@ class AsyncUrlSeeder:
                         query=config.query,
                         score_threshold=config.score_threshold,
                         scoring_method=config.scoring_method or "bm25",
-                        filter_nonsense=config.filter_nonsense_urls
+                        filter_nonsense=config.filter_nonsense_urls,
+                        prefetched=prefetched,
                     )
+                    if scorer:
+                        await scorer.update(res_list)
                 except Exception as e:
                     self._log("error", "Failed to process URL {url}: {error}",
                               params={"url": url, "error": str(e)}, tag="URL_SEED")
@@ -722,10 +1013,11 @@ class AsyncUrlSeeder:
         
         # Wait for workers to finish canceling
         await asyncio.gather(*worker_tasks, return_exceptions=True)
+        await self._cache_flush()
         
         # Apply BM25 scoring if query is provided
         if config.query and config.scoring_method == "bm25":
-            results = await self._apply_bm25_scoring(results, config)
+            results = await self._apply_bm25_scoring(results, config, scorer)
         
         # Apply score threshold filtering
         if config.score_threshold is not None:
@@ -734,6 +1026,8 @@ class AsyncUrlSeeder:
         # Sort by relevance score if available
         if any("relevance_score" in r for r in results):
             results.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
+            if config.top_k:
+                results = results[:config.top_k]
         
         self._log("info", "Completed head extraction for {count} URLs, {success} successful",
                   params={
@@ -743,38 +1037,23 @@ class AsyncUrlSeeder:
         
         return results
 
-    async def _apply_bm25_scoring(self, results: List[Dict[str, Any]], config: "SeedingConfig") -> List[Dict[str, Any]]:
-        """Apply BM25 scoring to results that have head_data."""
-        if not HAS_BM25:
-            self._log("warning", "BM25 scoring requested but rank_bm25 not available", tag="URL_SEED")
-            return results
-        
-        # Extract text contexts from head data
-        text_contexts = []
-        valid_results = []
-        
-        for result in results:
-            if result.get("status") == "valid" and result.get("head_data"):
-                text_context = self._extract_text_context(result["head_data"])
-                if text_context:
-                    text_contexts.append(text_context)
-                    valid_results.append(result)
-                else:
-                    # Use URL-based scoring as fallback
-                    score = self._calculate_url_relevance_score(config.query, result["url"])
-                    result["relevance_score"] = float(score)
-            elif result.get("status") == "valid":
-                # No head data but valid URL - use URL-based scoring
-                score = self._calculate_url_relevance_score(config.query, result["url"])
-                result["relevance_score"] = float(score)
-        
-        # Calculate BM25 scores for results with text context
-        if text_contexts and valid_results:
-            scores = await asyncio.to_thread(self._calculate_bm25_score, config.query, text_contexts)
-            for i, result in enumerate(valid_results):
-                if i < len(scores):
-                    result["relevance_score"] = float(scores[i])
-        
+    async def _apply_bm25_scoring(self, results: List[Dict[str, Any]], config: "SeedingConfig",
+                                  scorer: Optional[_HeadScorer] = None) -> List[Dict[str, Any]]:
+        """
+        Apply BM25 scoring to results that have head_data.
+
+        Valid results without head text get the URL-based score. A scorer that was
+        updated while the heads were fetched only needs the results it hasn't seen.
+        """
+        if scorer is None:
+            scorer = _HeadScorer(self, config.query)
+
+        def finish():
+            scorer.consume(results)
+            scorer.apply()
+
+        await asyncio.to_thread(finish)
+        await scorer.report()
         return results
 
     async def _resolve_head(self, url: str) -> Optional[str]:
@@ -871,40 +1150,57 @@ class AsyncUrlSeeder:
         2. If valid, yield from cache
         3. If invalid or force=True, fetch fresh and update cache
         4. FALLBACK: If anything fails, bypass cache and fetch directly
+
+        The sitemap is parsed while it downloads, and its lastmod is taken from
+        that parse. Only when a cached list within the TTL has to be checked
+        against the lastmod is the sitemap downloaded whole first (the lastmod is
+        the newest in the document); that download is then parsed if the list is stale.
         """
         # Get config values (passed via self during urls() call)
         cache_ttl_hours = getattr(self, '_cache_ttl_hours', 24)
         validate_lastmod = getattr(self, '_validate_sitemap_lastmod', True)
 
-        # Cache file path (new format: .json instead of .jsonl)
+        # Cache key of the domain's URL list in the cache store
         host = re.sub(r'^https?://', '', domain).rstrip('/')
         host_safe = re.sub('[/?#]+', '_', host)
         digest = hashlib.md5(pattern.encode()).hexdigest()[:8]
-        cache_path = self.cache_dir / f"sitemap_{host_safe}_{digest}.json"
+        cache_key = f"sitemap_{host_safe}_{digest}"
 
-        # Check for old .jsonl format and delete it
-        old_cache_path = self.cache_dir / f"sitemap_{host_safe}_{digest}.jsonl"
-        if old_cache_path.exists():
-            try:
-                old_cache_path.unlink()
-                self._log("info", "Deleted old cache format: {p}",
-                          params={"p": str(old_cache_path)}, tag="URL_SEED")
-            except Exception:
-                pass
+        # Delete the file caches of earlier versions (.jsonl, then .json)
+        for suffix in (".jsonl", ".json"):
+            old_cache_path = self.cache_dir / f"{cache_key}{suffix}"
+            if old_cache_path.exists():
+                try:
+                    old_cache_path.unlink()
+                    self._log("info", "Deleted old cache format: {p}",
+                              params={"p": str(old_cache_path)}, tag="URL_SEED")
+                except Exception:
+                    pass
 
-        # Step 1: Find sitemap URL and get lastmod (needed for validation)
+        # Step 1: Find sitemap URL
         sitemap_url = None
         sitemap_lastmod = None
         sitemap_content = None
 
-        schemes = ('https', 'http')
-        for scheme in schemes:
-            for suffix in ("/sitemap.xml", "/sitemap_index.xml"):
-                sm = f"{scheme}://{host}{suffix}"
-                resolved = await self._resolve_head(sm)
-                if resolved:
-                    sitemap_url = resolved
-                    # Fetch sitemap content to get lastmod
+        # Probe the usual locations concurrently; the first in this order that answers wins
+        candidates = [f"{scheme}://{host}{suffix}"
+                      for scheme in ('https', 'http')
+                      for suffix in ("/sitemap.xml", "/sitemap_index.xml")]
+        resolved = await asyncio.gather(*(self._resolve_head(sm) for sm in candidates))
+        sitemap_url = next((r for r in resolved if r), None)
+
+        # Step 2: Check cache validity (skip if force=True)
+        if not force:
+            # The lastmod is the newest of the whole sitemap, so the sitemap is only
+            # downloaded up front when a cached list exists that it could invalidate;
+            # otherwise it is streamed below and its lastmod taken from that parse
+            if validate_lastmod and sitemap_url:
+                try:
+                    cached_lastmod = await asyncio.to_thread(
+                        self._cache.sitemap_lastmod, cache_key, cache_ttl_hours)
+                except Exception:
+                    cached_lastmod = None
+                if cached_lastmod:
                     try:
                         r = await self.client.get(sitemap_url, timeout=15, follow_redirects=True)
                         if 200 <= r.status_code < 300:
@@ -912,41 +1208,78 @@ class AsyncUrlSeeder:
                             sitemap_lastmod = _parse_sitemap_lastmod(sitemap_content)
                     except Exception:
                         pass
-                    break
-            if sitemap_url:
-                break
-
-        # Step 2: Check cache validity (skip if force=True)
-        if not force and cache_path.exists():
-            if _is_cache_valid(cache_path, cache_ttl_hours, validate_lastmod, sitemap_lastmod):
+            try:
+                cached_urls = await asyncio.to_thread(
+                    self._cache.get_sitemap, cache_key, cache_ttl_hours, validate_lastmod, sitemap_lastmod)
+            except Exception:
+                cached_urls = None  # Unreadable cache: refetch
+            if cached_urls is not None:
                 self._log("info", "Loading sitemap URLs from valid cache: {p}",
-                          params={"p": str(cache_path)}, tag="URL_SEED")
-                cached_urls = _read_cache(cache_path)
+                          params={"p": cache_key}, tag="URL_SEED")
                 for url in cached_urls:
                     if _match(url, pattern):
                         yield url
                 return
-            else:
-                self._log("info", "Cache invalid/expired, refetching sitemap for {d}",
-                          params={"d": domain}, tag="URL_SEED")
+            self._log("info", "Cache invalid/expired, refetching sitemap for {d}",
+                      params={"d": domain}, tag="URL_SEED")
 
-        # Step 3: Fetch fresh URLs
-        discovered_urls = []
+        # Step 3: Fetch fresh URLs, written to the cache store as they are discovered
+        discovered_urls = self._cache.sitemap_writer(cache_key)
+        lastmods: Dict[str, str] = {}
+        try:
+            async for u in self._discover_sitemap_urls(domain, host, sitemap_url, sitemap_content, lastmods):
+                if discovered_urls is not None:
+                    try:
+                        if discovered_urls.buffer(u):
+                            await asyncio.to_thread(discovered_urls.write)
+                    except Exception as e:
+                        # The URLs are still yielded; the list just won't be cached
+                        self._log("warning", "Failed to cache sitemap URLs for {d}: {e}",
+                                  params={"d": domain, "e": str(e)}, tag="URL_SEED")
+                        discovered_urls = None
+                if _match(u, pattern):
+                    yield u
+        except BaseException:
+            # Stopped early (max_urls) or failed: keep the previous cached list
+            if discovered_urls is not None:
+                try:
+                    discovered_urls.discard()
+                except Exception:
+                    pass
+            raise
+
+        # Step 4: Make the new list the cached one (FALLBACK: if this fails, URLs were still yielded)
+        if discovered_urls:
+            if sitemap_lastmod is None and sitemap_url:
+                sitemap_lastmod = lastmods.get(sitemap_url)
+            try:
+                count = await asyncio.to_thread(discovered_urls.finish, sitemap_url or "", sitemap_lastmod)
+                self._log("info", "Cached {count} URLs for {d}",
+                          params={"count": count, "d": domain}, tag="URL_SEED")
+            except Exception as e:
+                self._log("warning", "Failed to cache sitemap URLs for {d}: {e}",
+                          params={"d": domain, "e": str(e)}, tag="URL_SEED")
 
+    async def _discover_sitemap_urls(self, domain: str, host: str, sitemap_url: Optional[str],
+                                     sitemap_content: Optional[bytes],
+                                     lastmods: Optional[Dict[str, str]] = None):
+        """
+        URLs of the domain's sitemap, or of the sitemaps listed in robots.txt without one.
+
+        `lastmods` gets the newest lastmod of `sitemap_url` when it is streamed.
+        """
         if sitemap_url and sitemap_content:
             self._log("info", "Found sitemap at {url}", params={"url": sitemap_url}, tag="URL_SEED")
 
             # Parse sitemap (reuse content we already fetched)
-            async for u in self._iter_sitemap_content(sitemap_url, sitemap_content):
-                discovered_urls.append(u)
-                if _match(u, pattern):
+            async with contextlib.aclosing(self._iter_sitemap_content(sitemap_url, sitemap_content)) as urls:
+                async for u in urls:
                     yield u
         elif sitemap_url:
-            # We have a sitemap URL but no content (fetch failed earlier), try again
+            # Not downloaded for cache validation: parse it while it downloads
             self._log("info", "Found sitemap at {url}", params={"url": sitemap_url}, tag="URL_SEED")
-            async for u in self._iter_sitemap(sitemap_url):
-                discovered_urls.append(u)
-                if _match(u, pattern):
+            async with contextlib.aclosing(self._iter_sitemap(sitemap_url, lastmods)) as urls:
+                async for u in urls:
                     yield u
         else:
             # Fallback: robots.txt
@@ -957,11 +1290,11 @@ class AsyncUrlSeeder:
                     sitemap_lines = [l.split(":", 1)[1].strip()
                                      for l in r.text.splitlines()
                                      if l.lower().startswith("sitemap:")]
-                    for sm in sitemap_lines:
-                        async for u in self._iter_sitemap(sm):
-                            discovered_urls.append(u)
-                            if _match(u, pattern):
-                                yield u
+                    # All listed sitemaps share one concurrency limit
+                    roots = [(sm, None) for sm in dict.fromkeys(sitemap_lines)]
+                    async with contextlib.aclosing(self._iter_sitemaps(roots)) as urls:
+                        async for u in urls:
+                            yield u
                 else:
                     self._log("warning", "robots.txt unavailable for {d} HTTP{c}",
                               params={"d": domain, "c": r.status_code}, tag="URL_SEED")
@@ -971,121 +1304,119 @@ class AsyncUrlSeeder:
                           params={"d": domain, "e": str(e)}, tag="URL_SEED")
                 return
 
-        # Step 4: Write to cache (FALLBACK: if write fails, URLs still yielded above)
-        if discovered_urls:
-            _write_cache(cache_path, discovered_urls, sitemap_url or "", sitemap_lastmod)
-            self._log("info", "Cached {count} URLs for {d}",
-                      params={"count": len(discovered_urls), "d": domain}, tag="URL_SEED")
-
     async def _iter_sitemap_content(self, url: str, content: bytes):
-        """Parse sitemap from already-fetched content."""
-        data = gzip.decompress(content) if url.endswith(".gz") else content
-        base_url = url
-
-        def _normalize_loc(raw: Optional[str]) -> Optional[str]:
-            if not raw:
-                return None
-            normalized = urljoin(base_url, raw.strip())
-            if not normalized:
-                return None
-            return normalized
-
-        # Detect if this is a sitemap index
-        is_sitemap_index = False
-        sub_sitemaps = []
-        regular_urls = []
+        """Parse sitemap from already-fetched content (child sitemaps are fetched)."""
+        async with contextlib.aclosing(self._iter_sitemaps([(url, content)])) as urls:
+            async for u in urls:
+                yield u
 
-        if LXML:
-            try:
-                parser = etree.XMLParser(recover=True)
-                root = etree.fromstring(data, parser=parser)
-                sitemap_loc_nodes = root.xpath("//*[local-name()='sitemap']/*[local-name()='loc']")
-                url_loc_nodes = root.xpath("//*[local-name()='url']/*[local-name()='loc']")
-
-                if sitemap_loc_nodes:
-                    is_sitemap_index = True
-                    for sitemap_elem in sitemap_loc_nodes:
-                        loc = _normalize_loc(sitemap_elem.text)
-                        if loc:
-                            sub_sitemaps.append(loc)
-
-                if not is_sitemap_index:
-                    for loc_elem in url_loc_nodes:
-                        loc = _normalize_loc(loc_elem.text)
-                        if loc:
-                            regular_urls.append(loc)
-            except Exception as e:
-                self._log("error", "LXML parsing error for sitemap {url}: {error}",
-                          params={"url": url, "error": str(e)}, tag="URL_SEED")
-                return
-        else:
-            import xml.etree.ElementTree as ET
+    async def _iter_sitemap(self, url: str, lastmods: Optional[Dict[str, str]] = None):
+        """Yield the URLs of a sitemap, and of its child sitemaps if it is an index."""
+        async with contextlib.aclosing(self._iter_sitemaps([(url, None)], lastmods)) as urls:
+            async for u in urls:
+                yield u
+
+    async def _iter_sitemaps(self, roots: List[tuple], lastmods: Optional[Dict[str, str]] = None):
+        """
+        Yield the URLs of sitemaps and of all their child sitemaps as they are parsed.
+
+        `roots` are (url, content) pairs; content None means the sitemap is fetched.
+        If `lastmods` is given, it gets the newest lastmod of each root that has one.
+        Child sitemaps are fetched concurrently, at most `sitemap_concurrency` at a
+        time, and each sitemap is parsed while it downloads (see _SitemapStreamParser).
+        URLs go through a bounded queue, in the batches parsed from each downloaded
+        chunk, so fetching pauses when the consumer is behind.
+        """
+        concurrency = max(1, getattr(self, "_sitemap_concurrency", SITEMAP_CONCURRENCY))
+        fetch_slots = asyncio.Semaphore(concurrency)
+        url_queue: asyncio.Queue = asyncio.Queue(maxsize=SITEMAP_QUEUE_BATCHES)
+        seen = {url for url, _ in roots}
+        tasks = set()
+        started = 0
+        finished = 0
+        stopping = False  # The consumer is gone: nothing reads the queue any more
+
+        def start(sitemap_url: str, content: Optional[bytes] = None, lastmods=None):
+            nonlocal started
+            started += 1
+            task = asyncio.create_task(process(sitemap_url, content, lastmods))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        async def process(sitemap_url: str, content: Optional[bytes], lastmods):
             try:
-                root = ET.fromstring(data)
-                for elem in root.iter():
-                    if '}' in elem.tag:
-                        elem.tag = elem.tag.split('}')[1]
-
-                sitemaps = root.findall('.//sitemap')
-                url_entries = root.findall('.//url')
-
-                if sitemaps:
-                    is_sitemap_index = True
-                    for sitemap in sitemaps:
-                        loc_elem = sitemap.find('loc')
-                        loc = _normalize_loc(loc_elem.text if loc_elem is not None else None)
-                        if loc:
-                            sub_sitemaps.append(loc)
-
-                if not is_sitemap_index:
-                    for url_elem in url_entries:
-                        loc_elem = url_elem.find('loc')
-                        loc = _normalize_loc(loc_elem.text if loc_elem is not None else None)
-                        if loc:
-                            regular_urls.append(loc)
+                children = 0
+                async with fetch_slots:
+                    async for items in self._stream_sitemap(sitemap_url, content, lastmods):
+                        urls = [loc for kind, loc in items if kind == "url"]
+                        for kind, loc in items:
+                            if kind == "sitemap" and loc not in seen:
+                                seen.add(loc)
+                                children += 1
+                                start(loc)
+                        if urls:
+                            await url_queue.put(urls)  # Waits while the consumer is behind
+                if children:
+                    self._log("info", "Processing sitemap index with {count} sub-sitemaps in parallel",
+                              params={"count": children}, tag="URL_SEED")
             except Exception as e:
-                self._log("error", "ElementTree parsing error for sitemap {url}: {error}",
-                          params={"url": url, "error": str(e)}, tag="URL_SEED")
-                return
-
-        # Process based on type
-        if is_sitemap_index and sub_sitemaps:
-            self._log("info", "Processing sitemap index with {count} sub-sitemaps",
-                      params={"count": len(sub_sitemaps)}, tag="URL_SEED")
-
-            queue_size = min(50000, len(sub_sitemaps) * 1000)
-            result_queue = asyncio.Queue(maxsize=queue_size)
-            completed_count = 0
-            total_sitemaps = len(sub_sitemaps)
-
-            async def process_subsitemap(sitemap_url: str):
-                try:
-                    async for u in self._iter_sitemap(sitemap_url):
-                        await result_queue.put(u)
-                except Exception as e:
-                    self._log("error", "Error processing sub-sitemap {url}: {error}",
-                              params={"url": sitemap_url, "error": str(e)}, tag="URL_SEED")
-                finally:
-                    await result_queue.put(None)
-
-            tasks = [asyncio.create_task(process_subsitemap(sm)) for sm in sub_sitemaps]
-
-            while completed_count < total_sitemaps:
-                item = await result_queue.get()
-                if item is None:
-                    completed_count += 1
-                else:
-                    yield item
+                self._log("error", "Error processing sitemap {url}: {error}",
+                          params={"url": sitemap_url, "error": str(e)}, tag="URL_SEED")
+            finally:
+                if not stopping:
+                    await url_queue.put(None)  # Completion sentinel
 
-            await asyncio.gather(*tasks, return_exceptions=True)
-        else:
-            for u in regular_urls:
-                yield u
+        for url, content in roots:
+            start(url, content, lastmods)
+        try:
+            while finished < started:
+                urls = await url_queue.get()
+                if urls is None:
+                    finished += 1
+                    continue
+                for url in urls:
+                    yield url
+        finally:
+            # The consumer may stop early (max_urls); don't leave fetches running,
+            # nor let them wait for room in the queue
+            stopping = True
+            for task in list(tasks):
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _stream_sitemap(self, url: str, content: Optional[bytes] = None,
+                              lastmods: Optional[Dict[str, str]] = None):
+        """
+        Yield lists of ("url" | "sitemap", location) pairs of one sitemap while it downloads.
 
-    async def _iter_sitemap(self, url: str):
+        Once it's fully parsed, its newest lastmod (if any) is stored in `lastmods`.
+        """
+        parser = _SitemapStreamParser(url)
         try:
-            r = await self.client.get(url, timeout=15, follow_redirects=True)
-            r.raise_for_status()
+            if content is None and hasattr(self.client, "stream"):
+                async with self.client.stream("GET", url, timeout=15, follow_redirects=True) as r:
+                    r.raise_for_status()
+                    parser.base_url = str(r.url)
+                    async for chunk in r.aiter_bytes():
+                        items = parser.feed(chunk)
+                        if items:
+                            yield items
+            else:
+                if content is None:
+                    # Clients without streaming support
+                    r = await self.client.get(url, timeout=15, follow_redirects=True)
+                    r.raise_for_status()
+                    parser.base_url = str(r.url)
+                    content = r.content
+                items = parser.feed(content)
+                if items:
+                    yield items
+            items = parser.close()
+            if items:
+                yield items
+            if lastmods is not None and parser.lastmod:
+                lastmods[url] = parser.lastmod
         except httpx.HTTPStatusError as e:
             self._log("warning", "Failed to fetch sitemap {url}: HTTP {status_code}",
                       params={"url": url, "status_code": e.response.status_code}, tag="URL_SEED")
@@ -1094,187 +1425,48 @@ class AsyncUrlSeeder:
             self._log("warning", "Network error fetching sitemap {url}: {error}",
                       params={"url": url, "error": str(e)}, tag="URL_SEED")
             return
-        except Exception as e:
-            self._log("error", "Unexpected error fetching sitemap {url}: {error}",
+        except (etree.XMLSyntaxError if LXML else SyntaxError, zlib.error) as e:
+            self._log("error", "Parsing error for sitemap {url}: {error}",
                       params={"url": url, "error": str(e)}, tag="URL_SEED")
             return
 
-        data = gzip.decompress(r.content) if url.endswith(".gz") else r.content
-        base_url = str(r.url)
-
-        def _normalize_loc(raw: Optional[str]) -> Optional[str]:
-            if not raw:
-                return None
-            normalized = urljoin(base_url, raw.strip())
-            if not normalized:
-                return None
-            return normalized
-
-        # Detect if this is a sitemap index by checking for <sitemapindex> or presence of <sitemap> elements
-        is_sitemap_index = False
-        sub_sitemaps = []
-        regular_urls = []
-
-        # Use lxml for XML parsing if available, as it's generally more robust
-        if LXML:
-            try:
-                # Use XML parser for sitemaps, not HTML parser
-                parser = etree.XMLParser(recover=True)
-                root = etree.fromstring(data, parser=parser)
-                # Namespace-agnostic lookups using local-name() so we honor custom or missing namespaces
-                sitemap_loc_nodes = root.xpath("//*[local-name()='sitemap']/*[local-name()='loc']")
-                url_loc_nodes = root.xpath("//*[local-name()='url']/*[local-name()='loc']")
-
-                self._log(
-                    "debug",
-                    "Parsed sitemap {url}: {sitemap_count} sitemap entries, {url_count} url entries discovered",
-                    params={
-                        "url": url,
-                        "sitemap_count": len(sitemap_loc_nodes),
-                        "url_count": len(url_loc_nodes),
-                    },
-                    tag="URL_SEED",
-                )
-
-                # Check for sitemap index entries
-                if sitemap_loc_nodes:
-                    is_sitemap_index = True
-                    for sitemap_elem in sitemap_loc_nodes:
-                        loc = _normalize_loc(sitemap_elem.text)
-                        if loc:
-                            sub_sitemaps.append(loc)
-
-                # If not a sitemap index, get regular URLs
-                if not is_sitemap_index:
-                    for loc_elem in url_loc_nodes:
-                        loc = _normalize_loc(loc_elem.text)
-                        if loc:
-                            regular_urls.append(loc)
-                    if not regular_urls:
-                        self._log(
-                            "warning",
-                            "No <loc> entries found inside <url> tags for sitemap {url}. The sitemap might be empty or use an unexpected structure.",
-                            params={"url": url},
-                            tag="URL_SEED",
-                        )
-            except Exception as e:
-                self._log("error", "LXML parsing error for sitemap {url}: {error}",
-                          params={"url": url, "error": str(e)}, tag="URL_SEED")
-                return
-        else:  # Fallback to xml.etree.ElementTree
-            import xml.etree.ElementTree as ET
-            try:
-                # Parse the XML
-                root = ET.fromstring(data)
-                # Remove namespace from tags for easier processing
-                for elem in root.iter():
-                    if '}' in elem.tag:
-                        elem.tag = elem.tag.split('}')[1]
-
-                # Check for sitemap index entries
-                sitemaps = root.findall('.//sitemap')
-                url_entries = root.findall('.//url')
-                self._log(
-                    "debug",
-                    "ElementTree parsed sitemap {url}: {sitemap_count} sitemap entries, {url_count} url entries discovered",
-                    params={
-                        "url": url,
-                        "sitemap_count": len(sitemaps),
-                        "url_count": len(url_entries),
-                    },
-                    tag="URL_SEED",
-                )
-                if sitemaps:
-                    is_sitemap_index = True
-                    for sitemap in sitemaps:
-                        loc_elem = sitemap.find('loc')
-                        loc = _normalize_loc(loc_elem.text if loc_elem is not None else None)
-                        if loc:
-                            sub_sitemaps.append(loc)
-
-                # If not a sitemap index, get regular URLs
-                if not is_sitemap_index:
-                    for url_elem in url_entries:
-                        loc_elem = url_elem.find('loc')
-                        loc = _normalize_loc(loc_elem.text if loc_elem is not None else None)
-                        if loc:
-                            regular_urls.append(loc)
-                    if not regular_urls:
-                        self._log(
-                            "warning",
-                            "No <loc> entries found inside <url> tags for sitemap {url}. The sitemap might be empty or use an unexpected structure.",
-                            params={"url": url},
-                            tag="URL_SEED",
-                        )
-            except Exception as e:
-                self._log("error", "ElementTree parsing error for sitemap {url}: {error}",
-                          params={"url": url, "error": str(e)}, tag="URL_SEED")
-                return
-
-        # Process based on type
-        if is_sitemap_index and sub_sitemaps:
-            self._log("info", "Processing sitemap index with {count} sub-sitemaps in parallel",
-                      params={"count": len(sub_sitemaps)}, tag="URL_SEED")
-
-            # Create a bounded queue for results to prevent RAM issues
-            # For sitemap indexes, use a larger queue as we expect many URLs
-            queue_size = min(50000, len(sub_sitemaps) * 1000)  # Estimate 1000 URLs per sitemap
-            result_queue = asyncio.Queue(maxsize=queue_size)
-            completed_count = 0
-            total_sitemaps = len(sub_sitemaps)
-
-            async def process_subsitemap(sitemap_url: str):
-                try:
-                    self._log(
-                        "debug", "Processing sub-sitemap: {url}", params={"url": sitemap_url}, tag="URL_SEED")
-                    # Recursively process sub-sitemap
-                    async for u in self._iter_sitemap(sitemap_url):
-                        await result_queue.put(u)  # Will block if queue is full
-                except Exception as e:
-                    self._log("error", "Error processing sub-sitemap {url}: {error}",
-                              params={"url": sitemap_url, "error": str(e)}, tag="URL_SEED")
-                finally:
-                    # Put sentinel to signal completion
-                    await result_queue.put(None)
-
-            # Start all tasks
-            tasks = [asyncio.create_task(process_subsitemap(sm))
-                     for sm in sub_sitemaps]
-
-            # Yield results as they come in
-            while completed_count < total_sitemaps:
-                item = await result_queue.get()
-                if item is None:
-                    completed_count += 1
-                else:
-                    yield item
-
-            # Ensure all tasks are done
-            await asyncio.gather(*tasks, return_exceptions=True)
-        else:
-            # Regular sitemap - yield URLs directly
-            for u in regular_urls:
-                yield u
+        self._log(
+            "debug",
+            "Parsed sitemap {url}: {sitemap_count} sitemap entries, {url_count} url entries discovered",
+            params={"url": url, "sitemap_count": parser.counts["sitemap"], "url_count": parser.counts["url"]},
+            tag="URL_SEED",
+        )
+        if not parser.counts["sitemap"] and not parser.counts["url"]:
+            self._log(
+                "warning",
+                "No <loc> entries found inside <url> tags for sitemap {url}. The sitemap might be empty or use an unexpected structure.",
+                params={"url": url},
+                tag="URL_SEED",
+            )
 
     # ─────────────────────────────── validate helpers
     async def _validate(self, url: str, res_list: List[Dict[str, Any]], live: bool,
                         extract: bool, timeout: int, verbose: bool, query: Optional[str] = None,
                         score_threshold: Optional[float] = None, scoring_method: str = "bm25",
-                        filter_nonsense: bool = True):
+                        filter_nonsense: bool = True,
+                        prefetched: Optional[Dict[str, Optional[Dict[str, Any]]]] = None):
         # Local verbose parameter for this function is used to decide if intermediate logs should be printed
         # The main logger's verbose status should be controlled by the caller.
-        
+        # `prefetched` holds the cache entries (None for misses) the producer looked up in bulk.
+        cache_kind = "head" if extract else "live"
+        lookup_done = prefetched is not None and url in prefetched
+        cached = prefetched.pop(url) if lookup_done else None
+
         # First check if this is a nonsense URL (if filtering is enabled)
         if filter_nonsense and self._is_nonsense_url(url):
             self._log("debug", "Filtered out nonsense URL: {url}", 
                       params={"url": url}, tag="URL_SEED")
             return
 
-        cache_kind = "head" if extract else "live"
-
         # ---------- try cache ----------
         if not (hasattr(self, 'force') and self.force):
-            cached = await self._cache_get(cache_kind, url)
+            if not lookup_done:
+                cached = await self._cache_get(cache_kind, url)
             if cached:
                 res_list.append(cached)
                 return
@@ -1336,20 +1528,16 @@ class AsyncUrlSeeder:
         timeout: int,
         max_redirects: int = 5,
         max_bytes: int = 65_536,  # stop after 64 kB even if </head> never comes
-        chunk_size: int = 4096,       # how much we read per await
     ):
+        # Compressed responses are decompressed while they stream (see _HeadReader)
+        accept_encoding = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
         for _ in range(max_redirects+1):
             try:
-                # ask the first `max_bytes` and force plain text to avoid
-                # partial-gzip decode headaches
                 async with self.client.stream(
                     "GET",
                     url,
                     timeout=timeout,
-                    headers={
-                        # "Range": f"bytes=0-{max_bytes-1}", # Dropped the Range header – no need now, and some servers ignore it. We still keep an upper‐bound max_bytes as a fail-safe.
-                        "Accept-Encoding": "identity",
-                    },
+                    headers={"Accept-Encoding": accept_encoding},
                     follow_redirects=False,
                 ) as r:
 
@@ -1373,29 +1561,13 @@ class AsyncUrlSeeder:
                                   params={"status_code": r.status_code, "url": r.url}, tag="URL_SEED")
                         return False, "", str(r.url)
 
-                    buf = bytearray()
-                    async for chunk in r.aiter_bytes(chunk_size):
-                        buf.extend(chunk)
-                        low = buf.lower()
-                        if b"</head>" in low or len(buf) >= max_bytes:
-                            await r.aclose()
-                            break
-
-                    enc = r.headers.get("Content-Encoding", "").lower()
+                    enc = r.headers.get("Content-Encoding", "")
+                    reader = _HeadReader(enc, max_bytes)
                     try:
-                        if enc == "gzip" and buf[:2] == b"\x1f\x8b":
-                            buf = gzip.decompress(buf)
-                        elif enc == "br" and HAS_BROTLI and buf[:4] == b"\x8b\x6c\x0a\x1a":
-                            buf = brotli.decompress(buf)
-                        elif enc in {"gzip", "br"}:
-                            # Header says “gzip” or “br” but payload is plain – ignore
-                            self._log(
-                                "debug",
-                                "Skipping bogus {encoding} for {url}",
-                                params={"encoding": enc, "url": r.url},
-                                tag="URL_SEED",
-                            )
-                    except Exception as e:
+                        async for chunk in r.aiter_raw():
+                            if reader.feed(chunk):
+                                break
+                    except (zlib.error, brotli.error if HAS_BROTLI else zlib.error) as e:
                         self._log(
                             "warning",
                             "Decompression error for {url} ({encoding}): {error}",
@@ -1403,29 +1575,20 @@ class AsyncUrlSeeder:
                                     "encoding": enc, "error": str(e)},
                             tag="URL_SEED",
                         )
-                        # fall through with raw buf
-
-                    # Find the </head> tag case-insensitively and decode
-                    idx = buf.lower().find(b"</head>")
-                    if idx == -1:
-                        self._log("debug", "No </head> tag found in initial bytes of {url}",
-                                  params={"url": r.url}, tag="URL_SEED")
-                        # If no </head> is found, take a reasonable chunk or all if small
-                        # Take max 10KB if no head tag
-                        html_bytes = buf if len(buf) < 10240 else buf[:10240]
-                    else:
-                        html_bytes = buf[:idx+7]  # Include </head> tag
-
-                    try:
-                        html = html_bytes.decode("utf-8", "replace")
-                    except Exception as e:
+                        # fall through with what was decompressed
+                    await r.aclose()
+                    if reader.bogus_encoding:
                         self._log(
-                            "warning",
-                            "Failed to decode head content for {url}: {error}",
-                            params={"url": r.url, "error": str(e)},
+                            "debug",
+                            "Skipping bogus {encoding} for {url}",
+                            params={"encoding": enc, "url": r.url},
                             tag="URL_SEED",
                         )
-                        html = html_bytes.decode("latin-1", "replace")
+                    if reader.end is None:
+                        self._log("debug", "No </head> tag found in initial bytes of {url}",
+                                  params={"url": r.url}, tag="URL_SEED")
+
+                    html = reader.head().decode("utf-8", "replace")
 
                     # Return the actual URL after redirects
                     return True, html, str(r.url)
@@ -1679,12 +1842,7 @@ class AsyncUrlSeeder:
         return False
     
     def _calculate_bm25_score(self, query: str, documents: List[str]) -> List[float]:
-        """Calculate BM25 scores for documents against a query."""
-        if not HAS_BM25:
-            self._log(
-                "warning", "rank_bm25 not installed. Returning zero scores.", tag="URL_SEED")
-            return [0.0] * len(documents)
-
+        """Calculate BM25 scores for documents against a query, normalized to 0-1."""
         if not query or not documents:
             return [0.0] * len(documents)
 
@@ -1697,36 +1855,13 @@ class AsyncUrlSeeder:
         if all(len(doc) == 0 for doc in tokenized_docs):
             return [0.0] * len(documents)
 
-        # Create BM25 instance and calculate scores
-        try:
-            from rank_bm25 import BM25Okapi
-            bm25 = BM25Okapi(tokenized_docs)
-            scores = bm25.get_scores(query_tokens)
-
-            # Normalize scores to 0-1 range
-            # BM25 can return negative scores, so we need to handle the full range
-            if len(scores) == 0:
-                return []
-            
-            min_score = min(scores)
-            max_score = max(scores)
-            
-            # If all scores are the same, return 0.5 for all
-            if max_score == min_score:
-                return [0.5] * len(scores)
-            
-            # Normalize to 0-1 range using min-max normalization
-            normalized_scores = [(score - min_score) / (max_score - min_score) for score in scores]
-
-            return normalized_scores
-        except Exception as e:
-            self._log("error", "Error calculating BM25 scores: {error}",
-                      params={"error": str(e)}, tag="URL_SEED")
-            return [0.0] * len(documents)
+        return _normalize_scores(bm25_scores(tokenized_docs, query_tokens)).tolist()
 
     # ─────────────────────────────── cleanup methods
     async def close(self):
-        """Close the HTTP client if we own it."""
+        """Write the cache and close the HTTP client if we own it."""
+        await self._cache_flush()
+        self._cache.close()
         if self._owns_client and self.client:
             await self.client.aclose()
             self._log("debug", "Closed HTTP client", tag="URL_SEED")
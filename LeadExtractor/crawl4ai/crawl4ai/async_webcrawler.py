@@ -13,7 +13,6 @@ from .models import (
     CrawlResult,
     MarkdownGenerationResult,
     DispatchResult,
-    ScrapingResult,
     CrawlResultContainer,
     RunManyReturn
 )
@@ -22,17 +21,13 @@ from .chunking_strategy import *  # noqa: F403
 from .chunking_strategy import IdentityChunking
 from .content_filter_strategy import *  # noqa: F403
 from .extraction_strategy import *  # noqa: F403
-from .extraction_strategy import NoExtractionStrategy
+from .extraction_strategy import NoExtractionStrategy, JsonElementExtractionStrategy
 from .async_crawler_strategy import (
     AsyncCrawlerStrategy,
     AsyncPlaywrightCrawlerStrategy,
     AsyncCrawlResponse,
 )
 from .cache_context import CacheMode, CacheContext
-from .markdown_generation_strategy import (
-    DefaultMarkdownGenerator,
-    MarkdownGenerationStrategy,
-)
 from .deep_crawling import DeepCrawlDecorator
 from .async_logger import AsyncLogger, AsyncLoggerBase
 from .async_configs import BrowserConfig, CrawlerRunConfig, ProxyConfig, SeedingConfig
@@ -42,14 +37,14 @@ from .async_url_seeder import AsyncUrlSeeder
 
 from .utils import (
     sanitize_input_encode,
-    InvalidCSSSelectorError,
     fast_format_html,
     get_error_context,
     RobotsParser,
-    preprocess_html_for_schema,
     compute_head_fingerprint,
 )
 from .cache_validator import CacheValidator, CacheValidationResult
+from .cpu_executor import CPUExecutor, process_html_content
+from .crawl_timing import CrawlTimer, record_stages, timed
 
 
 class AsyncWebCrawler:
@@ -117,6 +112,7 @@ class AsyncWebCrawler:
             os.getenv("CRAWL4_AI_BASE_DIRECTORY", Path.home())),
         thread_safe: bool = False,
         logger: AsyncLoggerBase = None,
+        cpu_executor: Optional[CPUExecutor] = None,
         **kwargs,
     ):
         """
@@ -127,6 +123,8 @@ class AsyncWebCrawler:
             config: Configuration object for browser settings. Default BrowserConfig()
             base_directory: Base directory for storing cache
             thread_safe: Whether to use thread-safe operations
+            cpu_executor: Optional process pool for scraping/markdown generation (see CPUExecutor).
+                          The caller owns it and shuts it down.
             **kwargs: Additional arguments for backwards compatibility
         """
         # Handle browser configuration
@@ -153,6 +151,9 @@ class AsyncWebCrawler:
         # Thread safety setup
         self._lock = asyncio.Lock() if thread_safe else None
 
+        # Opt-in process pool for CPU-bound HTML post-processing
+        self.cpu_executor = cpu_executor
+
         # Initialize directories
         self.crawl4ai_folder = os.path.join(base_directory, ".crawl4ai")
         os.makedirs(self.crawl4ai_folder, exist_ok=True)
@@ -189,8 +190,12 @@ class AsyncWebCrawler:
         This method will:
         1. Clean up browser resources
         2. Close any open pages and contexts
+        3. Flush the log file
         """
         await self.crawler_strategy.__aexit__(None, None, None)
+        flush = getattr(self.logger, "flush", None)
+        if flush is not None:
+            await asyncio.to_thread(flush)
 
     async def __aenter__(self):
         return await self.start()
@@ -247,6 +252,12 @@ class AsyncWebCrawler:
                 "Invalid URL, make sure the URL is a non-empty string")
 
         async with self._lock or self.nullcontext():
+            # Proxy handed out by the rotation strategy, and when the fetch
+            # through it started, until its outcome is reported back
+            rotated_proxy: Optional[ProxyConfig] = None
+            proxy_fetch_started: Optional[float] = None
+            # Per-stage timing, filled in along the way (CrawlResult.timings)
+            timer = CrawlTimer().start()
             try:
                 self.logger.verbose = config.verbose
 
@@ -267,19 +278,21 @@ class AsyncWebCrawler:
 
                 # Try to get cached result if appropriate
                 if cache_context.should_read():
-                    cached_result = await async_db_manager.aget_cached_url(url)
+                    with timed("cache_read"):
+                        cached_result = await async_db_manager.aget_cached_url(url)
 
                 # Smart Cache: Validate cache freshness if enabled
                 if cached_result and config.check_cache_freshness:
                     cache_metadata = await async_db_manager.aget_cache_metadata(url)
                     if cache_metadata:
-                        async with CacheValidator(timeout=config.cache_validation_timeout) as validator:
-                            validation = await validator.validate(
-                                url=url,
-                                stored_etag=cache_metadata.get("etag"),
-                                stored_last_modified=cache_metadata.get("last_modified"),
-                                stored_head_fingerprint=cache_metadata.get("head_fingerprint"),
-                            )
+                        with timed("cache_validate"):
+                            async with CacheValidator(timeout=config.cache_validation_timeout) as validator:
+                                validation = await validator.validate(
+                                    url=url,
+                                    stored_etag=cache_metadata.get("etag"),
+                                    stored_last_modified=cache_metadata.get("last_modified"),
+                                    stored_head_fingerprint=cache_metadata.get("head_fingerprint"),
+                                )
 
                         if validation.status == CacheValidationResult.FRESH:
                             cached_result.cache_status = "hit_validated"
@@ -359,6 +372,7 @@ class AsyncWebCrawler:
                                 }
                             )
                             config.proxy_config = next_proxy
+                            rotated_proxy = next_proxy
                     else:
                         # Existing behavior: rotate on each request
                         next_proxy: ProxyConfig = await config.proxy_rotation_strategy.get_next_proxy()
@@ -369,6 +383,7 @@ class AsyncWebCrawler:
                                 params={"proxy": next_proxy.server}
                             )
                             config.proxy_config = next_proxy
+                            rotated_proxy = next_proxy
 
                 # Fetch fresh content if needed
                 if not cached_result or not html:
@@ -392,15 +407,25 @@ class AsyncWebCrawler:
                                 response_headers={
                                     "X-Robots-Status": "Blocked by robots.txt"
                                 },
+                                timings=timer.stages,
                             )
 
                     ##############################
                     # Call CrawlerStrategy.crawl #
                     ##############################
-                    async_response = await self.crawler_strategy.crawl(
-                        url,
-                        config=config,  # Pass the entire config object
-                    )
+                    if rotated_proxy:
+                        proxy_fetch_started = time.perf_counter()
+                    with timed("fetch"):
+                        async_response = await self.crawler_strategy.crawl(
+                            url,
+                            config=config,  # Pass the entire config object
+                        )
+                    if rotated_proxy:
+                        await self._report_proxy_result(
+                            config, rotated_proxy, bool(async_response.html),
+                            proxy_fetch_started, async_response.status_code,
+                        )
+                        rotated_proxy = None
 
                     html = sanitize_input_encode(async_response.html)
                     screenshot_data = async_response.screenshot
@@ -448,6 +473,7 @@ class AsyncWebCrawler:
                     crawl_result.session_id = getattr(
                         config, "session_id", None)
                     crawl_result.cache_status = "miss"
+                    crawl_result.timings = timer.stages
 
                     # Compute head fingerprint for cache validation
                     if html:
@@ -465,7 +491,8 @@ class AsyncWebCrawler:
 
                     # Update cache if appropriate
                     if cache_context.should_write() and not bool(cached_result):
-                        await async_db_manager.acache_url(crawl_result)
+                        with timed("cache_write"):
+                            await async_db_manager.acache_url(crawl_result)
 
                     return CrawlResultContainer(crawl_result)
 
@@ -480,9 +507,16 @@ class AsyncWebCrawler:
                     cached_result.session_id = getattr(
                         config, "session_id", None)
                     cached_result.redirected_url = cached_result.redirected_url or url
+                    cached_result.timings = timer.stages
                     return CrawlResultContainer(cached_result)
 
             except Exception as e:
+                if rotated_proxy and proxy_fetch_started is not None:
+                    # The fetch through the proxy raised
+                    await self._report_proxy_result(
+                        config, rotated_proxy, False, proxy_fetch_started, None
+                    )
+
                 error_context = get_error_context(sys.exc_info())
 
                 error_message = (
@@ -500,9 +534,36 @@ class AsyncWebCrawler:
 
                 return CrawlResultContainer(
                     CrawlResult(
-                        url=url, html="", success=False, error_message=error_message
+                        url=url, html="", success=False, error_message=error_message,
+                        timings=timer.stages,
                     )
                 )
+            finally:
+                # Adds "total" to the timings the result refers to
+                timer.finish()
+
+    async def _report_proxy_result(
+        self,
+        config: CrawlerRunConfig,
+        proxy: ProxyConfig,
+        success: bool,
+        started: float,
+        status_code: Optional[int],
+    ) -> None:
+        """Tell the proxy rotation strategy how a fetch through `proxy` went."""
+        try:
+            await config.proxy_rotation_strategy.report_result(
+                proxy,
+                success=success,
+                latency=time.perf_counter() - started,
+                status_code=status_code,
+            )
+        except Exception as e:
+            self.logger.warning(
+                message="Proxy rotation strategy failed to record a result: {error}",
+                tag="PROXY",
+                params={"error": str(e)},
+            )
 
     async def aprocess_html(
         self,
@@ -552,115 +613,42 @@ class AsyncWebCrawler:
             )
         # === END PREFETCH SHORT-CIRCUIT ===
 
-        cleaned_html = ""
-        try:
-            _url = url if not kwargs.get("is_raw_html", False) else "Raw HTML"
-            t1 = time.perf_counter()
-
-            # Get scraping strategy and ensure it has a logger
-            scraping_strategy = config.scraping_strategy
-            if not scraping_strategy.logger:
-                scraping_strategy.logger = self.logger
-
-            # Process HTML content
-            params = config.__dict__.copy()
-            params.pop("url", None)
-            # add keys from kwargs to params that doesn't exist in params
-            params.update({k: v for k, v in kwargs.items()
-                          if k not in params.keys()})
-
-            ################################
-            # Scraping Strategy Execution  #
-            ################################
-            result: ScrapingResult = scraping_strategy.scrap(
-                url, html, **params)
-
-            if result is None:
-                raise ValueError(
-                    f"Process HTML, Failed to extract content from the website: {url}"
-                )
-
-        except InvalidCSSSelectorError as e:
-            raise ValueError(str(e))
-        except Exception as e:
-            raise ValueError(
-                f"Process HTML, Failed to extract content from the website: {url}, error: {str(e)}"
+        _url = url if not kwargs.get("is_raw_html", False) else "Raw HTML"
+        t1 = time.perf_counter()
+
+        # Get scraping strategy and ensure it has a logger
+        scraping_strategy = config.scraping_strategy
+        if not scraping_strategy.logger:
+            scraping_strategy.logger = self.logger
+
+        # Process HTML content
+        params = config.__dict__.copy()
+        params.pop("url", None)
+        # add keys from kwargs to params that doesn't exist in params
+        params.update({k: v for k, v in kwargs.items()
+                      if k not in params.keys()})
+
+        ##########################################################
+        # Scraping + Markdown Generation (optionally off-loop)   #
+        ##########################################################
+        if self.cpu_executor is not None:
+            processed = await self.cpu_executor.process_html(
+                url, html, scraping_strategy, config.markdown_generator, params, self.logger
             )
-
-        # Extract results - handle both dict and ScrapingResult
-        if isinstance(result, dict):
-            cleaned_html = sanitize_input_encode(
-                result.get("cleaned_html", ""))
-            media = result.get("media", {})
-            tables = media.pop("tables", []) if isinstance(media, dict) else []
-            links = result.get("links", {})
-            metadata = result.get("metadata", {})
         else:
-            cleaned_html = sanitize_input_encode(result.cleaned_html)
-            # media = result.media.model_dump()
-            # tables = media.pop("tables", [])
-            # links = result.links.model_dump()
-            media = result.media.model_dump() if hasattr(result.media, 'model_dump') else result.media
-            tables = media.pop("tables", []) if isinstance(media, dict) else []
-            links = result.links.model_dump() if hasattr(result.links, 'model_dump') else result.links
-            metadata = result.metadata
-
-        fit_html = preprocess_html_for_schema(html_content=html, text_threshold= 500, max_size= 300_000)
-
-        ################################
-        # Generate Markdown            #
-        ################################
-        markdown_generator: Optional[MarkdownGenerationStrategy] = (
-            config.markdown_generator or DefaultMarkdownGenerator()
-        )
-
-        # --- SELECT HTML SOURCE BASED ON CONTENT_SOURCE ---
-        # Get the desired source from the generator config, default to 'cleaned_html'
-        selected_html_source = getattr(markdown_generator, 'content_source', 'cleaned_html')
-
-        # Define the source selection logic using dict dispatch
-        html_source_selector = {
-            "raw_html": lambda: html,  # The original raw HTML
-            "cleaned_html": lambda: cleaned_html,  # The HTML after scraping strategy
-            "fit_html": lambda: fit_html,  # The HTML after preprocessing for schema
-        }
-
-        markdown_input_html = cleaned_html  # Default to cleaned_html
-
-        try:
-            # Get the appropriate lambda function, default to returning cleaned_html if key not found
-            source_lambda = html_source_selector.get(selected_html_source, lambda: cleaned_html)
-            # Execute the lambda to get the selected HTML
-            markdown_input_html = source_lambda()
-
-            # Log which source is being used (optional, but helpful for debugging)
-            # if self.logger and verbose:
-            #     actual_source_used = selected_html_source if selected_html_source in html_source_selector else 'cleaned_html (default)'
-            #     self.logger.debug(f"Using '{actual_source_used}' as source for Markdown generation for {url}", tag="MARKDOWN_SRC")
-
-        except Exception as e:
-            # Handle potential errors, especially from preprocess_html_for_schema
-            if self.logger:
-                self.logger.warning(
-                    f"Error getting/processing '{selected_html_source}' for markdown source: {e}. Falling back to cleaned_html.",
-                    tag="MARKDOWN_SRC"
-                )
-            # Ensure markdown_input_html is still the default cleaned_html in case of error
-            markdown_input_html = cleaned_html
-        # --- END: HTML SOURCE SELECTION ---
-
-        # Uncomment if by default we want to use PruningContentFilter
-        # if not config.content_filter and not markdown_generator.content_filter:
-        #     markdown_generator.content_filter = PruningContentFilter()
-
-        markdown_result: MarkdownGenerationResult = (
-            markdown_generator.generate_markdown(
-                input_html=markdown_input_html,
-                # Use explicit base_url if provided (for raw: HTML), otherwise redirected_url, then url
-                base_url=params.get("base_url") or params.get("redirected_url") or url
-                # html2text_options=kwargs.get('html2text', {})
+            processed = process_html_content(
+                url, html, scraping_strategy, config.markdown_generator, params, self.logger
             )
-        )
+        # Measured where the work ran, which may be a worker process
+        record_stages(processed.get("timings"))
+
+        cleaned_html = processed["cleaned_html"]
+        media = processed["media"]
+        tables = processed["tables"]
+        links = processed["links"]
+        metadata = processed["metadata"]
+        fit_html = processed["fit_html"]
+        markdown_result: MarkdownGenerationResult = processed["markdown"]
 
         # Log processing completion
         self.logger.url_status(
@@ -713,14 +701,25 @@ class AsyncWebCrawler:
             sections = chunking.chunk(content)
             # extracted_content = config.extraction_strategy.run(_url, sections)
 
+            # Schema strategies reuse the page's parsed document instead of parsing it again
+            extract_kwargs = {}
+            if isinstance(config.extraction_strategy, JsonElementExtractionStrategy):
+                document = {
+                    "html": processed["document"],
+                    "cleaned_html": processed["cleaned_document"],
+                }.get(content_format)
+                if document is not None:
+                    extract_kwargs["document"] = document
+
             # Use async version if available for better parallelism
-            if hasattr(config.extraction_strategy, 'arun'):
-                extracted_content = await config.extraction_strategy.arun(_url, sections)
-            else:
-                # Fallback to sync version run in thread pool to avoid blocking
-                extracted_content = await asyncio.to_thread(
-                    config.extraction_strategy.run, url, sections
-                )
+            with timed("extraction"):
+                if hasattr(config.extraction_strategy, 'arun'):
+                    extracted_content = await config.extraction_strategy.arun(_url, sections, **extract_kwargs)
+                else:
+                    # Fallback to sync version run in thread pool to avoid blocking
+                    extracted_content = await asyncio.to_thread(
+                        config.extraction_strategy.run, url, sections, **extract_kwargs
+                    )
                 
             extracted_content = json.dumps(
                 extracted_content, indent=4, default=str, ensure_ascii=False
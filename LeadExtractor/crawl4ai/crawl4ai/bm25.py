@@ -0,0 +1,229 @@
+"""
+Vectorized BM25 scoring and memoized stemming.
+
+`bm25_scores` computes the same scores as `rank_bm25.BM25Okapi(corpus).get_scores(query)`
+without building per-document Python dicts. Tokens are mapped to term ids once,
+the document-term frequencies are counted as a sparse (document, term) array with
+NumPy, and only the entries of query terms are scored.
+
+`BM25Index` gives the same scores for a corpus that grows one document at a time.
+"""
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from snowballstemmer import stemmer
+
+from .config import STEM_CACHE_SIZE
+
+
+def bm25_scores(
+    corpus: Sequence[Sequence[str]],
+    query: Iterable[str],
+    k1: float = 1.5,
+    b: float = 0.75,
+    epsilon: float = 0.25,
+) -> np.ndarray:
+    """
+    BM25 (Okapi) score of every tokenized document of `corpus` for the tokenized `query`.
+
+    Uses the parameters and IDF floor of `rank_bm25.BM25Okapi`: terms found in more
+    than half the documents get `epsilon` times the average IDF instead of a negative one.
+
+    Args:
+        corpus: Token lists, one per document.
+        query: Query tokens; repeated tokens count repeatedly.
+        k1, b, epsilon: BM25 parameters.
+
+    Returns:
+        np.ndarray: One score per document.
+    """
+    n_docs = len(corpus)
+    scores = np.zeros(n_docs)
+    doc_len = np.fromiter((len(doc) for doc in corpus), dtype=np.int64, count=n_docs)
+    total = int(doc_len.sum())
+    if total == 0:
+        return scores
+
+    vocab: Dict[str, int] = {}
+    term_ids = np.fromiter(
+        (vocab.setdefault(token, len(vocab)) for doc in corpus for token in doc),
+        dtype=np.int64,
+        count=total,
+    )
+    query_weight = np.zeros(len(vocab))
+    for token in query:
+        term = vocab.get(token)
+        if term is not None:
+            query_weight[term] += 1
+    if not query_weight.any():
+        return scores
+
+    # Sparse document-term matrix as sorted (document, term) keys with their counts
+    n_terms = len(vocab)
+    doc_ids = np.repeat(np.arange(n_docs, dtype=np.int64), doc_len)
+    keys, tf = np.unique(doc_ids * n_terms + term_ids, return_counts=True)
+    key_docs, key_terms = np.divmod(keys, n_terms)
+
+    df = np.bincount(key_terms, minlength=n_terms)
+    idf = np.log(n_docs - df + 0.5) - np.log(df + 0.5)
+    idf[idf < 0] = epsilon * idf.mean()
+
+    selected = query_weight[key_terms] > 0
+    key_docs, key_terms, tf = key_docs[selected], key_terms[selected], tf[selected]
+    norm = k1 * (1 - b + b * doc_len / (total / n_docs))
+    contributions = (idf * query_weight)[key_terms] * (tf * (k1 + 1)) / (tf + norm[key_docs])
+    return np.bincount(key_docs, weights=contributions, minlength=n_docs)
+
+
+class BM25Index:
+    """
+    BM25 (Okapi) scores of a fixed query over a corpus that documents are added to.
+
+    Adding a document updates the document frequencies, the document lengths and
+    the counts of the query terms in the document; scoring everything added so far
+    is then a few NumPy operations. Scores equal `bm25_scores(documents, query)`.
+
+    Args:
+        query: Query tokens; repeated tokens count repeatedly.
+        k1, b, epsilon: BM25 parameters, as in `bm25_scores`.
+    """
+
+    def __init__(
+        self,
+        query: Iterable[str],
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        query_counts = Counter(query)
+        self._query_columns = {term: column for column, term in enumerate(query_counts)}
+        self._query_weight = np.array(list(query_counts.values()), dtype=float)
+        self._vocab: Dict[str, int] = {}
+        self._df = np.zeros(0, dtype=np.int64)
+        self._pending_terms: List[int] = []  # term ids of documents not yet counted in _df
+        self._lengths = np.zeros(1024, dtype=np.int64)
+        self._tf = np.zeros((1024, len(query_counts)))
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, tokens: Sequence[str]) -> int:
+        """Add a tokenized document; returns its position."""
+        position = self._size
+        if position == len(self._lengths):
+            self._lengths = np.concatenate([self._lengths, np.zeros_like(self._lengths)])
+            self._tf = np.concatenate([self._tf, np.zeros_like(self._tf)])
+        counts = Counter(tokens)
+        vocab = self._vocab
+        self._pending_terms.extend([vocab.setdefault(term, len(vocab)) for term in counts])
+        self._lengths[position] = len(tokens)
+        for term, column in self._query_columns.items():
+            count = counts.get(term)
+            if count:
+                self._tf[position, column] = count
+        self._size = position + 1
+        return position
+
+    def scores(self) -> np.ndarray:
+        """Scores of all documents added so far, in the order they were added."""
+        n_docs = self._size
+        lengths = self._lengths[:n_docs]
+        total = int(lengths.sum())
+        if total == 0 or not self._query_columns:
+            return np.zeros(n_docs)
+
+        df = self._document_frequencies()
+        idf = np.log(n_docs - df + 0.5) - np.log(df + 0.5)
+        idf[idf < 0] = self.epsilon * idf.mean()
+        # Query terms that no document contains don't contribute
+        query_idf = np.array(
+            [
+                idf[self._vocab[term]] if term in self._vocab else 0.0
+                for term in self._query_columns
+            ]
+        )
+
+        k1, b = self.k1, self.b
+        tf = self._tf[:n_docs]
+        norm = k1 * (1 - b + b * lengths / (total / n_docs))
+        return (tf * (k1 + 1) / (tf + norm[:, None])) @ (query_idf * self._query_weight)
+
+    def _document_frequencies(self) -> np.ndarray:
+        # Counted in bulk when scoring; per-document NumPy updates cost more than the counting
+        if self._pending_terms or len(self._df) < len(self._vocab):
+            pending = np.bincount(
+                np.array(self._pending_terms, dtype=np.int64), minlength=len(self._vocab)
+            )
+            pending[: len(self._df)] += self._df
+            self._df = pending
+            self._pending_terms = []
+        return self._df
+
+    def top_k(self, k: int, scores: Optional[np.ndarray] = None) -> np.ndarray:
+        """Positions of the `k` best scoring documents, best first (ties in insertion order)."""
+        if scores is None:
+            scores = self.scores()
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        if k >= len(scores):
+            return np.argsort(-scores, kind="stable")
+        # Everything above the k-th best score, then the earliest documents tied with it
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > threshold)
+        tied = np.flatnonzero(scores == threshold)[: k - len(above)]
+        chosen = np.concatenate([above, tied])
+        return chosen[np.lexsort((chosen, -scores[chosen]))]
+
+
+class CachedStemmer:
+    """
+    A Snowball stemmer that remembers the stems of the words it has seen.
+
+    Has the `stemWord`/`stemWords` interface of `snowballstemmer.stemmer`. The cache is
+    cleared when it reaches `max_size` words. Safe to share between threads.
+    """
+
+    def __init__(self, language: str = "english", max_size: int = STEM_CACHE_SIZE):
+        self.language = language
+        self.max_size = max_size
+        self._stemmer = stemmer(language)
+        self._cache: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def stemWord(self, word: str) -> str:
+        stem = self._cache.get(word)
+        if stem is None:
+            stem = self._stem(word)
+        return stem
+
+    def stemWords(self, words: Iterable[str]) -> List[str]:
+        get = self._cache.get
+        stems = []
+        for word in words:
+            stem = get(word)
+            if stem is None:
+                stem = self._stem(word)
+            stems.append(stem)
+        return stems
+
+    def _stem(self, word: str) -> str:
+        # Snowball stemmers keep the word being stemmed as state, so misses are serialized
+        with self._lock:
+            stem = self._stemmer.stemWord(word)
+            if len(self._cache) >= self.max_size:
+                self._cache.clear()
+            self._cache[word] = stem
+        return stem
+
+
+@lru_cache(maxsize=None)
+def get_stemmer(language: str = "english") -> CachedStemmer:
+    """The shared `CachedStemmer` of a language."""
+    return CachedStemmer(language)
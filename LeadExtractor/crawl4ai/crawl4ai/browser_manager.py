@@ -12,6 +12,7 @@ import shlex
 from playwright.async_api import BrowserContext
 import hashlib
 from .js_snippet import load_js_script
+from .page_pool import PagePool
 from .config import DOWNLOAD_PAGE_TIMEOUT
 from .async_configs import BrowserConfig, CrawlerRunConfig
 from .utils import get_chromium_path
@@ -611,6 +612,11 @@ class BrowserManager:
         # Keep track of contexts by a "config signature," so each unique config reuses a single context
         self.contexts_by_config = {}
         self._contexts_lock = asyncio.Lock()
+
+        # Warm pages per config signature (BrowserConfig.page_pool_size > 0). Pools whose
+        # context was replaced are kept in _retired_pools until their pages come back.
+        self.page_pools = {}
+        self._retired_pools = []
         
         # Serialize context.new_page() across concurrent tasks to avoid races
         # when using a shared persistent context (context.pages may be empty
@@ -1081,6 +1087,9 @@ class BrowserManager:
             "chunking_strategy",
             "cache_mode",
             "content_filter",
+            "markdown_generator",
+            "table_extraction",
+            "interception_profile",
             "semaphore_count",
             "url"
         ]
@@ -1192,7 +1201,9 @@ class BrowserManager:
             # Uses the same caching mechanism as non-CDP mode: cache context by config signature,
             # but always create a new page. This prevents navigation conflicts while allowing
             # context reuse for multiple URLs with the same config (e.g., batch/deep crawls).
-            if self.config.create_isolated_context:
+            if self.config.create_isolated_context and self._use_page_pool(crawlerRunConfig):
+                page, context = await self._get_pooled_page(crawlerRunConfig)
+            elif self.config.create_isolated_context:
                 config_signature = self._make_config_signature(crawlerRunConfig)
 
                 async with self._contexts_lock:
@@ -1240,6 +1251,8 @@ class BrowserManager:
                             else:
                                 page = await context.new_page()
                                 await self._apply_stealth_to_page(page)
+        elif self._use_page_pool(crawlerRunConfig):
+            page, context = await self._get_pooled_page(crawlerRunConfig)
         else:
             # Otherwise, check if we have an existing context for this config
             config_signature = self._make_config_signature(crawlerRunConfig)
@@ -1263,6 +1276,108 @@ class BrowserManager:
 
         return page, context
 
+    def _use_page_pool(self, crawlerRunConfig: CrawlerRunConfig) -> bool:
+        # Session pages belong to their session and are closed by kill_session
+        return self.config.page_pool_size > 0 and not crawlerRunConfig.session_id
+
+    async def _new_pooled_page(self, context: BrowserContext):
+        page = await context.new_page()
+        await self._apply_stealth_to_page(page)
+        return page
+
+    async def _get_pooled_page(self, crawlerRunConfig: CrawlerRunConfig):
+        """
+        Get a page from the pool of the config's context, creating context and pool if needed.
+
+        A context that has handed out `max_navigations_per_context` pages is retired:
+        the next crawl gets a fresh context, and the old one is closed once all of its
+        pages have been released.
+        """
+        config_signature = self._make_config_signature(crawlerRunConfig)
+        retired = None
+
+        async with self._contexts_lock:
+            pool = self.page_pools.get(config_signature)
+            max_uses = self.config.max_navigations_per_context
+            if pool is not None and max_uses and pool.leases >= max_uses:
+                retired = self._retire_pool(config_signature)
+                pool = None
+
+            if pool is None:
+                context = self.contexts_by_config.get(config_signature)
+                if context is None:
+                    context = await self.create_browser_context(crawlerRunConfig)
+                    await self.setup_context(context, crawlerRunConfig)
+                    self.contexts_by_config[config_signature] = context
+                pool = PagePool(
+                    context,
+                    self._new_pooled_page,
+                    size=self.config.page_pool_size,
+                    max_uses=self.config.max_navigations_per_page,
+                    viewport={
+                        "width": self.config.viewport_width,
+                        "height": self.config.viewport_height,
+                    },
+                    logger=self.logger,
+                )
+                self.page_pools[config_signature] = pool
+
+        if retired is not None and not retired.leased:
+            await self._close_retired_pool(retired)
+
+        page = await pool.acquire()
+        return page, pool.context
+
+    def _retire_pool(self, config_signature: str) -> PagePool:
+        pool = self.page_pools.pop(config_signature)
+        pool.retired = True
+        if self.contexts_by_config.get(config_signature) is pool.context:
+            del self.contexts_by_config[config_signature]
+        self._retired_pools.append(pool)
+        if self.logger:
+            self.logger.debug(
+                message="Recycling browser context after {count} pages",
+                tag="BROWSER",
+                params={"count": pool.leases},
+            )
+        return pool
+
+    def is_pooled(self, page) -> bool:
+        """Whether a page from get_page belongs to a page pool."""
+        return any(
+            pool.owns(page)
+            for pool in list(self.page_pools.values()) + self._retired_pools
+        )
+
+    async def release_page(self, page) -> None:
+        """
+        Hand back a page obtained from get_page once the crawl is done.
+
+        Pooled pages are reset and kept for the next crawl; other pages are closed.
+        """
+        for pool in list(self.page_pools.values()) + self._retired_pools:
+            if pool.owns(page):
+                await pool.release(page)
+                if pool.retired and not pool.leased:
+                    await self._close_retired_pool(pool)
+                return
+        await page.close()
+
+    async def _close_retired_pool(self, pool: PagePool) -> None:
+        if pool in self._retired_pools:
+            self._retired_pools.remove(pool)
+        await pool.close()
+        if pool.context is not self.default_context:
+            try:
+                await pool.context.close()
+            except Exception as e:
+                if self.logger:
+                    self.logger.debug(
+                        message="Error closing recycled context: {error}",
+                        tag="BROWSER",
+                        params={"error": str(e)},
+                    )
+
     async def kill_session(self, session_id: str):
         """
         Kill a browser session and clean up resources.
@@ -1288,6 +1403,14 @@ class BrowserManager:
         for sid in expired_sessions:
             asyncio.create_task(self.kill_session(sid))
 
+    async def _close_page_pools(self):
+        """Stop warming pages and close retired contexts; live contexts are closed by close()."""
+        for pool in self.page_pools.values():
+            await pool.close()
+        self.page_pools.clear()
+        for pool in list(self._retired_pools):
+            await self._close_retired_pool(pool)
+
     async def close(self):
         """Close all browser resources and clean up."""
         if self.config.cdp_url:
@@ -1300,6 +1423,8 @@ class BrowserManager:
                 for session_id in session_ids:
                     await self.kill_session(session_id)
 
+                await self._close_page_pools()
+
                 # Close all contexts we created
                 for ctx in self.contexts_by_config.values():
                     try:
@@ -1336,6 +1461,8 @@ class BrowserManager:
         for session_id in session_ids:
             await self.kill_session(session_id)
 
+        await self._close_page_pools()
+
         # Now close all contexts we created. This reclaims memory from ephemeral contexts.
         for ctx in self.contexts_by_config.values():
             try:
@@ -13,6 +13,7 @@ from rich.text import Text
 from rich.live import Live
 from rich import box
 from ..models import CrawlStatus
+from ..crawl_timing import StageHistograms
 
 class TerminalUI:
     """Terminal user interface for CrawlerMonitor using rich library."""
@@ -37,6 +38,7 @@ class TerminalUI:
         self.layout.split(
             Layout(name="header", size=3),
             Layout(name="pipeline_status", size=10),
+            Layout(name="stage_timings", size=11),
             Layout(name="task_details", ratio=1),
             Layout(name="footer", size=3)  # Increased footer size to fit all content
         )
@@ -108,6 +110,7 @@ class TerminalUI:
         
         # Update pipeline status panel and task details panel
         self.layout["pipeline_status"].update(self._create_pipeline_panel())
+        self.layout["stage_timings"].update(self._create_stage_timings_panel())
         self.layout["task_details"].update(self._create_task_details_panel())
         
         # Update footer
@@ -224,6 +227,30 @@ class TerminalUI:
         
         return Panel(table, title="Pipeline Status", border_style="green")
     
+    def _create_stage_timings_panel(self) -> Panel:
+        """Create the per-stage timing panel (top-level stages, slowest first)."""
+        table = Table(show_header=True, box=None, expand=True)
+        table.add_column("Stage", style="cyan")
+        table.add_column("Count", justify="right")
+        table.add_column("Mean", justify="right")
+        table.add_column("p50", justify="right")
+        table.add_column("p95", justify="right")
+        table.add_column("p99", justify="right")
+
+        for stage, row in self.monitor.get_stage_summary().items():
+            if "." in stage:  # Breakdowns such as fetch.navigate
+                continue
+            table.add_row(
+                stage,
+                str(row["count"]),
+                f"{row['mean']:.3f}s",
+                f"{row['p50']:.3f}s",
+                f"{row['p95']:.3f}s",
+                f"{row['p99']:.3f}s",
+            )
+
+        return Panel(table, title="Stage Timings", border_style="magenta")
+
     def _create_task_details_panel(self) -> Panel:
         """Create the task details panel."""
         # Create a table for task details
@@ -396,6 +423,9 @@ class CrawlerMonitor:
         
         # Requeue tracking
         self.requeued_count = 0
+
+        # Per-stage timing histograms (CrawlResult.timings)
+        self.timings = StageHistograms()
         
         # Thread-safety
         self._lock = threading.RLock()
@@ -593,6 +623,36 @@ class CrawlerMonitor:
                 "avg_wait_time": avg_wait_time
             }
     
+    def record_timings(self, timings: Optional[Dict[str, float]], success: Optional[bool] = None):
+        """
+        Add the per-stage timings of a finished crawl.
+
+        Args:
+            timings: CrawlResult.timings (stage -> seconds)
+            success: Whether the crawl succeeded
+        """
+        self.timings.observe_timings(timings, success)
+
+    def get_stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get latency statistics per crawl stage.
+
+        Returns:
+            Dictionary mapping stage names to count, mean, p50, p95 and p99
+            (seconds), slowest mean first
+        """
+        return self.timings.summary()
+
+    def to_prometheus(self, prefix: str = "crawl4ai") -> str:
+        """
+        Export the stage timings in the Prometheus text exposition format.
+
+        Returns:
+            A crawl4ai_stage_duration_seconds histogram per stage and a
+            crawl4ai_crawls_total counter per outcome
+        """
+        return self.timings.to_prometheus(prefix)
+
     def get_task_stats(self, task_id: str) -> Dict:
         """
         Get statistics for a specific task.
@@ -38,6 +38,15 @@ PROVIDER_MODELS_PREFIXES = {
     "deepseek": os.getenv("DEEPSEEK_API_KEY"),
 }
 
+# Default request limits per provider prefix for the shared LLM scheduler
+# (overridden by LLMConfig.max_concurrency / tokens_per_minute). Token budgets
+# not given here are learned from the providers' rate-limit headers.
+LLM_PROVIDER_LIMITS = {
+    "groq": {"max_concurrency": 2},  # Free tier limits are low; replaces the old fixed 0.5 s delay
+    "ollama": {"max_concurrency": 2},  # Local models serve few requests at once
+    "default": {"max_concurrency": 8},
+}
+
 # Chunk token threshold
 CHUNK_TOKEN_THRESHOLD = 2**11  # 2048 tokens
 OVERLAP_RATE = 0.1
@@ -47,6 +56,9 @@ WORD_TOKEN_RATE = 1.3
 MIN_WORD_THRESHOLD = 1
 IMAGE_DESCRIPTION_MIN_WORD_THRESHOLD = 1
 
+# Words whose stems the BM25 filters remember, per language, before the cache is reset
+STEM_CACHE_SIZE = 100_000
+
 IMPORTANT_ATTRS = ["src", "href", "alt", "title", "width", "height"]
 ONLY_TEXT_ELIGIBLE_TAGS = [
     "b",
@@ -102,6 +114,34 @@ SCREENSHOT_HEIGHT_TRESHOLD = 10000
 PAGE_TIMEOUT = 60000
 DOWNLOAD_PAGE_TIMEOUT = 60000
 
+# Sitemap ingestion of AsyncUrlSeeder
+SITEMAP_CONCURRENCY = 8  # child sitemaps downloaded at the same time (SeedingConfig.sitemap_concurrency)
+SITEMAP_QUEUE_BATCHES = 64  # parsed chunks of URLs waiting for the consumer before downloads pause
+
+# Cache store of AsyncUrlSeeder: writes per transaction and URLs per lookup query
+SEEDER_CACHE_BATCH_SIZE = 500
+
+# Scored heads between the top-k reports of AsyncUrlSeeder (SeedingConfig.on_top_k)
+SEED_TOP_K_INTERVAL = 500
+
+# Adaptive full page scan (CrawlerRunConfig.adaptive_scroll)
+DEFAULT_SCROLL_TIME_BUDGET = 30  # seconds
+ADAPTIVE_SCROLL_QUIET_MS = 150  # DOM quiet period that ends the wait after a scroll
+ADAPTIVE_SCROLL_PLATEAU_CHECKS = 2  # checks at the bottom without growth before stopping
+ADAPTIVE_SCROLL_MAX_STEP_VIEWPORTS = 3  # largest step, in viewport heights
+
+# Log file writer of AsyncLogger: buffered lines are written after this long or this many characters
+LOG_FLUSH_INTERVAL = 1.0  # seconds
+LOG_FLUSH_SIZE = 64 * 1024
+
+# Embedding cache of AdaptiveCrawler's EmbeddingStrategy: writes per transaction and texts per lookup query
+EMBEDDING_CACHE_BATCH_SIZE = 256
+
+# Checkpoints of AdaptiveCrawler's CrawlState: a new snapshot replaces the appended deltas once they
+# outgrow this multiple of the snapshot's size, or number this many
+CHECKPOINT_COMPACT_RATIO = 1.0
+CHECKPOINT_MAX_DELTAS = 1000
+
 # Global user settings with descriptions and default values
 USER_SETTINGS = {
     "DEFAULT_LLM_PROVIDER": {
@@ -2,10 +2,9 @@ import inspect
 import re
 import time
 from bs4 import BeautifulSoup, Tag
-from typing import List, Tuple, Dict, Optional
-from rank_bm25 import BM25Okapi
+from typing import List, Tuple, Dict, Optional, Union
 from collections import deque
-from bs4 import NavigableString, Comment
+from lxml import etree
 
 from .utils import (
     clean_tokens,
@@ -20,14 +19,41 @@ from .types import LLMConfig
 from .config import DEFAULT_PROVIDER, OVERLAP_RATE, WORD_TOKEN_RATE
 from abc import ABC, abstractmethod
 import math
-from snowballstemmer import stemmer
+from .bm25 import bm25_scores, get_stemmer
 from .models import TokenUsage
+from .llm_scheduler import get_llm_scheduler
 from .prompts import PROMPT_FILTER_CONTENT
 import json
 import hashlib
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 from .async_logger import AsyncLogger, LogLevel, LogColor
+from .html_document import (
+    ASCII_SPACES,
+    NON_TEXT_TAGS,
+    RAW_TEXT_TAGS,
+    HTMLDocument,
+    drop_node,
+    get_stripped_text,
+    get_string,
+    get_text,
+    end_tag,
+    escape_text,
+    is_element as _is_element,
+    start_tag,
+    to_html,
+)
+
+def _child_nodes(element) -> list:
+    """Children of an element in BeautifulSoup order: strings and elements interleaved."""
+    nodes = []
+    if element.text:
+        nodes.append(element.text)
+    for child in element:
+        nodes.append(child)
+        if child.tail:
+            nodes.append(child.tail)
+    return nodes
 
 
 class RelevantContentFilter(ABC):
@@ -117,56 +143,67 @@ class RelevantContentFilter(ABC):
         self.verbose = False
         self.logger = logger
 
+    # Filters that set this to True accept an HTMLDocument in filter_content and
+    # reuse its parsed tree; others always receive the HTML string.
+    accepts_document = False
+
     @abstractmethod
     def filter_content(self, html: str) -> List[str]:
         """Abstract method to be implemented by specific filtering strategies"""
         pass
 
-    def extract_page_query(self, soup: BeautifulSoup, body: Tag) -> str:
-        """Common method to extract page metadata with fallbacks"""
+    def extract_page_query(self, root, body) -> str:
+        """
+        Common method to extract page metadata with fallbacks.
+
+        Args:
+            root: lxml document root (<html>)
+            body: lxml <body> element
+        """
         if self.user_query:
             return self.user_query
 
         query_parts = []
 
         # Title
-        try:
-            title = soup.title.string
-            if title:
-                query_parts.append(title)
-        except Exception:
-            pass
+        title = root.find(".//title")
+        if title is not None:
+            title_text = get_string(title)
+            if title_text:
+                query_parts.append(title_text)
 
-        if soup.find("h1"):
-            query_parts.append(soup.find("h1").get_text())
+        h1 = root.find(".//h1")
+        if h1 is not None:
+            query_parts.append(get_text(h1))
 
         # Meta tags
         temp = ""
         for meta_name in ["keywords", "description"]:
-            meta = soup.find("meta", attrs={"name": meta_name})
-            if meta and meta.get("content"):
-                query_parts.append(meta["content"])
-                temp += meta["content"]
+            meta = root.find(f".//meta[@name='{meta_name}']")
+            if meta is not None and meta.get("content"):
+                query_parts.append(meta.get("content"))
+                temp += meta.get("content")
 
         # If still empty, grab first significant paragraph
         if not temp:
             # Find the first tag P thatits text contains more than 50 characters
-            for p in body.find_all("p"):
-                if len(p.get_text()) > 150:
-                    query_parts.append(p.get_text()[:150])
+            for p in body.iter("p"):
+                text = get_text(p)
+                if len(text) > 150:
+                    query_parts.append(text[:150])
                     break
 
         return " ".join(filter(None, query_parts))
 
     def extract_text_chunks(
-        self, body: Tag, min_word_threshold: int = None
+        self, body, min_word_threshold: int = None
     ) -> List[Tuple[str, str]]:
         """
-        Extracts text chunks from a BeautifulSoup body element while preserving order.
+        Extracts text chunks from an lxml body element while preserving order.
         Returns list of tuples (text, tag_name) for classification.
 
         Args:
-            body: BeautifulSoup Tag object representing the body element
+            body: lxml element representing the body element
 
         Returns:
             List of (text, tag_name) tuples
@@ -214,10 +251,10 @@ class RelevantContentFilter(ABC):
         current_text = []
         chunk_index = 0
 
-        def should_break_chunk(tag: Tag) -> bool:
+        def should_break_chunk(tag_name: str) -> bool:
             """Determine if a tag should cause a break in the current text chunk"""
-            return tag.name not in INLINE_TAGS and not (
-                tag.name == "p" and len(current_text) == 0
+            return tag_name not in INLINE_TAGS and not (
+                tag_name == "p" and len(current_text) == 0
             )
 
         # Use deque for efficient push/pop operations
@@ -228,24 +265,26 @@ class RelevantContentFilter(ABC):
 
             if visited:
                 # End of block element - flush accumulated text
-                if current_text and should_break_chunk(element):
+                if current_text and should_break_chunk(element.tag):
                     text = " ".join("".join(current_text).split())
                     if text:
                         tag_type = (
-                            "header" if element.name in HEADER_TAGS else "content"
+                            "header" if element.tag in HEADER_TAGS else "content"
                         )
                         chunks.append((chunk_index, text, tag_type, element))
                         chunk_index += 1
                     current_text = []
                 continue
 
-            if isinstance(element, NavigableString):
-                if str(element).strip():
-                    current_text.append(str(element).strip())
+            # Text nodes (and comments, which count as text here)
+            if isinstance(element, str) or not _is_element(element):
+                text = element if isinstance(element, str) else element.text
+                if text and text.strip():
+                    current_text.append(text.strip())
                 continue
 
             # Pre-allocate children to avoid multiple list operations
-            children = list(element.children)
+            children = _child_nodes(element)
             if not children:
                 continue
 
@@ -254,8 +293,7 @@ class RelevantContentFilter(ABC):
 
             # Add children in reverse order for correct processing
             for child in reversed(children):
-                if isinstance(child, (Tag, NavigableString)):
-                    stack.append((child, False))
+                stack.append((child, False))
 
         # Handle any remaining text
         if current_text:
@@ -326,9 +364,9 @@ class RelevantContentFilter(ABC):
         )
         return bool(self.negative_patterns.search(class_id))
 
-    def clean_element(self, tag: Tag) -> str:
+    def clean_element(self, tag) -> str:
         """Common method for cleaning HTML elements with minimal overhead"""
-        if not tag or not isinstance(tag, Tag):
+        if tag is None or not _is_element(tag):
             return ""
 
         unwanted_tags = {"script", "style", "aside", "form", "iframe", "noscript"}
@@ -346,42 +384,48 @@ class RelevantContentFilter(ABC):
         builder = []
 
         def render_tag(elem):
-            if not isinstance(elem, Tag):
-                if isinstance(elem, str):
-                    builder.append(elem.strip())
-                return
-
-            if elem.name in unwanted_tags:
+            if elem.tag in unwanted_tags:
                 return
 
             # Start tag
-            builder.append(f"<{elem.name}")
+            builder.append(f"<{elem.tag}")
 
             # Add cleaned attributes
-            attrs = {k: v for k, v in elem.attrs.items() if k not in unwanted_attrs}
-            for key, value in attrs.items():
-                builder.append(f' {key}="{value}"')
+            for key, value in elem.attrib.items():
+                if key not in unwanted_attrs:
+                    builder.append(f' {key}="{value}"')
 
             builder.append(">")
 
-            # Process children
-            for child in elem.children:
-                render_tag(child)
+            # Process children (text, comments and tails are rendered stripped)
+            if elem.text:
+                builder.append(elem.text.strip())
+            for child in elem:
+                if _is_element(child):
+                    render_tag(child)
+                elif child.text:
+                    builder.append(child.text.strip())
+                if child.tail:
+                    builder.append(child.tail.strip())
 
             # Close tag
-            builder.append(f"</{elem.name}>")
+            builder.append(f"</{elem.tag}>")
 
         try:
             render_tag(tag)
             return "".join(builder)
         except Exception:
-            return str(tag)  # Fallback to original if anything fails
+            # Fallback to original if anything fails
+            return etree.tostring(tag, encoding="unicode", method="html", with_tail=False)
 
 
 class BM25ContentFilter(RelevantContentFilter):
     """
     Content filtering using BM25 algorithm with priority tag handling.
 
+    Scores are computed with NumPy over a sparse document-term array (see bm25.py),
+    and word stems are memoized per language across pages.
+
     How it works:
     1. Extracts page metadata with fallbacks.
     2. Extracts text chunks from the body element.
@@ -435,35 +479,38 @@ class BM25ContentFilter(RelevantContentFilter):
             "pre": 1.5,
             "th": 1.5,  # Table headers
         }
-        self.stemmer = stemmer(language) if use_stemming else None
+        self.stemmer = get_stemmer(language) if use_stemming else None
+
+    accepts_document = True
 
-    def filter_content(self, html: str, min_word_threshold: int = None) -> List[str]:
+    def filter_content(
+        self, html: Union[str, HTMLDocument], min_word_threshold: int = None
+    ) -> List[str]:
         """
         Implements content filtering using BM25 algorithm with priority tag handling.
 
             Note:
         This method implements the filtering logic for the BM25ContentFilter class.
         It takes HTML content as input and returns a list of filtered text chunks.
+        The document is only read, so an already parsed HTMLDocument is used as is.
 
         Args:
-            html (str): HTML content to be filtered.
+            html (Union[str, HTMLDocument]): HTML content to be filtered.
             min_word_threshold (int): Minimum word threshold for filtering (optional).
 
         Returns:
             List[str]: List of filtered text chunks.
         """
-        if not html or not isinstance(html, str):
+        if not html or not isinstance(html, (str, HTMLDocument)):
             return []
 
-        soup = BeautifulSoup(html, "lxml")
-
-        # Check if body is present
-        if not soup.body:
-            # Wrap in body tag if missing
-            soup = BeautifulSoup(f"<body>{html}</body>", "lxml")
-        body = soup.find("body")
+        document = HTMLDocument.of(html)
+        root = document.tree
+        body = document.body
+        if body is None:
+            return []
 
-        query = self.extract_page_query(soup, body)
+        query = self.extract_page_query(root, body)
 
         if not query:
             return []
@@ -483,13 +530,11 @@ class BM25ContentFilter(RelevantContentFilter):
         # tokenized_query = [ps.stem(word) for word in query.lower().split()]
 
         if self.use_stemming:
+            stem = self.stemmer.stemWords
             tokenized_corpus = [
-                [self.stemmer.stemWord(word) for word in chunk.lower().split()]
-                for _, chunk, _, _ in candidates
-            ]
-            tokenized_query = [
-                self.stemmer.stemWord(word) for word in query.lower().split()
+                stem(chunk.lower().split()) for _, chunk, _, _ in candidates
             ]
+            tokenized_query = stem(query.lower().split())
         else:
             tokenized_corpus = [
                 chunk.lower().split() for _, chunk, _, _ in candidates
@@ -504,13 +549,12 @@ class BM25ContentFilter(RelevantContentFilter):
         tokenized_corpus = [clean_tokens(tokens) for tokens in tokenized_corpus]
         tokenized_query = clean_tokens(tokenized_query)
 
-        bm25 = BM25Okapi(tokenized_corpus)
-        scores = bm25.get_scores(tokenized_query)
+        scores = bm25_scores(tokenized_corpus, tokenized_query)
 
         # Adjust scores with tag weights
         adjusted_candidates = []
         for score, (index, chunk, tag_type, tag) in zip(scores, candidates):
-            tag_weight = self.priority_tags.get(tag.name, 1.0)
+            tag_weight = self.priority_tags.get(tag.tag, 1.0)
             adjusted_score = score * tag_weight
             adjusted_candidates.append((adjusted_score, index, chunk, tag))
 
@@ -623,81 +667,159 @@ class PruningContentFilter(RelevantContentFilter):
             "h6": 0.7,
         }
 
-    def filter_content(self, html: str, min_word_threshold: int = None) -> List[str]:
+    accepts_document = True
+
+    def filter_content(
+        self, html: Union[str, HTMLDocument], min_word_threshold: int = None
+    ) -> List[str]:
         """
         Implements content filtering using pruning algorithm with dynamic threshold.
 
         Note:
         This method implements the filtering logic for the PruningContentFilter class.
         It takes HTML content as input and returns a list of filtered text chunks.
+        Pruning modifies the tree, so it works on a copy of an HTMLDocument's tree.
 
         Args:
-            html (str): HTML content to be filtered.
+            html (Union[str, HTMLDocument]): HTML content to be filtered.
             min_word_threshold (int): Minimum word threshold for filtering (optional).
 
         Returns:
             List[str]: List of filtered text chunks.
         """
-        if not html or not isinstance(html, str):
+        if not html or not isinstance(html, (str, HTMLDocument)):
             return []
 
-        soup = BeautifulSoup(html, "lxml")
-        if not soup.body:
-            soup = BeautifulSoup(f"<body>{html}</body>", "lxml")
+        root = HTMLDocument.of(html).fork()
+        body = root.find("body")
+        if body is None:
+            return []
+
+        # Whitespace is collapsed first, as BeautifulSoup does while parsing, so
+        # the text around removed nodes is joined the same way
+        self._collapse_whitespace(root)
 
         # Remove comments and unwanted tags
-        self._remove_comments(soup)
-        self._remove_unwanted_tags(soup)
+        self._remove_comments(root)
+        self._remove_unwanted_tags(root)
 
         # Prune tree starting from body
-        body = soup.find("body")
         self._prune_tree(body)
+        if body.getparent() is None:
+            # The whole body was pruned
+            return []
 
         # Extract remaining content as list of HTML strings
         content_blocks = []
-        for element in body.children:
-            if isinstance(element, str) or not hasattr(element, "name"):
+        for element in body:
+            if not _is_element(element):
                 continue
-            if len(element.get_text(strip=True)) > 0:
-                content_blocks.append(str(element))
+            if len(get_stripped_text(element)) > 0:
+                content_blocks.append(to_html(element))
 
         return content_blocks
 
-    def _remove_comments(self, soup):
+    def _remove_comments(self, root):
         """Removes HTML comments"""
-        for element in soup(text=lambda text: isinstance(text, Comment)):
-            element.extract()
+        for element in root.xpath("//comment()"):
+            drop_node(element)
 
-    def _remove_unwanted_tags(self, soup):
+    def _remove_unwanted_tags(self, root):
         """Removes unwanted tags"""
-        for tag in self.excluded_tags:
-            for element in soup.find_all(tag):
-                element.decompose()
+        for element in list(root.iter(*self.excluded_tags)):
+            drop_node(element)
+
+    @staticmethod
+    def _collapse_whitespace(root):
+        """
+        Replace whitespace-only text with a single newline or space (outside pre/textarea).
+
+        Markup indentation would otherwise count towards the tag length and lower the
+        text density of every block.
+        """
+        preserved = set()
+        for element in root.iter("pre", "textarea"):
+            preserved.update(element.iter())
+        for element in root.iter():
+            if element.text and element not in preserved and not element.text.strip(ASCII_SPACES):
+                element.text = "\n" if "\n" in element.text else " "
+            parent = element.getparent()
+            if element.tail and parent not in preserved and not element.tail.strip(ASCII_SPACES):
+                element.tail = "\n" if "\n" in element.tail else " "
+
+    def _node_metrics(self, root) -> Dict:
+        """
+        Stripped text length, inner HTML length and text space count of every element under `root`.
+
+        Computed in one post-order pass: each element's values are summed from its
+        children's, where measuring every node on its own re-reads and re-serializes
+        its whole subtree. HTML lengths are those of BeautifulSoup's markup (see
+        `to_html`). Measures the tree as it is, so it runs before pruning.
+        """
+        metrics = {}
+        for node in reversed(list(root.iter())):
+            if not _is_element(node):
+                continue
+            raw = node.tag in RAW_TEXT_TAGS
+            text = node.text
+            stripped = text.strip() if text and node.tag not in NON_TEXT_TAGS else ""
+            text_len = len(stripped)
+            spaces = stripped.count(" ")
+            tag_len = (len(text) if raw else len(escape_text(text))) if text else 0
+            for child in node:
+                if _is_element(child):
+                    child_text_len, child_tag_len, child_spaces = metrics[child]
+                    text_len += child_text_len
+                    spaces += child_spaces
+                    tag_len += len(start_tag(child)) + child_tag_len + len(end_tag(child))
+                else:
+                    tag_len += len(to_html(child))
+                tail = child.tail
+                if tail:
+                    stripped = tail.strip()
+                    text_len += len(stripped)
+                    spaces += stripped.count(" ")
+                    tag_len += len(tail) if raw else len(escape_text(tail))
+            metrics[node] = (text_len, tag_len, spaces)
+        return metrics
 
     def _prune_tree(self, node):
         """
         Prunes the tree starting from the given node.
 
+        Nodes are visited top-down (a removed node's subtree isn't visited), with
+        the metrics of all nodes computed up front by `_node_metrics`.
+
         Args:
-            node (Tag): The node from which the pruning starts.
+            node (lxml element): The node from which the pruning starts.
         """
-        if not node or not hasattr(node, "name") or node.name is None:
+        if node is None or not _is_element(node):
             return
 
-        text_len = len(node.get_text(strip=True))
-        tag_len = len(node.encode_contents().decode("utf-8"))
+        node_metrics = self._node_metrics(node)
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if self._should_remove(node, *node_metrics[node]):
+                drop_node(node)
+            else:
+                stack.extend(reversed([child for child in node if _is_element(child)]))
+
+    def _should_remove(self, node, text_len, tag_len, spaces) -> bool:
+        """Whether a node scores below the threshold"""
         link_text_len = sum(
             len(s.strip())
-            for s in (a.string for a in node.find_all("a", recursive=False))
+            for s in (get_string(a) for a in node if a.tag == "a")
             if s
         )
 
         metrics = {
             "node": node,
-            "tag_name": node.name,
+            "tag_name": node.tag,
             "text_len": text_len,
             "tag_len": tag_len,
             "link_text_len": link_text_len,
+            "word_count": spaces + 1,
         }
 
         score = self._compute_composite_score(metrics, text_len, tag_len, link_text_len)
@@ -705,7 +827,7 @@ class PruningContentFilter(RelevantContentFilter):
         if self.threshold_type == "fixed":
             should_remove = score < self.threshold
         else:  # dynamic
-            tag_importance = self.tag_importance.get(node.name, 0.7)
+            tag_importance = self.tag_importance.get(node.tag, 0.7)
             text_ratio = text_len / tag_len if tag_len > 0 else 0
             link_ratio = link_text_len / text_len if text_len > 0 else 1
 
@@ -719,19 +841,14 @@ class PruningContentFilter(RelevantContentFilter):
 
             should_remove = score < threshold
 
-        if should_remove:
-            node.decompose()
-        else:
-            children = [child for child in node.children if hasattr(child, "name")]
-            for child in children:
-                self._prune_tree(child)
+        return should_remove
 
     def _compute_composite_score(self, metrics, text_len, tag_len, link_text_len):
         """Computes the composite score"""
         if self.min_word_threshold:
-            # Get raw text from metrics node - avoid extra processing
-            text = metrics["node"].get_text(strip=True)
-            word_count = text.count(" ") + 1
+            word_count = metrics.get("word_count")
+            if word_count is None:
+                word_count = get_stripped_text(metrics["node"]).count(" ") + 1
             if word_count < self.min_word_threshold:
                 return -1.0  # Guaranteed removal
         score = 0.0
@@ -766,12 +883,12 @@ class PruningContentFilter(RelevantContentFilter):
     def _compute_class_id_weight(self, node):
         """Computes the class ID weight"""
         class_id_score = 0
-        if "class" in node.attrs:
-            classes = " ".join(node["class"])
-            if self.negative_patterns.match(classes):
+        classes = node.get("class")
+        if classes is not None:
+            if self.negative_patterns.match(" ".join(classes.split())):
                 class_id_score -= 0.5
-        if "id" in node.attrs:
-            element_id = node["id"]
+        element_id = node.get("id")
+        if element_id is not None:
             if self.negative_patterns.match(element_id):
                 class_id_score -= 0.5
         return class_id_score
@@ -891,6 +1008,8 @@ class LLMContentFilter(RelevantContentFilter):
         return sections
 
     def filter_content(self, html: str, ignore_cache: bool = True) -> List[str]:
+        if isinstance(html, HTMLDocument):
+            html = html.html
         if not html or not isinstance(html, str):
             return []
 
@@ -941,8 +1060,14 @@ class LLMContentFilter(RelevantContentFilter):
 
         start_time = time.time()
 
-        # Process chunks in parallel
-        with ThreadPoolExecutor(max_workers=4) as executor:
+        # Process chunks in parallel; the shared LLM scheduler limits requests per provider
+        budget = get_llm_scheduler().budget(
+            self.llm_config.provider,
+            self.llm_config.max_concurrency,
+            self.llm_config.tokens_per_minute,
+        )
+        max_workers = max(1, min(len(html_chunks), budget.max_concurrency or len(html_chunks)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = []
             for i, chunk in enumerate(html_chunks):
                 if self.logger:
@@ -983,6 +1108,9 @@ class LLMContentFilter(RelevantContentFilter):
                         base_delay=self.llm_config.backoff_base_delay,
                         max_attempts=self.llm_config.backoff_max_attempts,
                         exponential_factor=self.llm_config.backoff_exponential_factor,
+                        max_concurrency=self.llm_config.max_concurrency,
+                        tokens_per_minute=self.llm_config.tokens_per_minute,
+                        use_cache=self.llm_config.cache_responses,
                         extra_args=extra_args,
                     )
 
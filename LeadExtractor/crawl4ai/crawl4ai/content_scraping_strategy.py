@@ -618,7 +618,9 @@ class LXMLWebScrapingStrategy(ContentScrapingStrategy):
 
         success = True
         try:
-            doc = lhtml.document_fromstring(html)
+            # Scraping modifies the tree, so a shared document hands over a private copy
+            document = kwargs.get("document")
+            doc = document.fork() if document is not None else lhtml.document_fromstring(html)
             # Match BeautifulSoup's behavior of using body or full doc
             # body = doc.xpath('//body')[0] if doc.xpath('//body') else doc
             body = doc
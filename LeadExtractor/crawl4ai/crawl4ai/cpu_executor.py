@@ -0,0 +1,383 @@
+"""
+Process-pool executor for CPU-bound HTML post-processing.
+
+`AsyncWebCrawler.aprocess_html` runs scraping (lxml), markdown generation
+(html2text) and content filtering synchronously. On large pages that blocks the
+event loop and caps post-processing throughput at one core. Passing a
+`CPUExecutor` to the crawler moves scrape -> markdown -> content filter for each
+page into warm worker processes and returns a compact, picklable result.
+
+Example:
+    ```python
+    async with CPUExecutor(max_workers=4) as cpu_executor:
+        async with AsyncWebCrawler(cpu_executor=cpu_executor) as crawler:
+            results = await crawler.arun_many(urls, config=config)
+    ```
+"""
+import asyncio
+import copy
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from .html_document import HTMLDocument
+from .markdown_generation_strategy import (
+    DefaultMarkdownGenerator,
+    MarkdownGenerationStrategy,
+)
+from .models import MarkdownGenerationResult, ScrapingResult
+from .utils import (
+    InvalidCSSSelectorError,
+    preprocess_html_for_schema,
+    sanitize_input_encode,
+)
+
+# Parameters the built-in scraping strategy reads. They are passed to workers even
+# when they are not plain data (e.g. table_extraction); any other parameter is
+# passed only if it is plain data.
+SCRAPING_PARAM_KEYS = {
+    "word_count_threshold",
+    "css_selector",
+    "target_elements",
+    "excluded_tags",
+    "excluded_selector",
+    "only_text",
+    "remove_forms",
+    "remove_comments",
+    "keep_data_attributes",
+    "exclude_domains",
+    "exclude_external_links",
+    "exclude_external_images",
+    "exclude_all_images",
+    "exclude_social_media_links",
+    "exclude_social_media_domains",
+    "image_score_threshold",
+    "image_description_min_word_threshold",
+    "score_links",
+    "table_extraction",
+    "preserve_https_for_internal_links",
+    "redirected_url",
+    "original_scheme",
+    "base_url",
+    "is_raw_html",
+}
+
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+
+def _is_plain_data(value: Any) -> bool:
+    if isinstance(value, _PLAIN_TYPES):
+        return True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(_is_plain_data(item) for item in value)
+    if isinstance(value, dict):
+        return all(
+            isinstance(key, str) and _is_plain_data(item) for key, item in value.items()
+        )
+    return False
+
+
+def _detach_logger(obj: Any) -> Any:
+    """Shallow copy of a strategy without its logger (loggers hold open files/consoles)."""
+    if obj is None or getattr(obj, "logger", None) is None:
+        return obj
+    detached = copy.copy(obj)
+    detached.logger = None
+    return detached
+
+
+def picklable_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Subset of the processing parameters that can be shipped to a worker process.
+
+    Strategy objects the worker doesn't use (extraction, deep crawl, hooks, ...) are
+    dropped; loggers are detached from the ones it does use.
+    """
+    subset = {}
+    for key, value in params.items():
+        if key in SCRAPING_PARAM_KEYS:
+            subset[key] = _detach_logger(value)
+        elif _is_plain_data(value):
+            subset[key] = value
+    return subset
+
+
+def process_html_content(
+    url: str,
+    html: str,
+    scraping_strategy,
+    markdown_generator: Optional[MarkdownGenerationStrategy],
+    params: Dict[str, Any],
+    logger=None,
+) -> Dict[str, Any]:
+    """
+    Scrape, build fit_html and generate markdown (with content filtering) for a page.
+
+    This is the CPU-bound part of `AsyncWebCrawler.aprocess_html`. It runs either
+    in-process or in a `CPUExecutor` worker, so everything it returns is picklable.
+
+    The raw and cleaned HTML are wrapped in HTMLDocuments that are handed to every
+    stage, so each is parsed at most once by the stages that read it (content
+    filters, and schema extraction afterwards). Documents returned from a worker
+    carry only their HTML and are parsed again on first use.
+
+    Returns:
+        Dict with cleaned_html, media, tables, links, metadata, fit_html, markdown
+        (a MarkdownGenerationResult), document and cleaned_document (HTMLDocuments
+        of the raw and the cleaned HTML), and timings (seconds spent in "scrape"
+        and "markdown").
+    """
+    started = time.perf_counter()
+    document = HTMLDocument(html)
+    try:
+        ################################
+        # Scraping Strategy Execution  #
+        ################################
+        result: ScrapingResult = scraping_strategy.scrap(url, html, document=document, **params)
+
+        if result is None:
+            raise ValueError(
+                f"Process HTML, Failed to extract content from the website: {url}"
+            )
+
+    except InvalidCSSSelectorError as e:
+        raise ValueError(str(e))
+    except Exception as e:
+        raise ValueError(
+            f"Process HTML, Failed to extract content from the website: {url}, error: {str(e)}"
+        )
+
+    # Extract results - handle both dict and ScrapingResult
+    if isinstance(result, dict):
+        cleaned_html = sanitize_input_encode(result.get("cleaned_html", ""))
+        media = result.get("media", {})
+        tables = media.pop("tables", []) if isinstance(media, dict) else []
+        links = result.get("links", {})
+        metadata = result.get("metadata", {})
+    else:
+        cleaned_html = sanitize_input_encode(result.cleaned_html)
+        media = result.media.model_dump() if hasattr(result.media, 'model_dump') else result.media
+        tables = media.pop("tables", []) if isinstance(media, dict) else []
+        links = result.links.model_dump() if hasattr(result.links, 'model_dump') else result.links
+        metadata = result.metadata
+
+    cleaned_document = HTMLDocument(cleaned_html)
+    fit_html = preprocess_html_for_schema(html_content=html, text_threshold=500, max_size=300_000)
+
+    ################################
+    # Generate Markdown            #
+    ################################
+    scraped = time.perf_counter()
+    markdown_generator = markdown_generator or DefaultMarkdownGenerator()
+
+    # --- SELECT HTML SOURCE BASED ON CONTENT_SOURCE ---
+    # Get the desired source from the generator config, default to 'cleaned_html'
+    selected_html_source = getattr(markdown_generator, 'content_source', 'cleaned_html')
+
+    # Define the source selection logic using dict dispatch
+    html_source_selector = {
+        "raw_html": lambda: document,  # The original raw HTML
+        "cleaned_html": lambda: cleaned_document,  # The HTML after scraping strategy
+        "fit_html": lambda: HTMLDocument(fit_html),  # The HTML after preprocessing for schema
+    }
+
+    try:
+        # Get the appropriate lambda function, default to returning cleaned_html if key not found
+        source_lambda = html_source_selector.get(selected_html_source, lambda: cleaned_document)
+        markdown_input = source_lambda()
+    except Exception as e:
+        if logger:
+            logger.warning(
+                f"Error getting/processing '{selected_html_source}' for markdown source: {e}. Falling back to cleaned_html.",
+                tag="MARKDOWN_SRC"
+            )
+        markdown_input = cleaned_document
+    # --- END: HTML SOURCE SELECTION ---
+
+    # Uncomment if by default we want to use PruningContentFilter
+    # if not config.content_filter and not markdown_generator.content_filter:
+    #     markdown_generator.content_filter = PruningContentFilter()
+
+    markdown_result: MarkdownGenerationResult = markdown_generator.generate_markdown(
+        input_html=markdown_input.html,
+        # Use explicit base_url if provided (for raw: HTML), otherwise redirected_url, then url
+        base_url=params.get("base_url") or params.get("redirected_url") or url,
+        document=markdown_input,
+    )
+
+    return {
+        "cleaned_html": cleaned_html,
+        "media": media,
+        "tables": tables,
+        "links": links,
+        "metadata": metadata,
+        "fit_html": fit_html,
+        "markdown": markdown_result,
+        "document": document,
+        "cleaned_document": cleaned_document,
+        "timings": {"scrape": scraped - started, "markdown": time.perf_counter() - scraped},
+    }
+
+
+def _warm_worker() -> None:
+    """Worker initializer: import the heavy modules once per process, not per page."""
+    import lxml.html  # noqa: F401
+    from . import content_filter_strategy, content_scraping_strategy  # noqa: F401
+    from .html2text import HTML2Text  # noqa: F401
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+class CPUExecutor:
+    """
+    Process pool for scrape -> markdown -> content filter.
+
+    Back-pressure: at most `max_pending` pages are in flight (queued or running in
+    workers). While memory pressure is signalled (see `set_memory_pressure`,
+    driven by MemoryAdaptiveDispatcher) only `max_workers` are allowed, so pages
+    don't pile up in the pool's queue. `saturated` tells dispatchers to stop
+    starting new crawls until workers catch up.
+
+    Pages smaller than `min_html_size` characters, pages with link previews and
+    pages whose strategies can't be pickled are processed in-process as before.
+
+    Args:
+        max_workers: Worker processes (default: CPU count - 1, at least 1)
+        max_pending: Max pages in flight (default: 2 * max_workers)
+        min_html_size: Smaller pages are not worth the round trip to a worker
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        min_html_size: int = 20_000,
+    ):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_pending = max_pending or 2 * self.max_workers
+        self.min_html_size = min_html_size
+        self.memory_pressure = False
+        self.stats = {"offloaded": 0, "in_process": 0, "unpicklable": 0}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    async def start(self) -> None:
+        """Start the pool and spawn every worker up front."""
+        if self._pool is not None:
+            return
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_warm_worker
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._pool, _noop) for _ in range(self.max_workers))
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    @property
+    def limit(self) -> int:
+        return self.max_workers if self.memory_pressure else self.max_pending
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def saturated(self) -> bool:
+        return self._in_flight >= self.limit
+
+    def set_memory_pressure(self, under_pressure: bool) -> None:
+        self.memory_pressure = under_pressure
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def should_offload(self, html: str, params: Dict[str, Any]) -> bool:
+        # Link previews fetch pages over the network - keep them on the crawler's loop
+        if params.get("link_preview_config") is not None:
+            return False
+        return len(html) >= self.min_html_size
+
+    async def process_html(
+        self,
+        url: str,
+        html: str,
+        scraping_strategy,
+        markdown_generator: Optional[MarkdownGenerationStrategy],
+        params: Dict[str, Any],
+        logger=None,
+    ) -> Dict[str, Any]:
+        """Run `process_html_content` in a worker (waits for a free slot first)."""
+        if not self.should_offload(html, params):
+            self.stats["in_process"] += 1
+            return process_html_content(
+                url, html, scraping_strategy, markdown_generator, params, logger
+            )
+
+        args = (
+            url,
+            html,
+            _detach_logger(scraping_strategy),
+            self._detach_generator(markdown_generator),
+            picklable_params(params),
+        )
+        try:
+            # Fail fast (and fall back) before taking a slot if something can't be pickled
+            pickle.dumps(args[2:])
+        except Exception as e:
+            self.stats["unpicklable"] += 1
+            if logger:
+                logger.debug(
+                    f"CPU executor: processing {url} in-process, config not picklable: {e}",
+                    tag="SCRAPE",
+                )
+            return process_html_content(
+                url, html, scraping_strategy, markdown_generator, params, logger
+            )
+
+        if self._pool is None:
+            await self.start()
+
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._pool, process_html_content, *args)
+            self.stats["offloaded"] += 1
+            return result
+        finally:
+            async with condition:
+                self._in_flight -= 1
+                condition.notify_all()
+
+    @staticmethod
+    def _detach_generator(markdown_generator):
+        if markdown_generator is None:
+            return None
+        content_filter = getattr(markdown_generator, "content_filter", None)
+        if getattr(content_filter, "logger", None) is None:
+            return markdown_generator
+        detached = copy.copy(markdown_generator)
+        detached.content_filter = _detach_logger(content_filter)
+        return detached
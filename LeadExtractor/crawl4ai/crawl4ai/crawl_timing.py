@@ -0,0 +1,252 @@
+"""
+Per-stage timing of crawls.
+
+`AsyncWebCrawler.arun` starts a `CrawlTimer` for every crawl and makes it the
+current one (a context variable, so it follows the crawl into the crawler
+strategy and the cache database without changing their signatures). Code on
+the crawl's path charges time to named stages with `timed()`, `Laps` or
+`record_stage()`; all of them do nothing when no crawl is being timed. The
+stages end up in `CrawlResult.timings`:
+
+    cache_read, fetch, scrape, markdown, extraction, cache_write, total
+    fetch.page_setup, fetch.navigate, fetch.wait, fetch.scroll, fetch.js,
+    fetch.content, fetch.export (breakdown of fetch by the browser strategy)
+
+`StageHistograms` aggregates the timings of many crawls (dispatchers and
+CrawlerMonitor keep one) and renders them as a table or in the Prometheus text
+exposition format.
+
+Timers use `time.perf_counter()` (monotonic); a stage costs a dictionary update.
+"""
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+_current_timer: ContextVar[Optional["CrawlTimer"]] = ContextVar("crawl4ai_crawl_timer", default=None)
+
+# Upper bounds (seconds) of the histogram buckets; the last bucket is +Inf
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+
+class CrawlTimer:
+    """Seconds spent in each stage of one crawl."""
+
+    __slots__ = ("stages", "_started", "_token")
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._token = None
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def start(self) -> "CrawlTimer":
+        """Make this the timer of the current crawl."""
+        self._token = _current_timer.set(self)
+        return self
+
+    def finish(self) -> Dict[str, float]:
+        """Record the total time and stop being the current timer."""
+        self.stages["total"] = time.perf_counter() - self._started
+        if self._token is not None:
+            _current_timer.reset(self._token)
+            self._token = None
+        return self.stages
+
+
+def current_timer() -> Optional[CrawlTimer]:
+    """The timer of the crawl being run, if any."""
+    return _current_timer.get()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Charge `seconds` to `stage` of the current crawl."""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.add(stage, seconds)
+
+
+def record_stages(stages: Optional[Dict[str, float]]) -> None:
+    """Charge stages measured elsewhere (e.g. in a worker process) to the current crawl."""
+    timer = _current_timer.get()
+    if timer is not None and stages:
+        for stage, seconds in stages.items():
+            timer.add(stage, seconds)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Charge the time spent in the block to `stage` of the current crawl."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(stage, time.perf_counter() - started)
+
+
+class Laps:
+    """
+    Splits a sequence of steps into stages without wrapping each one in a block:
+    `lap(stage)` charges the time since the previous lap (or since creation).
+    """
+
+    __slots__ = ("_timer", "_last")
+
+    def __init__(self):
+        self._timer = _current_timer.get()
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        if self._timer is not None:
+            self._timer.add(stage, now - self._last)
+        self._last = now
+
+
+class StageHistograms:
+    """
+    Histograms of stage durations over many crawls, plus success/failure counts.
+
+    Thread-safe. `quantile()` interpolates within buckets, like Prometheus'
+    histogram_quantile(), but never beyond the largest observation.
+
+    Args:
+        buckets: Upper bounds of the buckets, in seconds (ascending)
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self._counts: Dict[str, List[int]] = {}  # stage -> count per bucket, +Inf last
+        self._sums: Dict[str, float] = {}
+        self._maxima: Dict[str, float] = {}
+        self.crawls = {"success": 0, "failure": 0}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._observe(stage, seconds)
+
+    def _observe(self, stage: str, seconds: float) -> None:
+        counts = self._counts.get(stage)
+        if counts is None:
+            counts = self._counts[stage] = [0] * (len(self.buckets) + 1)
+            self._sums[stage] = 0.0
+            self._maxima[stage] = seconds
+        counts[bisect_left(self.buckets, seconds)] += 1
+        self._sums[stage] += seconds
+        if seconds > self._maxima[stage]:
+            self._maxima[stage] = seconds
+
+    def observe_timings(self, timings: Optional[Dict[str, float]], success: Optional[bool] = None) -> None:
+        """Add the stage timings of one crawl (CrawlResult.timings)."""
+        with self._lock:
+            if success is not None:
+                self.crawls["success" if success else "failure"] += 1
+            for stage, seconds in (timings or {}).items():
+                self._observe(stage, seconds)
+
+    def stages(self) -> List[str]:
+        with self._lock:
+            return list(self._counts)
+
+    def count(self, stage: str) -> int:
+        with self._lock:
+            return sum(self._counts.get(stage, ()))
+
+    def quantile(self, stage: str, q: float) -> Optional[float]:
+        """Estimated q-quantile (0..1) of `stage`, or None before any observation."""
+        with self._lock:
+            counts = self._counts.get(stage)
+            if not counts:
+                return None
+            counts = list(counts)
+            maximum = self._maxima[stage]
+        total = sum(counts)
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(counts):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return maximum  # In +Inf
+                lower = self.buckets[i - 1] if i else 0.0
+                return min(lower + (self.buckets[i] - lower) * (rank - seen) / count, maximum)
+            seen += count
+        return maximum
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """count, mean, p50, p95 and p99 (seconds) per stage, slowest mean first."""
+        with self._lock:
+            stages = [(stage, sum(counts), self._sums[stage]) for stage, counts in self._counts.items()]
+        rows = {}
+        for stage, count, total in sorted(stages, key=lambda row: -row[2] / max(row[1], 1)):
+            rows[stage] = {
+                "count": count,
+                "mean": total / count if count else 0.0,
+                "p50": self.quantile(stage, 0.5),
+                "p95": self.quantile(stage, 0.95),
+                "p99": self.quantile(stage, 0.99),
+            }
+        return rows
+
+    def merge(self, other: "StageHistograms") -> None:
+        """Add the observations of `other` (same buckets) to this one."""
+        if other.buckets != self.buckets:
+            raise ValueError("Histograms with different buckets can't be merged")
+        with other._lock:
+            counts = {stage: list(c) for stage, c in other._counts.items()}
+            sums = dict(other._sums)
+            maxima = dict(other._maxima)
+            crawls = dict(other.crawls)
+        with self._lock:
+            for stage, stage_counts in counts.items():
+                mine = self._counts.setdefault(stage, [0] * (len(self.buckets) + 1))
+                for i, count in enumerate(stage_counts):
+                    mine[i] += count
+                self._sums[stage] = self._sums.get(stage, 0.0) + sums[stage]
+                self._maxima[stage] = max(self._maxima.get(stage, 0.0), maxima[stage])
+            for outcome, count in crawls.items():
+                self.crawls[outcome] += count
+
+    def to_prometheus(self, prefix: str = "crawl4ai") -> str:
+        """The histograms in the Prometheus text exposition format (version 0.0.4)."""
+        name = f"{prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each stage of a crawl.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for stage in sorted(self._counts):
+                label = _escape_label(stage)
+                cumulative = 0
+                for bound, count in zip(self.buckets + (math.inf,), self._counts[stage]):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else _format_float(bound)
+                    lines.append(f'{name}_bucket{{stage="{label}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{stage="{label}"}} {_format_float(self._sums[stage])}')
+                lines.append(f'{name}_count{{stage="{label}"}} {cumulative}')
+            lines += [
+                f"# HELP {prefix}_crawls_total Crawls finished, by outcome.",
+                f"# TYPE {prefix}_crawls_total counter",
+            ]
+            for outcome, count in self.crawls.items():
+                lines.append(f'{prefix}_crawls_total{{outcome="{outcome}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
@@ -128,6 +128,13 @@ class DeepCrawlStrategy(ABC):
         """
         pass
 
+    async def filter_links(self, urls: List[str], depth: int) -> List[bool]:
+        """
+        can_process_url() for all the links found on a page, in order.
+        Strategies with a filter chain override this to filter them in one batch.
+        """
+        return [await self.can_process_url(url, depth) for url in urls]
+
     @abstractmethod
     async def link_discovery(
         self,
@@ -72,6 +72,29 @@ class BestFirstCrawlingStrategy(DeepCrawlStrategy):
         Validate the URL format and apply filtering.
         For the starting URL (depth 0), filtering is bypassed.
         """
+        if not self._is_valid_url(url):
+            return False
+
+        if depth != 0 and not await self.filter_chain.apply(url):
+            return False
+
+        return True
+
+    async def filter_links(self, urls: List[str], depth: int) -> List[bool]:
+        """
+        can_process_url() for all the links of a page: each URL is validated,
+        then the valid ones go through the filter chain as one batch.
+        """
+        if type(self).can_process_url is not BestFirstCrawlingStrategy.can_process_url:
+            return await super().filter_links(urls, depth)  # Honour the override
+        verdicts = [self._is_valid_url(url) for url in urls]
+        if depth != 0:
+            passed = iter(await self.filter_chain.apply_batch([url for url, ok in zip(urls, verdicts) if ok]))
+            verdicts = [ok and next(passed) for ok in verdicts]
+        return verdicts
+
+    def _is_valid_url(self, url: str) -> bool:
+        """An absolute http(s) URL with a dotted host."""
         try:
             parsed = urlparse(url)
             if not parsed.scheme or not parsed.netloc:
@@ -83,10 +106,6 @@ class BestFirstCrawlingStrategy(DeepCrawlStrategy):
         except Exception as e:
             self.logger.warning(f"Invalid URL: {url}, error: {e}")
             return False
-
-        if depth != 0 and not await self.filter_chain.apply(url):
-            return False
-
         return True
 
     async def link_discovery(
@@ -119,16 +138,21 @@ class BestFirstCrawlingStrategy(DeepCrawlStrategy):
             links += result.links.get("external", [])
 
         # If we have more links than remaining capacity, limit how many we'll process
-        valid_links = []
+        candidates = []
         for link in links:
             url = link.get("href")
             base_url = normalize_url_for_deep_crawl(url, source_url)
-            if base_url in visited:
-                continue
-            if not await self.can_process_url(url, new_depth):
+            if base_url not in visited:
+                candidates.append((url, base_url))
+        unique_urls = list(dict.fromkeys(url for url, _ in candidates))
+        allowed = dict(zip(unique_urls, await self.filter_links(unique_urls, new_depth)))
+
+        valid_links = []
+        for url, base_url in candidates:
+            if not allowed[url]:
                 self.stats.urls_skipped += 1
                 continue
-                
+
             valid_links.append(base_url)
             
         # Record the new depths and add to next_links
@@ -61,6 +61,29 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
         Validates the URL and applies the filter chain.
         For the start URL (depth 0) filtering is bypassed.
         """
+        if not self._is_valid_url(url):
+            return False
+
+        if depth != 0 and not await self.filter_chain.apply(url):
+            return False
+
+        return True
+
+    async def filter_links(self, urls: List[str], depth: int) -> List[bool]:
+        """
+        can_process_url() for all the links of a page: each URL is validated,
+        then the valid ones go through the filter chain as one batch.
+        """
+        if type(self).can_process_url is not BFSDeepCrawlStrategy.can_process_url:
+            return await super().filter_links(urls, depth)  # Honour the override
+        verdicts = [self._is_valid_url(url) for url in urls]
+        if depth != 0:
+            passed = iter(await self.filter_chain.apply_batch([url for url, ok in zip(urls, verdicts) if ok]))
+            verdicts = [ok and next(passed) for ok in verdicts]
+        return verdicts
+
+    def _is_valid_url(self, url: str) -> bool:
+        """An absolute http(s) URL with a dotted host."""
         try:
             parsed = urlparse(url)
             if not parsed.scheme or not parsed.netloc:
@@ -72,10 +95,6 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
         except Exception as e:
             self.logger.warning(f"Invalid URL: {url}, error: {e}")
             return False
-
-        if depth != 0 and not await self.filter_chain.apply(url):
-            return False
-
         return True
 
     async def link_discovery(
@@ -108,17 +127,23 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
         if self.include_external:
             links += result.links.get("external", [])
 
-        valid_links = []
-        
-        # First collect all valid links
+        # Filter the links not crawled yet in one batch
+        candidates = []
         for link in links:
             url = link.get("href")
             # Strip URL fragments to avoid duplicate crawling
             # base_url = url.split('#')[0] if url else url
             base_url = normalize_url_for_deep_crawl(url, source_url)
-            if base_url in visited:
+            if base_url not in visited:
+                candidates.append((url, base_url))
+        unique_urls = list(dict.fromkeys(url for url, _ in candidates))
+        allowed = dict(zip(unique_urls, await self.filter_links(unique_urls, next_depth)))
+
+        valid_links = []
+        for url, base_url in candidates:
+            if base_url in visited:  # Seen earlier on this page
                 continue
-            if not await self.can_process_url(url, next_depth):
+            if not allowed[url]:
                 self.stats.urls_skipped += 1
                 continue
 
@@ -237,16 +237,24 @@ class DFSDeepCrawlStrategy(BFSDeepCrawlStrategy):
         seen = self._dfs_seen
         valid_links: List[Tuple[str, float]] = []
 
+        # Filter the links not pushed yet in one batch
+        candidates = []
         for link in links:
             raw_url = link.get("href")
             if not raw_url:
                 continue
 
             normalized_url = normalize_url_for_deep_crawl(raw_url, source_url)
-            if not normalized_url or normalized_url in seen:
+            if normalized_url and normalized_url not in seen:
+                candidates.append((raw_url, normalized_url))
+        unique_urls = list(dict.fromkeys(url for url, _ in candidates))
+        allowed = dict(zip(unique_urls, await self.filter_links(unique_urls, next_depth)))
+
+        for raw_url, normalized_url in candidates:
+            if normalized_url in seen:  # Seen earlier on this page
                 continue
 
-            if not await self.can_process_url(raw_url, next_depth):
+            if not allowed[raw_url]:
                 self.stats.urls_skipped += 1
                 continue
 
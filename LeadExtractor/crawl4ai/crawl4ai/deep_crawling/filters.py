@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Pattern, Set, Union
+from typing import List, Pattern, Sequence, Set, Union
 from urllib.parse import urlparse
 from array import array
 import re
@@ -67,14 +67,22 @@ class URLFilter(ABC):
 
 
 class FilterChain:
-    """Optimized filter chain"""
+    """
+    Optimized filter chain.
 
-    __slots__ = ("filters", "stats", "_logger_ref")
+    The filters are compiled into a FilterPlan on first use: the built-in
+    pattern, domain and content-type filters become a few fused checks on a
+    single parse of each URL, evaluated cheapest first. Use apply_batch() to
+    filter all the links of a page at once.
+    """
+
+    __slots__ = ("filters", "stats", "_logger_ref", "_plan")
 
     def __init__(self, filters: List[URLFilter] = None):
         self.filters = tuple(filters or [])  # Immutable tuple for speed
         self.stats = FilterStats()
         self._logger_ref = None
+        self._plan = None
 
     @property
     def logger(self):
@@ -85,35 +93,322 @@ class FilterChain:
 
     def add_filter(self, filter_: URLFilter) -> "FilterChain":
         """Add a filter to the chain"""
-        self.filters.append(filter_)
+        self.filters = self.filters + (filter_,)
+        self._plan = None  # Recompiled on next use
         return self  # Enable method chaining
 
-    async def apply(self, url: str) -> bool:
-        """Apply all filters concurrently when possible"""
-        self.stats._counters[0] += 1  # Total processed URLs
-
-        tasks = []
-        for f in self.filters:
-            result = f.apply(url)
-
-            if inspect.isawaitable(result):
-                tasks.append(result)  # Collect async tasks
-            elif not result:  # Sync rejection
-                self.stats._counters[2] += 1  # Sync rejected
-                return False
-
-        if tasks:
-            results = await asyncio.gather(*tasks)
-
-            # Count how many filters rejected
-            rejections = results.count(False)
-            self.stats._counters[2] += rejections
-
-            if not all(results):
-                return False  # Stop early if any filter rejected
+    @property
+    def plan(self) -> "FilterPlan":
+        if self._plan is None or self._plan.filters != self.filters:
+            self._plan = FilterPlan(self.filters)
+        return self._plan
 
-        self.stats._counters[1] += 1  # Passed
-        return True
+    async def apply(self, url: str) -> bool:
+        """Apply all filters (async ones concurrently) to one URL"""
+        return (await self.apply_batch([url]))[0]
+
+    async def apply_batch(self, urls: List[str]) -> List[bool]:
+        """
+        Apply all filters to a batch of URLs (e.g. the links of a page).
+
+        Sync checks run over the whole batch, cheapest first, each one only on
+        the URLs every earlier check passed. Async filters (network lookups)
+        run last, concurrently, on the URLs that are left.
+        """
+        plan = self.plan
+        passed, pending = plan.evaluate(urls)
+
+        if pending:
+            indices = list(pending)
+            outcomes = await asyncio.gather(*(
+                asyncio.gather(*pending[i], *(f.apply(urls[i]) for f in plan.async_filters))
+                for i in indices
+            ))
+            for i, results in zip(indices, outcomes):
+                if not all(results):
+                    passed[i] = False
+
+        n_passed = sum(passed)
+        self.stats._counters[0] += len(urls)  # Total processed URLs
+        self.stats._counters[1] += n_passed
+        self.stats._counters[2] += len(urls) - n_passed
+        return passed
+
+
+class FilterPlan:
+    """
+    A FilterChain's filters compiled for evaluation over batches of URLs.
+
+    - Each URL is split once into what the built-in filters look at (host,
+      extension, ...) instead of every filter parsing it again.
+    - All DomainFilters are merged into one trie of reversed domain labels:
+      one walk up the host decides blocked/allowed for every filter, and the
+      verdict is cached per host.
+    - The patterns of each URLPatternFilter are fused: extensions into a set,
+      anchored patterns (domain globs, path prefixes) into one regex, the
+      remaining globs and regexes into another.
+    - Checks run in cost order: extension lookups, the domain trie, pattern
+      regexes (fewest patterns first), then custom filters in chain order.
+      Async filters are left to FilterChain.apply_batch.
+
+    Results match applying the filters one by one. Filter stats count the URLs
+    each filter actually saw, which can differ from unordered evaluation since
+    a URL stops at the first check that rejects it.
+    """
+
+    __slots__ = ("filters", "async_filters", "_steps", "_needs_parts")
+
+    _COST_EXTENSION, _COST_DOMAIN, _COST_PATTERN, _COST_CUSTOM = range(4)
+
+    def __init__(self, filters: Sequence[URLFilter]):
+        self.filters = tuple(filters)
+        self.async_filters: List[URLFilter] = []
+        steps = []
+        domain_filters = []
+        for position, f in enumerate(self.filters):
+            if inspect.iscoroutinefunction(f.apply):
+                self.async_filters.append(f)
+            elif type(f).apply is DomainFilter.apply:
+                domain_filters.append(f)
+            elif type(f).apply is ContentTypeFilter.apply:
+                steps.append((self._COST_EXTENSION, 0, position, _ContentTypeStep(f)))
+            elif type(f).apply is URLPatternFilter.apply:
+                step = _PatternStep(f)
+                steps.append((self._COST_PATTERN, step.size, position, step))
+            else:
+                steps.append((self._COST_CUSTOM, 0, position, _CustomStep(f)))
+        if domain_filters:
+            steps.append((self._COST_DOMAIN, 0, 0, _DomainStep(domain_filters)))
+        steps.sort(key=lambda step: step[:3])
+        self._steps = [step for *_, step in steps]
+        self._needs_parts = any(step.needs_parts for step in self._steps)
+
+    def evaluate(self, urls: List[str]):
+        """
+        Run the sync checks over `urls`.
+
+        Returns the verdict per URL, and for the URLs that passed but still
+        depend on async results, a mapping from their index to the awaitables
+        custom filters returned (empty lists if only the chain's async filters
+        are left to run).
+        """
+        passed = [False] * len(urls)
+        survivors = list(range(len(urls)))
+        parts = [_split_url(url) for url in urls] if self._needs_parts else None
+        awaiting: Dict[int, list] = {}
+        for step in self._steps:
+            if not survivors:
+                break
+            survivors = step.run(urls, parts, survivors, awaiting)
+        for i in survivors:
+            passed[i] = True
+
+        kept = set(survivors) if awaiting else ()
+        for i, awaitables in awaiting.items():
+            if i not in kept:  # Rejected later on: never awaited
+                for awaitable in awaitables:
+                    close = getattr(awaitable, "close", None)
+                    if close is not None:
+                        close()
+        pending = {i: awaiting.get(i, []) for i in kept}
+        if self.async_filters:
+            for i in survivors:
+                pending.setdefault(i, [])
+        return passed, pending
+
+
+def _split_url(url: str):
+    """
+    (host, last path segment's extension, content-type extension) of `url`,
+    extracted exactly as DomainFilter, URLPatternFilter and ContentTypeFilter
+    do, with one pass of string searches.
+    """
+    start = url.find("://")
+    rest = start + 3 if start != -1 else 0
+    slash = url.find("/", rest)
+    if start == -1:
+        host = ""
+    else:
+        host = (url[rest:slash] if slash != -1 else url[rest:]).lower()
+        if not host:  # "://" followed by "/": the regex keeps searching
+            host = DomainFilter._extract_domain(url)
+
+    # URLPatternFilter: extension of the last segment before the query
+    before_query = url.split("?", 1)[0]
+    segment = before_query[before_query.rfind("/") + 1:]
+    pattern_ext = segment[segment.rfind(".") + 1:]
+
+    # ContentTypeFilter: extension of the last segment of the path (query included)
+    content_ext = ""
+    if slash != -1:
+        filename = url[url.rfind("/") + 1:]
+        if "." in filename:
+            content_ext = filename.rpartition(".")[-1].lower()
+    return host, pattern_ext, content_ext
+
+
+def _count(filter_: URLFilter, seen: int, passed: int) -> None:
+    filter_.stats._counters[0] += seen
+    filter_.stats._counters[1] += passed
+    filter_.stats._counters[2] += seen - passed
+
+
+class _ContentTypeStep:
+    __slots__ = ("filter", "check", "extensions")
+    needs_parts = True
+
+    def __init__(self, filter_: "ContentTypeFilter"):
+        self.filter = filter_
+        self.check = filter_._check_extension
+        self.extensions = filter_._ext_map
+
+    def run(self, urls, parts, survivors, awaiting):
+        if self.check:
+            extensions = self.extensions
+            kept = [i for i in survivors if not parts[i][2] or parts[i][2] in extensions]
+        else:
+            kept = survivors
+        _count(self.filter, len(survivors), len(kept))
+        return kept
+
+
+class _DomainStep:
+    """All DomainFilters of a chain as one trie of reversed domain labels."""
+
+    __slots__ = ("filters", "_root", "_required", "_cache")
+    needs_parts = True
+
+    _CACHE_SIZE = 10_000
+    # Trie node: [children, blocked by filters (bit mask), allowed by filters (bit mask)]
+
+    def __init__(self, filters: List["DomainFilter"]):
+        self.filters = filters
+        self._root = [{}, 0, 0]
+        self._required = 0  # Filters with an allow list, which a host must match
+        self._cache: Dict[str, int] = {}
+        for bit, f in enumerate(filters):
+            mask = 1 << bit
+            for domain in f._blocked_domains:
+                self._node(domain)[1] |= mask
+            if f._allowed_domains is not None:
+                self._required |= mask
+                for domain in f._allowed_domains:
+                    self._node(domain)[2] |= mask
+
+    def _node(self, domain: str) -> list:
+        node = self._root
+        for label in reversed(domain.split(".")):
+            node = node[0].setdefault(label, [{}, 0, 0])
+        return node
+
+    def _rejected_by(self, host: str) -> int:
+        """Bit mask of the filters that reject `host`."""
+        blocked = allowed = 0
+        node = self._root
+        for label in reversed(host.split(".")):
+            node = node[0].get(label)
+            if node is None:
+                break
+            blocked |= node[1]
+            allowed |= node[2]
+        return blocked | (self._required & ~allowed)
+
+    def run(self, urls, parts, survivors, awaiting):
+        cache = self._cache
+        if len(cache) > self._CACHE_SIZE:
+            cache.clear()
+        kept = []
+        # Filters reject in chain order: a URL counts for the first filter that rejects it
+        rejected_at = [0] * len(self.filters)
+        for i in survivors:
+            host = parts[i][0]
+            rejected = cache.get(host)
+            if rejected is None:
+                rejected = cache[host] = self._rejected_by(host)
+            if rejected:
+                rejected_at[(rejected & -rejected).bit_length() - 1] += 1
+            else:
+                kept.append(i)
+        seen = len(survivors)
+        for f, n_rejected in zip(self.filters, rejected_at):
+            _count(f, seen, seen - n_rejected)
+            seen -= n_rejected
+        return kept
+
+
+class _PatternStep:
+    __slots__ = ("filter", "reverse", "suffixes", "match", "search", "size")
+    needs_parts = True
+
+    def __init__(self, filter_: "URLPatternFilter"):
+        self.filter = filter_
+        self.reverse = bool(filter_._reverse)
+        self.suffixes = frozenset(filter_._simple_suffixes)
+        self.size = len(filter_._simple_prefixes) + len(filter_._domain_patterns) + len(filter_._path_patterns)
+        # Prefixes match on a path boundary (see URLPatternFilter.apply); a
+        # prefix containing "?" can never match the part before the query
+        anchored = list(filter_._domain_patterns) + [
+            re.compile(re.escape(prefix) + r"(?=[/?#]|\Z)")
+            for prefix in filter_._simple_prefixes
+            if "?" not in prefix
+        ]
+        self.match = _fuse(anchored)  # Patterns matched at the start of the URL
+        self.search = _fuse(filter_._path_patterns)  # Patterns searched anywhere
+
+    def run(self, urls, parts, survivors, awaiting):
+        suffixes, match, search = self.suffixes, self.match, self.search
+        kept = []
+        n_matched = 0
+        for i in survivors:
+            url = urls[i]
+            matched = bool(
+                (suffixes and parts[i][1] in suffixes)
+                or (match and any(p.match(url) for p in match))
+                or (search and any(p.search(url) for p in search))
+            )
+            n_matched += matched
+            if matched is not self.reverse:
+                kept.append(i)
+        # Like URLPatternFilter.apply, stats count matches, not the (reversed) verdict
+        _count(self.filter, len(survivors), n_matched)
+        return kept
+
+
+class _CustomStep:
+    __slots__ = ("filter",)
+    needs_parts = False
+
+    def __init__(self, filter_: URLFilter):
+        self.filter = filter_
+
+    def run(self, urls, parts, survivors, awaiting):
+        apply = self.filter.apply
+        kept = []
+        for i in survivors:
+            result = apply(urls[i])
+            if inspect.isawaitable(result):  # Decided with the async filters
+                awaiting.setdefault(i, []).append(result)
+                kept.append(i)
+            elif result:
+                kept.append(i)
+        return kept
+
+
+def _fuse(patterns: List[Pattern]) -> List[Pattern]:
+    """
+    `patterns` as a single alternation regex (one scan of the URL instead of
+    one per pattern), or unchanged if they can't be combined: different flags,
+    bytes patterns or inline global flags. Patterns with capture groups are
+    kept apart, as joining them would renumber their backreferences.
+    """
+    fusable = [p for p in patterns if not p.groups]
+    grouped = [p for p in patterns if p.groups]
+    if len(fusable) < 2 or len({(p.flags, type(p.pattern)) for p in fusable}) > 1:
+        return list(patterns)
+    try:
+        return [re.compile("|".join(f"(?:{p.pattern})" for p in fusable), fusable[0].flags)] + grouped
+    except re.error:
+        return list(patterns)
 
 
 class URLPatternFilter(URLFilter):
@@ -0,0 +1,306 @@
+"""
+Embeddings for AdaptiveCrawler's EmbeddingStrategy: cached, batched, indexed.
+
+- `EmbeddingCache`: vectors by model and content hash of the text, in SQLite,
+  so a text is embedded once across re-evaluations and runs.
+- `BatchedEmbedder`: turns any "list of texts -> array" embedding function
+  (`TextEmbedder` for get_text_embeddings, a local model, `HashingEmbedder` in
+  tests) into one that embeds each distinct, uncached text once, `batch_size`
+  texts per call.
+- `VectorIndex`: the knowledge base's normalised vectors in a growing buffer,
+  keeping the best similarity of each query point up to date as documents are
+  added, so coverage and gap scoring don't rescan the whole knowledge base.
+"""
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from .config import EMBEDDING_CACHE_BATCH_SIZE
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    key TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (model, key)
+) WITHOUT ROWID;
+"""
+
+
+def content_key(text: str) -> str:
+    """Cache key of `text`: a hash of its content."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def default_cache_path() -> Path:
+    return Path(os.getenv("CRAWL4_AI_BASE_DIRECTORY", Path.home())) / ".crawl4ai" / "embeddings.db"
+
+
+class EmbeddingCache:
+    """
+    Embedding vectors by model and content key, in SQLite (WAL journal).
+
+    Written vectors are visible to lookups right away and reach the database
+    every `batch_size` writes or on `flush()`. Without a path, vectors are only
+    kept in memory. Safe to share between threads.
+
+    Args:
+        path: Database file, or None for an in-memory cache.
+        batch_size: Buffered writes per transaction, and keys per lookup query.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, batch_size: int = EMBEDDING_CACHE_BATCH_SIZE):
+        self.path = Path(path) if path is not None else None
+        self.batch_size = max(1, batch_size)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending: Dict[tuple, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def get_many(self, model: str, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors of the `keys` of `model`."""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                vector = self._pending.get((model, key))
+                if vector is None:
+                    missing.append(key)
+                else:
+                    found[key] = vector
+            if self.path is None or not missing:
+                return found
+            connection = self._connect()
+            for start in range(0, len(missing), self.batch_size):
+                chunk = missing[start:start + self.batch_size]
+                rows = connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({','.join('?' * len(chunk))})",
+                    (model, *chunk),
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, np.ndarray]) -> None:
+        """Store vectors by key; committed with the next batch."""
+        if self.buffer_many(model, vectors):
+            self.flush()
+
+    def buffer_many(self, model: str, vectors: Dict[str, np.ndarray]) -> bool:
+        """
+        Store vectors by key in memory only; True once a batch is due, for the
+        caller to `flush()` (e.g. in a thread, off the event loop).
+        """
+        with self._lock:
+            for key, vector in vectors.items():
+                self._pending[(model, key)] = np.asarray(vector, dtype=np.float32)
+            return self.path is not None and len(self._pending) >= self.batch_size
+
+    def flush(self) -> None:
+        """Commit the buffered vectors."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.path is None or not self._pending:
+            return
+        rows = [(model, key, vector.tobytes()) for (model, key), vector in self._pending.items()]
+        connection = self._connect()
+        with connection:
+            connection.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)", rows)
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Commit the buffered vectors and close the database."""
+        with self._lock:
+            self._flush()
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class TextEmbedder:
+    """
+    get_text_embeddings as an embedding function: an embedding API through
+    litellm when `llm_config` is given, otherwise a local sentence-transformers
+    model (small ones like all-MiniLM-L6-v2 run fine on a CPU).
+    """
+
+    def __init__(self, llm_config: Optional[Dict] = None, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        self.llm_config = llm_config
+        self.model_name = model_name
+        self.model = llm_config.get("provider", model_name) if llm_config else model_name
+
+    async def __call__(self, texts: List[str]) -> np.ndarray:
+        from .utils import get_text_embeddings
+        return await get_text_embeddings(texts, self.llm_config, self.model_name, batch_size=max(1, len(texts)))
+
+
+class HashingEmbedder:
+    """
+    Deterministic embeddings without a model: each word adds ±1 to a bucket
+    chosen by its hash. Texts sharing words get similar vectors, which is
+    enough to exercise coverage and link scoring in tests and offline runs.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.model = f"hashing-{dim}"
+        self.calls = 0
+
+    async def __call__(self, texts: List[str]) -> np.ndarray:
+        self.calls += 1
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                h = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "little")
+                vectors[row, h % self.dim] += 1.0 if h >> 63 else -1.0
+        return vectors
+
+
+class BatchedEmbedder:
+    """
+    Embeds texts through `embed`, each distinct text once, `batch_size` per call,
+    and looks them up in `cache` by content first. Cache reads and commits
+    run in a thread, off the event loop.
+
+    Args:
+        embed: Async function from a list of texts to an (n, dim) array.
+        model: Name the cache keeps the vectors under; vectors of different
+            models never mix. Defaults to `embed.model`.
+        cache: EmbeddingCache, or None to embed every call's texts again.
+        batch_size: Texts per call to `embed`.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[List[str]], Awaitable[Any]],
+        model: Optional[str] = None,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = 32,
+    ):
+        self.embed = embed
+        self.model = model or getattr(embed, "model", None) or type(embed).__name__
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.dim: Optional[int] = None
+        self.calls = 0  # Calls to `embed`
+        self.embedded = 0  # Texts sent to `embed`
+        self.cache_hits = 0
+
+    async def __call__(self, texts: List[str]) -> np.ndarray:
+        """Embeddings of `texts`, one float32 row per text."""
+        keys = [content_key(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        if self.cache is not None:
+            vectors = await asyncio.to_thread(self.cache.get_many, self.model, set(keys))
+            self.cache_hits += len(vectors)
+
+        todo = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                todo.setdefault(key, text)
+        todo_keys = list(todo)
+        for start in range(0, len(todo_keys), self.batch_size):
+            chunk = todo_keys[start:start + self.batch_size]
+            embedded = np.asarray(await self.embed([todo[key] for key in chunk]), dtype=np.float32)
+            self.calls += 1
+            self.embedded += len(chunk)
+            new = dict(zip(chunk, embedded))
+            vectors.update(new)
+            if self.cache is not None and self.cache.buffer_many(self.model, new):
+                await asyncio.to_thread(self.cache.flush)
+        if todo and self.cache is not None:
+            await asyncio.to_thread(self.cache.flush)  # One transaction per call, next to the cost of embedding
+
+        if not texts:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        result = np.stack([vectors[key] for key in keys])
+        self.dim = result.shape[1]
+        return result
+
+
+def normalize_rows(vectors: Any) -> np.ndarray:
+    """`vectors` as float32 rows of unit length (zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class VectorIndex:
+    """
+    Unit-normalised vectors that are only ever added to, for cosine similarity.
+
+    Rows live in one float32 buffer that doubles when full, so adding costs the
+    new rows, not a copy of the index. Query sets passed to `coverage()` keep
+    each query's best similarity to the index and update it as rows are added:
+    after the first call, coverage costs O(queries x new rows) per update
+    whatever the size of the index.
+    """
+
+    def __init__(self):
+        self._rows: Optional[np.ndarray] = None
+        self._size = 0
+        self._tracked: Dict[str, list] = {}  # name -> [queries, normalised queries, best similarities]
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """The normalised rows (a view; don't modify)."""
+        if self._rows is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self._rows[:self._size]
+
+    def add(self, vectors: Any) -> None:
+        new = normalize_rows(vectors)
+        if not len(new):
+            return
+        if self._rows is None:
+            self._rows = np.empty((max(16, len(new)), new.shape[1]), dtype=np.float32)
+        elif self._size + len(new) > len(self._rows):
+            grown = np.empty((max(2 * len(self._rows), self._size + len(new)), self._rows.shape[1]), dtype=np.float32)
+            grown[:self._size] = self._rows[:self._size]
+            self._rows = grown
+        self._rows[self._size:self._size + len(new)] = new
+        self._size += len(new)
+        for tracked in self._tracked.values():
+            np.maximum(tracked[2], (tracked[1] @ new.T).max(axis=1), out=tracked[2])
+
+    def max_similarity(self, vectors: Any) -> np.ndarray:
+        """Best cosine similarity of each of `vectors` to the index (-1 when empty)."""
+        queries = normalize_rows(vectors)
+        if not self._size:
+            return np.full(len(queries), -1.0, dtype=np.float32)
+        return (queries @ self.vectors.T).max(axis=1)
+
+    def coverage(self, queries: Any, name: str = "query") -> np.ndarray:
+        """
+        Best cosine similarity of each query to the index, maintained
+        incrementally for the array last passed under `name`.
+        """
+        tracked = self._tracked.get(name)
+        if tracked is None or tracked[0] is not queries:
+            normalized = normalize_rows(queries)
+            best = self.max_similarity(normalized)
+            tracked = self._tracked[name] = [queries, normalized, best]
+        return tracked[2].copy()
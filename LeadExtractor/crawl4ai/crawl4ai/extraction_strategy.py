@@ -28,6 +28,7 @@ from .utils import (
 from .models import * # noqa: F403
 
 from .models import TokenUsage
+from .llm_scheduler import get_llm_scheduler
 
 from .model_loader import * # noqa: F403
 from .model_loader import (
@@ -44,6 +45,9 @@ import numpy as np
 import re
 from bs4 import BeautifulSoup
 from lxml import html, etree
+from cssselect import HTMLTranslator, SelectorError
+from .html_document import HTMLDocument, get_stripped_text, parse_html_document
+from .schema_plan import SchemaPlan, _extract_in_worker, _init_worker, schema_fingerprint
 
 
 class ExtractionStrategy(ABC):
@@ -651,7 +655,10 @@ class LLMExtractionStrategy(ExtractionStrategy):
                 extra_args=self.extra_args,
                 base_delay=self.llm_config.backoff_base_delay,
                 max_attempts=self.llm_config.backoff_max_attempts,
-                exponential_factor=self.llm_config.backoff_exponential_factor
+                exponential_factor=self.llm_config.backoff_exponential_factor,
+                max_concurrency=self.llm_config.max_concurrency,
+                tokens_per_minute=self.llm_config.tokens_per_minute,
+                use_cache=self.llm_config.cache_responses,
             )  # , json_response=self.extract_type == "schema")
             # Track usage
             usage = TokenUsage(
@@ -758,21 +765,15 @@ class LLMExtractionStrategy(ExtractionStrategy):
             overlap=int(self.chunk_token_threshold * self.overlap_rate),
         )
         extracted_content = []
-        if self.llm_config.provider.startswith("groq/"):
-            # Sequential processing with a delay
-            for ix, section in enumerate(merged_sections):
-                extract_func = partial(self.extract, url)
-                extracted_content.extend(
-                    extract_func(ix, sanitize_input_encode(section))
-                )
-                time.sleep(0.5)  # 500 ms delay between each processing
-        else:
-            # Parallel processing using ThreadPoolExecutor
-            # extract_func = partial(self.extract, url)
-            # for ix, section in enumerate(merged_sections):
-            #     extracted_content.append(extract_func(ix, section))
-
-            with ThreadPoolExecutor(max_workers=4) as executor:
+        if merged_sections:
+            # The shared LLM scheduler limits requests per provider; use as many threads as it allows
+            budget = get_llm_scheduler().budget(
+                self.llm_config.provider,
+                self.llm_config.max_concurrency,
+                self.llm_config.tokens_per_minute,
+            )
+            max_workers = min(len(merged_sections), budget.max_concurrency or len(merged_sections))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 extract_func = partial(self.extract, url)
                 futures = [
                     executor.submit(extract_func, ix, sanitize_input_encode(section))
@@ -851,7 +852,10 @@ class LLMExtractionStrategy(ExtractionStrategy):
                 extra_args=self.extra_args,
                 base_delay=self.llm_config.backoff_base_delay,
                 max_attempts=self.llm_config.backoff_max_attempts,
-                exponential_factor=self.llm_config.backoff_exponential_factor
+                exponential_factor=self.llm_config.backoff_exponential_factor,
+                max_concurrency=self.llm_config.max_concurrency,
+                tokens_per_minute=self.llm_config.tokens_per_minute,
+                use_cache=self.llm_config.cache_responses,
             )
             # Track usage
             usage = TokenUsage(
@@ -926,6 +930,7 @@ class LLMExtractionStrategy(ExtractionStrategy):
     async def arun(self, url: str, sections: List[str]) -> List[Dict[str, Any]]:
         """
         Async version: Process sections with true parallelism using asyncio.gather.
+        Requests wait for the provider's limits in the shared LLM scheduler.
 
         Args:
             url: The URL of the webpage.
@@ -1007,8 +1012,13 @@ class JsonElementExtractionStrategy(ExtractionStrategy):
         schema (Dict[str, Any]): The schema defining the extraction rules.
         verbose (bool): Enables verbose logging for debugging purposes.
 
+    The schema is compiled once into a `SchemaPlan` (see schema_plan.py) that is
+    reused for every page, and `extract_many` applies it to many pages, optionally
+    in a process pool.
+
     Methods:
         extract(url, html_content, *q, **kwargs): Extracts structured data from HTML content.
+        extract_many(html_list, urls, max_workers): Extracts structured data from many pages.
         _extract_item(element, fields): Extracts fields from a single element.
         _extract_single_field(element, field): Extracts a single field based on its type.
         _apply_transform(value, transform): Applies a transformation to a value.
@@ -1026,6 +1036,15 @@ class JsonElementExtractionStrategy(ExtractionStrategy):
 
     DEL = "\n"
 
+    # Methods a SchemaPlan reproduces; strategies overriding one of them run without a plan
+    _PLAN_METHODS = (
+        "_extract_field",
+        "_extract_single_field",
+        "_extract_list_item",
+        "_extract_item",
+        "_compute_field",
+    )
+
     def __init__(self, schema: Dict[str, Any], **kwargs):
         """
         Initialize the JSON element extraction strategy with a schema.
@@ -1036,6 +1055,33 @@ class JsonElementExtractionStrategy(ExtractionStrategy):
         super().__init__(**kwargs)
         self.schema = schema
         self.verbose = kwargs.get("verbose", False)
+        self._plan = None
+
+    def __getstate__(self):
+        # Plans hold compiled selectors that can't be pickled; they are rebuilt on first use
+        state = self.__dict__.copy()
+        state["_plan"] = None
+        return state
+
+    def _get_plan(self) -> Optional[SchemaPlan]:
+        """The compiled plan of the current schema, or None if this strategy can't use one"""
+        cls = type(self)
+        if any(
+            getattr(cls, name) is not getattr(JsonElementExtractionStrategy, name)
+            for name in self._PLAN_METHODS
+        ):
+            return None
+        plan = getattr(self, "_plan", None)
+        # Compared by content: the schema dict may have been changed in place
+        if plan is None or plan.fingerprint != schema_fingerprint(self.schema):
+            plan = self._plan = SchemaPlan(self.schema, self)
+        return plan
+
+    def _selector_function(self, selector: str, base: bool = False):
+        """A function returning the elements `selector` matches under an element (used by plans)"""
+        if base:
+            return lambda element: self._get_base_elements(element, selector)
+        return lambda element: self._get_elements(element, selector)
 
     def extract(
         self, url: str, html_content: str, *q, **kwargs
@@ -1053,12 +1099,26 @@ class JsonElementExtractionStrategy(ExtractionStrategy):
             html_content (str): The raw HTML content to parse and extract.
             *q: Additional positional arguments.
             **kwargs: Additional keyword arguments for custom extraction.
+                document (HTMLDocument): Already parsed `html_content`, reused
+                    instead of parsing it again.
 
         Returns:
             List[Dict[str, Any]]: A list of extracted items, each represented as a dictionary.
         """
 
-        parsed_html = self._parse_html(html_content)
+        document = kwargs.get("document")
+        if document is not None:
+            parsed_html = self._parse_document(document)
+        else:
+            parsed_html = self._parse_html(html_content)
+
+        plan = self._get_plan()
+        if plan is not None:
+            return plan.extract(parsed_html)
+        return self._extract_uncompiled(parsed_html)
+
+    def _extract_uncompiled(self, parsed_html) -> List[Dict[str, Any]]:
+        """Extraction walking the schema dicts, for strategies that override field extraction"""
         base_elements = self._get_base_elements(
             parsed_html, self.schema["baseSelector"]
         )
@@ -1082,11 +1142,52 @@ class JsonElementExtractionStrategy(ExtractionStrategy):
 
         return results
 
+    def extract_many(
+        self,
+        html_list: List[str],
+        urls: Union[str, List[str], None] = None,
+        max_workers: Optional[int] = None,
+        chunksize: int = 8,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Apply the schema to many pages.
+
+        The schema is compiled once and reused for every page. With `max_workers`
+        > 1 the pages are processed in a process pool; each worker receives the
+        strategy once and compiles its own plan.
+
+        Args:
+            html_list (List[str]): HTML of the pages.
+            urls (str or List[str], optional): URL of each page, or one URL for all.
+            max_workers (int, optional): Worker processes; None or 1 processes in-process.
+            chunksize (int): Pages sent to a worker at a time.
+
+        Returns:
+            List[List[Dict[str, Any]]]: The extracted items of each page, in input order.
+        """
+        html_list = list(html_list)
+        if urls is None or isinstance(urls, str):
+            urls = [urls or ""] * len(html_list)
+        jobs = list(zip(urls, html_list))
+        if not max_workers or max_workers <= 1 or len(jobs) <= 1:
+            return [self.extract(url, html) for url, html in jobs]
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            return list(executor.map(_extract_in_worker, jobs, chunksize=chunksize))
+
     @abstractmethod
     def _parse_html(self, html_content: str):
         """Parse HTML content into appropriate format"""
         pass
 
+    def _parse_document(self, document: HTMLDocument):
+        """Parsed form of a shared HTMLDocument; strategies that work on lxml trees reuse its tree"""
+        return self._parse_html(document.html)
+
     @abstractmethod
     def _get_base_elements(self, parsed_html, selector: str):
         """Get all base elements using the selector"""
@@ -1104,7 +1205,7 @@ class JsonElementExtractionStrategy(ExtractionStrategy):
                 nested_element = nested_elements[0] if nested_elements else None
                 return (
                     self._extract_item(nested_element, field["fields"])
-                    if nested_element
+                    if nested_element is not None
                     else {}
                 )
 
@@ -1433,52 +1534,136 @@ In this scenario, use your best judgment to generate the schema. You need to exa
         except Exception as e:
             raise Exception(f"Failed to generate schema: {str(e)}")
 
+# Attributes BeautifulSoup returns as lists of values; JsonCssExtractionStrategy keeps
+# returning them that way so extracted attribute fields don't change shape.
+MULTI_VALUED_ATTRIBUTES = {
+    "*": {"class", "accesskey", "dropzone"},
+    "a": {"rel", "rev"},
+    "link": {"rel", "rev"},
+    "td": {"headers"},
+    "th": {"headers"},
+    "form": {"accept-charset"},
+    "object": {"archive"},
+    "area": {"rel"},
+    "icon": {"sizes"},
+    "iframe": {"sandbox"},
+    "output": {"for"},
+}
+
+
 class JsonCssExtractionStrategy(JsonElementExtractionStrategy):
     """
     Concrete implementation of `JsonElementExtractionStrategy` using CSS selectors.
 
     How it works:
-    1. Parses HTML content with BeautifulSoup.
-    2. Selects elements using CSS selectors defined in the schema.
+    1. Parses HTML content with lxml (or reuses the tree of a shared HTMLDocument).
+    2. Selects elements using CSS selectors defined in the schema, compiled once to XPath.
     3. Extracts field data and applies transformations as defined.
 
+    Schemas with selectors lxml's cssselect can't translate (e.g. soupsieve-only
+    pseudo-classes) are run with BeautifulSoup, as before.
+
     Attributes:
         schema (Dict[str, Any]): The schema defining the extraction rules.
         verbose (bool): Enables verbose logging for debugging purposes.
 
     Methods:
-        _parse_html(html_content): Parses HTML content into a BeautifulSoup object.
+        _parse_html(html_content): Parses HTML content into an lxml tree.
         _get_base_elements(parsed_html, selector): Selects base elements using a CSS selector.
         _get_elements(element, selector): Selects child elements using a CSS selector.
-        _get_element_text(element): Extracts text content from a BeautifulSoup element.
-        _get_element_html(element): Extracts the raw HTML content of a BeautifulSoup element.
-        _get_element_attribute(element, attribute): Retrieves an attribute value from a BeautifulSoup element.
+        _get_element_text(element): Extracts text content from an element.
+        _get_element_html(element): Extracts the raw HTML content of an element.
+        _get_element_attribute(element, attribute): Retrieves an attribute value from an element.
     """
 
+    _translator = HTMLTranslator()
+
     def __init__(self, schema: Dict[str, Any], **kwargs):
         kwargs["input_format"] = "html"  # Force HTML input
         super().__init__(schema, **kwargs)
+        self._compiled_selectors = {}
+        self.use_soup = not self._compile_schema(schema)
+
+    def __getstate__(self):
+        # Compiled XPath objects can't be pickled; they are rebuilt on demand
+        state = super().__getstate__()
+        state["_compiled_selectors"] = {}
+        return state
+
+    def _compile_schema(self, schema: Dict[str, Any]) -> bool:
+        """Compile every selector in the schema; False if one isn't supported by lxml"""
+        try:
+            self._compile_selector(schema["baseSelector"], include_self=True)
+            pending = list(schema.get("fields", [])) + list(schema.get("baseFields", []))
+            while pending:
+                field = pending.pop()
+                if field.get("selector"):
+                    self._compile_selector(field["selector"])
+                pending.extend(field.get("fields", []))
+        except (SelectorError, etree.XPathError) as e:
+            if self.verbose:
+                print(f"Selector not supported by lxml, using BeautifulSoup: {e}")
+            return False
+        return True
+
+    def _compile_selector(self, selector: str, include_self: bool = False):
+        key = (selector, include_self)
+        compiled = self._compiled_selectors.get(key)
+        if compiled is None:
+            # The document root (<html>) is a match for base selectors, like the
+            # BeautifulSoup object above it; child selectors match descendants only
+            prefix = "descendant-or-self::" if include_self else "descendant::"
+            compiled = etree.XPath(self._translator.css_to_xpath(selector, prefix=prefix))
+            self._compiled_selectors[key] = compiled
+        return compiled
 
     def _parse_html(self, html_content: str):
-        # return BeautifulSoup(html_content, "html.parser")
-        return BeautifulSoup(html_content, "lxml")
+        if self.use_soup:
+            return BeautifulSoup(html_content, "lxml")
+        return parse_html_document(html_content)
+
+    def _parse_document(self, document: HTMLDocument):
+        if self.use_soup:
+            return self._parse_html(document.html)
+        # Extraction only reads the tree, so the shared tree is used directly
+        return document.tree
+
+    def _selector_function(self, selector: str, base: bool = False):
+        if self.use_soup:
+            return lambda element: element.select(selector)
+        return self._compile_selector(selector, include_self=base)
 
     def _get_base_elements(self, parsed_html, selector: str):
-        return parsed_html.select(selector)
+        if self.use_soup:
+            return parsed_html.select(selector)
+        return self._compile_selector(selector, include_self=True)(parsed_html)
 
     def _get_elements(self, element, selector: str):
-        # Return all matching elements using select() instead of select_one()
-        # This ensures that we get all elements that match the selector, not just the first one
-        return element.select(selector)
+        # Return all matching elements, not just the first one
+        if self.use_soup:
+            return element.select(selector)
+        return self._compile_selector(selector)(element)
 
     def _get_element_text(self, element) -> str:
-        return element.get_text(strip=True)
+        if self.use_soup:
+            return element.get_text(strip=True)
+        return get_stripped_text(element)
 
     def _get_element_html(self, element) -> str:
-        return str(element)
+        if self.use_soup:
+            return str(element)
+        return etree.tostring(element, encoding="unicode", method="html", with_tail=False)
 
     def _get_element_attribute(self, element, attribute: str):
-        return element.get(attribute)
+        if self.use_soup:
+            return element.get(attribute)
+        value = element.get(attribute)
+        if value is not None and (
+            attribute in MULTI_VALUED_ATTRIBUTES["*"]
+            or attribute in MULTI_VALUED_ATTRIBUTES.get(element.tag, ())
+        ):
+            return value.split()
+        return value
 
 class JsonLxmlExtractionStrategy(JsonElementExtractionStrategy):
     def __init__(self, schema: Dict[str, Any], **kwargs):
@@ -1498,9 +1683,29 @@ class JsonLxmlExtractionStrategy(JsonElementExtractionStrategy):
         self.etree = etree
         self.html_parser = html
         self.CSSSelector = CSSSelector
-    
+
+    def __getstate__(self):
+        # Selector functions and modules can't be pickled; they are rebuilt on demand
+        state = super().__getstate__()
+        for key in ("_selector_cache", "_xpath_cache", "_result_cache"):
+            state[key] = {}
+        for key in ("etree", "html_parser", "CSSSelector"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        from lxml import etree, html
+        from lxml.cssselect import CSSSelector
+
+        self.__dict__.update(state)
+        self.etree = etree
+        self.html_parser = html
+        self.CSSSelector = CSSSelector
+
     def _parse_html(self, html_content: str):
         """Parse HTML content with error recovery"""
+        # Cached results are keyed by element identity, which is only valid within one tree
+        self._clear_caches()
         try:
             parser = self.etree.HTMLParser(recover=True, remove_blank_text=True)
             return self.etree.fromstring(html_content, parser)
@@ -1702,6 +1907,11 @@ class JsonLxmlExtractionStrategy(JsonElementExtractionStrategy):
             self._selector_cache[selector_str] = self._create_selector_function(selector_str)
         return self._selector_cache[selector_str]
     
+    def _selector_function(self, selector: str, base: bool = False):
+        selector_func = self._get_selector(selector)
+        # Base elements don't need context sensitivity
+        return partial(selector_func, context_sensitive=not base)
+
     def _get_base_elements(self, parsed_html, selector: str):
         """Get all base elements using the selector"""
         selector_func = self._get_selector(selector)
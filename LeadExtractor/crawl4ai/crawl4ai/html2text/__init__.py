@@ -1,5 +1,6 @@
 """html2text: Turn HTML into equivalent Markdown-structured text."""
 
+import functools
 import html.entities
 import html.parser
 import re
@@ -29,6 +30,11 @@ from .utils import (
 
 __version__ = (2024, 2, 26)
 
+# Pages repeat the same links many times; joining them dominates link output
+_urljoin = functools.lru_cache(maxsize=4096)(urlparse.urljoin)
+
+RE_WHITESPACE = re.compile(r"\s+")
+
 
 # TODO:
 # Support decoded entities with UNIFIABLE.
@@ -504,7 +510,7 @@ class HTML2Text(html.parser.HTMLParser):
             self.quote = not self.quote
 
         def link_url(self: HTML2Text, link: str, title: str = "") -> None:
-            url = urlparse.urljoin(self.baseurl, link)
+            url = _urljoin(self.baseurl, link)
             title = ' "{}"'.format(title) if title.strip() else ""
             self.o("]({url}{title})".format(url=escape_md(url), title=title))
 
@@ -599,7 +605,7 @@ class HTML2Text(html.parser.HTMLParser):
                     if self.inline_links:
                         href = attrs.get("href") or ""
                         self.o(
-                            "(" + escape_md(urlparse.urljoin(self.baseurl, href)) + ")"
+                            "(" + escape_md(_urljoin(self.baseurl, href)) + ")"
                         )
                     else:
                         i = self.previousIndex(attrs)
@@ -786,7 +792,7 @@ class HTML2Text(html.parser.HTMLParser):
                 # This is a very dangerous call ... it could mess up
                 # all handling of &nbsp; when not handled properly
                 # (see entityref)
-                data = re.sub(r"\s+", r" ", data)
+                data = RE_WHITESPACE.sub(" ", data)
                 if data and data[0] == " ":
                     self.space = True
                     data = data[1:]
@@ -1043,6 +1049,8 @@ class CustomHTML2Text(HTML2Text):
         self.preserved_content = []
         self.preserve_depth = 0
         self.handle_code_in_pre = handle_code_in_pre
+        # One entry per open ul/ol: whether it has an <li> without its end tag
+        self.open_items = []
 
         # Configuration options
         self.skip_internal_links = False
@@ -1104,6 +1112,20 @@ class CustomHTML2Text(HTML2Text):
                 self.preserved_content.append(f"</{tag}>")
             return
 
+        # Close list items whose </li> was omitted, as an HTML parser would,
+        # so list spacing does not depend on the end tag being written out
+        if tag == "li" or (tag in ("ul", "ol") and not start):
+            if self.open_items and self.open_items[-1] and (start or tag != "li"):
+                self.open_items[-1] = False
+                super().handle_tag("li", {}, False)
+            if tag == "li" and self.open_items:
+                self.open_items[-1] = start
+        if tag in ("ul", "ol"):
+            if start:
+                self.open_items.append(False)
+            elif self.open_items:
+                self.open_items.pop()
+
         # Handle pre tags
         if tag == "pre":
             if start:
@@ -0,0 +1,286 @@
+"""
+Parse-once HTML documents shared by the post-processing stages.
+
+Scraping, content filtering, markdown generation and schema extraction all start
+from the same HTML string. `HTMLDocument` wraps that string and parses it with lxml
+the first time a stage asks for the tree; every later stage reuses the parsed tree
+instead of parsing the page again (and instead of building a BeautifulSoup tree,
+which is several times slower than lxml).
+
+Stages that only read the tree use `document.tree`. Stages that modify it (pruning,
+cleaning) call `document.fork()` and work on their own copy, so the shared tree is
+never changed under another stage. The text and markup helpers below follow
+BeautifulSoup's semantics, so stages ported from BeautifulSoup produce the same
+text and markup as before.
+
+Example:
+    ```python
+    document = HTMLDocument(cleaned_html)
+    blocks = PruningContentFilter().filter_content(document)
+    items = JsonCssExtractionStrategy(schema).extract(url, document.html, document=document)
+    ```
+"""
+import copy
+from typing import Optional, Union
+
+from lxml import etree
+from lxml import html as lhtml
+
+
+# Elements whose text BeautifulSoup's get_text() leaves out
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+# Elements in which whitespace-only text is kept as is
+PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+
+# Elements BeautifulSoup writes as <tag/> when they have no contents
+VOID_TAGS = frozenset({
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image",
+    "img", "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source",
+    "spacer", "track", "wbr",
+})
+
+# Elements whose text BeautifulSoup writes without escaping
+RAW_TEXT_TAGS = frozenset({"script", "style"})
+
+# Attributes BeautifulSoup reads as whitespace-separated lists (written back single-spaced)
+_LIST_ATTRIBUTES = {
+    "a": {"rel", "rev"}, "link": {"rel", "rev"}, "td": {"headers"}, "th": {"headers"},
+    "form": {"accept-charset"}, "object": {"archive"}, "area": {"rel"}, "icon": {"sizes"},
+    "iframe": {"sandbox"}, "output": {"for"},
+}
+_GLOBAL_LIST_ATTRIBUTES = {"class", "accesskey", "dropzone"}
+
+# Attributes libxml2 gives their own name as value when they have none (BeautifulSoup
+# keeps them empty); `disabled="disabled"` in the source can't be told apart and is
+# written as `disabled=""` too
+_BOOLEAN_ATTRIBUTES = {
+    "checked", "compact", "declare", "defer", "disabled", "ismap", "multiple", "nohref",
+    "noresize", "noshade", "nowrap", "readonly", "selected",
+}
+
+
+def is_element(node) -> bool:
+    """False for comments and processing instructions (their tag is not a string)."""
+    return isinstance(node.tag, str)
+
+
+# What BeautifulSoup counts as whitespace when collapsing strings (not e.g. \xa0)
+ASCII_SPACES = " \n\t\x0c\r"
+
+
+def _collapse(text: str) -> str:
+    # BeautifulSoup keeps whitespace-only strings as a single newline or space
+    if text.strip(ASCII_SPACES):
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def _iter_text(element):
+    """Text nodes under an lxml element in document order (without the element's own tail)."""
+    in_preserved = any(True for _ in element.iterancestors(*PRESERVE_WHITESPACE_TAGS))
+    stack = [(element, in_preserved)]
+    while stack:
+        node, preserve = stack.pop()
+        if isinstance(node, str):
+            yield node if preserve else _collapse(node)
+            continue
+        preserve = preserve or node.tag in PRESERVE_WHITESPACE_TAGS
+        items = []
+        if node.text and is_element(node) and node.tag not in NON_TEXT_TAGS:
+            items.append((node.text, preserve))
+        for child in node:
+            items.append((child, preserve))
+            if child.tail:
+                items.append((child.tail, preserve))
+        stack.extend(reversed(items))
+
+
+def get_text(element) -> str:
+    """lxml equivalent of BeautifulSoup's `tag.get_text()`."""
+    return "".join(_iter_text(element))
+
+
+def get_stripped_text(element) -> str:
+    """lxml equivalent of BeautifulSoup's `tag.get_text(strip=True)`."""
+    return "".join(text.strip() for text in _iter_text(element))
+
+
+def get_string(element) -> Optional[str]:
+    """lxml equivalent of BeautifulSoup's `tag.string`: the only string inside the element."""
+    while True:
+        if len(element) == 0:
+            return element.text
+        if len(element) > 1 or element.text or element[0].tail:
+            return None
+        element = element[0]
+
+
+def escape_text(text: str) -> str:
+    """Text as BeautifulSoup's "minimal" formatter writes it."""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _attribute(tag: str, name: str, value: str) -> str:
+    if name in _BOOLEAN_ATTRIBUTES and value == name:
+        value = ""
+    elif name in _GLOBAL_LIST_ATTRIBUTES or name in _LIST_ATTRIBUTES.get(tag, ()):
+        value = " ".join(value.split())
+    value = escape_text(value)
+    if '"' in value:
+        if "'" in value:
+            return f' {name}="{value.replace(chr(34), "&quot;")}"'
+        return f" {name}='{value}'"
+    return f' {name}="{value}"'
+
+
+def start_tag(element) -> str:
+    """
+    The start tag BeautifulSoup writes for an element: attributes sorted by
+    name, valueless ones as `name=""`, and `<tag/>` for an empty void element.
+    """
+    attributes = "".join(_attribute(element.tag, name, value) for name, value in sorted(element.attrib.items()))
+    if element.tag in VOID_TAGS and element.text is None and len(element) == 0:
+        return f"<{element.tag}{attributes}/>"
+    return f"<{element.tag}{attributes}>"
+
+
+def end_tag(element) -> str:
+    """The end tag BeautifulSoup writes for an element ("" for an empty void element)."""
+    if element.tag in VOID_TAGS and element.text is None and len(element) == 0:
+        return ""
+    return f"</{element.tag}>"
+
+
+def _node_html(node) -> str:
+    # Comments and processing instructions
+    if node.tag is etree.Comment:
+        return f"<!--{node.text or ''}-->"
+    return etree.tostring(node, encoding="unicode", with_tail=False)
+
+
+def to_html(element, with_tail: bool = False) -> str:
+    """
+    lxml equivalent of BeautifulSoup's `str(tag)`. lxml's own HTML serializer
+    writes valueless attributes bare and percent-encodes spaces in URLs, so
+    stages ported from BeautifulSoup use this to return the same markup.
+    """
+    parts = []
+    stack = [element]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            parts.append(node)
+            continue
+        if not is_element(node):
+            parts.append(_node_html(node))
+            continue
+        parts.append(start_tag(node))
+        if node.text is None and len(node) == 0 and node.tag in VOID_TAGS:
+            continue
+        raw = node.tag in RAW_TEXT_TAGS
+        items = [node.text if raw else escape_text(node.text)] if node.text else []
+        for child in node:
+            items.append(child)
+            if child.tail:
+                items.append(child.tail if raw else escape_text(child.tail))
+        items.append(f"</{node.tag}>")
+        stack.extend(reversed(items))
+    if with_tail and element.tail:
+        parts.append(escape_text(element.tail))
+    return "".join(parts)
+
+
+def drop_node(node) -> None:
+    """Remove a node from its parent, keeping its tail text (like `Tag.decompose`)."""
+    parent = node.getparent()
+    if parent is None:
+        return
+    if node.tail:
+        previous = node.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + node.tail
+        else:
+            parent.text = (parent.text or "") + node.tail
+    parent.remove(node)
+
+
+def parse_html_document(html: str) -> lhtml.HtmlElement:
+    """
+    Parse an HTML string into a full lxml document (html/head/body).
+
+    Unlike `lxml.html.document_fromstring` this never raises: empty input gives an
+    empty document, and strings with an XML encoding declaration are parsed as bytes.
+    """
+    if not html or not html.strip():
+        return lhtml.document_fromstring("<html><body></body></html>")
+    try:
+        return lhtml.document_fromstring(html)
+    except ValueError:
+        # "Unicode strings with encoding declaration are not supported"
+        parser = lhtml.HTMLParser(encoding="utf-8")
+        return lhtml.document_fromstring(html.encode("utf-8"), parser=parser)
+    except etree.ParserError:
+        return lhtml.document_fromstring("<html><body></body></html>")
+
+
+class HTMLDocument:
+    """
+    An HTML string and its lxml tree, parsed at most once.
+
+    Documents are picklable; only the HTML string is sent, the tree is parsed
+    again (lazily) on the other side.
+
+    Args:
+        html: The HTML content
+        tree: An already parsed tree for `html`, if the caller has one
+    """
+
+    __slots__ = ("html", "_tree")
+
+    def __init__(self, html: str, tree: Optional[lhtml.HtmlElement] = None):
+        self.html = html or ""
+        self._tree = tree
+
+    @classmethod
+    def of(cls, html: Union[str, "HTMLDocument", None]) -> "HTMLDocument":
+        """Wrap a string in a document; documents are returned as is."""
+        if isinstance(html, HTMLDocument):
+            return html
+        return cls(html or "")
+
+    @property
+    def is_parsed(self) -> bool:
+        return self._tree is not None
+
+    @property
+    def tree(self) -> lhtml.HtmlElement:
+        """The shared, read-only document root (<html>)."""
+        if self._tree is None:
+            self._tree = parse_html_document(self.html)
+        return self._tree
+
+    @property
+    def body(self) -> Optional[lhtml.HtmlElement]:
+        """The shared <body> element, or None if the document has none."""
+        return self.tree.find("body")
+
+    def fork(self) -> lhtml.HtmlElement:
+        """
+        A private copy of the tree for stages that modify it.
+
+        Copies the shared tree if it is already parsed (copying is cheaper than
+        parsing); otherwise parses a fresh tree and leaves this document unparsed.
+        """
+        if self._tree is not None:
+            return copy.deepcopy(self._tree)
+        return parse_html_document(self.html)
+
+    def __str__(self) -> str:
+        return self.html
+
+    def __len__(self) -> int:
+        return len(self.html)
+
+    def __reduce__(self):
+        return (HTMLDocument, (self.html,))
@@ -0,0 +1,65 @@
+async ({ delay, maxSteps, timeBudget, quietPeriod, plateauChecks, maxStepViewports }) => {
+    const started = performance.now();
+    const elapsed = () => performance.now() - started;
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+    const root = document.scrollingElement || document.documentElement;
+    const viewport = window.innerHeight || 800;
+
+    // Track nodes added anywhere in the document; a quiet period means loading stopped.
+    // Growth itself is judged by scrollHeight, so animated widgets can't keep the scan alive.
+    let addedNodes = 0;
+    let lastMutation = performance.now();
+    const observer = new MutationObserver((records) => {
+        for (const record of records) {
+            if (record.addedNodes.length) {
+                addedNodes += record.addedNodes.length;
+                lastMutation = performance.now();
+            }
+        }
+    });
+    observer.observe(document.documentElement, { childList: true, subtree: true });
+
+    // Wait `delay`, then until the DOM has been quiet for `quietPeriod` (at most 4 * delay more)
+    const settle = async () => {
+        await sleep(delay);
+        const deadline = performance.now() + 4 * delay;
+        while (performance.now() - lastMutation < quietPeriod && performance.now() < deadline) {
+            if (elapsed() >= timeBudget) return;
+            await sleep(Math.min(50, quietPeriod));
+        }
+    };
+
+    // Tall pages are scanned in bigger steps: ~20 steps per page, 1 to maxStepViewports viewports each
+    const stepSize = (height) => Math.max(viewport, Math.min(viewport * maxStepViewports, Math.ceil(height / 20)));
+
+    let steps = 0;
+    let position = 0;
+    let height = root.scrollHeight;
+    let plateau = 0;
+    let reason = "end";
+    try {
+        while (true) {
+            if (maxSteps !== null && steps >= maxSteps) { reason = "max_steps"; break; }
+            if (elapsed() >= timeBudget) { reason = "time_budget"; break; }
+
+            const atBottom = position + viewport >= height;
+            position = atBottom ? height : Math.min(position + stepSize(height), height);
+            window.scrollTo(0, position);
+            steps += 1;
+            await settle();
+
+            const newHeight = root.scrollHeight;
+            if (newHeight > height) {
+                height = newHeight;
+                plateau = 0;
+            } else if (atBottom || position + viewport >= newHeight) {
+                // At the bottom and nothing new appeared
+                plateau += 1;
+                if (plateau >= plateauChecks) { reason = "plateau"; break; }
+            }
+        }
+    } finally {
+        observer.disconnect();
+    }
+    return { steps, elapsed: elapsed() / 1000, height, addedNodes, reason };
+}
@@ -0,0 +1,625 @@
+"""
+Shared scheduler for LLM completion requests.
+
+Every LLM call made through `perform_completion_with_backoff` /
+`aperform_completion_with_backoff` (LLMExtractionStrategy, LLMContentFilter,
+LLMTableExtraction, ...) goes through one process-wide `LLMScheduler`. Per
+provider (model string) it enforces:
+
+- a concurrency limit, shared by threads and event loops,
+- a tokens-per-minute budget (token bucket; each request reserves its estimated
+  tokens and is settled with the real usage afterwards),
+- retries of rate-limited requests after the delay the provider asks for
+  (`retry-after`, `x-ratelimit-reset-*` headers) or exponential backoff, with
+  jitter. While a provider is rate limited, its other requests wait as well.
+
+Limits come from `LLMConfig(max_concurrency=..., tokens_per_minute=...)`, else
+from `LLM_PROVIDER_LIMITS` in config.py. A provider's token budget is also
+learned from `x-ratelimit-limit-tokens` / `-remaining-tokens` response headers.
+
+With `LLMConfig(cache_responses=True)` responses are kept in a SQLite cache
+(~/.crawl4ai/llm_cache/responses.db) keyed by model, prompt hash and request
+options, so re-running an extraction over the same chunks costs no tokens.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .config import LLM_PROVIDER_LIMITS
+
+# Characters per token used to estimate a prompt's size before sending it
+CHARS_PER_TOKEN = 4
+
+
+def _parse_duration(value: Any) -> Optional[float]:
+    """Seconds from "20", "1.5s", "250ms", "6m0s", "1h2m3s" or an HTTP date."""
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    seconds, number, index = 0.0, "", 0
+    while index < len(text):
+        char = text[index]
+        if char.isdigit() or char == ".":
+            number += char
+        elif text.startswith("ms", index) and number:
+            seconds += float(number) / 1000
+            number, index = "", index + 1
+        elif char in "hms" and number:
+            seconds += float(number) * {"h": 3600, "m": 60, "s": 1}[char]
+            number = ""
+        else:
+            break
+        index += 1
+    else:
+        if not number:
+            return seconds
+    try:
+        # Retry-After as HTTP date, or RFC 3339 reset times (anthropic-ratelimit-*-reset)
+        from datetime import datetime, timezone
+
+        if "t" in text and "-" in text:
+            moment = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        else:
+            moment = parsedate_to_datetime(str(value))
+        return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalize_headers(headers: Any) -> Dict[str, str]:
+    if not headers:
+        return {}
+    try:
+        items = dict(headers).items()
+    except (TypeError, ValueError):
+        return {}
+    normalized = {}
+    for key, value in items:
+        key = str(key).lower()
+        # litellm re-exports provider headers with an "llm_provider-" prefix
+        if key.startswith("llm_provider-"):
+            key = key[len("llm_provider-"):]
+        normalized[key] = value
+    return normalized
+
+
+def retry_delay_from_headers(headers: Any) -> Optional[float]:
+    """The wait a rate-limited provider asks for, in seconds (None if it doesn't say)."""
+    headers = _normalize_headers(headers)
+    if "retry-after-ms" in headers:
+        delay = _parse_duration(headers["retry-after-ms"])
+        return delay / 1000 if delay is not None else None
+    delays = [
+        _parse_duration(headers[key])
+        for key in (
+            "retry-after",
+            "x-ratelimit-reset-tokens",
+            "x-ratelimit-reset-requests",
+            "anthropic-ratelimit-tokens-reset",
+            "anthropic-ratelimit-requests-reset",
+        )
+        if key in headers
+    ]
+    delays = [delay for delay in delays if delay is not None]
+    return max(delays) if delays else None
+
+
+def _error_headers(error: Exception) -> Dict[str, str]:
+    headers = getattr(error, "headers", None)
+    if not headers:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    return _normalize_headers(headers)
+
+
+def _response_headers(response: Any) -> Dict[str, str]:
+    hidden = getattr(response, "_hidden_params", None) or {}
+    return _normalize_headers(hidden.get("additional_headers"))
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def _int_header(headers: Dict[str, str], *keys: str) -> Optional[int]:
+    for key in keys:
+        try:
+            return int(float(headers[key]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+class ProviderBudget:
+    """
+    Concurrency slots and a token bucket for one provider.
+
+    Thread-safe; slots are handed to waiting threads and coroutines in FIFO order.
+
+    Args:
+        max_concurrency: Requests in flight at once (None: no limit)
+        tokens_per_minute: Token budget (None: no budget, until learned from headers)
+        clock: Monotonic clock, replaceable in tests
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._waiters = deque()
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self.tokens_per_minute = tokens_per_minute
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = clock()
+        self.paused_until = 0.0
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "cache_hits": 0, "waited": 0.0}
+
+    def configure(self, max_concurrency: Optional[int] = None, tokens_per_minute: Optional[int] = None) -> None:
+        """Apply limits given explicitly (None keeps the current value)."""
+        if tokens_per_minute is not None and tokens_per_minute != self.tokens_per_minute:
+            with self._lock:
+                self._refill()
+                self.tokens_per_minute = tokens_per_minute
+                self._tokens = min(self._tokens, tokens_per_minute) if self._tokens else float(tokens_per_minute)
+        if max_concurrency is not None and max_concurrency != self.max_concurrency:
+            with self._lock:
+                self.max_concurrency = max_concurrency
+            # A higher limit frees slots for waiters
+            while True:
+                with self._lock:
+                    if not self._waiters or not self._has_free_slot():
+                        break
+                    self.active += 1
+                    waiter = self._waiters.popleft()
+                self._hand_over(waiter)
+
+    # -- concurrency --------------------------------------------------------
+
+    def _has_free_slot(self) -> bool:
+        return self.max_concurrency is None or self.active < self.max_concurrency
+
+    def acquire(self) -> None:
+        """Take a slot, blocking the calling thread until one is free."""
+        with self._lock:
+            if self._has_free_slot() and not self._waiters:
+                self.active += 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def acquire_async(self) -> None:
+        """Take a slot, waiting without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._has_free_slot() and not self._waiters:
+                self.active += 1
+                return
+            future = loop.create_future()
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Give the slot to the next waiter, or free it."""
+        with self._lock:
+            if not self._waiters or not self._has_free_slot() and self.active > self.max_concurrency:
+                self.active -= 1
+                return
+            waiter = self._waiters.popleft()
+        self._hand_over(waiter)
+
+    def _hand_over(self, waiter) -> None:
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+            return
+        loop, future = waiter
+
+        def wake():
+            if future.done():
+                # Cancelled while the slot was on its way
+                self.release()
+            else:
+                future.set_result(None)
+
+        try:
+            loop.call_soon_threadsafe(wake)
+        except RuntimeError:
+            # The waiter's loop is closed
+            self.release()
+
+    # -- token budget ---------------------------------------------------------
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if self.tokens_per_minute:
+            rate = self.tokens_per_minute / 60
+            self._tokens = min(float(self.tokens_per_minute), self._tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve `tokens` from the budget; returns the seconds to wait before sending."""
+        with self._lock:
+            self._refill()
+            wait = max(0.0, self.paused_until - self._updated)
+            if self.tokens_per_minute:
+                self._tokens -= min(tokens, self.tokens_per_minute)
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / (self.tokens_per_minute / 60))
+            self.stats["waited"] += wait
+            return wait
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Correct a reservation with the tokens the request really used."""
+        with self._lock:
+            if self.tokens_per_minute:
+                self._refill()
+                self._tokens = min(float(self.tokens_per_minute), self._tokens + reserved - used)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request to this provider for `seconds`."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, self._clock() + seconds)
+
+    def observe_headers(self, headers: Dict[str, str], learn_limit: bool = True) -> None:
+        """Sync the bucket with the provider's own view of the budget."""
+        limit = _int_header(headers, "x-ratelimit-limit-tokens", "anthropic-ratelimit-tokens-limit")
+        remaining = _int_header(headers, "x-ratelimit-remaining-tokens", "anthropic-ratelimit-tokens-remaining")
+        with self._lock:
+            self._refill()
+            if learn_limit and limit and not self.tokens_per_minute:
+                self.tokens_per_minute = limit
+                self._tokens = float(limit if remaining is None else remaining)
+            elif remaining is not None and self.tokens_per_minute:
+                self._tokens = min(self._tokens, float(remaining))
+
+
+class LLMResponseCache:
+    """
+    Persistent LLM response cache (SQLite).
+
+    Args:
+        path: Database file (default: ~/.crawl4ai/llm_cache/responses.db)
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(provider: str, prompt: str, options: Dict[str, Any]) -> str:
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8", "surrogatepass")).hexdigest()
+        options_json = json.dumps(options, sort_keys=True, default=str)
+        return hashlib.sha256(f"{provider}\n{prompt_hash}\n{options_json}".encode()).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.path is None:
+                from .utils import get_home_folder
+
+                directory = Path(get_home_folder()) / "llm_cache"
+                directory.mkdir(parents=True, exist_ok=True)
+                self.path = str(directory / "responses.db")
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, provider TEXT, response TEXT, created REAL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, provider: str, response: Dict[str, Any]) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, provider, json.dumps(response, default=str), time.time()),
+            )
+            connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def _dump_response(response: Any) -> Optional[Dict[str, Any]]:
+    if hasattr(response, "model_dump"):
+        return response.model_dump()
+    return None
+
+
+def _restore_response(data: Dict[str, Any]) -> Any:
+    from litellm import ModelResponse
+
+    return ModelResponse(**data)
+
+
+class LLMScheduler:
+    """
+    Schedules LLM completions per provider. Use the shared instance from
+    `get_llm_scheduler()`; separate instances don't share budgets.
+
+    Args:
+        cache: Response cache used when a call asks for caching
+        completion: Sync completion function (default: litellm.completion)
+        acompletion: Async completion function (default: litellm.acompletion)
+        sleep: Blocking sleep, replaceable in tests
+        asleep: Async sleep, replaceable in tests
+        rng: Random source for jitter
+    """
+
+    def __init__(
+        self,
+        cache: Optional[LLMResponseCache] = None,
+        completion: Optional[Callable] = None,
+        acompletion: Optional[Callable] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        asleep: Callable = asyncio.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.cache = cache or LLMResponseCache()
+        self._completion = completion
+        self._acompletion = acompletion
+        self._sleep = sleep
+        self._asleep = asleep
+        self._rng = rng
+        self._budgets: Dict[str, ProviderBudget] = {}
+        self._explicit_budget: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def budget(
+        self,
+        provider: str,
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ) -> ProviderBudget:
+        """The budget of `provider`, created from LLM_PROVIDER_LIMITS on first use."""
+        with self._lock:
+            budget = self._budgets.get(provider)
+            if budget is None:
+                defaults = next(
+                    (limits for prefix, limits in LLM_PROVIDER_LIMITS.items() if provider.startswith(prefix)),
+                    LLM_PROVIDER_LIMITS.get("default", {}),
+                )
+                budget = ProviderBudget(
+                    max_concurrency=defaults.get("max_concurrency"),
+                    tokens_per_minute=defaults.get("tokens_per_minute"),
+                )
+                self._budgets[provider] = budget
+                self._explicit_budget[provider] = defaults.get("tokens_per_minute") is not None
+            if tokens_per_minute is not None:
+                self._explicit_budget[provider] = True
+        budget.configure(max_concurrency, tokens_per_minute)
+        return budget
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {provider: dict(budget.stats) for provider, budget in self._budgets.items()}
+
+    # -- shared steps -------------------------------------------------------
+
+    @staticmethod
+    def _request_args(api_token, json_response, base_url, extra_args) -> Dict[str, Any]:
+        args = {"temperature": 0.01, "api_key": api_token, "base_url": base_url}
+        if json_response:
+            args["response_format"] = {"type": "json_object"}
+        if extra_args:
+            args.update(extra_args)
+        return args
+
+    @staticmethod
+    def _estimate_tokens(prompt: str, args: Dict[str, Any]) -> int:
+        # Providers count the completion allowance against the budget too
+        return len(prompt) // CHARS_PER_TOKEN + int(args.get("max_tokens") or 0)
+
+    def _cache_key(self, provider: str, prompt: str, args: Dict[str, Any]) -> str:
+        options = {key: value for key, value in args.items() if key != "api_key"}
+        return LLMResponseCache.key(provider, prompt, options)
+
+    def _cached(self, budget: ProviderBudget, key: Optional[str]) -> Any:
+        if key is None:
+            return None
+        return self._hit(budget, self.cache.get(key))
+
+    @staticmethod
+    def _hit(budget: ProviderBudget, data: Optional[Dict[str, Any]]) -> Any:
+        if data is None:
+            return None
+        budget.stats["cache_hits"] += 1
+        return _restore_response(data)
+
+    def _store(self, key: Optional[str], provider: str, response: Any) -> None:
+        if key is None:
+            return
+        data = _dump_response(response)
+        if data is not None:
+            self.cache.put(key, provider, data)
+
+    def _finish(self, provider: str, budget: ProviderBudget, reserved: int, response: Any) -> None:
+        usage = getattr(response, "usage", None)
+        used = getattr(usage, "total_tokens", None)
+        budget.settle(reserved, used if used is not None else reserved)
+        headers = _response_headers(response)
+        if headers:
+            budget.observe_headers(headers, learn_limit=not self._explicit_budget.get(provider))
+
+    def _retry_delay(self, budget: ProviderBudget, error: Exception, attempt: int, base_delay, factor) -> float:
+        budget.stats["rate_limited"] += 1
+        budget.stats["retries"] += 1
+        delay = retry_delay_from_headers(_error_headers(error))
+        if delay is None:
+            delay = base_delay * (factor ** attempt)
+        # Jitter keeps requests that were throttled together from retrying together
+        delay *= 1 + 0.25 * self._rng()
+        budget.pause(delay)
+        return delay
+
+    # -- entry points -------------------------------------------------------
+
+    def complete(
+        self,
+        provider: str,
+        prompt: str,
+        api_token: Optional[str] = None,
+        json_response: bool = False,
+        base_url: Optional[str] = None,
+        base_delay: float = 2,
+        max_attempts: int = 3,
+        exponential_factor: float = 2,
+        extra_args: Optional[Dict[str, Any]] = None,
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        use_cache: bool = False,
+    ) -> Any:
+        """
+        Send a completion request, waiting for a slot and for the token budget.
+
+        Rate-limited requests are retried up to `max_attempts` times; the last
+        rate-limit error and any other error are raised.
+        """
+        budget = self.budget(provider, max_concurrency, tokens_per_minute)
+        args = self._request_args(api_token, json_response, base_url, extra_args)
+        key = self._cache_key(provider, prompt, args) if use_cache else None
+        cached = self._cached(budget, key)
+        if cached is not None:
+            return cached
+        completion = self._completion
+        if completion is None:
+            import litellm
+            from litellm import completion
+
+            litellm.drop_params = True  # Auto-drop unsupported params (e.g., temperature for O-series/GPT-5)
+
+        reserved = self._estimate_tokens(prompt, args)
+        for attempt in range(max_attempts):
+            budget.acquire()
+            try:
+                wait = budget.reserve(reserved)
+                if wait:
+                    self._sleep(wait)
+                budget.stats["requests"] += 1
+                try:
+                    response = completion(
+                        model=provider, messages=[{"role": "user", "content": prompt}], **args
+                    )
+                except Exception as e:
+                    budget.settle(reserved, 0)
+                    if not _is_rate_limit(e) or attempt == max_attempts - 1:
+                        raise
+                    delay = self._retry_delay(budget, e, attempt, base_delay, exponential_factor)
+                    print(f"Rate limit error: {e}. Retrying in {delay:.1f} seconds...")
+                    continue
+                self._finish(provider, budget, reserved, response)
+            finally:
+                budget.release()
+            self._store(key, provider, response)
+            return response
+
+    async def acomplete(
+        self,
+        provider: str,
+        prompt: str,
+        api_token: Optional[str] = None,
+        json_response: bool = False,
+        base_url: Optional[str] = None,
+        base_delay: float = 2,
+        max_attempts: int = 3,
+        exponential_factor: float = 2,
+        extra_args: Optional[Dict[str, Any]] = None,
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        use_cache: bool = False,
+    ) -> Any:
+        """Async version of `complete`."""
+        budget = self.budget(provider, max_concurrency, tokens_per_minute)
+        args = self._request_args(api_token, json_response, base_url, extra_args)
+        key = self._cache_key(provider, prompt, args) if use_cache else None
+        if key is not None:
+            # The cache is SQLite: read and commit in a thread, off the event loop
+            cached = self._hit(budget, await asyncio.to_thread(self.cache.get, key))
+            if cached is not None:
+                return cached
+        acompletion = self._acompletion
+        if acompletion is None:
+            import litellm
+            from litellm import acompletion
+
+            litellm.drop_params = True  # Auto-drop unsupported params (e.g., temperature for O-series/GPT-5)
+
+        reserved = self._estimate_tokens(prompt, args)
+        for attempt in range(max_attempts):
+            await budget.acquire_async()
+            try:
+                wait = budget.reserve(reserved)
+                if wait:
+                    await self._asleep(wait)
+                budget.stats["requests"] += 1
+                try:
+                    response = await acompletion(
+                        model=provider, messages=[{"role": "user", "content": prompt}], **args
+                    )
+                except Exception as e:
+                    budget.settle(reserved, 0)
+                    if not _is_rate_limit(e) or attempt == max_attempts - 1:
+                        raise
+                    delay = self._retry_delay(budget, e, attempt, base_delay, exponential_factor)
+                    print(f"Rate limit error: {e}. Retrying in {delay:.1f} seconds...")
+                    continue
+                self._finish(provider, budget, reserved, response)
+            finally:
+                budget.release()
+            if key is not None:
+                await asyncio.to_thread(self._store, key, provider, response)
+            return response
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """The process-wide scheduler shared by all LLM strategies."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
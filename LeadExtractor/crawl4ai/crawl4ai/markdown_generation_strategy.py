@@ -1,15 +1,30 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 from .models import MarkdownGenerationResult
 from .html2text import CustomHTML2Text
 # from .types import RelevantContentFilter
 from .content_filter_strategy import RelevantContentFilter
+from .html_document import HTMLDocument, parse_html_document
+from .html2text.utils import pad_tables_in_text
 import re
+from itertools import accumulate
 from urllib.parse import urljoin
 
 # Pre-compile the regex pattern
 LINK_PATTERN = re.compile(r'!?\[([^\]]+)\]\(([^)]+?)(?:\s+"([^"]*)")?\)')
 
+# Elements without an end tag: html.parser reports only their start tag
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+})
+
+# Characters lxml serializes as entities in text (&amp; &lt; &gt;). html.parser
+# reports those as separate entity events, so text is split on them the same way.
+ENTITY_CHARS = re.compile(r"([&<>])")
+
+NBSP_PLACEHOLDER = "&nbsp_place_holder;"
+
 
 def fast_urljoin(base: str, url: str) -> str:
     """Fast URL joining for common cases."""
@@ -79,6 +94,22 @@ class DefaultMarkdownGenerator(MarkdownGenerationStrategy):
     ):
         super().__init__(content_filter, options, verbose=False, content_source=content_source)
 
+    def _create_converter(self, base_url: str) -> CustomHTML2Text:
+        """The html2text converter used for this document."""
+        return CustomHTML2Text(baseurl=base_url)
+
+    def _convert(
+        self, h: CustomHTML2Text, html: str, document: Optional[HTMLDocument] = None
+    ) -> str:
+        """Convert HTML to markdown with a configured converter."""
+        return h.handle(html)
+
+    def _link_citations(
+        self, h: CustomHTML2Text, raw_markdown: str, base_url: str
+    ) -> Tuple[str, str]:
+        """Citations for the markdown `h` just produced."""
+        return self.convert_links_to_citations(raw_markdown, base_url)
+
     def convert_links_to_citations(
         self, markdown: str, base_url: str = ""
     ) -> Tuple[str, str]:
@@ -171,13 +202,20 @@ class DefaultMarkdownGenerator(MarkdownGenerationStrategy):
             options (Optional[Dict[str, Any]]): Additional options for markdown generation.
             content_filter (Optional[RelevantContentFilter]): Content filter for generating fit markdown.
             citations (bool): Whether to generate citations.
+            **kwargs:
+                document (HTMLDocument): Shared parsed form of `input_html`; content
+                    filters that accept documents reuse its tree.
 
         Returns:
             MarkdownGenerationResult: Result containing raw markdown, fit markdown, fit HTML, and references markdown.
         """
+        document: Optional[HTMLDocument] = kwargs.get("document")
+        if isinstance(input_html, HTMLDocument):
+            document = input_html
+            input_html = input_html.html
         try:
             # Initialize HTML2Text with default options for better conversion
-            h = CustomHTML2Text(baseurl=base_url)
+            h = self._create_converter(base_url)
             default_options = {
                 "body_width": 0,  # Disable text wrapping
                 "ignore_emphasis": False,
@@ -207,7 +245,7 @@ class DefaultMarkdownGenerator(MarkdownGenerationStrategy):
 
             # Generate raw markdown
             try:
-                raw_markdown = h.handle(input_html)
+                raw_markdown = self._convert(h, input_html, document)
             except Exception as e:
                 raw_markdown = f"Error converting HTML to markdown: {str(e)}"
 
@@ -221,7 +259,7 @@ class DefaultMarkdownGenerator(MarkdownGenerationStrategy):
                     (
                         markdown_with_citations,
                         references_markdown,
-                    ) = self.convert_links_to_citations(raw_markdown, base_url)
+                    ) = self._link_citations(h, raw_markdown, base_url)
                 except Exception as e:
                     markdown_with_citations = raw_markdown
                     references_markdown = f"Error generating citations: {str(e)}"
@@ -232,11 +270,14 @@ class DefaultMarkdownGenerator(MarkdownGenerationStrategy):
             if content_filter or self.content_filter:
                 try:
                     content_filter = content_filter or self.content_filter
-                    filtered_html = content_filter.filter_content(input_html)
+                    if document is not None and getattr(content_filter, "accepts_document", False):
+                        filtered_html = content_filter.filter_content(document)
+                    else:
+                        filtered_html = content_filter.filter_content(input_html)
                     filtered_html = "\n".join(
                         "<div>{}</div>".format(s) for s in filtered_html
                     )
-                    fit_markdown = h.handle(filtered_html)
+                    fit_markdown = self._convert(h, filtered_html)
                 except Exception as e:
                     fit_markdown = f"Error generating fit markdown: {str(e)}"
                     filtered_html = ""
@@ -258,3 +299,219 @@ class DefaultMarkdownGenerator(MarkdownGenerationStrategy):
                 fit_markdown="",
                 fit_html="",
             )
+
+
+class TreeHTML2Text(CustomHTML2Text):
+    """
+    CustomHTML2Text fed from a parsed lxml tree instead of an HTML string.
+
+    `handle_tree` walks the tree iteratively and replays the start tag, data and
+    end tag events html.parser would report for the serialized tree, so the
+    markdown is the same as `handle(html)` without tokenizing the HTML again.
+
+    While converting, the output piece that closes each inline link and image
+    is recorded, so `citations` only has to look at those places instead of
+    scanning the whole markdown with a regex.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pieces: List[str] = []
+        # (index of the piece after "]", True for images whose "]" ends the previous piece)
+        self.link_closes: List[Tuple[int, bool]] = []
+        self._image_open: Optional[int] = None
+
+    def handle_tree(self, root) -> str:
+        """Convert an lxml element (usually the document root) to markdown."""
+        self.start = True
+        self.link_closes = []
+        self._image_open = None
+        self._walk(root)
+
+        self.pbr()
+        self.o("", force="end")
+        self.pieces = self.outtextlist
+        self.outtextlist = []
+
+        markdown = self._join(self.pieces)
+        markdown = self.optwrap(markdown)
+        if self.pad_tables:
+            return pad_tables_in_text(markdown)
+        return markdown
+
+    def _join(self, pieces: List[str]) -> str:
+        nbsp = "\xa0" if self.unicode_snob else " "
+        return "".join(pieces).replace(NBSP_PLACEHOLDER, nbsp)
+
+    def _walk(self, root) -> None:
+        handle_tag = self.handle_tag
+        handle_text = self._handle_text
+
+        handle_tag(root.tag, dict(root.attrib), True)
+        if root.text:
+            handle_text(root.text, root.tag)
+        stack = [(root, iter(root))]
+        while stack:
+            element, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if element.tag not in VOID_ELEMENTS:
+                    handle_tag(element.tag, {}, False)
+                if stack and element.tail:
+                    handle_text(element.tail, stack[-1][0].tag)
+                continue
+
+            if not isinstance(child.tag, str):
+                # Comments and processing instructions: only their tail is text
+                if child.tail:
+                    handle_text(child.tail, element.tag)
+                continue
+
+            handle_tag(child.tag, dict(child.attrib), True)
+            if child.text:
+                handle_text(child.text, child.tag)
+            stack.append((child, iter(child)))
+
+    def _handle_text(self, text: str, parent_tag: str) -> None:
+        if parent_tag in ("script", "style") or not (
+            "&" in text or "<" in text or ">" in text
+        ):
+            self.handle_data(text)
+            return
+        for i, part in enumerate(ENTITY_CHARS.split(text)):
+            if i % 2:
+                self.handle_data(part, True)
+            elif part:
+                self.handle_data(part)
+
+    def o(self, data: str, puredata: bool = False, force=False) -> None:
+        # Link and image markup is never "pure data"
+        if puredata or not data or data[0] not in "]!(":
+            super().o(data, puredata, force)
+            return
+
+        count = len(self.outtextlist)
+        super().o(data, puredata, force)
+        if len(self.outtextlist) == count:
+            return
+        index = len(self.outtextlist) - 1
+
+        if data.startswith("]("):
+            self.link_closes.append((index, False))
+        elif data[0] == "!" and data.startswith("![") and data.endswith("]"):
+            self._image_open = index
+        elif data[0] == "(" and self._image_open == index - 1:
+            self.link_closes.append((index, True))
+            self._image_open = None
+
+    def citations(self, base_url: str = "") -> Tuple[str, str]:
+        """
+        Markdown with citations and the references list for the last conversion.
+
+        Same output as `DefaultMarkdownGenerator.convert_links_to_citations` for
+        every link and image html2text wrote: each recorded "](" is matched with
+        the same pattern, starting where the regex scan would have started.
+        Text in the page that merely looks like a markdown link is left as is.
+        """
+        markdown = "".join(self.pieces)
+        offsets = [0, *accumulate(map(len, self.pieces))]
+        link_map = {}
+        url_cache = {}
+        parts = []
+        last_end = 0
+        counter = 1
+
+        for index, image in self.link_closes:
+            close = offsets[index] - 1 if image else offsets[index]
+            if close < last_end:
+                continue
+            # The link text can't contain "]": it starts at the first "[" after the last one
+            start = markdown.find(
+                "[", max(last_end, markdown.rfind("]", last_end, close) + 1), close
+            )
+            if start < 0:
+                continue
+            if start > last_end and markdown[start - 1] == "!":
+                start -= 1
+            match = LINK_PATTERN.match(markdown, start)
+            if match is None:
+                continue
+
+            parts.append(markdown[last_end:start])
+            text, url, title = match.groups()
+
+            if base_url and not url.startswith(("http://", "https://", "mailto:")):
+                if url not in url_cache:
+                    url_cache[url] = fast_urljoin(base_url, url)
+                url = url_cache[url]
+
+            if url not in link_map:
+                desc = []
+                if title:
+                    desc.append(title)
+                if text and text != title:
+                    desc.append(text)
+                link_map[url] = (counter, ": " + " - ".join(desc) if desc else "")
+                counter += 1
+
+            num = link_map[url][0]
+            parts.append(
+                f"{text}⟨{num}⟩"
+                if not match.group(0).startswith("!")
+                else f"![{text}⟨{num}⟩]"
+            )
+            last_end = match.end()
+
+        parts.append(markdown[last_end:])
+
+        references = ["\n\n## References\n\n"]
+        references.extend(
+            f"⟨{num}⟩ {url}{desc}\n"
+            for url, (num, desc) in sorted(link_map.items(), key=lambda x: x[1][0])
+        )
+        return self._join(parts), "".join(references)
+
+
+class LXMLMarkdownGenerator(DefaultMarkdownGenerator):
+    """
+    Markdown generation from an already parsed lxml tree.
+
+    Produces the same raw markdown and citations as DefaultMarkdownGenerator
+    (the same html2text rules do the formatting), but:
+    1. Walks the tree of the shared HTMLDocument (`document=`, or an HTMLDocument
+       passed as `input_html`) instead of tokenizing the HTML string again.
+    2. Records links and images while writing them, so markdown and citations
+       come out of one pass instead of a regex scan over the markdown.
+
+    Input that is not lxml output (e.g. raw_html with named entities such as
+    `&rsquo;`, or unclosed tags other than `<li>`) is normalized by lxml first,
+    so small differences to DefaultMarkdownGenerator are possible there. With
+    `body_width` or `pad_tables` set, citations fall back to the regex scan.
+
+    Args:
+        content_filter (Optional[RelevantContentFilter]): Content filter for generating fit markdown.
+        options (Optional[Dict[str, Any]]): Additional options for markdown generation. Defaults to None.
+        content_source (str): Source of content to generate markdown from. Options: "cleaned_html", "raw_html", "fit_html". Defaults to "cleaned_html".
+    """
+
+    def _create_converter(self, base_url: str) -> TreeHTML2Text:
+        return TreeHTML2Text(baseurl=base_url)
+
+    def _convert(
+        self, h: TreeHTML2Text, html: str, document: Optional[HTMLDocument] = None
+    ) -> str:
+        if document is not None and document.html == html:
+            root = document.tree
+        else:
+            root = parse_html_document(html)
+        return h.handle_tree(root)
+
+    def _link_citations(
+        self, h: TreeHTML2Text, raw_markdown: str, base_url: str
+    ) -> Tuple[str, str]:
+        if h.body_width or h.pad_tables:
+            # The markdown was rewrapped after the pieces were recorded
+            return self.convert_links_to_citations(raw_markdown, base_url)
+        markdown_with_citations, references = h.citations(base_url)
+        return markdown_with_citations.replace("    ```", "```"), references
@@ -156,6 +156,8 @@ class CrawlResult(BaseModel):
     head_fingerprint: Optional[str] = None
     cached_at: Optional[float] = None
     cache_status: Optional[str] = None  # "hit", "hit_validated", "hit_fallback", "miss"
+    # Seconds per crawl stage ("fetch", "scrape", ..., "total"), see crawl_timing.py
+    timings: Optional[Dict[str, float]] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -0,0 +1,216 @@
+"""
+Pre-warmed page pools for BrowserManager.
+
+Opening a page (`context.new_page()` plus stealth scripts) costs 50-150 ms, which
+is paid for every crawl when each crawl gets a fresh page. A `PagePool` keeps a
+few ready pages per browser context. Pages go back to the pool after a crawl,
+are reset (storage cleared, routes removed, navigated to about:blank), and are
+handed to the next crawl with the same context. A page is closed and replaced
+after `max_uses` crawls, so leaks in long-lived renderer processes stay bounded.
+"""
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Set
+
+# Clears storage for the page's current origin before leaving it
+CLEAR_STORAGE_JS = """
+() => {
+    try { window.localStorage.clear(); } catch (e) {}
+    try { window.sessionStorage.clear(); } catch (e) {}
+}
+"""
+
+
+def _track_listeners(page) -> Dict[tuple, int]:
+    """
+    Wrap the page's `on`, `once` and `remove_listener` to count the listeners
+    added through them, by (event, handler). A `once` listener counts until it
+    is removed, even after it fired.
+    """
+    listeners: Dict[tuple, int] = {}
+    remove_listener = page.remove_listener
+
+    def counted(register):
+        def add(event, f):
+            register(event, f)
+            listeners[(event, f)] = listeners.get((event, f), 0) + 1
+
+        return add
+
+    def remove(event, f):
+        remove_listener(event, f)
+        count = listeners.pop((event, f), 0) - 1
+        if count > 0:
+            listeners[(event, f)] = count
+
+    page.on = counted(page.on)
+    page.once = counted(page.once)
+    page.remove_listener = remove
+    return listeners
+
+
+class PagePool:
+    """
+    Ready pages for one browser context.
+
+    `acquire` returns an idle page, or opens one if none is idle; `release` resets
+    the page and keeps it for the next `acquire`. Up to `size` idle pages are kept;
+    they are opened in the background when the pool runs low. A page that still has
+    event listeners from its last crawl (added with `page.on`/`page.once` and not
+    removed with `page.remove_listener`), or that fails to reset, is closed instead
+    of reused.
+
+    Args:
+        context: The BrowserContext the pages belong to
+        create_page: Coroutine function opening a ready (stealth-applied) page in `context`
+        size: Idle pages to keep warm
+        max_uses: Crawls served by a page before it is closed and replaced (0: no limit)
+        viewport: Viewport size restored between crawls, e.g. {"width": 1080, "height": 600}
+        logger: Logger for reset failures
+    """
+
+    def __init__(
+        self,
+        context,
+        create_page: Callable[..., Awaitable],
+        size: int,
+        max_uses: int = 0,
+        viewport: Optional[Dict[str, int]] = None,
+        logger=None,
+    ):
+        self.context = context
+        self.size = size
+        self.max_uses = max_uses
+        self.viewport = viewport
+        self.logger = logger
+        self._create_page = create_page
+        self._idle: Deque = deque()
+        self._uses: Dict = {}
+        self._listeners: Dict = {}
+        self._fill_task: Optional[asyncio.Task] = None
+        self.leased: Set = set()
+        self.leases = 0
+        self.retired = False
+        self.stats = {"created": 0, "reused": 0, "recycled": 0, "reset_failed": 0}
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def owns(self, page) -> bool:
+        return page in self.leased
+
+    async def acquire(self):
+        """A ready page, leased until `release`."""
+        self.leases += 1
+        page = None
+        while self._idle:
+            candidate = self._idle.popleft()
+            if candidate.is_closed():
+                self._forget(candidate)
+                continue
+            page = candidate
+            self.stats["reused"] += 1
+            break
+        if page is None:
+            page = await self._new_page()
+        self.leased.add(page)
+        self._schedule_fill()
+        return page
+
+    async def release(self, page) -> None:
+        """Reset a leased page and keep it, or close it if it is worn out."""
+        self.leased.discard(page)
+        self._uses[page] = self._uses.get(page, 0) + 1
+        worn_out = self.max_uses and self._uses[page] >= self.max_uses
+        if self.retired or worn_out or page.is_closed() or len(self._idle) >= self.size:
+            if worn_out:
+                self.stats["recycled"] += 1
+            await self._close_page(page)
+            self._schedule_fill()
+            return
+        if not await self._reset(page):
+            self.stats["reset_failed"] += 1
+            await self._close_page(page)
+            self._schedule_fill()
+            return
+        self._idle.append(page)
+
+    async def warm(self) -> None:
+        """Open pages until `size` are idle."""
+        while not self.retired and len(self._idle) < self.size:
+            page = await self._new_page()
+            if self.retired:
+                await self._close_page(page)
+                return
+            self._idle.append(page)
+
+    async def close(self) -> None:
+        """Stop warming and close the idle pages. Leased pages are closed on release."""
+        self.retired = True
+        if self._fill_task is not None and not self._fill_task.done():
+            self._fill_task.cancel()
+            try:
+                await self._fill_task
+            except BaseException:
+                pass
+        while self._idle:
+            await self._close_page(self._idle.popleft())
+
+    async def _new_page(self):
+        page = await self._create_page(self.context)
+        self._uses[page] = 0
+        self._listeners[page] = _track_listeners(page)
+        self.stats["created"] += 1
+        return page
+
+    async def _reset(self, page) -> bool:
+        try:
+            if self._listeners.get(page):
+                # Handlers from the last crawl would fire for the next one
+                return False
+            await page.evaluate(CLEAR_STORAGE_JS)
+            await page.unroute_all(behavior="ignoreErrors")
+            await page.set_extra_http_headers({})
+            await page.goto("about:blank")
+            if self.viewport and page.viewport_size != self.viewport:
+                await page.set_viewport_size(self.viewport)
+            return True
+        except Exception as e:
+            if self.logger:
+                self.logger.debug(
+                    message="Could not reset pooled page, closing it: {error}",
+                    tag="BROWSER",
+                    params={"error": str(e)},
+                )
+            return False
+
+    def _schedule_fill(self) -> None:
+        if self.retired or len(self._idle) >= self.size:
+            return
+        if self._fill_task is None or self._fill_task.done():
+            self._fill_task = asyncio.create_task(self._fill())
+
+    async def _fill(self) -> None:
+        try:
+            await self.warm()
+        except Exception as e:
+            # The context may be closing; the next acquire opens a page itself
+            if self.logger:
+                self.logger.debug(
+                    message="Could not pre-open pages: {error}",
+                    tag="BROWSER",
+                    params={"error": str(e)},
+                )
+
+    async def _close_page(self, page) -> None:
+        self._forget(page)
+        try:
+            if not page.is_closed():
+                await page.close()
+        except Exception:
+            pass
+
+    def _forget(self, page) -> None:
+        self._uses.pop(page, None)
+        self._listeners.pop(page, None)
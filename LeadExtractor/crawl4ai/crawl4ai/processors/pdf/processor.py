@@ -1,11 +1,16 @@
 import logging
+import math
+import os
 import re
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from time import time
 from dataclasses import dataclass, asdict, field
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Sequence, Tuple, Union
 import base64
 import tempfile
 from .utils import *
@@ -21,6 +26,28 @@ from .utils import (
 
 logger = logging.getLogger(__name__)
 
+# Most pages handed to a worker at once. Contiguous pages share fonts and
+# resources, which the worker's reader parses only once.
+MAX_PAGES_PER_TASK = 16
+# Smaller page sets are processed in-process: starting workers would cost more
+MIN_PAGES_FOR_WORKERS = 8
+
+# State of a page-processing worker process: the strategy, its one PdfReader
+# for the document and the image directory (see _init_pdf_worker)
+_worker_state = None
+
+
+def _init_pdf_worker(strategy, pdf_path: str, image_dir: Optional[Path]) -> None:
+    """Worker initializer: open the document once per process, not once per page."""
+    global _worker_state
+    from pypdf import PdfReader
+    _worker_state = (strategy, PdfReader(pdf_path), image_dir)
+
+
+def _run_pdf_task(method: str, indices: List[int]):
+    strategy, reader, image_dir = _worker_state
+    return getattr(strategy, method)(reader, indices, image_dir)
+
 @dataclass
 class PDFMetadata:
     title: Optional[str] = None
@@ -117,26 +144,23 @@ class NaivePDFProcessorStrategy(PDFProcessorStrategy):
                     shutil.rmtree(self._temp_dir)
                 except Exception as e:
                     logger.error(f"Failed to cleanup temp directory: {str(e)}")
+                self._temp_dir = None
 
         result.processing_time = time() - start_time
         return result
 
     def process_batch(self, pdf_path: Path) -> PDFProcessResult:
-        """Like process() but processes PDF pages in parallel batches"""
+        """
+        Like process() but processes PDF pages in parallel, in `batch_size`
+        worker processes (see iter_pages). Images, if enabled, are extracted in
+        a second pass once the text of every page is done.
+        """
         # Import inside method to allow dependency to be optional
         try:
             from pypdf import PdfReader
-            import pypdf  # For type checking
         except ImportError:
             raise ImportError("pypdf is required for PDF processing. Install with 'pip install crawl4ai[pdf]'")
-            
-        import concurrent.futures
-        import threading
-        
-        # Initialize pypdf thread support
-        if not hasattr(threading.current_thread(), "_children"): 
-            threading.current_thread()._children = set()
-        
+
         start_time = time()
         result = PDFProcessResult(
             metadata=PDFMetadata(),
@@ -145,46 +169,17 @@ class NaivePDFProcessorStrategy(PDFProcessorStrategy):
         )
 
         try:
-            # Get metadata and page count from main thread
-            with pdf_path.open('rb') as file:
-                reader = PdfReader(file)
-                result.metadata = self._extract_metadata(pdf_path, reader)
-                total_pages = len(reader.pages)
-
-            # Handle image directory setup
-            image_dir = None
-            if self.extract_images and self.save_images_locally:
-                if self.image_save_dir:
-                    image_dir = Path(self.image_save_dir)
-                    image_dir.mkdir(exist_ok=True, parents=True)
-                else:
-                    self._temp_dir = tempfile.mkdtemp(prefix='pdf_images_')
-                    image_dir = Path(self._temp_dir)
-
-            def process_page_safely(page_num: int):
-                # Each thread opens its own file handle
-                with pdf_path.open('rb') as file:
-                    thread_reader = PdfReader(file)
-                    page = thread_reader.pages[page_num]
-                    self.current_page_number = page_num + 1
-                    return self._process_page(page, image_dir)
-
-            # Process pages in parallel batches
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self.batch_size) as executor:
-                futures = []
-                for page_num in range(total_pages):
-                    future = executor.submit(process_page_safely, page_num)
-                    futures.append((page_num + 1, future))
-
-                # Collect results in order
-                result.pages = [None] * total_pages
-                for page_num, future in futures:
-                    try:
-                        pdf_page = future.result()
-                        result.pages[page_num - 1] = pdf_page
-                    except Exception as e:
-                        logger.error(f"Failed to process page {page_num}: {str(e)}")
-                        raise
+            reader = PdfReader(str(pdf_path))
+            result.metadata = self._extract_metadata(pdf_path, reader)
+            result.pages = list(self.iter_pages(pdf_path, total_pages=len(reader.pages)))
+
+            if self.extract_images:
+                image_dir = self._get_image_dir()
+                pages = {page.page_number: page for page in result.pages}
+                for page_number, images in self.iter_page_images(
+                    pdf_path, total_pages=len(result.pages), image_dir=image_dir
+                ):
+                    pages[page_number].images = images
 
         except Exception as e:
             logger.error(f"Failed to process PDF: {str(e)}")
@@ -197,11 +192,133 @@ class NaivePDFProcessorStrategy(PDFProcessorStrategy):
                     shutil.rmtree(self._temp_dir)
                 except Exception as e:
                     logger.error(f"Failed to cleanup temp directory: {str(e)}")
+                self._temp_dir = None
 
         result.processing_time = time() - start_time
         return result
 
-    def _process_page(self, page, image_dir: Optional[Path]) -> PDFPage:
+    def iter_pages(
+        self,
+        pdf_path: Path,
+        max_workers: Optional[int] = None,
+        total_pages: Optional[int] = None,
+    ) -> Iterator[PDFPage]:
+        """
+        Text, markdown, HTML, links and layout of every page, in page order,
+        without images (see iter_page_images).
+
+        Pages are sharded into contiguous ranges across `max_workers` processes
+        (default: batch_size, at most one per CPU), each of which parses the
+        document once. Pages
+        are yielded as soon as the range they belong to is done and every
+        earlier one has been yielded; at most two ranges per worker are in
+        flight, so memory doesn't grow with the document.
+        """
+        if total_pages is None:
+            from pypdf import PdfReader
+            total_pages = len(PdfReader(str(pdf_path)).pages)
+        for pages in self._run_page_tasks(
+            "_process_pages", pdf_path, range(total_pages), max_workers, image_dir=None
+        ):
+            yield from pages
+
+    def iter_page_images(
+        self,
+        pdf_path: Path,
+        page_numbers: Optional[Iterable[int]] = None,
+        max_workers: Optional[int] = None,
+        total_pages: Optional[int] = None,
+        image_dir: Optional[Path] = None,
+    ) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        Deferred image extraction: (page_number, images) for the given pages
+        (1-based, default: all), in order and in parallel like iter_pages.
+        Images are saved to `image_dir` if save_images_locally is set.
+        """
+        if page_numbers is None:
+            if total_pages is None:
+                from pypdf import PdfReader
+                total_pages = len(PdfReader(str(pdf_path)).pages)
+            indices = range(total_pages)
+        else:
+            indices = sorted(number - 1 for number in set(page_numbers))
+        if self.save_images_locally and image_dir is None:
+            image_dir = self._get_image_dir()
+        for images in self._run_page_tasks(
+            "_extract_pages_images", pdf_path, indices, max_workers, image_dir
+        ):
+            yield from images
+
+    def _run_page_tasks(
+        self,
+        method: str,
+        pdf_path: Path,
+        indices: Sequence[int],
+        max_workers: Optional[int],
+        image_dir: Optional[Path],
+    ) -> Iterator[list]:
+        """Run `method` over `indices` in contiguous tasks, yielding task results in order."""
+        max_workers = max_workers or self.batch_size or 1
+        per_task = max(1, min(MAX_PAGES_PER_TASK, math.ceil(len(indices) / (max_workers * 4))))
+        tasks = [list(indices[i:i + per_task]) for i in range(0, len(indices), per_task)]
+        # Text extraction is CPU-bound: more workers than CPUs only adds overhead
+        workers = min(max_workers, len(tasks), os.cpu_count() or 1)
+
+        if workers <= 1 or len(indices) < MIN_PAGES_FOR_WORKERS:
+            from pypdf import PdfReader
+            reader = PdfReader(str(pdf_path))
+            for task in tasks:
+                yield getattr(self, method)(reader, task, image_dir)
+            return
+
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_pdf_worker,
+            initargs=(self, str(pdf_path), image_dir),
+        )
+        try:
+            remaining = iter(tasks)
+            in_flight = deque(
+                pool.submit(_run_pdf_task, method, task) for task in islice(remaining, 2 * workers)
+            )
+            while in_flight:
+                try:
+                    done = in_flight.popleft().result()
+                except Exception as e:
+                    logger.error(f"Failed to process PDF pages: {str(e)}")
+                    raise
+                for task in islice(remaining, 1):
+                    in_flight.append(pool.submit(_run_pdf_task, method, task))
+                yield done
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _process_pages(self, reader, indices: List[int], image_dir: Optional[Path]) -> List[PDFPage]:
+        pages = []
+        for index in indices:
+            self.current_page_number = index + 1
+            pages.append(self._process_page(reader.pages[index], image_dir, extract_images=False))
+        return pages
+
+    def _extract_pages_images(self, reader, indices: List[int], image_dir: Optional[Path]) -> List[Tuple[int, List[Dict]]]:
+        images = []
+        for index in indices:
+            self.current_page_number = index + 1
+            images.append((index + 1, self._extract_images(reader.pages[index], image_dir)))
+        return images
+
+    def _get_image_dir(self) -> Optional[Path]:
+        if not self.save_images_locally:
+            return None
+        if self.image_save_dir:
+            image_dir = Path(self.image_save_dir)
+            image_dir.mkdir(exist_ok=True, parents=True)
+            return image_dir
+        if not self._temp_dir:
+            self._temp_dir = tempfile.mkdtemp(prefix='pdf_images_')
+        return Path(self._temp_dir)
+
+    def _process_page(self, page, image_dir: Optional[Path], extract_images: Optional[bool] = None) -> PDFPage:
         pdf_page = PDFPage(
             page_number=self.current_page_number,
         )
@@ -219,7 +336,7 @@ class NaivePDFProcessorStrategy(PDFProcessorStrategy):
         page.extract_text(visitor_text=visitor_text)
 
         # Image extraction
-        if self.extract_images:
+        if self.extract_images if extract_images is None else extract_images:
             pdf_page.images = self._extract_images(page, image_dir)
 
         # Link extraction
@@ -237,9 +354,6 @@ class NaivePDFProcessorStrategy(PDFProcessorStrategy):
             from pypdf.generic import IndirectObject
         except ImportError:
             raise ImportError("pypdf is required for PDF processing. Install with 'pip install crawl4ai[pdf]'")
-            
-        if not self.extract_images:
-            return []
 
         images = []
         try:
@@ -1,8 +1,10 @@
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple, Union
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from itertools import cycle
 import os
 import asyncio
+import random
 import time
 
 
@@ -187,6 +189,27 @@ class ProxyRotationStrategy(ABC):
         """
         pass
 
+    async def report_result(
+        self,
+        proxy: ProxyConfig,
+        success: bool,
+        latency: Optional[float] = None,
+        status_code: Optional[int] = None,
+    ) -> None:
+        """
+        Record the outcome of a request made through `proxy`.
+
+        AsyncWebCrawler calls this after every fetch through a proxy handed out by
+        the strategy. Strategies that don't learn from outcomes ignore it.
+
+        Args:
+            proxy: Proxy the request went through
+            success: Whether the page was fetched
+            latency: Seconds the fetch took
+            status_code: HTTP status of the response, if there was one
+        """
+        pass
+
 class RoundRobinProxyStrategy(ProxyRotationStrategy):
     """Simple round-robin proxy rotation strategy using ProxyConfig objects.
 
@@ -339,3 +362,216 @@ class RoundRobinProxyStrategy(ProxyRotationStrategy):
                 del self._sessions[session_id]
 
             return len(expired)
+
+
+@dataclass
+class ProxyStats:
+    """Health of one proxy, as seen by HealthAwareProxyStrategy."""
+
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    success_rate: float = 1.0  # EWMA of outcomes, 1.0 until proven otherwise
+    latency: Optional[float] = None  # EWMA of seconds per successful request
+    quarantines: int = 0  # Quarantines in a row, sets the backoff
+    quarantined_until: float = 0.0
+    probe_started: Optional[float] = None  # Set while a probe request is out
+
+    @property
+    def quarantined(self) -> bool:
+        return self.quarantines > 0
+
+
+class HealthAwareProxyStrategy(RoundRobinProxyStrategy):
+    """Proxy rotation weighted by each proxy's success rate and latency.
+
+    Outcomes reported through `report_result()` (AsyncWebCrawler does this after
+    every fetch) update an EWMA of the success rate and of the latency of each
+    proxy. `get_next_proxy()` picks proxies at random with a weight of
+    success_rate ** 2 / latency, so a proxy that fails half the time or is twice
+    as slow gets a quarter or half of the traffic.
+
+    After `failure_threshold` consecutive failures a proxy is quarantined for
+    `quarantine_base` seconds, doubling with every failed probe up to
+    `quarantine_max`. When its quarantine ends, the proxy gets a single probe
+    request; if that succeeds it's back in rotation, otherwise it's quarantined
+    again for longer.
+
+    Sticky sessions work as with RoundRobinProxyStrategy. A session whose proxy
+    is quarantined is moved to a healthy one on its next request.
+
+    Args:
+        proxies: List of ProxyConfig objects
+        latency_alpha: EWMA weight of a new latency sample
+        success_alpha: EWMA weight of a new outcome
+        failure_threshold: Consecutive failures that quarantine a proxy
+        quarantine_base: Seconds of the first quarantine
+        quarantine_max: Longest quarantine, in seconds
+        probe_timeout: Seconds after which an unreported probe is given up and retried
+        failure_status_codes: Status codes counted as failures of the proxy
+        clock: Time source (seconds), replaceable in tests
+        rng: Random generator used for the weighted choice, replaceable in tests
+    """
+
+    def __init__(
+        self,
+        proxies: List[ProxyConfig] = None,
+        latency_alpha: float = 0.3,
+        success_alpha: float = 0.2,
+        failure_threshold: int = 3,
+        quarantine_base: float = 30.0,
+        quarantine_max: float = 900.0,
+        probe_timeout: float = 120.0,
+        failure_status_codes: Tuple[int, ...] = (407, 429, 502, 503, 504),
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.latency_alpha = latency_alpha
+        self.success_alpha = success_alpha
+        self.failure_threshold = max(1, failure_threshold)
+        self.quarantine_base = quarantine_base
+        self.quarantine_max = quarantine_max
+        self.probe_timeout = probe_timeout
+        self.failure_status_codes = tuple(failure_status_codes)
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._stats: Dict[Tuple[str, Optional[str]], ProxyStats] = {}
+        super().__init__(proxies)
+
+    @staticmethod
+    def _key(proxy: Union[ProxyConfig, str]) -> Tuple[str, Optional[str]]:
+        if isinstance(proxy, str):
+            return proxy, None
+        return proxy.server, proxy.username
+
+    def add_proxies(self, proxies: List[ProxyConfig]):
+        """Add new proxies to the rotation pool"""
+        for proxy in proxies:
+            key = self._key(proxy)
+            if key not in self._stats:
+                self._stats[key] = ProxyStats()
+                self._proxies.append(proxy)
+
+    def get_stats(self) -> Dict[str, ProxyStats]:
+        """Health of every proxy, by server."""
+        return {proxy.server: self._stats[self._key(proxy)] for proxy in self._proxies}
+
+    def is_quarantined(self, proxy: Union[ProxyConfig, str]) -> bool:
+        """Whether `proxy` is out of rotation (including while it's being probed)."""
+        stats = self._stats.get(self._key(proxy))
+        return stats is not None and stats.quarantined
+
+    async def get_next_proxy(self) -> Optional[ProxyConfig]:
+        """Get a healthy proxy, or the next quarantined one due for a probe"""
+        if not self._proxies:
+            return None
+        now = self._clock()
+
+        healthy = []
+        soonest = None
+        for proxy in self._proxies:
+            stats = self._stats[self._key(proxy)]
+            if not stats.quarantined:
+                healthy.append((proxy, stats))
+                continue
+            probing = stats.probe_started is not None and now - stats.probe_started < self.probe_timeout
+            if not probing and stats.quarantined_until <= now:
+                stats.probe_started = now
+                return proxy
+            if soonest is None or stats.quarantined_until < soonest[1].quarantined_until:
+                soonest = (proxy, stats)
+
+        if not healthy:
+            # Every proxy is quarantined: use the one closest to its probe
+            # rather than none at all, which would crawl without a proxy
+            return soonest[0]
+
+        # Proxies without a latency sample yet are assumed to be average
+        known = [stats.latency for _, stats in healthy if stats.latency is not None]
+        default_latency = sum(known) / len(known) if known else 1.0
+        weights = [
+            max(stats.success_rate, 0.01) ** 2 / max(stats.latency or default_latency, 1e-3)
+            for _, stats in healthy
+        ]
+        pick = self._rng.random() * sum(weights)
+        for (proxy, _), weight in zip(healthy, weights):
+            pick -= weight
+            if pick < 0:
+                return proxy
+        return healthy[-1][0]
+
+    async def report_result(
+        self,
+        proxy: ProxyConfig,
+        success: bool,
+        latency: Optional[float] = None,
+        status_code: Optional[int] = None,
+    ) -> None:
+        """
+        Record the outcome of a request made through `proxy`.
+
+        A success with a status code in `failure_status_codes` counts as a failure.
+        Outcomes of proxies the strategy doesn't know are ignored.
+
+        Args:
+            proxy: Proxy the request went through (ProxyConfig or server URL)
+            success: Whether the page was fetched
+            latency: Seconds the fetch took
+            status_code: HTTP status of the response, if there was one
+        """
+        stats = self._stats.get(self._key(proxy))
+        if stats is None:
+            return
+        if status_code in self.failure_status_codes:
+            success = False
+        now = self._clock()
+
+        stats.requests += 1
+        stats.success_rate += self.success_alpha * ((1.0 if success else 0.0) - stats.success_rate)
+        if success:
+            stats.consecutive_failures = 0
+            if latency is not None:
+                if stats.latency is None:
+                    stats.latency = latency
+                else:
+                    stats.latency += self.latency_alpha * (latency - stats.latency)
+            if stats.quarantined:
+                # Probe succeeded: back in rotation, with a fresh start
+                stats.quarantines = 0
+                stats.probe_started = None
+                stats.success_rate = max(stats.success_rate, 0.5)
+            return
+
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        if stats.quarantined or stats.consecutive_failures >= self.failure_threshold:
+            # Failed probe (or late failures of a quarantined proxy): back off further
+            if stats.probe_started is not None or not stats.quarantined:
+                stats.quarantines += 1
+            stats.probe_started = None
+            backoff = self.quarantine_base * 2 ** (stats.quarantines - 1)
+            stats.quarantined_until = now + min(backoff, self.quarantine_max)
+
+    async def get_proxy_for_session(
+        self,
+        session_id: str,
+        ttl: Optional[int] = None
+    ) -> Optional[ProxyConfig]:
+        """
+        Get or create a sticky proxy for a session.
+
+        Like RoundRobinProxyStrategy, except that a session bound to a
+        quarantined proxy is moved to a healthy one.
+
+        Args:
+            session_id: Unique session identifier
+            ttl: Optional time-to-live in seconds for this session
+
+        Returns:
+            ProxyConfig for this session
+        """
+        session = self._sessions.get(session_id)
+        if session is not None and self.is_quarantined(session[0]):
+            if any(not stats.quarantined for stats in self._stats.values()):
+                await self.release_session(session_id)
+        return await super().get_proxy_for_session(session_id, ttl)
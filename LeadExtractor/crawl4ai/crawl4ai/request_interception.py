@@ -0,0 +1,360 @@
+"""
+Declarative request-interception profiles.
+
+`BrowserConfig.text_mode` / `light_mode` block a fixed list of file extensions for
+every page of a context. An `InterceptionProfile` set on `CrawlerRunConfig`
+describes per crawl what the page may load:
+
+- resource types to block (Playwright's `request.resource_type`: "image",
+  "font", "media", "stylesheet", "script", ...),
+- domains to block (e.g. analytics and ad networks) and domains never blocked,
+- whether the page's own (first-party) scripts stay allowed when scripts are
+  blocked,
+- a cap on the response body size of subresources.
+
+The profile is installed with `page.route("**/*", ...)` before navigation and
+removed after the crawl. Domain lists are compiled once into suffix sets, so a
+request is matched with one set lookup per label of its host. Each profile keeps
+running stats of requests blocked and bytes saved across all crawls using it.
+
+Example:
+    ```python
+    profile = InterceptionProfile.preset("light")
+    config = CrawlerRunConfig(interception_profile=profile)
+    ...
+    print(profile.stats)
+    ```
+
+Note: Chromium disables its HTTP cache for pages with routes installed.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+# Analytics, tag managers and ad networks that never contribute page content
+ANALYTICS_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "analytics.google.com",
+    "connect.facebook.net",
+    "facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "fullstory.com",
+    "clarity.ms",
+    "bat.bing.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "newrelic.com",
+    "nr-data.net",
+    "sentry.io",
+    "mc.yandex.ru",
+    "top-fwz1.mail.ru",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "adnxs.com",
+    "amazon-adsystem.com",
+)
+
+# Rough median transfer sizes per resource type, used to estimate the bytes saved
+# by requests that were blocked before any response was seen
+TYPICAL_RESOURCE_SIZES = {
+    "image": 20_000,
+    "media": 500_000,
+    "font": 30_000,
+    "stylesheet": 15_000,
+    "script": 25_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "document": 30_000,
+}
+
+PRESETS = {
+    "text": {
+        "block_resource_types": ["image", "media", "font", "stylesheet"],
+        "block_domains": ANALYTICS_DOMAINS,
+    },
+    "light": {
+        "block_resource_types": ["image", "media", "font"],
+        "block_domains": ANALYTICS_DOMAINS,
+    },
+    "no_analytics": {
+        "block_domains": ANALYTICS_DOMAINS,
+    },
+}
+
+# Second-level labels under which registrable domains have three labels (example.co.uk)
+_COMPOUND_SLDS = frozenset({"co", "com", "org", "net", "gov", "ac", "edu", "ne", "or"})
+
+
+@lru_cache(maxsize=8192)
+def _host(url: str) -> str:
+    try:
+        return (urlsplit(url).hostname or "").rstrip(".")
+    except ValueError:
+        return ""
+
+
+def _site(host: str) -> str:
+    """Registrable domain of a host, approximated without a public suffix list."""
+    labels = host.split(".")
+    if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in _COMPOUND_SLDS:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+class DomainMatcher:
+    """
+    Matches hosts against a list of domains, including their subdomains.
+
+    "example.com" matches example.com and www.example.com but not badexample.com.
+    """
+
+    def __init__(self, domains: Iterable[str] = ()):
+        self.domains = frozenset(
+            domain.strip().lower().lstrip(".") for domain in domains if domain and domain.strip()
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.domains)
+
+    def __iter__(self):
+        return iter(sorted(self.domains))
+
+    def matches(self, host: str) -> bool:
+        if not self.domains or not host:
+            return False
+        host = host.lower()
+        if host in self.domains:
+            return True
+        index = host.find(".")
+        while index != -1:
+            if host[index + 1:] in self.domains:
+                return True
+            index = host.find(".", index + 1)
+        return False
+
+
+class InterceptionProfile:
+    """
+    What a page may load during a crawl.
+
+    A request is decided in this order: the main document is always allowed;
+    `allow_domains` are always allowed; `block_domains` are blocked; first-party
+    scripts are allowed if `allow_first_party_scripts`; `block_resource_types`
+    are blocked. Requests that pass are handed on to other route handlers (e.g.
+    text_mode's) with `route.fallback()`.
+
+    With `max_body_size` set, a request that passes is fetched to check its size
+    and, if small enough, answered with `route.fulfill()`. That ends routing:
+    handlers installed before the profile (such as routes added in the
+    `on_page_context_created` hook) never see it. When the crawl has text_mode's
+    routes, the crawler skips the body-size check so they still apply.
+
+    Args:
+        name: Name shown in logs
+        block_resource_types: Playwright resource types to block
+        block_domains: Domains (and their subdomains) to block
+        allow_domains: Domains (and their subdomains) never blocked
+        allow_first_party_scripts: Keep scripts from the crawled site when "script" is blocked
+        max_body_size: Abort subresources whose body is larger than this many bytes.
+                       The response is fetched by the route handler to check its size,
+                       so this adds a round trip per request; use it for heavy pages.
+    """
+
+    def __init__(
+        self,
+        name: str = "custom",
+        block_resource_types: Iterable[str] = (),
+        block_domains: Iterable[str] = (),
+        allow_domains: Iterable[str] = (),
+        allow_first_party_scripts: bool = True,
+        max_body_size: Optional[int] = None,
+    ):
+        self.name = name
+        self.block_resource_types = frozenset(block_resource_types)
+        self.block_domains = DomainMatcher(block_domains)
+        self.allow_domains = DomainMatcher(allow_domains)
+        self.allow_first_party_scripts = allow_first_party_scripts
+        self.max_body_size = max_body_size
+        self.stats = self._empty_stats()
+
+    @classmethod
+    def preset(cls, name: str, **overrides) -> "InterceptionProfile":
+        """A built-in profile: "text", "light" or "no_analytics"."""
+        if name not in PRESETS:
+            raise ValueError(
+                f"Unknown interception profile '{name}', expected one of {sorted(PRESETS)}"
+            )
+        return cls(name=name, **{**PRESETS[name], **overrides})
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
+            "requests": 0,
+            "requests_blocked": 0,
+            "bytes_saved": 0,
+            "blocked_by_type": {},
+            "blocked_by_reason": {},
+        }
+
+    def reset_stats(self) -> None:
+        self.stats = self._empty_stats()
+
+    def decide(self, url: str, resource_type: str, site: str = "") -> Optional[str]:
+        """
+        Why a request should be blocked, or None to let it through.
+
+        Args:
+            url: Request URL
+            resource_type: Playwright resource type
+            site: Registrable domain of the crawled page, for first-party checks
+        """
+        host = _host(url)
+        if self.allow_domains.matches(host):
+            return None
+        if self.block_domains.matches(host):
+            return "domain"
+        if resource_type in self.block_resource_types:
+            if resource_type == "script" and self.allow_first_party_scripts and site and _site(host) == site:
+                return None
+            return "resource_type"
+        return None
+
+    def record(self, resource_type: str, reason: Optional[str], size: Optional[int] = None) -> None:
+        stats = self.stats
+        stats["requests"] += 1
+        if reason is None:
+            return
+        stats["requests_blocked"] += 1
+        stats["blocked_by_type"][resource_type] = stats["blocked_by_type"].get(resource_type, 0) + 1
+        stats["blocked_by_reason"][reason] = stats["blocked_by_reason"].get(reason, 0) + 1
+        if size is None:
+            size = TYPICAL_RESOURCE_SIZES.get(resource_type, 0)
+        stats["bytes_saved"] += size
+
+    def interceptor(
+        self, page_url: str, logger=None, fallback_routes: bool = False
+    ) -> "RequestInterceptor":
+        """
+        A route handler applying this profile to a crawl of `page_url`.
+
+        With `fallback_routes`, every request that passes is handed on with
+        `route.fallback()` and `max_body_size` is not checked.
+        """
+        return RequestInterceptor(self, page_url, logger=logger, fallback_routes=fallback_routes)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "block_resource_types": sorted(self.block_resource_types),
+            "block_domains": list(self.block_domains),
+            "allow_domains": list(self.allow_domains),
+            "allow_first_party_scripts": self.allow_first_party_scripts,
+            "max_body_size": self.max_body_size,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "InterceptionProfile":
+        return cls(**data)
+
+    def __repr__(self) -> str:
+        return f"InterceptionProfile({self.to_dict()!r})"
+
+
+class RequestInterceptor:
+    """
+    Route handler for one crawl. Install with `await interceptor.install(page)`
+    before navigating and remove with `await interceptor.uninstall(page)`.
+    """
+
+    def __init__(
+        self,
+        profile: InterceptionProfile,
+        page_url: str,
+        logger=None,
+        fallback_routes: bool = False,
+    ):
+        self.profile = profile
+        self.site = _site(_host(page_url))
+        self.logger = logger
+        # Other handlers must see passing requests; fulfilling one would end routing
+        self.fallback_routes = fallback_routes
+        self.blocked = 0
+        self._installed = False
+
+    async def install(self, page) -> None:
+        await page.route("**/*", self.handle)
+        self._installed = True
+
+    async def uninstall(self, page) -> None:
+        if not self._installed:
+            return
+        self._installed = False
+        try:
+            await page.unroute("**/*", self.handle)
+        except Exception:
+            # The page may already be closed
+            pass
+
+    async def handle(self, route) -> None:
+        request = route.request
+        resource_type = request.resource_type
+        if self._is_main_document(request):
+            await route.fallback()
+            return
+
+        reason = self.profile.decide(request.url, resource_type, self.site)
+        if reason is not None:
+            self._block(resource_type, reason)
+            await route.abort("blockedbyclient")
+            return
+
+        max_body_size = self.profile.max_body_size
+        if not max_body_size or self.fallback_routes:
+            self.profile.record(resource_type, None)
+            await route.fallback()
+            return
+
+        try:
+            response = await route.fetch()
+            length = response.headers.get("content-length")
+            size = int(length) if length and length.isdigit() else len(await response.body())
+        except Exception as e:
+            if self.logger:
+                self.logger.debug(
+                    message="Could not check body size of {url}: {error}",
+                    tag="INTERCEPT",
+                    params={"url": request.url, "error": str(e)},
+                )
+            self.profile.record(resource_type, None)
+            await route.fallback()
+            return
+
+        if size > max_body_size:
+            self._block(resource_type, "body_size", size)
+            await route.abort("blockedbyclient")
+        else:
+            self.profile.record(resource_type, None)
+            await route.fulfill(response=response)
+
+    def _block(self, resource_type: str, reason: str, size: Optional[int] = None) -> None:
+        self.blocked += 1
+        self.profile.record(resource_type, reason, size)
+
+    @staticmethod
+    def _is_main_document(request) -> bool:
+        if request.resource_type != "document":
+            return False
+        try:
+            return request.is_navigation_request() and request.frame.parent_frame is None
+        except Exception:
+            return False
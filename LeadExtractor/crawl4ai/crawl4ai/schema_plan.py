@@ -0,0 +1,248 @@
+"""
+Compiled extraction plans for the JSON schema strategies.
+
+`JsonElementExtractionStrategy.extract` used to walk the schema dicts for every
+element of every page: look up each field's type, resolve its selector through
+the strategy, re-read patterns and expressions. A `SchemaPlan` does that once per
+schema. Every field becomes a function of an element, with its selector already
+compiled by the strategy (an lxml XPath object for JsonCssExtractionStrategy),
+its regex compiled and its expression compiled to a code object. Nested and list
+fields become a tree of these functions. The plan is built on the first
+`extract` and reused for every later page, as long as `strategy.schema` has the
+same fingerprint (its JSON), so a schema changed in place gets a new plan too.
+
+Results and error handling are the same as the dict-walking methods
+(`_extract_field`, `_extract_item`, ...): an error in a field yields the field's
+default, an error in a base field propagates. Strategies that override one of
+those methods are run without a plan.
+"""
+import json
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+Extractor = Callable[[Any], Any]
+
+
+def schema_fingerprint(schema: Dict[str, Any]) -> str:
+    """The schema as canonical JSON (functions by repr), to tell when a plan is stale."""
+    return json.dumps(schema, sort_keys=True, default=repr)
+
+
+def _raising(error: Exception) -> Extractor:
+    """A function that raises `error` when called, so a schema error surfaces where it used to."""
+
+    def fail(*args):
+        raise error
+
+    return fail
+
+
+class SchemaPlan:
+    """
+    A schema compiled against one strategy.
+
+    Args:
+        schema: The extraction schema
+        strategy: The JsonElementExtractionStrategy providing selectors and element readers
+    """
+
+    def __init__(self, schema: Dict[str, Any], strategy):
+        self.schema = schema
+        self.fingerprint = schema_fingerprint(schema)
+        self._strategy = strategy
+        self._verbose = strategy.verbose
+        self._get_text = strategy._get_element_text
+        self._get_html = strategy._get_element_html
+        self._get_attribute = strategy._get_element_attribute
+        self._transform = strategy._apply_transform
+
+        self._base = self._selector(schema["baseSelector"], base=True)
+        self._base_fields = [
+            (field["name"], self._single(field)) for field in schema.get("baseFields", [])
+        ]
+        self._item = self._compile_item(schema["fields"])
+
+    def extract(self, root) -> List[Dict[str, Any]]:
+        """Items extracted from a parsed page."""
+        base_fields = self._base_fields
+        extract_item = self._item
+        results = []
+        for element in self._base(root):
+            item = {}
+            for name, extract in base_fields:
+                value = extract(element)
+                if value is not None:
+                    item[name] = value
+            item.update(extract_item(element))
+            if item:
+                results.append(item)
+        return results
+
+    # -- compilation --------------------------------------------------------
+
+    def _selector(self, selector: str, base: bool = False) -> Extractor:
+        try:
+            return self._strategy._selector_function(selector, base=base)
+        except Exception as e:
+            return _raising(e)
+
+    def _reader(self, field: Dict[str, Any]) -> Extractor:
+        """Value of a selected element, by field type."""
+        field_type = field["type"]
+        if field_type == "text":
+            return self._get_text
+        if field_type == "attribute":
+            get_attribute = self._get_attribute
+            return lambda element: get_attribute(element, field["attribute"])
+        if field_type == "html":
+            return self._get_html
+        if field_type == "regex":
+            get_text = self._get_text
+            try:
+                search = re.compile(field["pattern"]).search
+            except Exception as e:
+                return _raising(e)
+
+            def read_regex(element):
+                match = search(get_text(element))
+                return match.group(1) if match else None
+
+            return read_regex
+        return lambda element: None
+
+    def _single(self, field: Dict[str, Any]) -> Extractor:
+        """Same as `_extract_single_field`."""
+        pick = self._selector(field["selector"]) if "selector" in field else None
+        read = self._reader(field)
+        has_transform = "transform" in field
+        transform = field.get("transform")
+        apply_transform = self._transform
+        default = field.get("default")
+
+        def extract_single(element):
+            if pick is not None:
+                selected = pick(element)
+                if not selected:
+                    return default
+                element = selected[0]
+            value = read(element)
+            if has_transform:
+                value = apply_transform(value, transform)
+            return value if value is not None else default
+
+        return extract_single
+
+    def _field(self, field: Dict[str, Any]) -> Extractor:
+        """Same as `_extract_field`: errors give the field's default."""
+        try:
+            extract = self._field_body(field)
+        except Exception as e:
+            extract = _raising(e)
+        verbose = self._verbose
+
+        def extract_field(element):
+            try:
+                return extract(element)
+            except Exception as e:
+                if verbose:
+                    print(f"Error extracting field {field['name']}: {str(e)}")
+                return field.get("default")
+
+        return extract_field
+
+    def _field_body(self, field: Dict[str, Any]) -> Extractor:
+        field_type = field["type"]
+        if field_type == "nested":
+            pick = self._selector(field["selector"])
+            extract_item = self._compile_item(field["fields"])
+
+            def extract_nested(element):
+                selected = pick(element)
+                return extract_item(selected[0]) if selected else {}
+
+            return extract_nested
+
+        if field_type == "list":
+            pick = self._selector(field["selector"])
+            extract_list_item = self._compile_list_item(field["fields"])
+            return lambda element: [extract_list_item(child) for child in pick(element)]
+
+        if field_type == "nested_list":
+            pick = self._selector(field["selector"])
+            extract_item = self._compile_item(field["fields"])
+            return lambda element: [extract_item(child) for child in pick(element)]
+
+        return self._single(field)
+
+    def _computed(self, field: Dict[str, Any]) -> Extractor:
+        """Same as `_compute_field`, with the expression compiled once."""
+        if "expression" in field:
+            try:
+                code = compile(field["expression"], "<schema>", "eval")
+            except Exception as e:
+                compute = _raising(e)
+            else:
+                def compute(item):
+                    return eval(code, {}, item)
+        elif "function" in field:
+            compute = field["function"]
+        else:
+            return lambda item: None
+        verbose = self._verbose
+
+        def compute_field(item):
+            try:
+                return compute(item)
+            except Exception as e:
+                if verbose:
+                    print(f"Error computing field {field['name']}: {str(e)}")
+                return field.get("default")
+
+        return compute_field
+
+    def _compile_item(self, fields: List[Dict[str, Any]]) -> Extractor:
+        """Same as `_extract_item`."""
+        compiled: List[Tuple[str, bool, Extractor]] = []
+        for field in fields:
+            if field["type"] == "computed":
+                compiled.append((field["name"], True, self._computed(field)))
+            else:
+                compiled.append((field["name"], False, self._field(field)))
+
+        def extract_item(element):
+            item = {}
+            for name, computed, extract in compiled:
+                value = extract(item) if computed else extract(element)
+                if value is not None:
+                    item[name] = value
+            return item
+
+        return extract_item
+
+    def _compile_list_item(self, fields: List[Dict[str, Any]]) -> Extractor:
+        """Same as `_extract_list_item`."""
+        compiled = [(field["name"], self._single(field)) for field in fields]
+
+        def extract_list_item(element):
+            item = {}
+            for name, extract in compiled:
+                value = extract(element)
+                if value is not None:
+                    item[name] = value
+            return item
+
+        return extract_list_item
+
+
+# Strategy used by `extract_many` in worker processes, set once per worker
+_worker_strategy = None
+
+
+def _init_worker(strategy) -> None:
+    global _worker_strategy
+    _worker_strategy = strategy
+
+
+def _extract_in_worker(job: Tuple[str, str]) -> List[Dict[str, Any]]:
+    url, html = job
+    return _worker_strategy.extract(url, html)
@@ -0,0 +1,281 @@
+"""
+Embedded cache store of AsyncUrlSeeder.
+
+One SQLite database (WAL journal) holds what used to be a JSON file per URL
+(head / live-check results) and a JSON file per sitemap (the discovered URLs):
+
+- `entries`: (kind, url) -> JSON result, with its creation time for the TTL.
+- `sitemaps` / `sitemap_urls`: the URL list of a domain's sitemaps, with the
+  sitemap's lastmod and the creation time used to validate it.
+
+Writes are buffered and committed `batch_size` at a time, and lookups of many
+URLs are one query per batch, so warming a large domain costs a handful of
+transactions instead of a file per URL.
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .config import SEEDER_CACHE_BATCH_SIZE
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (kind, url)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sitemaps (
+    key TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    sitemap_url TEXT,
+    sitemap_lastmod TEXT,
+    url_count INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sitemap_urls (
+    key TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (key, generation, position)
+) WITHOUT ROWID;
+"""
+
+
+class SeederCache:
+    """
+    Head/live-check results and sitemap URL lists of AsyncUrlSeeder, in SQLite.
+
+    The database is opened on first use. Written entries are visible to lookups
+    right away and reach the database every `batch_size` writes or on `flush()`.
+    Safe to share between threads and event loops.
+
+    Args:
+        path: Database file.
+        batch_size: Buffered writes per transaction, and URLs per lookup query.
+        clock: Time source (seconds), replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = SEEDER_CACHE_BATCH_SIZE,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.batch_size = max(1, batch_size)
+        self._clock = clock
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    # ───────── head / live-check results
+
+    def get(self, kind: str, url: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """The entry of `url`, unless it's missing or older than `max_age` seconds."""
+        return self.get_many(kind, [url], max_age).get(url)
+
+    def get_many(self, kind: str, urls: Iterable[str], max_age: float) -> Dict[str, Dict[str, Any]]:
+        """Entries of the `urls` that are cached and not older than `max_age` seconds."""
+        oldest = self._clock() - max_age
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            missing = []
+            for url in urls:
+                pending = self._pending.get((kind, url))
+                if pending is None:
+                    missing.append(url)
+                elif pending[1] >= oldest:
+                    found[url] = json.loads(pending[0])
+            connection = self._connect() if missing else None
+            for start in range(0, len(missing), self.batch_size):
+                chunk = missing[start:start + self.batch_size]
+                rows = connection.execute(
+                    f"SELECT url, data FROM entries WHERE kind = ? AND created >= ? "
+                    f"AND url IN ({','.join('?' * len(chunk))})",
+                    (kind, oldest, *chunk),
+                ).fetchall()
+                for url, data in rows:
+                    found[url] = json.loads(data)
+        return found
+
+    def put(self, kind: str, url: str, data: Dict[str, Any]) -> None:
+        """Store the entry of `url`; committed with the next batch."""
+        if self.buffer(kind, url, data):
+            self.flush()
+
+    def buffer(self, kind: str, url: str, data: Dict[str, Any]) -> bool:
+        """
+        Store the entry of `url` in memory only; True once a batch is due, for
+        the caller to `flush()` (e.g. in a thread, off the event loop).
+        """
+        with self._lock:
+            self._pending[(kind, url)] = (json.dumps(data, separators=(",", ":")), self._clock())
+            return len(self._pending) >= self.batch_size
+
+    def flush(self) -> None:
+        """Commit the buffered entries."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        rows = [(kind, url, data, created) for (kind, url), (data, created) in self._pending.items()]
+        connection = self._connect()
+        with connection:
+            connection.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", rows)
+        self._pending.clear()
+
+    # ───────── sitemap URL lists
+
+    def get_sitemap(
+        self,
+        key: str,
+        ttl_hours: float,
+        validate_lastmod: bool = True,
+        current_lastmod: Optional[str] = None,
+    ) -> Optional[List[str]]:
+        """
+        The cached URL list of `key`, or None when it has to be fetched again.
+
+        The list is invalid when it's missing or empty, when it's older than
+        `ttl_hours` (if ttl_hours > 0), or, with `validate_lastmod`, when the
+        sitemap's `current_lastmod` is newer than the one it was built from.
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT generation, sitemap_lastmod, url_count, created FROM sitemaps WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            generation, cached_lastmod, url_count, created = row
+            if not url_count:
+                return None
+            if ttl_hours > 0 and (self._clock() - created) / 3600 > ttl_hours:
+                return None
+            if validate_lastmod and current_lastmod and cached_lastmod and current_lastmod > cached_lastmod:
+                return None
+            return [
+                url
+                for (url,) in connection.execute(
+                    "SELECT url FROM sitemap_urls WHERE key = ? AND generation = ? ORDER BY position",
+                    (key, generation),
+                )
+            ]
+
+    def sitemap_lastmod(self, key: str, ttl_hours: float) -> Optional[str]:
+        """
+        The sitemap lastmod the cached URL list of `key` was built from, or None
+        when there is no list within `ttl_hours` or it was stored without one.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT sitemap_lastmod, url_count, created FROM sitemaps WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        cached_lastmod, url_count, created = row
+        if not url_count or (ttl_hours > 0 and (self._clock() - created) / 3600 > ttl_hours):
+            return None
+        return cached_lastmod
+
+    def sitemap_writer(self, key: str) -> "SitemapWriter":
+        """A writer that replaces the URL list of `key` once it's finished."""
+        return SitemapWriter(self, key)
+
+    def close(self) -> None:
+        """Commit the buffered entries and close the database."""
+        with self._lock:
+            if self._connection is not None or self._pending:
+                self._flush()
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class SitemapWriter:
+    """
+    Writes a sitemap URL list in batches under a new generation.
+
+    The previous list stays valid until `finish()` switches to the new one, so an
+    interrupted fetch leaves the cache as it was.
+    """
+
+    def __init__(self, cache: SeederCache, key: str):
+        self.cache = cache
+        self.key = key
+        self.generation = time.time_ns()
+        self.count = 0
+        self._batch: List[str] = []
+
+    def __len__(self) -> int:
+        return self.count + len(self._batch)
+
+    def add(self, url: str) -> None:
+        if self.buffer(url):
+            self.write()
+
+    def buffer(self, url: str) -> bool:
+        """Add `url` in memory only; True once a batch is due, for the caller to `write()`."""
+        self._batch.append(url)
+        return len(self._batch) >= self.cache.batch_size
+
+    def write(self) -> None:
+        """Write the buffered URLs."""
+        if not self._batch:
+            return
+        start = self.count
+        rows = [(self.key, self.generation, start + i, url) for i, url in enumerate(self._batch)]
+        with self.cache._lock:
+            connection = self.cache._connect()
+            with connection:
+                connection.executemany("INSERT INTO sitemap_urls VALUES (?, ?, ?, ?)", rows)
+        self.count += len(self._batch)
+        self._batch = []
+
+    def finish(self, sitemap_url: str, sitemap_lastmod: Optional[str]) -> int:
+        """Make the written list the cached one; returns its number of URLs."""
+        self.write()
+        with self.cache._lock:
+            connection = self.cache._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO sitemaps VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.key, self.generation, sitemap_url, sitemap_lastmod, self.count, self.cache._clock()),
+                )
+                # Earlier lists, and lists of interrupted fetches
+                connection.execute(
+                    "DELETE FROM sitemap_urls WHERE key = ? AND generation != ?",
+                    (self.key, self.generation),
+                )
+        return self.count
+
+    def discard(self) -> None:
+        """Drop what was written; the cached list stays as it was."""
+        self._batch = []
+        with self.cache._lock:
+            connection = self.cache._connect()
+            with connection:
+                connection.execute(
+                    "DELETE FROM sitemap_urls WHERE key = ? AND generation = ?",
+                    (self.key, self.generation),
+                )
@@ -798,6 +798,9 @@ Return only a JSON array of extracted tables following the specified format."""
                     base_delay=self.llm_config.backoff_base_delay,
                     max_attempts=self.llm_config.backoff_max_attempts,
                     exponential_factor=self.llm_config.backoff_exponential_factor,
+                    max_concurrency=self.llm_config.max_concurrency,
+                    tokens_per_minute=self.llm_config.tokens_per_minute,
+                    use_cache=self.llm_config.cache_responses,
                     extra_args=self.extra_args
                 )
                 
@@ -1122,6 +1125,9 @@ Return only a JSON array of extracted tables following the specified format."""
                     base_delay=self.llm_config.backoff_base_delay,
                     max_attempts=self.llm_config.backoff_max_attempts,
                     exponential_factor=self.llm_config.backoff_exponential_factor,
+                    max_concurrency=self.llm_config.max_concurrency,
+                    tokens_per_minute=self.llm_config.tokens_per_minute,
+                    use_cache=self.llm_config.cache_responses,
                     extra_args=self.extra_args
                 )
                 
@@ -30,6 +30,7 @@ WebScrapingStrategy = Union['LXMLWebScrapingStrategyType']
 # Proxy types
 ProxyRotationStrategy = Union['ProxyRotationStrategyType']
 RoundRobinProxyStrategy = Union['RoundRobinProxyStrategyType']
+HealthAwareProxyStrategy = Union['HealthAwareProxyStrategyType']
 
 # Extraction types
 ExtractionStrategy = Union['ExtractionStrategyType']
@@ -122,6 +123,7 @@ if TYPE_CHECKING:
     from .proxy_strategy import (
         ProxyRotationStrategy as ProxyRotationStrategyType,
         RoundRobinProxyStrategy as RoundRobinProxyStrategyType,
+        HealthAwareProxyStrategy as HealthAwareProxyStrategyType,
     )
     
     # Extraction imports
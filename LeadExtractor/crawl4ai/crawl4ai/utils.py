@@ -1748,15 +1748,19 @@ def perform_completion_with_backoff(
     base_delay=2,
     max_attempts=3,
     exponential_factor=2,
+    max_concurrency=None,
+    tokens_per_minute=None,
+    use_cache=False,
     **kwargs,
 ):
     """
     Perform an API completion request with exponential backoff.
 
     How it works:
-    1. Sends a completion request to the API.
-    2. Retries on rate-limit errors with exponential delays.
-    3. Returns the API response or an error after all retries.
+    1. Waits for a free slot and token budget of the provider in the shared LLMScheduler.
+    2. Sends a completion request to the API.
+    3. Retries on rate-limit errors after the delay the provider asks for, or with exponential delays.
+    4. Returns the API response, or raises the error after all retries.
 
     Args:
         provider (str): The name of the API provider.
@@ -1767,67 +1771,30 @@ def perform_completion_with_backoff(
         base_delay (int): The base delay in seconds. Defaults to 2.
         max_attempts (int): The maximum number of attempts. Defaults to 3.
         exponential_factor (int): The exponential factor. Defaults to 2.
+        max_concurrency (Optional[int]): Requests to this provider in flight at once. Defaults to LLM_PROVIDER_LIMITS.
+        tokens_per_minute (Optional[int]): Token budget of this provider. Defaults to LLM_PROVIDER_LIMITS.
+        use_cache (bool): Reuse a cached response for the same model, prompt and options. Defaults to False.
         **kwargs: Additional arguments for the API request.
 
     Returns:
-        dict: The API response or an error message after all retries.
-    """
-
-    from litellm import completion
-    from litellm.exceptions import RateLimitError
-    import litellm
-    litellm.drop_params = True  # Auto-drop unsupported params (e.g., temperature for O-series/GPT-5)
-
-    extra_args = {"temperature": 0.01, "api_key": api_token, "base_url": base_url}
-    if json_response:
-        extra_args["response_format"] = {"type": "json_object"}
-
-    if kwargs.get("extra_args"):
-        extra_args.update(kwargs["extra_args"])
-
-    for attempt in range(max_attempts):
-        try:
-            response = completion(
-                model=provider,
-                messages=[{"role": "user", "content": prompt_with_variables}],
-                **extra_args,
-            )
-            return response  # Return the successful response
-        except RateLimitError as e:
-            print("Rate limit error:", str(e))
-
-            if attempt == max_attempts - 1:
-                # Last attempt failed, raise the error.
-                raise
-
-            # Check if we have exhausted our max attempts
-            if attempt < max_attempts - 1:
-                # Calculate the delay and wait
-                delay = base_delay * (exponential_factor**attempt)  # Exponential backoff formula
-                print(f"Waiting for {delay} seconds before retrying...")
-                time.sleep(delay)
-            else:
-                # Return an error response after exhausting all retries
-                return [
-                    {
-                        "index": 0,
-                        "tags": ["error"],
-                        "content": ["Rate limit error. Please try again later."],
-                    }
-                ]
-        except Exception as e:
-            raise e  # Raise any other exceptions immediately
-            # print("Error during completion request:", str(e))
-            # error_message = e.message
-            # return [
-            #     {
-            #         "index": 0,
-            #         "tags": ["error"],
-            #         "content": [
-            #             f"Error during LLM completion request. {error_message}"
-            #         ],
-            #     }
-            # ]
+        dict: The API response.
+    """
+    from .llm_scheduler import get_llm_scheduler
+
+    return get_llm_scheduler().complete(
+        provider,
+        prompt_with_variables,
+        api_token,
+        json_response=json_response,
+        base_url=base_url,
+        base_delay=base_delay,
+        max_attempts=max_attempts,
+        exponential_factor=exponential_factor,
+        extra_args=kwargs.get("extra_args"),
+        max_concurrency=max_concurrency,
+        tokens_per_minute=tokens_per_minute,
+        use_cache=use_cache,
+    )
 
 
 async def aperform_completion_with_backoff(
@@ -1839,15 +1806,19 @@ async def aperform_completion_with_backoff(
     base_delay=2,
     max_attempts=3,
     exponential_factor=2,
+    max_concurrency=None,
+    tokens_per_minute=None,
+    use_cache=False,
     **kwargs,
 ):
     """
     Async version: Perform an API completion request with exponential backoff.
 
     How it works:
-    1. Sends an async completion request to the API.
-    2. Retries on rate-limit errors with exponential delays (async).
-    3. Returns the API response or an error after all retries.
+    1. Waits (async) for a free slot and token budget of the provider in the shared LLMScheduler.
+    2. Sends an async completion request to the API.
+    3. Retries on rate-limit errors after the delay the provider asks for, or with exponential delays (async).
+    4. Returns the API response, or raises the error after all retries.
 
     Args:
         provider (str): The name of the API provider.
@@ -1858,57 +1829,30 @@ async def aperform_completion_with_backoff(
         base_delay (int): The base delay in seconds. Defaults to 2.
         max_attempts (int): The maximum number of attempts. Defaults to 3.
         exponential_factor (int): The exponential factor. Defaults to 2.
+        max_concurrency (Optional[int]): Requests to this provider in flight at once. Defaults to LLM_PROVIDER_LIMITS.
+        tokens_per_minute (Optional[int]): Token budget of this provider. Defaults to LLM_PROVIDER_LIMITS.
+        use_cache (bool): Reuse a cached response for the same model, prompt and options. Defaults to False.
         **kwargs: Additional arguments for the API request.
 
     Returns:
-        dict: The API response or an error message after all retries.
-    """
-
-    from litellm import acompletion
-    from litellm.exceptions import RateLimitError
-    import litellm
-    import asyncio
-    litellm.drop_params = True  # Auto-drop unsupported params (e.g., temperature for O-series/GPT-5)
-
-    extra_args = {"temperature": 0.01, "api_key": api_token, "base_url": base_url}
-    if json_response:
-        extra_args["response_format"] = {"type": "json_object"}
-
-    if kwargs.get("extra_args"):
-        extra_args.update(kwargs["extra_args"])
-
-    for attempt in range(max_attempts):
-        try:
-            response = await acompletion(
-                model=provider,
-                messages=[{"role": "user", "content": prompt_with_variables}],
-                **extra_args,
-            )
-            return response  # Return the successful response
-        except RateLimitError as e:
-            print("Rate limit error:", str(e))
-
-            if attempt == max_attempts - 1:
-                # Last attempt failed, raise the error.
-                raise
-
-            # Check if we have exhausted our max attempts
-            if attempt < max_attempts - 1:
-                # Calculate the delay and wait
-                delay = base_delay * (exponential_factor**attempt)  # Exponential backoff formula
-                print(f"Waiting for {delay} seconds before retrying...")
-                await asyncio.sleep(delay)
-            else:
-                # Return an error response after exhausting all retries
-                return [
-                    {
-                        "index": 0,
-                        "tags": ["error"],
-                        "content": ["Rate limit error. Please try again later."],
-                    }
-                ]
-        except Exception as e:
-            raise e  # Raise any other exceptions immediately
+        dict: The API response.
+    """
+    from .llm_scheduler import get_llm_scheduler
+
+    return await get_llm_scheduler().acomplete(
+        provider,
+        prompt_with_variables,
+        api_token,
+        json_response=json_response,
+        base_url=base_url,
+        base_delay=base_delay,
+        max_attempts=max_attempts,
+        exponential_factor=exponential_factor,
+        extra_args=kwargs.get("extra_args"),
+        max_concurrency=max_concurrency,
+        tokens_per_minute=tokens_per_minute,
+        use_cache=use_cache,
+    )
 
 
 def extract_blocks(url, html, provider=DEFAULT_PROVIDER, api_token=None, base_url=None):
@@ -2598,14 +2542,214 @@ def is_external_url(url: str, base_domain: str) -> bool:
         return False
 
 
+# Tokens removed by clean_tokens
+_NOISE_TOKENS = {
+    "ccp",
+    "up",
+    "↑",
+    "▲",
+    "⬆️",
+    "a",
+    "an",
+    "at",
+    "by",
+    "in",
+    "of",
+    "on",
+    "to",
+    "the",
+}
+
+_STOP_WORDS = {
+    "a",
+    "an",
+    "and",
+    "are",
+    "as",
+    "at",
+    "be",
+    "by",
+    "for",
+    "from",
+    "has",
+    "he",
+    "in",
+    "is",
+    "it",
+    "its",
+    "of",
+    "on",
+    "that",
+    "the",
+    "to",
+    "was",
+    "were",
+    "will",
+    "with",
+    # Pronouns
+    "i",
+    "you",
+    "he",
+    "she",
+    "it",
+    "we",
+    "they",
+    "me",
+    "him",
+    "her",
+    "us",
+    "them",
+    "my",
+    "your",
+    "his",
+    "her",
+    "its",
+    "our",
+    "their",
+    "mine",
+    "yours",
+    "hers",
+    "ours",
+    "theirs",
+    "myself",
+    "yourself",
+    "himself",
+    "herself",
+    "itself",
+    "ourselves",
+    "themselves",
+    # Common verbs
+    "am",
+    "is",
+    "are",
+    "was",
+    "were",
+    "be",
+    "been",
+    "being",
+    "have",
+    "has",
+    "had",
+    "having",
+    "do",
+    "does",
+    "did",
+    "doing",
+    # Prepositions
+    "about",
+    "above",
+    "across",
+    "after",
+    "against",
+    "along",
+    "among",
+    "around",
+    "at",
+    "before",
+    "behind",
+    "below",
+    "beneath",
+    "beside",
+    "between",
+    "beyond",
+    "by",
+    "down",
+    "during",
+    "except",
+    "for",
+    "from",
+    "in",
+    "inside",
+    "into",
+    "near",
+    "of",
+    "off",
+    "on",
+    "out",
+    "outside",
+    "over",
+    "past",
+    "through",
+    "to",
+    "toward",
+    "under",
+    "underneath",
+    "until",
+    "up",
+    "upon",
+    "with",
+    "within",
+    # Conjunctions
+    "and",
+    "but",
+    "or",
+    "nor",
+    "for",
+    "yet",
+    "so",
+    "although",
+    "because",
+    "since",
+    "unless",
+    # Articles
+    "a",
+    "an",
+    "the",
+    # Other common words
+    "this",
+    "that",
+    "these",
+    "those",
+    "what",
+    "which",
+    "who",
+    "whom",
+    "whose",
+    "when",
+    "where",
+    "why",
+    "how",
+    "all",
+    "any",
+    "both",
+    "each",
+    "few",
+    "more",
+    "most",
+    "other",
+    "some",
+    "such",
+    "can",
+    "cannot",
+    "can't",
+    "could",
+    "couldn't",
+    "may",
+    "might",
+    "must",
+    "mustn't",
+    "shall",
+    "should",
+    "shouldn't",
+    "will",
+    "won't",
+    "would",
+    "wouldn't",
+    "not",
+    "n't",
+    "no",
+    "nor",
+    "none",
+}
+
+
 def clean_tokens(tokens: list[str]) -> list[str]:
     """
     Clean a list of tokens by removing noise, stop words, and short tokens.
 
     How it works:
-    1. Defines a set of noise words and stop words.
-    2. Filters tokens based on length and exclusion criteria.
-    3. Excludes tokens starting with certain symbols (e.g., "↑", "▲").
+    1. Filters tokens based on length, noise words and stop words.
+    2. Excludes tokens starting with certain symbols (e.g., "↑", "▲").
 
     Args:
         tokens (list[str]): The list of tokens to clean.
@@ -2613,214 +2757,13 @@ def clean_tokens(tokens: list[str]) -> list[str]:
     Returns:
         list[str]: The cleaned list of tokens.
     """
-
-    # Set of tokens to remove
-    noise = {
-        "ccp",
-        "up",
-        "↑",
-        "▲",
-        "⬆️",
-        "a",
-        "an",
-        "at",
-        "by",
-        "in",
-        "of",
-        "on",
-        "to",
-        "the",
-    }
-
-    STOP_WORDS = {
-        "a",
-        "an",
-        "and",
-        "are",
-        "as",
-        "at",
-        "be",
-        "by",
-        "for",
-        "from",
-        "has",
-        "he",
-        "in",
-        "is",
-        "it",
-        "its",
-        "of",
-        "on",
-        "that",
-        "the",
-        "to",
-        "was",
-        "were",
-        "will",
-        "with",
-        # Pronouns
-        "i",
-        "you",
-        "he",
-        "she",
-        "it",
-        "we",
-        "they",
-        "me",
-        "him",
-        "her",
-        "us",
-        "them",
-        "my",
-        "your",
-        "his",
-        "her",
-        "its",
-        "our",
-        "their",
-        "mine",
-        "yours",
-        "hers",
-        "ours",
-        "theirs",
-        "myself",
-        "yourself",
-        "himself",
-        "herself",
-        "itself",
-        "ourselves",
-        "themselves",
-        # Common verbs
-        "am",
-        "is",
-        "are",
-        "was",
-        "were",
-        "be",
-        "been",
-        "being",
-        "have",
-        "has",
-        "had",
-        "having",
-        "do",
-        "does",
-        "did",
-        "doing",
-        # Prepositions
-        "about",
-        "above",
-        "across",
-        "after",
-        "against",
-        "along",
-        "among",
-        "around",
-        "at",
-        "before",
-        "behind",
-        "below",
-        "beneath",
-        "beside",
-        "between",
-        "beyond",
-        "by",
-        "down",
-        "during",
-        "except",
-        "for",
-        "from",
-        "in",
-        "inside",
-        "into",
-        "near",
-        "of",
-        "off",
-        "on",
-        "out",
-        "outside",
-        "over",
-        "past",
-        "through",
-        "to",
-        "toward",
-        "under",
-        "underneath",
-        "until",
-        "up",
-        "upon",
-        "with",
-        "within",
-        # Conjunctions
-        "and",
-        "but",
-        "or",
-        "nor",
-        "for",
-        "yet",
-        "so",
-        "although",
-        "because",
-        "since",
-        "unless",
-        # Articles
-        "a",
-        "an",
-        "the",
-        # Other common words
-        "this",
-        "that",
-        "these",
-        "those",
-        "what",
-        "which",
-        "who",
-        "whom",
-        "whose",
-        "when",
-        "where",
-        "why",
-        "how",
-        "all",
-        "any",
-        "both",
-        "each",
-        "few",
-        "more",
-        "most",
-        "other",
-        "some",
-        "such",
-        "can",
-        "cannot",
-        "can't",
-        "could",
-        "couldn't",
-        "may",
-        "might",
-        "must",
-        "mustn't",
-        "shall",
-        "should",
-        "shouldn't",
-        "will",
-        "won't",
-        "would",
-        "wouldn't",
-        "not",
-        "n't",
-        "no",
-        "nor",
-        "none",
-    }
-
     # Single comprehension, more efficient than multiple passes
     return [
         token
         for token in tokens
         if len(token) > 2
-        and token not in noise
-        and token not in STOP_WORDS
+        and token not in _NOISE_TOKENS
+        and token not in _STOP_WORDS
         and not token.startswith("↑")
         and not token.startswith("▲")
         and not token.startswith("⬆")
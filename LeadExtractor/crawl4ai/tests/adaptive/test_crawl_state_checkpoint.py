@@ -0,0 +1,145 @@
+"""
+Tests for CrawlState's append-only checkpoints: deltas, compaction, torn writes and the former single-JSON format.
+"""
+import json
+
+import numpy as np
+import pytest
+
+from crawl4ai import adaptive_crawler
+from crawl4ai.adaptive_crawler import CrawlState, StatisticalStrategy
+from crawl4ai.models import Link
+
+WORDS = ["async", "await", "python", "event", "loop", "task", "future", "queue", "socket", "thread"]
+
+
+class Markdown:
+    def __init__(self, content):
+        self.raw_markdown = content
+
+
+class Page:
+    def __init__(self, url, content):
+        self.url = url
+        self.markdown = Markdown(content)
+        self.links = {"internal": [], "external": []}
+        self.metadata = {"title": url}
+
+
+async def crawl(state, strategy, start, count):
+    pages = [Page(f"https://example.com/{i}", " ".join(WORDS[j % 10] for j in range(i, i + 30)) + f" page{i}")
+             for i in range(start, start + count)]
+    await strategy.update_state(state, pages)
+    state.knowledge_base.extend(pages)
+    state.crawled_urls.update(page.url for page in pages)
+    state.pending_links.extend(Link(href=f"{page.url}/next", text=f"next after {page.url}") for page in pages)
+    state.metrics["confidence"] = start / 100
+    rows = np.random.default_rng(start).normal(size=(count, 8))
+    state.kb_embeddings = rows if state.kb_embeddings is None else np.vstack([state.kb_embeddings, rows])
+
+
+def as_saved(state):
+    """The state as its snapshot holds it, with sets in a stable order."""
+    saved = json.loads(json.dumps(state._to_dict()))
+    saved["crawled_urls"].sort()
+    for postings in saved["documents_with_terms"].values():
+        postings.sort()
+    return saved
+
+
+def assert_same(loaded, state):
+    assert as_saved(loaded) == as_saved(state)
+
+
+@pytest.mark.asyncio
+async def test_saves_append_deltas_and_resume_replays_them(tmp_path):
+    path = tmp_path / "state.json"
+    state, strategy = CrawlState(query="python async"), StatisticalStrategy()
+    state.query_embeddings = np.ones((2, 8))
+    await crawl(state, strategy, 0, 20)
+    state.save(path)
+    snapshot_size = path.stat().st_size
+
+    for start in (20, 23, 26):
+        await crawl(state, strategy, start, 3)
+        state.save(path)
+    state.save(path)  # Nothing changed, nothing written
+
+    lines = path.read_bytes().splitlines()
+    assert [json.loads(line)["type"] for line in lines] == ["snapshot"] + ["delta"] * 3
+    assert max(len(line) for line in lines[1:]) < snapshot_size / 4
+
+    resumed = CrawlState.load(path)
+    assert_same(resumed, state)
+
+    # A resumed state keeps appending to its file
+    await crawl(resumed, strategy, 29, 3)
+    resumed.save(path)
+    assert len(path.read_bytes().splitlines()) == 5
+    await crawl(state, strategy, 29, 3)
+    assert_same(CrawlState.load(path), state)
+
+
+@pytest.mark.asyncio
+async def test_compaction_and_changes_a_delta_cannot_express_write_a_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / "state.json"
+    state, strategy = CrawlState(query="python"), StatisticalStrategy()
+    await crawl(state, strategy, 0, 5)
+    state.save(path)
+
+    monkeypatch.setattr(adaptive_crawler, "CHECKPOINT_MAX_DELTAS", 2)
+    for start in (5, 6, 7):
+        await crawl(state, strategy, start, 1)
+        state.save(path)
+    assert len(path.read_bytes().splitlines()) == 1  # The third save compacted
+    await crawl(state, strategy, 8, 1)
+    state.save(path)
+    assert len(path.read_bytes().splitlines()) == 2
+
+    state.pending_links.pop(0)
+    state.save(path)
+    assert len(path.read_bytes().splitlines()) == 1
+    assert_same(CrawlState.load(path), state)
+
+    state.save(tmp_path / "other.json")  # Another path starts with a snapshot
+    state.save(path)
+    assert len((tmp_path / "other.json").read_bytes().splitlines()) == 1
+    assert len(path.read_bytes().splitlines()) == 1
+
+
+@pytest.mark.asyncio
+async def test_torn_last_write_is_ignored_and_former_format_loads(tmp_path):
+    path = tmp_path / "state.json"
+    state, strategy = CrawlState(query="python"), StatisticalStrategy()
+    await crawl(state, strategy, 0, 5)
+    state.save(path)
+    expected = as_saved(state)
+    await crawl(state, strategy, 5, 2)
+    state.save(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:-40])
+
+    resumed = CrawlState.load(path)
+    assert as_saved(resumed) == expected
+    await crawl(resumed, strategy, 5, 2)
+    resumed.save(path)  # Rewritten rather than appended after the torn record
+    assert len(path.read_bytes().splitlines()) == 1
+    assert_same(CrawlState.load(path), state)
+
+    path.write_bytes(path.read_bytes().rstrip(b"\n"))  # Complete but unterminated: kept, not appended to
+    resumed = CrawlState.load(path)
+    assert_same(resumed, state)
+    resumed.save(path, compact=False)
+    assert path.read_bytes().endswith(b"\n")
+
+    legacy = tmp_path / "legacy.json"
+    legacy.write_text(json.dumps(state._to_dict(), indent=2))
+    assert_same(CrawlState.load(legacy), state)
+
+    with open(path, "ab") as f:
+        f.write(b"{not json\n")
+    await crawl(state, strategy, 7, 1)
+    with open(path, "ab") as f:
+        f.write(b'{"type":"delta"}\n')
+    with pytest.raises(ValueError):
+        CrawlState.load(path)
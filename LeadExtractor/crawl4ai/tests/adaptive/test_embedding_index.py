@@ -0,0 +1,120 @@
+"""
+Tests for the embedding cache, batching and vector index of EmbeddingStrategy, with a deterministic embedder.
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from crawl4ai.adaptive_crawler import AdaptiveConfig, CrawlState, EmbeddingStrategy
+from crawl4ai.embedding_index import BatchedEmbedder, EmbeddingCache, HashingEmbedder, VectorIndex
+from crawl4ai.models import Link
+
+TOPICS = ["async await coroutines", "event loop scheduling", "python packaging wheels",
+          "database indexes btree", "http caching headers", "css grid layout"]
+
+
+class Markdown:
+    def __init__(self, content):
+        self.raw_markdown = content
+
+
+class Page:
+    def __init__(self, url, content):
+        self.url = url
+        self.markdown = Markdown(content)
+
+
+def brute_force_best(queries, kb):
+    q = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    d = kb / np.linalg.norm(kb, axis=1, keepdims=True)
+    return (q @ d.T).max(axis=1)
+
+
+@pytest.mark.asyncio
+async def test_texts_are_embedded_once_in_batches_and_persisted(tmp_path):
+    embedder = HashingEmbedder(dim=64)
+    batched = BatchedEmbedder(embedder, cache=EmbeddingCache(tmp_path / "embeddings.db"), batch_size=4)
+
+    texts = [f"page {i} about {TOPICS[i % 6]}" for i in range(10)]
+    vectors = await batched(texts + texts[:3])  # Repeated texts are embedded once
+    assert vectors.shape == (13, 64)
+    assert np.array_equal(vectors[10:], vectors[:3])
+    assert (embedder.calls, batched.embedded) == (3, 10)  # 4 + 4 + 2
+
+    await batched(texts[5:] + ["something new"])
+    assert (embedder.calls, batched.embedded, batched.cache_hits) == (4, 11, 5)
+
+    # The database is only used in threads, off the event loop
+    threads = set()
+    cache = batched.cache
+    connect = cache._connect
+
+    def record_thread():
+        threads.add(threading.get_ident())
+        return connect()
+
+    cache._connect = record_thread
+    await batched(["one more text"] + texts[:2])
+    assert threads and threading.get_ident() not in threads
+
+    # Another run finds them in the database; another model doesn't
+    other_run = BatchedEmbedder(HashingEmbedder(dim=64), cache=EmbeddingCache(tmp_path / "embeddings.db"))
+    assert np.array_equal(await other_run(texts), vectors[:10])
+    assert other_run.embedded == 0
+    other_model = BatchedEmbedder(HashingEmbedder(dim=32), cache=EmbeddingCache(tmp_path / "embeddings.db"))
+    assert (await other_model(texts)).shape == (10, 32)
+    assert other_model.embedded == 10
+
+
+def test_index_coverage_is_updated_incrementally():
+    rng = np.random.default_rng(3)
+    queries = rng.normal(size=(8, 16))
+    index = VectorIndex()
+    assert index.coverage(queries).tolist() == [-1.0] * 8
+
+    kb = np.empty((0, 16))
+    for size in (1, 20, 3, 40):  # Grows past the initial buffer
+        batch = rng.normal(size=(size, 16))
+        index.add(batch)
+        kb = np.vstack([kb, batch])
+        assert np.allclose(index.coverage(queries), brute_force_best(queries, kb), atol=1e-5)
+    assert len(index) == 64
+    assert np.allclose(index.max_similarity(kb[:5]), 1.0, atol=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_strategy_reuses_embeddings_and_matches_brute_force(tmp_path):
+    embedder = HashingEmbedder(dim=128)
+    config = AdaptiveConfig(strategy="embedding", embedding_cache_path=str(tmp_path / "embeddings.db"))
+    strategy = EmbeddingStrategy(embedder=embedder)
+    strategy.config = config
+
+    state = CrawlState(query="async python")
+    state.query_embeddings = await strategy._get_embeddings([f"{topic} in python" for topic in TOPICS[:4]])
+    pages = [Page(f"https://example.com/{i}", f"{TOPICS[i % 6]} " * 20 + f"page {i}") for i in range(12)]
+    for start in range(0, 12, 3):
+        await strategy.update_state(state, pages[start:start + 3])
+
+    confidence = await strategy.calculate_confidence(state)
+    best = brute_force_best(state.query_embeddings, state.kb_embeddings)
+    assert confidence == pytest.approx(float(best.mean()), abs=1e-5)
+    gaps = strategy.find_coverage_gaps(state.kb_embeddings, state.query_embeddings)
+    assert [distance for _, distance in gaps] == pytest.approx(list(1 - best), abs=1e-5)
+
+    links = [Link(href=f"https://example.com/link{i}", text=f"{TOPICS[i % 6]} guide") for i in range(30)]
+    state.pending_links = links
+    calls = embedder.calls
+    ranked = await strategy.rank_links(state, config)
+    assert len(ranked) == 30 and ranked[0][1] >= ranked[-1][1]
+    assert embedder.calls == calls + 1  # All link texts in one call
+
+    # Re-evaluating embeds nothing again
+    calls = embedder.calls
+    await strategy.rank_links(state, config)
+    await strategy.update_state(state, pages[:3])
+    assert embedder.calls == calls
+
+    # A resumed state (a different array) rebuilds the index once
+    state.kb_embeddings = np.array(state.kb_embeddings.tolist())
+    assert await strategy.calculate_confidence(state) == pytest.approx(confidence, abs=1e-5)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Compare AdaptiveCrawler state saving: one JSON document per save vs appended checkpoint deltas.
+
+Crawls --pages synthetic pages (--words words each from a Zipf-like vocabulary,
+a few pending links per page) into a CrawlState through StatisticalStrategy,
+saving the state every --save-every pages as digest() does after each
+iteration, optionally with --dim dimensional embeddings per page:
+
+- full: the former CrawlState.save, the whole state as indented JSON each time
+- checkpoint: CrawlState.save, a snapshot followed by deltas, compacted as
+  they outgrow the snapshot
+
+Reports time spent saving, bytes written, final file size and the time to
+resume (CrawlState.load) from each file; both must load the same state.
+
+Usage:
+    python tests/benchmarks/bench_crawl_state_checkpoint.py --pages 10000 --save-every 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from crawl4ai.adaptive_crawler import CrawlState, StatisticalStrategy  # noqa: E402
+from crawl4ai.models import Link  # noqa: E402
+
+
+class Markdown:
+    def __init__(self, content):
+        self.raw_markdown = content
+
+
+class Page:
+    def __init__(self, url, content):
+        self.url = url
+        self.markdown = Markdown(content)
+        self.links = {"internal": [], "external": []}
+        self.metadata = {"title": url}
+
+
+def make_pages(count: int, words: int, seed: int = 5):
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(50_000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [Page(f"https://docs.example.com/section{i % 50}/page{i}", " ".join(rng.choices(vocabulary, weights, k=words)))
+            for i in range(count)]
+
+
+def full_save(state: CrawlState, path: str):
+    """The former CrawlState.save."""
+    with open(path, "w") as f:
+        json.dump(state._to_dict(), f, indent=2)
+
+
+def run(pages, save_every: int, dim: int, path: str, mode: str):
+    state, strategy = CrawlState(query="term1 term7 term42"), StatisticalStrategy()
+    rng = np.random.default_rng(1)
+    saving = 0.0
+    written = 0
+    saves = 0
+    for start in range(0, len(pages), save_every):
+        batch = pages[start:start + save_every]
+        asyncio.run(strategy.update_state(state, batch))
+        state.knowledge_base.extend(batch)
+        state.crawled_urls.update(page.url for page in batch)
+        state.pending_links.extend(Link(href=f"{page.url}/{n}", text=f"link {n} of {page.url}")
+                                   for page in batch for n in range(3))
+        state.metrics["confidence"] = len(state.knowledge_base) / len(pages)
+        if dim:
+            rows = rng.normal(size=(len(batch), dim)).astype(np.float32)
+            state.kb_embeddings = rows if state.kb_embeddings is None else np.vstack([state.kb_embeddings, rows])
+
+        checkpoint = state._checkpoint
+        size = checkpoint.size if checkpoint is not None else 0
+        started = time.perf_counter()
+        if mode == "full":
+            full_save(state, path)
+        else:
+            state.save(path)
+        saving += time.perf_counter() - started
+        saves += 1
+        if mode == "full":
+            written += os.path.getsize(path)
+        elif state._checkpoint is checkpoint:
+            written += state._checkpoint.size - size
+        else:
+            written += state._checkpoint.size  # A new snapshot
+
+    started = time.perf_counter()
+    loaded = CrawlState.load(path)
+    resume = time.perf_counter() - started
+    return state, loaded, saves, saving, written, os.path.getsize(path), resume
+
+
+def fingerprint(state: CrawlState):
+    return (len(state.knowledge_base), len(state.pending_links), sorted(state.crawled_urls)[-1],
+            sum(state.term_frequencies.values()), sum(map(len, state.documents_with_terms.values())),
+            state.total_documents, state.crawl_order[-1],
+            None if state.kb_embeddings is None else float(np.asarray(state.kb_embeddings).sum()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=10_000)
+    parser.add_argument("--words", type=int, default=200, help="Words per page")
+    parser.add_argument("--save-every", type=int, default=10, help="Pages crawled between saves")
+    parser.add_argument("--dim", type=int, default=0, help="Embedding dimensions per page (0 for none)")
+    parser.add_argument("--modes", default="full,checkpoint")
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages, args.words)
+    print(f"{args.pages} pages of {args.words} words, saved every {args.save_every} pages"
+          + (f", {args.dim}-dim embeddings" if args.dim else ""))
+
+    fingerprints = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in args.modes.split(","):
+            state, loaded, saves, saving, written, size, resume = run(
+                pages, args.save_every, args.dim, os.path.join(directory, f"{mode}.json"), mode)
+            fingerprints[mode] = fingerprint(loaded)
+            assert fingerprints[mode] == fingerprint(state), f"{mode} resumed a different state"
+            print(f"{mode:>10}: {saves} saves in {saving:.2f}s ({saving / saves * 1000:.1f} ms each), "
+                  f"{written / 2 ** 20:.0f} MiB written, file {size / 2 ** 20:.1f} MiB, resume {resume:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Measure what per-stage crawl timing costs per crawl.
+
+Runs --crawls simulated crawls through the same instrumentation AsyncWebCrawler
+uses (a CrawlTimer, timed() blocks for the cache and fetch, Laps for the
+browser steps, the stages reported by HTML processing) and adds each crawl's
+timings to a StageHistograms, as dispatchers and CrawlerMonitor do. The crawl
+itself does no work, so the time per crawl is all overhead; it is compared with
+the same loop without instrumentation, then the Prometheus export is timed.
+
+Usage:
+    python tests/benchmarks/bench_crawl_timing.py --crawls 200000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from crawl4ai.crawl_timing import CrawlTimer, Laps, StageHistograms, record_stages, timed  # noqa: E402
+
+BROWSER_STEPS = ("fetch.page_setup", "fetch.navigate", "fetch.wait", "fetch.scroll", "fetch.js",
+                 "fetch.wait", "fetch.content", "fetch.export")
+
+
+async def instrumented(crawls: int, histograms: StageHistograms):
+    for _ in range(crawls):
+        timer = CrawlTimer().start()
+        try:
+            with timed("cache_read"):
+                pass
+            with timed("fetch"):
+                laps = Laps()
+                for step in BROWSER_STEPS:
+                    laps.lap(step)
+            record_stages({"scrape": 0.01, "markdown": 0.005})
+            with timed("cache_write"):
+                pass
+        finally:
+            timer.finish()
+        histograms.observe_timings(timer.stages, True)
+
+
+async def bare(crawls: int):
+    for _ in range(crawls):
+        try:
+            for _step in BROWSER_STEPS:
+                pass
+        finally:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--crawls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    asyncio.run(bare(args.crawls))
+    baseline = time.perf_counter() - started
+
+    histograms = StageHistograms()
+    started = time.perf_counter()
+    asyncio.run(instrumented(args.crawls, histograms))
+    elapsed = time.perf_counter() - started
+
+    per_crawl = (elapsed - baseline) / args.crawls
+    print(f"{args.crawls} crawls, {len(histograms.stages())} stages each")
+    print(f"instrumentation: {per_crawl * 1e6:.2f} µs per crawl")
+
+    started = time.perf_counter()
+    text = histograms.to_prometheus()
+    print(f"prometheus export: {(time.perf_counter() - started) * 1000:.2f} ms, {len(text.splitlines())} lines")
+    started = time.perf_counter()
+    summary = histograms.summary()
+    print(f"summary: {(time.perf_counter() - started) * 1000:.2f} ms")
+    for stage, row in list(summary.items())[:3]:
+        print(f"  {stage:>16}: p50 {row['p50'] * 1e6:.1f} µs, p99 {row['p99'] * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Measure EmbeddingStrategy's coverage bookkeeping as the knowledge base grows.
+
+Adds --docs documents in batches of --batch (random --dim vectors) and, after
+each batch, computes every query point's best similarity, as confidence, gap
+scoring and validation do on each iteration:
+
+- brute force: the former code, normalising the whole knowledge base and
+  multiplying it with the queries every time
+- index: VectorIndex.coverage(), which only compares the queries with the
+  vectors added since the previous call
+
+Then embeds --links link texts twice through BatchedEmbedder with a
+HashingEmbedder, to show the second evaluation is served from the cache.
+
+Usage:
+    python tests/benchmarks/bench_embedding_index.py --docs 20000 --queries 40
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from crawl4ai.embedding_index import BatchedEmbedder, EmbeddingCache, HashingEmbedder, VectorIndex  # noqa: E402
+
+
+def brute_force(queries, kb):
+    q = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    d = kb / np.linalg.norm(kb, axis=1, keepdims=True)
+    return (q @ d.T).max(axis=1)
+
+
+async def embed_twice(links: int, path: str):
+    embedder = HashingEmbedder(dim=384)
+    batched = BatchedEmbedder(embedder, cache=EmbeddingCache(path), batch_size=64)
+    texts = [f"link {i} about topic {i % 97} and section {i % 13}" for i in range(links)]
+    timings = []
+    for _ in range(2):
+        started = time.perf_counter()
+        await batched(texts)
+        timings.append(time.perf_counter() - started)
+    return timings, embedder.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=10, help="Documents added per iteration")
+    parser.add_argument("--queries", type=int, default=40)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--links", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+    batches = [rng.normal(size=(args.batch, args.dim)).astype(np.float32) for _ in range(args.docs // args.batch)]
+
+    kb = np.empty((0, args.dim), dtype=np.float32)
+    brute_time = 0.0
+    for batch in batches:
+        kb = np.vstack([kb, batch])
+        started = time.perf_counter()
+        expected = brute_force(queries, kb)
+        brute_time += time.perf_counter() - started
+
+    index = VectorIndex()
+    index_time = 0.0
+    for batch in batches:
+        started = time.perf_counter()
+        index.add(batch)
+        best = index.coverage(queries)
+        index_time += time.perf_counter() - started
+
+    assert np.allclose(best, expected, atol=1e-4)
+    print(f"{len(kb)} documents in {len(batches)} updates, {args.queries} queries, {args.dim} dims")
+    print(f"brute force: {brute_time:.2f}s, {brute_time / len(batches) * 1000:.2f} ms per update")
+    print(f"      index: {index_time:.2f}s, {index_time / len(batches) * 1000:.3f} ms per update")
+
+    with tempfile.TemporaryDirectory() as directory:
+        (first, second), calls = asyncio.run(embed_twice(args.links, os.path.join(directory, "embeddings.db")))
+    print(f"{args.links} link texts: first pass {first * 1000:.0f} ms ({calls} embedding calls), "
+          f"second pass {second * 1000:.0f} ms from the cache")
+
+
+if __name__ == "__main__":
+    main()
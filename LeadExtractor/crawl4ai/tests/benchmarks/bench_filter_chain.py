@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Compare deep-crawl link filtering: filters applied one by one vs the compiled plan.
+
+Generates --links synthetic links over a few hundred hosts (pages of --page-size
+links, as link discovery sees them) and filters them with a typical chain: a
+domain allow/block list, a content-type filter and two URL pattern filters
+with globs, prefixes, suffixes and regexes. Modes:
+
+- per-filter: the former FilterChain.apply, every filter parsing each URL again,
+  awaited once per link
+- per-link: FilterChain.apply, the compiled plan on one URL at a time
+- batch: FilterChain.apply_batch, the compiled plan on each page's links
+
+Every filter's lru_cache is cleared first so repeated runs don't measure
+cache hits; all modes must agree on every link.
+
+Usage:
+    python tests/benchmarks/bench_filter_chain.py --links 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from crawl4ai.deep_crawling.filters import (  # noqa: E402
+    ContentTypeFilter,
+    DomainFilter,
+    FilterChain,
+    URLPatternFilter,
+)
+
+SECTIONS = ["docs", "blog", "api", "apiv2", "products", "careers", "static", "news", "tags", "search"]
+EXTENSIONS = ["", "", "", ".html", ".htm", ".php", ".pdf", ".png", ".jpg", ".css", ".js", ".zip"]
+
+
+def make_links(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    hosts = [f"{sub}.site{n}.{tld}" for n in range(60) for sub, tld in
+             (("www", "com"), ("docs", "com"), ("cdn", "net"), ("blog", "org"), ("shop", "io"))]
+    hosts += ["tracker.ads.com", "evil.example", "example.com", "www.example.com"]
+    links = []
+    for _ in range(count):
+        path = "/".join(rng.choice(SECTIONS) for _ in range(rng.randint(1, 4)))
+        url = f"https://{rng.choice(hosts)}/{path}/{rng.randrange(10 ** 6)}{rng.choice(EXTENSIONS)}"
+        if rng.random() < 0.2:
+            url += f"?page={rng.randrange(100)}&ref=nav"
+        links.append(url)
+    return links
+
+
+def make_filters():
+    allowed = [f"site{n}.com" for n in range(0, 60, 2)] + [f"site{n}.org" for n in range(60)] + ["example.com"]
+    return [
+        DomainFilter(allowed_domains=allowed, blocked_domains=["docs.site4.com", "ads.com", "evil.example"]),
+        ContentTypeFilter(["text/html", "application/x-httpd-php"]),
+        URLPatternFilter(["*/careers/*", "*/search/*", "*.php", r"^https://[^/]+/tags/\d+"], reverse=True),
+        URLPatternFilter(["*/docs/*", "*/blog/**", "*/api/*", "*.html", "https://example.com/products/*",
+                          "*://*.site8.com/*", "*news*[0-9]"]),
+    ]
+
+
+def clear_caches(filters):
+    ContentTypeFilter._extract_extension.cache_clear()
+    DomainFilter._extract_domain.cache_clear()
+    for f in filters:
+        for attr in ("apply", "_check_url_cached"):
+            method = getattr(type(f), attr, None)
+            if hasattr(method, "cache_clear"):
+                method.cache_clear()
+
+
+async def per_filter(filters, links):
+    """The former FilterChain.apply."""
+    async def apply(url):
+        for f in filters:
+            if not f.apply(url):
+                return False
+        return True
+
+    return [await apply(url) for url in links]
+
+
+async def per_link(chain, links):
+    return [await chain.apply(url) for url in links]
+
+
+async def batch(chain, links, page_size):
+    verdicts = []
+    for start in range(0, len(links), page_size):
+        verdicts += await chain.apply_batch(links[start:start + page_size])
+    return verdicts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--links", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=200, help="Links per page")
+    parser.add_argument("--modes", default="per-filter,per-link,batch")
+    args = parser.parse_args()
+
+    links = make_links(args.links)
+    print(f"{len(links)} links, {len({url.split('/')[2] for url in links})} hosts, {args.page_size} links per page")
+
+    verdicts = {}
+    for mode in args.modes.split(","):
+        filters = make_filters()
+        clear_caches(filters)
+        chain = FilterChain(filters)
+        started = time.perf_counter()
+        if mode == "per-filter":
+            verdicts[mode] = asyncio.run(per_filter(filters, links))
+        elif mode == "per-link":
+            verdicts[mode] = asyncio.run(per_link(chain, links))
+        else:
+            verdicts[mode] = asyncio.run(batch(chain, links, args.page_size))
+        elapsed = time.perf_counter() - started
+        print(f"{mode:>10}: {elapsed:.2f}s, {len(links) / elapsed / 1000:.0f}k links/s, "
+              f"{sum(verdicts[mode])} passed")
+
+    reference = next(iter(verdicts.values()))
+    assert all(v == reference for v in verdicts.values()), "Modes disagree on verdicts"
+
+
+if __name__ == "__main__":
+    main()
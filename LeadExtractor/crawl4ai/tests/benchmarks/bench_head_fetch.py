@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Measure head extraction throughput of AsyncUrlSeeder against a local HTTP
+server (no network access needed).
+
+Every URL serves the same synthetic page: a <head> (title, meta, links,
+JSON-LD, inline style and script, --head-kb in total) followed by a large
+body. The server gzip-compresses responses when the client accepts it and
+sends them in chunks at --kbps per connection, so what a client doesn't read
+costs neither time nor bandwidth. The page cache of the seeder is a fresh
+directory per run, so every head is fetched.
+
+Reported: heads per second, and the bytes the server sent before the client
+closed the connection.
+
+Usage:
+    python tests/benchmarks/bench_head_fetch.py --urls 100000 --concurrency 100
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from crawl4ai.async_configs import SeedingConfig  # noqa: E402
+from crawl4ai.async_url_seeder import AsyncUrlSeeder  # noqa: E402
+
+
+def build_page(head_kb: int, body_kb: int) -> bytes:
+    rng = random.Random(1)
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 10)))
+                  for _ in range(5000)]
+
+    def text(size: int) -> str:
+        words = []
+        while sum(len(w) + 1 for w in words) < size:
+            words.append(rng.choice(vocabulary))
+        return " ".join(words)
+
+    meta = "".join(
+        f'<meta name="keyword-{i}" content="{text(60)}">' for i in range(20)
+    )
+    links = "".join(f'<link rel="alternate" hreflang="l{i}" href="/l{i}/page">' for i in range(10))
+    jsonld = json.dumps({"@context": "https://schema.org", "@type": "Article", "headline": text(80),
+                         "author": {"@type": "Person", "name": "Someone"}, "keywords": text(300).split()})
+    head = (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        "<title>Benchmark page for head extraction</title>"
+        f'<meta name="description" content="{text(150)}">'
+        f'{meta}{links}<script type="application/ld+json">{jsonld}</script>'
+    )
+    # Inline CSS and JavaScript make up the rest of the head, as on many sites
+    filler = max(0, head_kb * 1024 - len(head))
+    style = "".join(f".{w} {{ margin: {i % 17}px; color: #{i % 4096:03x}; }}\n"
+                    for i, w in enumerate(rng.choice(vocabulary) for _ in range(filler // 80)))
+    script = "var config = {" + ",".join(f'"{w}{i}": "{rng.choice(vocabulary)}"'
+                                         for i, w in enumerate(rng.choice(vocabulary) for _ in range(filler // 50))) + "};"
+    head += f"<style>{style[:filler // 2]}</style><script>{script[:filler // 2]}</script></head>"
+    paragraphs = "".join(f"<p>{text(1000)}</p>" for _ in range(body_kb))
+    return (head + f"<body>{paragraphs}</body></html>").encode()
+
+
+def _serve(page: bytes, chunk_size: int, kbps: int, port: int, ports, sent):
+    compressed = gzip.compress(page, compresslevel=6)
+
+    async def handle(reader, writer):
+        written = 0
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                use_gzip = b"gzip" in request.lower().split(b"accept-encoding:", 1)[-1].split(b"\r\n", 1)[0]
+                body = compressed if use_gzip else page
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                    + (b"Content-Encoding: gzip\r\n" if use_gzip else b"")
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                )
+                for start in range(0, len(body), chunk_size):
+                    await asyncio.sleep(chunk_size / 1024 / kbps)
+                    if writer.is_closing():
+                        raise ConnectionResetError
+                    writer.write(body[start:start + chunk_size])
+                    await writer.drain()
+                    written += min(chunk_size, len(body) - start)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            with sent.get_lock():
+                sent.value += written
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", port, backlog=4096, reuse_port=True)
+        ports.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def serve(page: bytes, kbps: int, processes: int, chunk_size: int = 8192):
+    """Serve `page` from other processes sharing one port, so the server doesn't slow the client."""
+    ports = multiprocessing.Queue()
+    sent = multiprocessing.Value("q", 0)
+    workers = []
+    port = 0
+    for _ in range(processes):
+        worker = multiprocessing.Process(
+            target=_serve, args=(page, chunk_size, kbps, port, ports, sent), daemon=True)
+        worker.start()
+        workers.append(worker)
+        port = ports.get(timeout=30)
+    return workers, port, sent
+
+
+async def run(base: str, n_urls: int, concurrency: int):
+    urls = [f"{base}/articles/benchmark-page-{i}" for i in range(n_urls)]
+    with tempfile.TemporaryDirectory() as directory:
+        seeder = AsyncUrlSeeder(base_directory=directory, cache_root=os.path.join(directory, "cache"))
+        config = SeedingConfig(extract_head=True, concurrency=concurrency, verbose=False)
+        started = time.perf_counter()
+        results = await seeder.extract_head_for_urls(urls, config=config, concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+        await seeder.close()
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--urls", type=int, default=20000, help="Heads to fetch")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--head-kb", type=int, default=48, help="Size of the page's <head>")
+    parser.add_argument("--body-kb", type=int, default=200, help="Size of the page body after </head>")
+    parser.add_argument("--kbps", type=int, default=1000, help="Bandwidth of each connection, in kB/s")
+    parser.add_argument("--server-processes", type=int, default=1, help="Server processes sharing the port")
+    args = parser.parse_args()
+
+    page = build_page(args.head_kb, args.body_kb)
+    servers, port, sent = serve(page, args.kbps, args.server_processes)
+    try:
+        results, elapsed = asyncio.run(run(f"http://127.0.0.1:{port}", args.urls, args.concurrency))
+    finally:
+        for server in servers:
+            server.terminate()
+
+    valid = [r for r in results if r.get("status") == "valid"]
+    titled = sum(1 for r in valid if r["head_data"].get("title"))
+    print(f"page: {len(page) / 1024:.0f} kB ({len(gzip.compress(page)) / 1024:.0f} kB gzipped), "
+          f"head {page.index(b'</head>') / 1024:.1f} kB")
+    print(f"{len(valid)}/{args.urls} heads ({titled} with a title) in {elapsed:.2f}s: "
+          f"{len(valid) / elapsed:,.0f} heads/s")
+    print(f"server sent {sent.value / 1e6:.1f} MB ({sent.value / max(1, args.urls) / 1024:.1f} kB per URL)")
+
+
+if __name__ == "__main__":
+    main()
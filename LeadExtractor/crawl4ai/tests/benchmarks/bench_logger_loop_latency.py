@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Measure how much AsyncLogger's file output delays the event loop.
+
+--tasks coroutines each "crawl" --urls-per-task URLs, logging three lines
+(FETCH, SCRAPE, COMPLETE) per URL like a verbose crawl does, and yielding to
+the loop in between. A ticker coroutine sleeps 1 ms at a time and records how
+late it wakes up: that lateness is what every other coroutine (network I/O,
+timeouts) waits on too.
+
+Modes:
+- off: no log file
+- per-message: the former file output, which opened, appended to and closed
+  the file for every message on the loop thread
+- buffered: the background writer (LogFileWriter)
+
+Console output is off in every mode, so only the file output is compared.
+
+Usage:
+    python tests/benchmarks/bench_logger_loop_latency.py --tasks 50 --urls-per-task 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from rich.text import Text  # noqa: E402
+
+from crawl4ai.async_logger import AsyncLogger  # noqa: E402
+
+
+class PerMessageFileLogger(AsyncLogger):
+    """AsyncLogger with the file output it had before the background writer."""
+
+    def _write_to_file(self, message: str):
+        if self.log_file:
+            text = Text.from_markup(message)
+            plain_text = text.plain
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            with open(self.log_file, "a", encoding="utf-8") as f:
+                f.write(f"[{timestamp}] {plain_text}\n")
+
+
+async def crawl(logger, task: int, urls: int):
+    for i in range(urls):
+        url = f"https://example.com/section-{task}/article-{i}"
+        logger.url_status(url, True, 0.42, tag="FETCH")
+        await asyncio.sleep(0)
+        logger.info("Scraped {url} | {words} words", tag="SCRAPE", params={"url": url, "words": 1234})
+        await asyncio.sleep(0)
+        logger.url_status(url, True, 0.57, tag="COMPLETE")
+        await asyncio.sleep(0)
+
+
+async def measure(logger, tasks: int, urls: int):
+    lateness = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lateness.append(time.perf_counter() - started - 0.001)
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(crawl(logger, t, urls) for t in range(tasks)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick
+    flush = getattr(logger, "flush", None)
+    if flush is not None:
+        flush()
+    return elapsed, lateness
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=50, help="Concurrent crawl coroutines")
+    parser.add_argument("--urls-per-task", type=int, default=200)
+    parser.add_argument("--modes", default="off,per-message,buffered")
+    args = parser.parse_args()
+
+    messages = args.tasks * args.urls_per_task * 3
+    print(f"{messages} log messages from {args.tasks} tasks")
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in args.modes.split(","):
+            log_file = None if mode == "off" else os.path.join(directory, f"{mode}.log")
+            cls = PerMessageFileLogger if mode == "per-message" else AsyncLogger
+            logger = cls(log_file=log_file, verbose=False)
+            elapsed, lateness = asyncio.run(measure(logger, args.tasks, args.urls_per_task))
+            lateness.sort()
+            p99 = lateness[int(len(lateness) * 0.99)] if lateness else 0.0
+            print(
+                f"{mode:>12}: {elapsed:.2f}s, {messages / elapsed:,.0f} messages/s, loop lateness "
+                f"median {statistics.median(lateness) * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms, "
+                f"max {lateness[-1] * 1000:.2f} ms"
+            )
+            if log_file:
+                with open(log_file, encoding="utf-8") as f:
+                    assert sum(1 for _ in f) == messages
+                if hasattr(logger, "close"):
+                    logger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Compare DefaultMarkdownGenerator (html2text on the HTML string) with
+LXMLMarkdownGenerator (html2text rules driven by the parsed lxml tree) on a
+directory of saved pages.
+
+Every page is scraped once with LXMLWebScrapingStrategy; both generators then
+convert the same cleaned HTML. The lxml generator reads the tree of a shared
+HTMLDocument, as it does inside the crawler, so the timing excludes parsing
+(the tree is already there from the earlier post-processing stages) unless
+--include-parse is given.
+
+Usage:
+    python tests/benchmarks/bench_markdown.py path/to/pages --repeat 5
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy  # noqa: E402
+from crawl4ai.html_document import HTMLDocument  # noqa: E402
+from crawl4ai.markdown_generation_strategy import (  # noqa: E402
+    DefaultMarkdownGenerator,
+    LXMLMarkdownGenerator,
+)
+
+FIELDS = ("raw_markdown", "markdown_with_citations", "references_markdown")
+
+
+def load_pages(directory: str, base_url: str):
+    paths = sorted(glob.glob(os.path.join(directory, "**", "*.htm*"), recursive=True))
+    scraper = LXMLWebScrapingStrategy()
+    pages = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            html = f.read()
+        pages.append((path, scraper.scrap(base_url, html).cleaned_html))
+    return pages
+
+
+def run(generator, pages, base_url, repeat, include_parse):
+    best = float("inf")
+    results = []
+    for _ in range(repeat):
+        documents = [HTMLDocument(html) for _, html in pages]
+        if not include_parse:
+            for document in documents:
+                document.tree
+        started = time.perf_counter()
+        results = [
+            generator.generate_markdown(document.html, base_url=base_url, document=document)
+            for document in documents
+        ]
+        best = min(best, time.perf_counter() - started)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directory", help="Directory with saved .html pages (searched recursively)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per generator; the best is reported")
+    parser.add_argument("--base-url", default="https://example.com/")
+    parser.add_argument("--include-parse", action="store_true", help="Count lxml parsing in the lxml timing")
+    args = parser.parse_args()
+
+    pages = load_pages(args.directory, args.base_url)
+    if not pages:
+        parser.error(f"no .html files under {args.directory}")
+    size = sum(len(html) for _, html in pages)
+    print(f"{len(pages)} pages, {size / 1e6:.2f}M characters of cleaned HTML")
+
+    default_time, expected = run(DefaultMarkdownGenerator(), pages, args.base_url, args.repeat, True)
+    lxml_time, actual = run(LXMLMarkdownGenerator(), pages, args.base_url, args.repeat, args.include_parse)
+
+    print(f"{'DefaultMarkdownGenerator':<26} {default_time:8.3f}s  {size / default_time / 1e6:6.2f} M chars/s")
+    print(f"{'LXMLMarkdownGenerator':<26} {lxml_time:8.3f}s  {size / lxml_time / 1e6:6.2f} M chars/s")
+    print(f"speedup: {default_time / lxml_time:.2f}x")
+
+    mismatches = 0
+    for (path, _), a, b in zip(pages, expected, actual):
+        for field in FIELDS:
+            if getattr(a, field) != getattr(b, field):
+                mismatches += 1
+                print(f"  output differs: {os.path.basename(path)} ({field})")
+    print(f"identical output: {len(pages) * len(FIELDS) - mismatches}/{len(pages) * len(FIELDS)}")
+
+
+if __name__ == "__main__":
+    main()
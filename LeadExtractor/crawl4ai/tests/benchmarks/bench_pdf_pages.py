@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Compare PDF page processing: one reader per page in threads vs worker processes.
+
+Generates a --pages page PDF (text, a link and, every --image-every pages, an
+image on each page; fonts and images shared across pages like in real
+documents) and processes it with:
+
+- threads: the former NaivePDFProcessorStrategy.process_batch, which ran each
+  page in a thread pool and parsed the whole file again for every page
+- sequential: process(), one reader, one page after another
+- processes: process_batch(), contiguous page ranges in --workers processes,
+  one reader per worker, images in a deferred second pass
+
+Usage:
+    python tests/benchmarks/bench_pdf_pages.py --pages 500 --workers 4
+"""
+import argparse
+import concurrent.futures
+import os
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from crawl4ai.processors.pdf.processor import NaivePDFProcessorStrategy  # noqa: E402
+
+
+def write_pdf(path: Path, pages: int, lines_per_page: int = 45, image_every: int = 10) -> None:
+    """Write a simple multi-page PDF without third-party libraries."""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    page_tree = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pixels = zlib.compress(bytes((x * 16) % 256 for x in range(32 * 32 * 3)))
+    image = add(
+        b"<< /Type /XObject /Subtype /Image /Width 32 /Height 32 /ColorSpace /DeviceRGB "
+        b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>\nstream\n" % len(pixels)
+        + pixels + b"\nendstream"
+    )
+
+    kids = []
+    for number in range(1, pages + 1):
+        lines = [
+            f"Page {number} line {line}: the quick brown fox jumps over the lazy dog, "
+            f"section {number}.{line} of the generated benchmark document."
+            for line in range(lines_per_page)
+        ]
+        text = b"BT /F1 9 Tf 11 TL 40 760 Td " + b" ".join(b"(%s) Tj T*" % line.encode() for line in lines) + b" ET"
+        has_image = image_every and number % image_every == 0
+        if has_image:
+            text += b" q 64 0 0 64 480 700 cm /Im1 Do Q"
+        content = add(b"<< /Length %d >>\nstream\n" % len(text) + text + b"\nendstream")
+        link = add(
+            b"<< /Type /Annot /Subtype /Link /Rect [40 20 200 35] "
+            b"/A << /S /URI /URI (https://example.com/doc/page-%d) >> >>" % number
+        )
+        xobjects = b" /XObject << /Im1 %d 0 R >>" % image if has_image else b""
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >>%s >> /Annots [%d 0 R] >>"
+            % (page_tree, content, font, xobjects, link)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+    objects[page_tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    path.write_bytes(bytes(out))
+
+
+def process_threads_reparsing(strategy: NaivePDFProcessorStrategy, pdf_path: Path):
+    """The former process_batch: a thread per page, each parsing the file again."""
+    from pypdf import PdfReader
+
+    total_pages = len(PdfReader(str(pdf_path)).pages)
+
+    def process_page(index):
+        with pdf_path.open("rb") as file:
+            page = PdfReader(file).pages[index]
+            strategy.current_page_number = index + 1
+            return strategy._process_page(page, None)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=strategy.batch_size) as executor:
+        return list(executor.map(process_page, range(total_pages)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--image-every", type=int, default=10, help="Put an image on every Nth page (0: none)")
+    parser.add_argument("--images", action="store_true", help="Extract images too")
+    parser.add_argument("--modes", default="threads,sequential,processes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = Path(directory) / "generated.pdf"
+        write_pdf(pdf_path, args.pages, image_every=args.image_every)
+        print(f"{args.pages} pages, {pdf_path.stat().st_size / 1e6:.1f} MB, {args.workers} workers, "
+              f"{os.cpu_count()} CPUs, images {'on' if args.images else 'off'}")
+
+        texts = {}
+        for mode in args.modes.split(","):
+            strategy = NaivePDFProcessorStrategy(extract_images=args.images, batch_size=args.workers)
+            started = time.perf_counter()
+            if mode == "threads":
+                pages = process_threads_reparsing(strategy, pdf_path)
+            elif mode == "sequential":
+                pages = strategy.process(pdf_path).pages
+            else:
+                pages = strategy.process_batch(pdf_path).pages
+            elapsed = time.perf_counter() - started
+
+            first = None
+            if mode == "processes":
+                started = time.perf_counter()
+                first = next(iter(strategy.iter_pages(pdf_path)))
+                first = time.perf_counter() - started
+            texts[mode] = [page.raw_text for page in pages]
+            images = sum(len(page.images) for page in pages)
+            line = f"{mode:>10}: {elapsed:.2f}s, {len(pages) / elapsed:.0f} pages/s, {images} images"
+            if first is not None:
+                line += f", first page streamed after {first * 1000:.0f} ms"
+            print(line)
+
+        reference = next(iter(texts.values()))
+        assert all(pages == reference for pages in texts.values()), "Modes disagree on page text"
+
+
+if __name__ == "__main__":
+    main()
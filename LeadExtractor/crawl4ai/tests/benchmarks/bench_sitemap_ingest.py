@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Measure sitemap ingestion of AsyncUrlSeeder on a synthetic site served from
+memory by a local HTTP server (no network access needed).
+
+The site has a sitemap index pointing to --children gzipped sitemaps that
+together list --urls URLs. Every response waits --latency seconds before the
+body is sent, like a remote server would. The index is ingested once per
+--concurrency value; the time to the first URL, the total time and the rate
+are reported for each. With --memory the peak Python memory (tracemalloc) is
+reported too, at the cost of much slower runs.
+
+Usage:
+    python tests/benchmarks/bench_sitemap_ingest.py --urls 1000000 --children 200 --concurrency 1,8
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from crawl4ai.async_url_seeder import AsyncUrlSeeder  # noqa: E402
+
+NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def build_site(n_urls: int, n_children: int):
+    files = {}
+    per_child = -(-n_urls // n_children)
+    for c in range(n_children):
+        start, stop = c * per_child, min(n_urls, (c + 1) * per_child)
+        entries = "".join(
+            f"<url><loc>https://example.com/section-{c}/page-{i}</loc><lastmod>2024-01-01</lastmod></url>"
+            for i in range(start, stop)
+        )
+        body = f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="{NS}">{entries}</urlset>'
+        files[f"/sitemaps/{c}.xml.gz"] = gzip.compress(body.encode(), compresslevel=6)
+    return files
+
+
+def serve(files, latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = files.get(self.path)
+            time.sleep(latency)
+            if body is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def ingest(index_url: str, concurrency: int, memory: bool):
+    seeder = AsyncUrlSeeder()
+    seeder._sitemap_concurrency = concurrency
+    count = 0
+    first = None
+    peak = None
+    if memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        async for _ in seeder._iter_sitemap(index_url):
+            if first is None:
+                first = time.perf_counter() - started
+            count += 1
+        total = time.perf_counter() - started
+        if memory:
+            _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if memory:
+            tracemalloc.stop()
+        await seeder.close()
+    return count, first, total, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--urls", type=int, default=1_000_000, help="URLs listed in all sitemaps")
+    parser.add_argument("--children", type=int, default=200, help="Sitemaps in the index")
+    parser.add_argument("--concurrency", default="1,8", help="Comma-separated sitemap_concurrency values")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before each response")
+    parser.add_argument("--memory", action="store_true", help="Trace the peak Python memory of each run")
+    args = parser.parse_args()
+
+    files = build_site(args.urls, args.children)
+    server = serve(files, args.latency)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    index = "".join(f"<sitemap><loc>{base}{path}</loc></sitemap>" for path in files)
+    files["/sitemap.xml"] = f'<?xml version="1.0"?><sitemapindex xmlns="{NS}">{index}</sitemapindex>'.encode()
+    size = sum(len(body) for body in files.values())
+    print(f"{args.urls} URLs in {args.children} sitemaps, {size / 1e6:.1f} MB gzipped")
+
+    try:
+        for concurrency in (int(value) for value in args.concurrency.split(",")):
+            count, first, total, peak = asyncio.run(ingest(f"{base}/sitemap.xml", concurrency, args.memory))
+            line = (
+                f"concurrency {concurrency:>3}: {count} URLs, first after {first:.3f}s, "
+                f"total {total:.2f}s, {count / total:,.0f} URLs/s"
+            )
+            if peak is not None:
+                line += f", peak {peak / 1e6:.1f} MB"
+            print(line)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Tests for vectorized BM25 scoring, memoized stemming and the one-pass pruning metrics.
+"""
+import random
+
+import pytest
+from rank_bm25 import BM25Okapi
+from snowballstemmer import stemmer
+
+from crawl4ai.bm25 import CachedStemmer, bm25_scores
+from crawl4ai.content_filter_strategy import PruningContentFilter
+from crawl4ai.html_document import HTMLDocument, end_tag, get_stripped_text, start_tag, to_html
+
+
+def test_scores_match_rank_bm25():
+    rng = random.Random(7)
+    words = [f"w{i}" for i in range(40)]
+    for _ in range(20):
+        corpus = [
+            [rng.choice(words[: rng.randint(3, 40)]) for _ in range(rng.randint(0, 30))]
+            for _ in range(rng.randint(1, 25))
+        ]
+        if not any(corpus):
+            continue
+        query = [rng.choice(words) for _ in range(rng.randint(1, 6))] + ["unknown"]
+        expected = BM25Okapi(corpus).get_scores(query)
+        assert bm25_scores(corpus, query) == pytest.approx(expected)
+
+
+def test_scores_edge_cases():
+    assert list(bm25_scores([], ["a"])) == []
+    assert list(bm25_scores([[], []], ["a"])) == [0, 0]
+    assert list(bm25_scores([["a"], ["b"]], [])) == [0, 0]
+    assert list(bm25_scores([["a"], ["b"]], ["c"])) == [0, 0]
+
+
+def test_cached_stemmer():
+    words = "running runs ran easily fairly running generously".split()
+    cached = CachedStemmer("english", max_size=3)
+    assert cached.stemWords(words) == stemmer("english").stemWords(words)
+    assert cached.stemWord("running") == "run"
+    assert len(cached._cache) <= 3
+
+
+def test_pruning_metrics_match_per_node_measures():
+    html = """
+    <html><body>
+      <div class="main" itemscope itemtype="http://schema.org/Thing">
+        <p>Text &amp; more &lt;text&gt; with&nbsp;entities and a <a href="/x?a=1&amp;b=2">link</a> tail</p>
+        <ul><li></li><li>item <b>bold</b></li></ul>
+        <img src="a.png" alt='say "hi"'><br>
+        <input type="checkbox" checked disabled>
+        <pre>  keep   spaces  </pre>
+        <template><p>hidden text</p></template>
+      </div>
+      plain tail
+    </body></html>
+    """
+    pruner = PruningContentFilter()
+    root = HTMLDocument(html).fork()
+    body = root.find("body")
+    pruner._collapse_whitespace(root)
+    metrics = pruner._node_metrics(body)
+    assert len(metrics) == len(list(body.iter()))
+    for node, (text_len, tag_len, spaces) in metrics.items():
+        text = get_stripped_text(node)
+        assert (text_len, tag_len, spaces) == (
+            len(text),
+            len(to_html(node)) - len(start_tag(node)) - len(end_tag(node)),
+            text.count(" "),
+        ), node.tag
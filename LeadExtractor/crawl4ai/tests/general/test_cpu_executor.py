@@ -0,0 +1,162 @@
+"""
+Tests for offloading HTML post-processing to CPUExecutor.
+"""
+import asyncio
+
+import pytest
+
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CPUExecutor
+from crawl4ai.async_logger import AsyncLogger
+from crawl4ai.content_filter_strategy import PruningContentFilter
+from crawl4ai.cpu_executor import picklable_params, process_html_content
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+
+HTML_SAMPLE = """
+<html>
+<head><title>Test Page</title></head>
+<body>
+    <h1>Test Content</h1>
+    <p>This is a test paragraph with <a href="/about">an internal link</a>
+    and <a href="https://other.example.org/">an external one</a>.</p>
+    <div class="container">
+        <p>This is content within a container, long enough to survive pruning
+        because it has plenty of words in it and very few links.</p>
+    </div>
+    <img src="https://example.com/image.png" alt="An example image">
+</body>
+</html>
+"""
+
+
+@pytest.fixture
+def markdown_generator():
+    return DefaultMarkdownGenerator(content_filter=PruningContentFilter())
+
+
+def test_picklable_params_drops_unused_objects():
+    """Strategy objects the worker doesn't need are dropped, plain data is kept."""
+    logger = AsyncLogger(verbose=False)
+    params = {
+        "word_count_threshold": 10,
+        "excluded_tags": ["nav"],
+        "extraction_strategy": object(),
+        "table_extraction": LXMLWebScrapingStrategy(logger=logger),
+        "custom_option": {"depth": 2},
+    }
+    subset = picklable_params(params)
+
+    assert subset["word_count_threshold"] == 10
+    assert subset["excluded_tags"] == ["nav"]
+    assert subset["custom_option"] == {"depth": 2}
+    assert "extraction_strategy" not in subset
+    assert subset["table_extraction"].logger is None
+    # The caller's object keeps its logger
+    assert params["table_extraction"].logger is logger
+
+
+@pytest.mark.asyncio
+async def test_worker_result_matches_in_process(markdown_generator):
+    """Scraping and markdown from a worker equal the in-process result."""
+    params = CrawlerRunConfig().__dict__.copy()
+    params.pop("url", None)
+    params = picklable_params(params)
+    expected = process_html_content(
+        "https://example.com", HTML_SAMPLE, LXMLWebScrapingStrategy(), markdown_generator, params
+    )
+
+    async with CPUExecutor(max_workers=1, min_html_size=0) as executor:
+        result = await executor.process_html(
+            "https://example.com", HTML_SAMPLE, LXMLWebScrapingStrategy(), markdown_generator, params
+        )
+        assert executor.stats["offloaded"] == 1
+
+    assert result["cleaned_html"] == expected["cleaned_html"]
+    assert result["links"] == expected["links"]
+    assert result["markdown"].raw_markdown == expected["markdown"].raw_markdown
+    assert result["markdown"].fit_markdown == expected["markdown"].fit_markdown
+
+
+@pytest.mark.asyncio
+async def test_small_pages_stay_in_process(markdown_generator):
+    """Pages under min_html_size skip the pool."""
+    executor = CPUExecutor(max_workers=1, min_html_size=10_000_000)
+    await executor.process_html(
+        "https://example.com", HTML_SAMPLE, LXMLWebScrapingStrategy(), markdown_generator, {}
+    )
+    assert executor.stats == {"offloaded": 0, "in_process": 1, "unpicklable": 0}
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_unpicklable_strategy_falls_back():
+    """A strategy that can't be pickled is processed in-process."""
+
+    class LocalStrategy(LXMLWebScrapingStrategy):
+        pass
+
+    async with CPUExecutor(max_workers=1, min_html_size=0) as executor:
+        result = await executor.process_html(
+            "https://example.com", HTML_SAMPLE, LocalStrategy(), None, {}
+        )
+        assert executor.stats["unpicklable"] == 1
+    assert "Test Content" in result["markdown"].raw_markdown
+
+
+@pytest.mark.asyncio
+async def test_back_pressure_limits_in_flight(markdown_generator):
+    """No more than max_pending pages are in flight; memory pressure lowers the limit."""
+    executor = CPUExecutor(max_workers=1, max_pending=2, min_html_size=0)
+    assert executor.limit == 2
+    executor.set_memory_pressure(True)
+    assert executor.limit == 1
+    executor.set_memory_pressure(False)
+
+    async with executor:
+        peak = 0
+
+        async def watch():
+            nonlocal peak
+            while True:
+                peak = max(peak, executor.in_flight)
+                await asyncio.sleep(0)
+
+        watcher = asyncio.create_task(watch())
+        await asyncio.gather(*(
+            executor.process_html(
+                "https://example.com", HTML_SAMPLE, LXMLWebScrapingStrategy(), markdown_generator, {}
+            )
+            for _ in range(6)
+        ))
+        watcher.cancel()
+
+    assert 1 <= peak <= 2
+    assert executor.in_flight == 0
+    assert not executor.saturated
+
+
+@pytest.mark.asyncio
+async def test_aprocess_html_uses_executor(tmp_path, markdown_generator):
+    """AsyncWebCrawler.aprocess_html returns the same result with and without the executor."""
+    config = CrawlerRunConfig(markdown_generator=markdown_generator)
+    kwargs = dict(
+        url="https://example.com",
+        html=HTML_SAMPLE,
+        extracted_content=None,
+        config=config,
+        screenshot_data=None,
+        pdf_data=None,
+        verbose=False,
+    )
+
+    crawler = AsyncWebCrawler(base_directory=str(tmp_path))
+    expected = await crawler.aprocess_html(**kwargs)
+
+    async with CPUExecutor(max_workers=1, min_html_size=0) as executor:
+        crawler = AsyncWebCrawler(base_directory=str(tmp_path), cpu_executor=executor)
+        result = await crawler.aprocess_html(**kwargs)
+        assert executor.stats["offloaded"] == 1
+
+    assert result.cleaned_html == expected.cleaned_html
+    assert result.markdown.raw_markdown == expected.markdown.raw_markdown
+    assert result.links == expected.links
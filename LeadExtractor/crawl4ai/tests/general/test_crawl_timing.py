@@ -0,0 +1,116 @@
+"""
+Tests for per-stage crawl timing (CrawlResult.timings) and its histograms.
+"""
+import asyncio
+import re
+import time
+
+import pytest
+
+from crawl4ai.async_configs import CrawlerRunConfig
+from crawl4ai.async_webcrawler import AsyncWebCrawler
+from crawl4ai.cache_context import CacheMode
+from crawl4ai.components.crawler_monitor import CrawlerMonitor
+from crawl4ai.crawl_timing import CrawlTimer, Laps, StageHistograms, current_timer, record_stage, timed
+from crawl4ai.models import AsyncCrawlResponse
+
+
+@pytest.mark.asyncio
+async def test_timers_are_per_task():
+    async def crawl(name, delay):
+        timer = CrawlTimer().start()
+        try:
+            with timed("fetch"):
+                await asyncio.sleep(delay)
+            record_stage("scrape", 1.0)
+            assert current_timer() is timer
+        finally:
+            timer.finish()
+        return name, timer.stages
+
+    results = dict(await asyncio.gather(crawl("slow", 0.05), crawl("fast", 0.0)))
+    assert results["slow"]["fetch"] >= 0.05 > results["fast"]["fetch"]
+    assert results["slow"]["scrape"] == results["fast"]["scrape"] == 1.0
+    assert results["slow"]["total"] >= results["slow"]["fetch"]
+    assert current_timer() is None
+
+    # Without a timer, nothing is recorded and nothing fails
+    with timed("fetch"):
+        record_stage("scrape", 1.0)
+
+
+def test_laps_charge_time_since_previous_lap():
+    timer = CrawlTimer().start()
+    try:
+        laps = Laps()
+        time.sleep(0.02)
+        laps.lap("fetch.navigate")
+        laps.lap("fetch.wait")
+        time.sleep(0.01)
+        laps.lap("fetch.wait")
+    finally:
+        timer.finish()
+    assert timer.stages["fetch.navigate"] >= 0.02
+    assert 0.01 <= timer.stages["fetch.wait"] < timer.stages["fetch.navigate"]
+
+
+def test_histogram_quantiles_and_prometheus_format():
+    histograms = StageHistograms(buckets=(0.1, 0.2, 0.5, 1.0))
+    for i in range(100):
+        histograms.observe_timings({"fetch": 0.1 + 0.4 * i / 100, "scrape": 0.05}, success=i % 10 != 0)
+    histograms.observe("fetch", 5.0)
+
+    assert histograms.count("fetch") == 101
+    assert 0.2 < histograms.quantile("fetch", 0.5) < 0.5
+    assert histograms.quantile("fetch", 0.999) == 5.0  # In +Inf: the largest observation
+    assert histograms.quantile("scrape", 0.99) == pytest.approx(0.05)  # Not the bucket's bound
+    assert histograms.quantile("extraction", 0.5) is None
+    summary = histograms.summary()
+    assert list(summary) == ["fetch", "scrape"]  # Slowest first
+    assert summary["scrape"]["mean"] == pytest.approx(0.05)
+
+    other = StageHistograms(buckets=(0.1, 0.2, 0.5, 1.0))
+    other.observe_timings({"scrape": 0.15}, success=True)
+    histograms.merge(other)
+    assert histograms.count("scrape") == 101
+    with pytest.raises(ValueError):
+        histograms.merge(StageHistograms(buckets=(1.0,)))
+
+    text = histograms.to_prometheus()
+    assert "# TYPE crawl4ai_stage_duration_seconds histogram" in text
+    assert 'crawl4ai_stage_duration_seconds_bucket{stage="scrape",le="0.1"} 100' in text
+    assert 'crawl4ai_stage_duration_seconds_bucket{stage="scrape",le="+Inf"} 101' in text
+    assert 'crawl4ai_stage_duration_seconds_count{stage="fetch"} 101' in text
+    assert 'crawl4ai_crawls_total{outcome="success"} 91' in text
+    assert 'crawl4ai_crawls_total{outcome="failure"} 10' in text
+    # Buckets are cumulative
+    counts = [int(n) for n in re.findall(r'stage="fetch",le="[^"]+"\} (\d+)', text)]
+    assert counts == sorted(counts)
+
+
+class FakeCrawlerStrategy:
+    async def crawl(self, url, config):
+        await asyncio.sleep(0.01)
+        html = "<html><head><title>t</title></head><body>" + "<p>Some text here.</p>" * 50 + "</body></html>"
+        return AsyncCrawlResponse(html=html, response_headers={}, status_code=200)
+
+
+@pytest.mark.asyncio
+async def test_crawl_result_carries_stage_timings(tmp_path, monkeypatch):
+    monkeypatch.setenv("CRAWL4_AI_BASE_DIRECTORY", str(tmp_path))
+    crawler = AsyncWebCrawler(crawler_strategy=FakeCrawlerStrategy())
+    crawler.ready = True  # Nothing to start
+    result = await crawler.arun("https://example.com/", config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS))
+
+    assert result.success
+    timings = result.timings
+    assert {"fetch", "scrape", "markdown", "total"} <= set(timings)
+    assert "cache_read" not in timings and "cache_write" not in timings  # Bypassed
+    assert timings["fetch"] >= 0.01
+    assert timings["total"] >= timings["fetch"] + timings["scrape"] + timings["markdown"]
+    assert current_timer() is None
+
+    monitor = CrawlerMonitor(enable_ui=False)
+    monitor.record_timings(timings, result.success)
+    assert monitor.get_stage_summary()["fetch"]["count"] == 1
+    assert 'crawl4ai_crawls_total{outcome="success"} 1' in monitor.to_prometheus()
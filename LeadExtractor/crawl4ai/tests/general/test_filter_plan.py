@@ -0,0 +1,130 @@
+"""
+Tests for FilterChain's compiled plan: batch evaluation must agree with the filters applied one by one.
+"""
+import itertools
+import re
+
+import pytest
+
+from crawl4ai.deep_crawling import BFSDeepCrawlStrategy
+from crawl4ai.deep_crawling.filters import (
+    ContentTypeFilter,
+    DomainFilter,
+    FilterChain,
+    URLFilter,
+    URLPatternFilter,
+)
+from crawl4ai.models import CrawlResult
+
+HOSTS = ["example.com", "www.example.com", "Docs.Example.com", "evil.com", "a.evil.com", "evil.com.cn", "site.org"]
+PATHS = ["", "/", "/api", "/api/", "/apiv2/x", "/api?x=1", "/api#top", "/docs/page.html", "/img/a.PNG",
+         "/file.pdf?x=y.html", "/a/b.tar.gz", "/blog/2023/05/post", "/q?u=http://evil.com/p", "/doc.html\n"]
+URLS = [scheme + host + path for scheme, host, path in itertools.product(["https://", "http://", ""], HOSTS, PATHS)]
+URLS += ["https:///evil.com/x", "http://", "https://evil.com?x=/a.html"]
+
+FILTER_SETS = [
+    lambda: [URLPatternFilter(["*.html", "*.pdf"])],
+    lambda: [URLPatternFilter(["https://example.com/api/*", "*.png"], reverse=True)],
+    lambda: [URLPatternFilter(["*://*.example.com/*", "https://example.com/api?x/*"])],
+    lambda: [URLPatternFilter([r"^https://.*\d{4}", "*/blog/**", "*{docs,img}*", re.compile("EVIL", re.I)])],
+    lambda: [DomainFilter(allowed_domains=["example.com"], blocked_domains=["docs.example.com"])],
+    lambda: [DomainFilter(blocked_domains="evil.com"), DomainFilter(allowed_domains=["example.com", "evil.com"])],
+    lambda: [ContentTypeFilter(["text/html", "pdf"])],
+    lambda: [
+        ContentTypeFilter("text/html"),
+        DomainFilter(blocked_domains=["evil.com"]),
+        URLPatternFilter(["*/api/*", "*.pdf"], reverse=True),
+        URLPatternFilter("*example*"),
+    ],
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_filters", FILTER_SETS)
+async def test_batch_matches_filters_applied_one_by_one(make_filters):
+    expected = [all(f.apply(url) for f in make_filters()) for url in URLS]
+    chain = FilterChain(make_filters())
+    assert await chain.apply_batch(URLS) == expected
+    assert [await chain.apply(url) for url in URLS[:40]] == expected[:40]
+    assert chain.stats.total_urls == len(URLS) + 40
+    assert chain.stats.passed_urls == sum(expected) + sum(expected[:40])
+
+
+@pytest.mark.asyncio
+async def test_backreferences_keep_their_group_numbers():
+    urls = ["xx", "ab", "xa", "https://example.com/docs/docs", "https://example.com/docs/api", "https://a.com/b.html"]
+    for patterns in ([r"^(a)b$", r"^(x)\1$"], [r"/(\w+)/\1$", "*.html", r"^ab$"]):
+        pattern_filter = URLPatternFilter(patterns)
+        expected = [pattern_filter.apply(url) for url in urls]
+        assert await FilterChain([URLPatternFilter(patterns)]).apply_batch(urls) == expected
+    assert URLPatternFilter([r"^(a)b$", r"^(x)\1$"]).apply("xx")
+
+
+class SlowFilter(URLFilter):
+    def __init__(self, rejected):
+        super().__init__()
+        self.rejected = rejected
+        self.seen = []
+
+    async def apply(self, url):
+        self.seen.append(url)
+        return url not in self.rejected
+
+
+class CallCountingFilter(URLFilter):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def apply(self, url):
+        self.calls += 1
+        return "keep" in url
+
+
+@pytest.mark.asyncio
+async def test_cheap_checks_run_first_and_async_filters_last():
+    slow = SlowFilter(rejected={"https://example.com/keep/2"})
+    custom = CallCountingFilter()
+    domain = DomainFilter(blocked_domains=["evil.com"])
+    chain = FilterChain([slow, custom, domain, ContentTypeFilter("text/html")])
+
+    urls = ["https://evil.com/keep", "https://example.com/keep/1", "https://example.com/keep/2",
+            "https://example.com/keep.pdf", "https://example.com/drop"]
+    assert await chain.apply_batch(urls) == [False, True, False, False, False]
+
+    assert custom.calls == 3  # After the extension and domain checks
+    assert slow.seen == urls[1:3]  # Only on the URLs every sync check passed
+    assert (domain.stats.total_urls, domain.stats.rejected_urls) == (4, 1)
+
+
+@pytest.mark.asyncio
+async def test_add_filter_recompiles_the_plan():
+    chain = FilterChain([DomainFilter(allowed_domains="example.com")])
+    assert await chain.apply("https://example.com/a.pdf")
+    chain.add_filter(ContentTypeFilter("text/html"))
+    assert not await chain.apply("https://example.com/a.pdf")
+    assert len(chain.filters) == 2
+
+
+@pytest.mark.asyncio
+async def test_link_discovery_filters_a_page_in_one_batch():
+    batches = []
+
+    class RecordingChain(FilterChain):
+        async def apply_batch(self, urls):
+            batches.append(list(urls))
+            return await super().apply_batch(urls)
+
+    strategy = BFSDeepCrawlStrategy(
+        max_depth=2, filter_chain=RecordingChain([URLPatternFilter("*/docs/*")])
+    )
+    links = ["https://example.com/docs/a", "https://example.com/blog", "https://example.com/docs/b",
+             "https://example.com/docs/a", "mailto:someone@example.com"]
+    result = CrawlResult(url="https://example.com/", html="", success=True,
+                         links={"internal": [{"href": href} for href in links]})
+    next_level, depths = [], {}
+    await strategy.link_discovery(result, "https://example.com/", 0, {"https://example.com/"}, next_level, depths)
+
+    assert [url for url, _ in next_level] == ["https://example.com/docs/a", "https://example.com/docs/b"]
+    assert batches == [links[:3]]  # Duplicates and invalid URLs don't reach the chain
+    assert strategy.stats.urls_skipped == 2
@@ -0,0 +1,86 @@
+"""
+Tests for the full page scan's step and time reporting, using a fake page (no browser needed).
+"""
+import pytest
+
+from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncPlaywrightCrawlerStrategy
+from crawl4ai.async_logger import AsyncLogger
+
+
+class FakePage:
+    """A page whose height grows by `growth` pixels each time the bottom is reached, `grows` times."""
+
+    def __init__(self, height=3000, growth=0, grows=0):
+        self.viewport_size = {"width": 1000, "height": 800}
+        self.height = height
+        self.growth = growth
+        self.grows = grows
+        self.position = 0
+        self.scripts = []
+
+    async def evaluate(self, expression, arg=None):
+        self.scripts.append((expression, arg))
+        if "scrollHeight}" in expression:
+            return {"width": 1000, "height": self.height}
+        if "window.scrollTo" in expression and arg is None:
+            self.position = int(expression.split("window.scrollTo(")[1].split(",")[1].split(")")[0])
+            if self.grows and self.position + 800 >= self.height:
+                self.grows -= 1
+                self.height += self.growth
+            return {"success": True}
+        return {"steps": 7, "elapsed": 0.4, "height": self.height, "addedNodes": 12, "reason": "plateau"}
+
+    async def wait_for_timeout(self, timeout):
+        pass
+
+
+@pytest.fixture
+def strategy():
+    return AsyncPlaywrightCrawlerStrategy(browser_config=BrowserConfig(), logger=AsyncLogger(verbose=False))
+
+
+@pytest.mark.asyncio
+async def test_scan_reports_steps(strategy):
+    page = FakePage(height=3000, growth=1000, grows=1)
+    report = await strategy._handle_full_page_scan(page, scroll_delay=0)
+
+    assert report["reason"] == "end"
+    assert report["height"] == 4000
+    assert report["steps"] == 4
+    assert page.position == 4000
+
+
+@pytest.mark.asyncio
+async def test_scan_stops_at_limits(strategy):
+    page = FakePage(height=100000)
+    report = await strategy._handle_full_page_scan(page, scroll_delay=0, max_scroll_steps=3)
+    assert report["reason"] == "max_steps"
+    assert report["steps"] == 3
+
+    report = await strategy._handle_full_page_scan(page, scroll_delay=0, time_budget=0)
+    assert report["reason"] == "time_budget"
+    assert report["steps"] == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_scan_runs_in_page(strategy):
+    page = FakePage(height=5000)
+    report = await strategy._handle_full_page_scan(
+        page, scroll_delay=0.2, max_scroll_steps=50, adaptive=True, time_budget=5
+    )
+
+    assert report == {"steps": 7, "elapsed": 0.4, "height": 5000, "reason": "plateau"}
+    script, options = next((script, arg) for script, arg in page.scripts if arg is not None)
+    assert "MutationObserver" in script
+    assert options["delay"] == 200
+    assert options["maxSteps"] == 50
+    assert options["timeBudget"] == 5000
+    assert page.position == 5000
+
+
+def test_config_round_trip():
+    config = CrawlerRunConfig(scan_full_page=True, adaptive_scroll=True, scroll_time_budget=10)
+    clone = config.clone()
+    assert clone.adaptive_scroll is True
+    assert clone.scroll_time_budget == 10
@@ -0,0 +1,122 @@
+"""
+Tests for streaming <head> extraction of AsyncUrlSeeder, served by an httpx mock transport (no network).
+"""
+import gzip
+import random
+import zlib
+
+import httpx
+import pytest
+
+from crawl4ai.async_url_seeder import HAS_BROTLI, AsyncUrlSeeder, _HeadReader, _parse_head
+
+HEAD = (
+    b'<!DOCTYPE html><html lang="de"><head><meta charset="utf-8">'
+    b"<title>First</title><title>Second</title>"
+    b'<meta name="description" content="About the page">'
+    b'<meta property="og:title" content="OG title">'
+    b'<link rel="canonical" href="https://example.com/page">'
+    b'<script type="application/ld+json">{"@type": "Article", "headline": "Hi"}</script>'
+    b"</head>"
+)
+# Random text, so the body stays large once compressed
+_rng = random.Random(0)
+BODY = "".join(f"<p>{_rng.getrandbits(64):x}</p>" for _ in range(5000)).encode()
+PAGE = HEAD + b"<body>" + BODY + b"</body></html>"
+
+
+def compress(body, encoding):
+    if encoding == "gzip":
+        return gzip.compress(body)
+    if encoding == "deflate":
+        return zlib.compress(body)
+    if encoding == "raw-deflate":
+        compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        return compressor.compress(body) + compressor.flush()
+    if encoding == "br":
+        import brotli
+        return brotli.compress(body)
+    return body
+
+
+class CountingStream(httpx.AsyncByteStream):
+    def __init__(self, body, chunk_size):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.sent = 0
+
+    async def __aiter__(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            self.sent += 1
+            yield self.body[start:start + self.chunk_size]
+
+
+def make_seeder(tmp_path, body, headers=None, chunk_size=1024):
+    streams = []
+
+    async def handle(request):
+        stream = CountingStream(body, chunk_size)
+        streams.append((request, stream))
+        return httpx.Response(200, headers=headers or {}, stream=stream)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    seeder = AsyncUrlSeeder(client=client, base_directory=tmp_path, cache_root=tmp_path / "cache")
+    return seeder, streams
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding", ["identity", "gzip", "deflate", "raw-deflate", "br"])
+async def test_compressed_heads_read_while_streaming(tmp_path, encoding):
+    if encoding == "br" and not HAS_BROTLI:
+        pytest.skip("brotli is not installed")
+    body = compress(PAGE, encoding)
+    header = "deflate" if encoding == "raw-deflate" else encoding
+    seeder, streams = make_seeder(tmp_path, body, {"Content-Encoding": header}, chunk_size=512)
+
+    ok, html, final_url = await seeder._fetch_head("https://example.com/page", timeout=5)
+
+    assert ok and final_url == "https://example.com/page"
+    assert html.endswith("</head>") and html.startswith("<!DOCTYPE html>")
+    request, stream = streams[0]
+    assert "gzip" in request.headers["Accept-Encoding"]
+    total_chunks = -(-len(body) // 512)
+    assert stream.sent < total_chunks  # Stopped reading after the head
+    await seeder.close()
+
+
+@pytest.mark.asyncio
+async def test_bogus_gzip_header_on_plain_body(tmp_path):
+    seeder, _ = make_seeder(tmp_path, PAGE, {"Content-Encoding": "gzip"})
+    ok, html, _ = await seeder._fetch_head("https://example.com/page", timeout=5)
+    assert ok and html.endswith("</head>")
+    await seeder.close()
+
+
+def test_head_end_split_between_chunks():
+    for split in range(len(HEAD) - 8, len(HEAD)):
+        reader = _HeadReader()
+        assert not reader.feed(PAGE[:split])
+        assert reader.feed(PAGE[split:split + 100])
+        assert reader.head() == HEAD
+
+
+def test_body_tag_and_max_bytes_end_the_head():
+    reader = _HeadReader()
+    assert reader.feed(b"<html><title>No head end</title><body class='x'><p>text</p>")
+    assert reader.head() == b"<html><title>No head end</title>"
+
+    reader = _HeadReader(max_bytes=4096)
+    assert not reader.feed(b"<html>" + b"x" * 2000)
+    assert reader.feed(b"x" * 3000)
+    assert reader.end is None and len(reader.head()) <= 10240
+
+
+def test_parse_head_fields():
+    info = _parse_head(HEAD.decode())
+    assert info["lang"] == "de"
+    assert info["title"] == "First"
+    assert info["charset"] == "utf-8"
+    assert info["meta"]["description"] == "About the page"
+    assert info["meta"]["og:title"] == "OG title"
+    assert info["link"]["canonical"][0]["href"] == "https://example.com/page"
+    assert info["jsonld"] == [{"@type": "Article", "headline": "Hi"}]
@@ -0,0 +1,168 @@
+"""
+Tests for the shared, parse-once HTMLDocument and the stages that use it.
+"""
+import pickle
+
+import pytest
+from bs4 import BeautifulSoup
+
+from crawl4ai import CrawlerRunConfig, HTMLDocument
+from crawl4ai.content_filter_strategy import BM25ContentFilter, PruningContentFilter
+from crawl4ai.cpu_executor import process_html_content
+from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
+from crawl4ai.html_document import get_stripped_text, get_text, to_html
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+HTML_SAMPLE = """
+<html>
+<head><title>Python Programming Guide</title>
+<meta name="description" content="A guide to Python programming"></head>
+<body>
+    <nav class="menu"><a href="/">Home</a> <a href="/docs">Docs</a></nav>
+    <article>
+        <h1>Python   Programming</h1>
+        <p>Python is a programming language that lets you work quickly and integrate
+        systems more effectively. <!-- note --> Python programming is <b>fun</b>.</p>
+        <pre>  keep   this  </pre>
+        <div class="product" data-id="1"><span class="name">Widget</span>
+            <a class="buy now" rel="nofollow" href="/buy/1">Buy</a></div>
+        <div class="product" data-id="2"><span class="name">Gadget</span></div>
+    </article>
+    <footer>Copyright</footer>
+</body>
+</html>
+"""
+
+SCHEMA = {
+    "name": "products",
+    "baseSelector": "div.product",
+    "baseFields": [{"name": "id", "type": "attribute", "attribute": "data-id"}],
+    "fields": [
+        {"name": "name", "selector": "span.name", "type": "text"},
+        {"name": "classes", "selector": "a", "type": "attribute", "attribute": "class"},
+        {"name": "link", "selector": "a", "type": "nested", "fields": [
+            {"name": "href", "type": "attribute", "attribute": "href"},
+        ]},
+    ],
+}
+
+
+def test_document_parses_once():
+    """The tree is parsed on first use and shared; fork() returns an independent copy."""
+    document = HTMLDocument(HTML_SAMPLE)
+    assert not document.is_parsed
+    tree = document.tree
+    assert document.tree is tree
+    assert document.body.tag == "body"
+
+    fork = document.fork()
+    fork.find("body").clear()
+    assert len(document.body) > 0
+
+
+def test_document_edge_cases():
+    """Empty input and encoding declarations parse; pickling keeps only the HTML."""
+    assert HTMLDocument("").body is not None
+    declared = '<?xml version="1.0" encoding="utf-8"?><html><body><p>x</p></body></html>'
+    assert HTMLDocument(declared).body.findtext("p") == "x"
+
+    document = HTMLDocument(HTML_SAMPLE)
+    document.tree
+    restored = pickle.loads(pickle.dumps(document))
+    assert restored.html == HTML_SAMPLE and not restored.is_parsed
+
+
+def test_text_helpers_match_beautifulsoup():
+    """get_text/get_stripped_text give BeautifulSoup's results on lxml elements."""
+    soup = BeautifulSoup(HTML_SAMPLE, "lxml")
+    document = HTMLDocument(HTML_SAMPLE)
+    for tag in ("article", "p", "pre", "body"):
+        assert get_text(document.tree.find(f".//{tag}")) == soup.find(tag).get_text()
+        assert get_stripped_text(document.tree.find(f".//{tag}")) == soup.find(tag).get_text(strip=True)
+
+
+RAW_HTML = """<html><body>
+<div itemscope itemtype="https://schema.org/Organization" class=" card   main ">
+  <h2 id="contact" CLASS="title">Contact&nbsp;us</h2>
+  <p>Call <a href="tel:+7 (495) 123-45-67" rel=" nofollow  noopener">+7 (495) 123-45-67</a> or write to
+  <a title='say "hi" &amp; more' href="/write?to=sales&amp;from=site">sales</a> &lt;any time&gt;.</p>
+  <!-- comment --> <br><img alt="" src="/logo 1.png"><button disabled>Send</button>
+  <script>if (a < b && c) { go(); }</script>
+</div>
+</body></html>"""
+
+
+def test_markup_matches_beautifulsoup():
+    """to_html writes an element as str() of the BeautifulSoup tag does."""
+    soup = BeautifulSoup(RAW_HTML, "lxml")
+    root = HTMLDocument(RAW_HTML).fork()
+    PruningContentFilter._collapse_whitespace(root)  # As BeautifulSoup does while parsing
+    for tag in ("div", "p", "a", "h2", "br", "img", "button", "script"):
+        assert to_html(root.find(f".//{tag}")) == str(soup.find(tag))
+
+
+def test_pruning_raw_html_keeps_markup():
+    """Pruning raw HTML returns BeautifulSoup's markup: valueless attributes and link targets as written."""
+    assert PruningContentFilter().filter_content(RAW_HTML) == [
+        '<div class="card main" itemscope="" itemtype="https://schema.org/Organization">\n'
+        '<h2 class="title" id="contact">Contact\xa0us</h2>\n'
+        '<p>Call <a href="tel:+7 (495) 123-45-67" rel="nofollow noopener">+7 (495) 123-45-67</a> or write to\n'
+        """  <a href="/write?to=sales&amp;from=site" title='say "hi" &amp; more'>sales</a> &lt;any time&gt;.</p>\n"""
+        ' <button disabled="">Send</button>\n\n</div>'
+    ]
+
+
+@pytest.mark.parametrize("content_filter", [PruningContentFilter(), BM25ContentFilter()])
+def test_filters_accept_documents(content_filter):
+    """Filters give the same result for a string and a document, and leave the shared tree intact."""
+    document = HTMLDocument(HTML_SAMPLE)
+    before = len(list(document.tree.iter()))
+    assert content_filter.filter_content(document) == content_filter.filter_content(HTML_SAMPLE)
+    assert len(list(document.tree.iter())) == before
+
+
+def test_json_css_extraction_on_lxml():
+    """JsonCss extraction on lxml matches the BeautifulSoup backend and reuses a document."""
+    strategy = JsonCssExtractionStrategy(SCHEMA)
+    assert not strategy.use_soup
+
+    expected = [
+        {"id": "1", "name": "Widget", "classes": ["buy", "now"], "link": {"href": "/buy/1"}},
+        {"id": "2", "name": "Gadget", "link": {}},
+    ]
+    assert strategy.extract("https://example.com", HTML_SAMPLE) == expected
+    document = HTMLDocument(HTML_SAMPLE)
+    assert strategy.extract("https://example.com", HTML_SAMPLE, document=document) == expected
+    assert document.is_parsed
+
+    soup_strategy = JsonCssExtractionStrategy(SCHEMA)
+    soup_strategy.use_soup = True
+    assert soup_strategy.extract("https://example.com", HTML_SAMPLE) == expected
+
+    # The strategy stays picklable (compiled selectors are rebuilt)
+    restored = pickle.loads(pickle.dumps(strategy))
+    assert restored.extract("https://example.com", HTML_SAMPLE) == expected
+
+
+def test_json_css_falls_back_for_soupsieve_selectors():
+    """Selectors lxml can't translate keep the BeautifulSoup backend."""
+    schema = {**SCHEMA, "baseSelector": "div.product:-soup-contains('Widget')"}
+    strategy = JsonCssExtractionStrategy(schema)
+    assert strategy.use_soup
+    assert [item["name"] for item in strategy.extract("https://example.com", HTML_SAMPLE)] == ["Widget"]
+
+
+def test_pipeline_shares_documents():
+    """process_html_content hands its documents to the filter and returns them for extraction."""
+    params = CrawlerRunConfig().__dict__.copy()
+    params.pop("url", None)
+    generator = DefaultMarkdownGenerator(content_filter=BM25ContentFilter())
+    processed = process_html_content(
+        "https://example.com", HTML_SAMPLE, LXMLWebScrapingStrategy(), generator, params
+    )
+    assert processed["document"].html == HTML_SAMPLE
+    assert processed["cleaned_document"].html == processed["cleaned_html"]
+    # BM25 parsed the cleaned document; extraction reuses that tree
+    assert processed["cleaned_document"].is_parsed
+    assert "Python" in processed["markdown"].fit_markdown
@@ -0,0 +1,223 @@
+"""
+Tests for the shared LLM scheduler, using fake completion functions (no API calls).
+"""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import crawl4ai.llm_scheduler as llm_scheduler
+from crawl4ai.llm_scheduler import (
+    LLMResponseCache,
+    LLMScheduler,
+    ProviderBudget,
+    retry_delay_from_headers,
+)
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, headers=None):
+        super().__init__("rate limited")
+        self.headers = headers or {}
+
+
+class FakeResponse(SimpleNamespace):
+    def model_dump(self):
+        return {"content": self.content, "total_tokens": self.usage.total_tokens}
+
+
+def response(content="ok", total_tokens=10, headers=None):
+    result = FakeResponse(content=content, usage=SimpleNamespace(total_tokens=total_tokens))
+    result._hidden_params = {"additional_headers": headers or {}}
+    return result
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    sleeps = []
+    scheduler = LLMScheduler(
+        cache=LLMResponseCache(str(tmp_path / "responses.db")),
+        sleep=sleeps.append,
+        rng=lambda: 0.0,
+    )
+    scheduler.sleeps = sleeps
+    return scheduler
+
+
+def test_retry_delay_from_headers():
+    assert retry_delay_from_headers({"Retry-After": "3"}) == 3
+    assert retry_delay_from_headers({"retry-after-ms": "250"}) == 0.25
+    assert retry_delay_from_headers({"llm_provider-x-ratelimit-reset-tokens": "1m30s"}) == 90
+    assert retry_delay_from_headers({"x-ratelimit-reset-requests": "120ms"}) == pytest.approx(0.12)
+    assert retry_delay_from_headers({"content-type": "application/json"}) is None
+
+
+def test_retries_rate_limits_after_requested_delay(scheduler):
+    calls = []
+
+    def completion(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise RateLimited({"retry-after": "7"})
+        return response()
+
+    scheduler._completion = completion
+    assert scheduler.complete("test/model", "prompt", "key").content == "ok"
+    assert len(calls) == 2
+    # The retry waits for the provider's pause (7 s), not the 2 s backoff
+    assert scheduler.sleeps and scheduler.sleeps[-1] == pytest.approx(7, abs=0.1)
+    assert scheduler.budget("test/model").stats["rate_limited"] == 1
+
+
+def test_gives_up_after_max_attempts_and_raises_other_errors(scheduler):
+    def rate_limited(**kwargs):
+        raise RateLimited()
+
+    scheduler._completion = rate_limited
+    with pytest.raises(RateLimited):
+        scheduler.complete("test/model", "prompt", "key", max_attempts=2, base_delay=0)
+
+    def broken(**kwargs):
+        raise ValueError("bad request")
+
+    scheduler._completion = broken
+    with pytest.raises(ValueError):
+        scheduler.complete("test/other", "prompt", "key")
+    assert scheduler.budget("test/other").stats["requests"] == 1
+
+
+def test_token_budget():
+    now = [0.0]
+    budget = ProviderBudget(tokens_per_minute=600, clock=lambda: now[0])
+    assert budget.reserve(600) == 0
+    # 10 tokens/second refill: 300 more tokens need 30 s
+    assert budget.reserve(300) == pytest.approx(30)
+    budget.settle(300, 0)
+    now[0] = 10
+    assert budget.reserve(100) == 0
+
+    budget.observe_headers({"x-ratelimit-remaining-tokens": "0"})
+    assert budget.reserve(60) == pytest.approx(6)
+
+
+def test_learns_budget_from_headers(scheduler):
+    scheduler._completion = lambda **kwargs: response(
+        headers={"x-ratelimit-limit-tokens": "1000", "x-ratelimit-remaining-tokens": "400"}
+    )
+    scheduler.complete("test/model", "prompt", "key")
+    budget = scheduler.budget("test/model")
+    assert budget.tokens_per_minute == 1000
+    assert budget.reserve(400) == 0
+    assert budget.reserve(100) > 0
+
+
+def test_response_cache(scheduler, tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_scheduler, "_restore_response", lambda data: SimpleNamespace(**data))
+    calls = []
+    scheduler._completion = lambda **kwargs: calls.append(kwargs) or response("fresh")
+
+    first = scheduler.complete("test/model", "prompt", "key", use_cache=True)
+    second = scheduler.complete("test/model", "prompt", "other-key", use_cache=True)
+    assert first.content == second.content == "fresh"
+    assert len(calls) == 1
+
+    # Different options or no caching: a new request
+    scheduler.complete("test/model", "prompt", "key", json_response=True, use_cache=True)
+    scheduler.complete("test/model", "prompt", "key")
+    assert len(calls) == 3
+
+    # The cache is persistent
+    other = LLMScheduler(cache=LLMResponseCache(str(tmp_path / "responses.db")))
+    other._completion = None
+    assert other.complete("test/model", "prompt", "key", use_cache=True).content == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_response_cache_async_stays_off_the_loop(scheduler, monkeypatch):
+    monkeypatch.setattr(llm_scheduler, "_restore_response", lambda data: SimpleNamespace(**data))
+    calls, threads = [], []
+    cache = scheduler.cache
+    for name in ("get", "put"):
+        method = getattr(cache, name)
+        monkeypatch.setattr(
+            cache, name, lambda *args, method=method: threads.append(threading.get_ident()) or method(*args)
+        )
+
+    async def acompletion(**kwargs):
+        calls.append(kwargs)
+        return response("fresh")
+
+    scheduler._acompletion = acompletion
+    first = await scheduler.acomplete("test/model", "prompt", "key", use_cache=True)
+    second = await scheduler.acomplete("test/model", "prompt", "key", use_cache=True)
+    assert first.content == second.content == "fresh"
+    assert len(calls) == 1
+    assert scheduler.budget("test/model").stats["cache_hits"] == 1
+    # get, put, get: none of them on the event loop's thread
+    assert len(threads) == 3
+    assert threading.get_ident() not in threads
+
+
+def test_concurrency_limit_across_threads(scheduler):
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def completion(**kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return response()
+
+    scheduler._completion = completion
+    threads = [
+        threading.Thread(target=scheduler.complete, args=("test/model", "prompt", "key"), kwargs={"max_concurrency": 2})
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+    assert scheduler.budget("test/model").active == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_async(scheduler):
+    active, peak = [0], [0]
+
+    async def acompletion(**kwargs):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        return response()
+
+    scheduler._acompletion = acompletion
+    results = await asyncio.gather(
+        *(scheduler.acomplete("test/model", "prompt", "key", max_concurrency=3) for _ in range(10))
+    )
+    assert len(results) == 10
+    assert peak[0] == 3
+    assert scheduler.budget("test/model").active == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_frees_its_place():
+    budget = ProviderBudget(max_concurrency=1)
+    await budget.acquire_async()
+    waiter = asyncio.ensure_future(budget.acquire_async())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    budget.release()
+    assert budget.active == 0
+    await asyncio.wait_for(budget.acquire_async(), 1)
+    assert budget.active == 1
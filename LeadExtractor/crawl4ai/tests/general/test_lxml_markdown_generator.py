@@ -0,0 +1,124 @@
+"""
+Tests for LXMLMarkdownGenerator: markdown from the parsed lxml tree must match
+DefaultMarkdownGenerator on lxml-serialized (cleaned) HTML.
+"""
+import pytest
+from lxml import html as lhtml
+
+import crawl4ai.markdown_generation_strategy as markdown_generation_strategy
+from crawl4ai.content_filter_strategy import PruningContentFilter
+from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+from crawl4ai.cpu_executor import process_html_content
+from crawl4ai.html_document import HTMLDocument
+from crawl4ai.markdown_generation_strategy import (
+    DefaultMarkdownGenerator,
+    LXMLMarkdownGenerator,
+)
+
+BASE_URL = "https://example.com/docs/"
+
+SAMPLES = {
+    "links": """
+        <div><h1>Title</h1>
+        <p>Read <a href="/guide" title="The guide">the guide</a>, <a href="page.html">a page</a>
+        and <a href="https://other.org/">https://other.org/</a> again: <a href="/guide">guide</a>.</p>
+        <p>Empty <a href="/empty"></a> and <a href="mailto:me@example.com">mail</a> and <a>no href</a>.</p>
+        </div>
+    """,
+    "images": """
+        <div><p>Logo <img src="/logo.png" alt="Logo"> and <img src="/noalt.png">.</p>
+        <a href="/home"><img src="/home.png" alt="Home"></a>
+        <a href="/both"> <img src="/i.png" alt="Icon"> Both </a>
+        <p>Hello!<a href="/bang">bang</a></p></div>
+    """,
+    "formatting": """
+        <div><h2>Head <a href="/h">linked</a></h2><a href="/x"><h3>Header in link</h3></a>
+        <p>Some <b>bold</b>, <strong> strong &amp; spaced </strong>, <em>em</em>x and
+        <code>inline [code]</code> with &lt;tags&gt; &amp; [brackets] (parens).</p>
+        <pre><code>def f(x):
+    return x * 2</code></pre>
+        <blockquote>Quoted<br>text</blockquote><hr>
+        <!-- a comment --> after comment</div>
+    """,
+    "lists_tables": """
+        <div><ul><li>One</li><li>Two<ol start="3"><li>Three</li><li><a href="/four">Four</a></li></ol></li></ul>
+        <table><tr><th>Name</th><th>Value</th></tr><tr><td>a b</td><td><a href="/v">v</a></td></tr></table>
+        <dl><dt>Term</dt><dd>Definition</dd></dl>
+        <script>var a = "<b>not markdown</b>";</script><style>p { color: red }</style></div>
+    """,
+}
+
+
+def cleaned(html: str) -> str:
+    """Serialize like the scraping strategy does."""
+    return lhtml.tostring(lhtml.fromstring(html), encoding="unicode", method="html")
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+def test_matches_default_generator(name):
+    """Raw markdown, citations and references equal DefaultMarkdownGenerator's."""
+    html = cleaned(SAMPLES[name])
+    expected = DefaultMarkdownGenerator().generate_markdown(html, base_url=BASE_URL)
+    result = LXMLMarkdownGenerator().generate_markdown(html, base_url=BASE_URL)
+
+    assert result.raw_markdown == expected.raw_markdown
+    assert result.markdown_with_citations == expected.markdown_with_citations
+    assert result.references_markdown == expected.references_markdown
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "<div><ul><li>one<li>two</ul><blockquote>quote</blockquote></div>",
+        "<div><ul><li>a<ul><li>b</ul><li>c</ul><ol><li>1<li>2</ol>after</div>",
+    ],
+)
+def test_omitted_list_item_end_tags(html):
+    """Lists without </li> convert the same on raw HTML as on the parsed tree."""
+    expected = DefaultMarkdownGenerator().generate_markdown(cleaned(html)).raw_markdown
+    assert DefaultMarkdownGenerator().generate_markdown(html).raw_markdown == expected
+    assert LXMLMarkdownGenerator().generate_markdown(html).raw_markdown == expected
+
+
+def test_citations_fall_back_when_wrapping():
+    """With body_width set the markdown is rewrapped, citations use the regex scan."""
+    html = cleaned(SAMPLES["links"])
+    options = {"body_width": 40}
+    expected = DefaultMarkdownGenerator(options=options).generate_markdown(html, base_url=BASE_URL)
+    result = LXMLMarkdownGenerator(options=options).generate_markdown(html, base_url=BASE_URL)
+
+    assert result.raw_markdown == expected.raw_markdown
+    assert result.markdown_with_citations == expected.markdown_with_citations
+
+
+def test_reuses_document_tree(monkeypatch):
+    """A parsed HTMLDocument is walked as is, not parsed again."""
+    document = HTMLDocument(cleaned(SAMPLES["links"]))
+    document.tree
+
+    def fail(html):
+        raise AssertionError("document parsed again")
+
+    monkeypatch.setattr(markdown_generation_strategy, "parse_html_document", fail)
+    result = LXMLMarkdownGenerator().generate_markdown(document)
+    assert '[the guide](/guide "The guide")' in result.raw_markdown
+
+
+def test_pipeline_matches_default_generator():
+    """Through the post-processing pipeline (with fit markdown) both generators agree."""
+    html = "<html><body>" + "".join(SAMPLES.values()) + "</body></html>"
+    results = [
+        process_html_content(
+            "https://example.com/docs/",
+            html,
+            LXMLWebScrapingStrategy(),
+            generator(content_filter=PruningContentFilter(threshold=0.1)),
+            {},
+        )["markdown"]
+        for generator in (DefaultMarkdownGenerator, LXMLMarkdownGenerator)
+    ]
+    expected, result = results
+    assert result.raw_markdown == expected.raw_markdown
+    assert result.markdown_with_citations == expected.markdown_with_citations
+    assert result.references_markdown == expected.references_markdown
+    assert result.fit_markdown == expected.fit_markdown
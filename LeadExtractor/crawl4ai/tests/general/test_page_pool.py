@@ -0,0 +1,202 @@
+"""
+Tests for pooled pages in BrowserManager, using fake pages and contexts (no browser needed).
+"""
+import asyncio
+
+import pytest
+
+from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig
+from crawl4ai.browser_manager import BrowserManager
+from crawl4ai.page_pool import PagePool
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.calls = []
+        self.closed = False
+        self.viewport_size = {"width": 1080, "height": 600}
+        self.listeners = []
+
+    def on(self, event, f):
+        self.listeners.append((event, f))
+
+    once = on
+
+    def remove_listener(self, event, f):
+        self.listeners.remove((event, f))
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    async def evaluate(self, script):
+        self.calls.append("evaluate")
+
+    async def unroute_all(self, behavior=None):
+        self.calls.append("unroute_all")
+
+    async def set_extra_http_headers(self, headers):
+        self.calls.append("set_extra_http_headers")
+
+    async def goto(self, url):
+        self.calls.append(url)
+
+    async def set_viewport_size(self, viewport):
+        self.viewport_size = viewport
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+async def create_page(context):
+    return await context.new_page()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_and_resets_pages():
+    """A released page is reset and handed out again."""
+    pool = PagePool(FakeContext(), create_page, size=1, viewport={"width": 800, "height": 600})
+    page = await pool.acquire()
+    page.viewport_size = {"width": 300, "height": 300}
+    await pool.release(page)
+
+    assert not page.closed
+    assert page.calls == ["evaluate", "unroute_all", "set_extra_http_headers", "about:blank"]
+    assert page.viewport_size == {"width": 800, "height": 600}
+    assert await pool.acquire() is page
+    assert pool.stats["reused"] == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_prewarms_pages():
+    """The pool opens pages in the background until `size` are idle."""
+    context = FakeContext()
+    pool = PagePool(context, create_page, size=3)
+    await pool.acquire()
+    await settle()
+
+    assert pool.idle == 3
+    assert len(context.pages) == 4
+    await pool.close()
+    assert all(page.closed for page in context.pages[1:])
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_worn_out_and_dirty_pages():
+    """Pages are replaced after max_uses crawls, or if a crawl left listeners behind."""
+    pool = PagePool(FakeContext(), create_page, size=1, max_uses=2)
+    page = await pool.acquire()
+    await pool.release(page)
+    assert await pool.acquire() is page
+    await pool.release(page)
+    assert page.closed
+    assert pool.stats["recycled"] == 1
+    await pool.close()
+
+    # Listeners the crawl removed again don't count
+    pool = PagePool(FakeContext(), create_page, size=1)
+    page = await pool.acquire()
+    page.on("download", print)
+    page.once("close", print)
+    page.remove_listener("download", print)
+    page.remove_listener("close", print)
+    await pool.release(page)
+    assert not page.closed and page.listeners == []
+
+    page = await pool.acquire()
+    page.on("download", print)
+    await pool.release(page)
+    assert page.closed
+    assert pool.stats["reset_failed"] == 1
+    await pool.close()
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    def make(**kwargs):
+        browser_manager = BrowserManager(BrowserConfig(**kwargs))
+        contexts = []
+
+        async def create_browser_context(crawlerRunConfig=None):
+            contexts.append(FakeContext())
+            return contexts[-1]
+
+        async def setup_context(context, crawlerRunConfig=None, is_default=False):
+            pass
+
+        monkeypatch.setattr(browser_manager, "create_browser_context", create_browser_context)
+        monkeypatch.setattr(browser_manager, "setup_context", setup_context)
+        return browser_manager, contexts
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_get_page_uses_pool(manager):
+    """With page_pool_size set, pages are returned to the pool; session pages are not pooled."""
+    browser_manager, contexts = manager(page_pool_size=2)
+    config = CrawlerRunConfig()
+
+    page, context = await browser_manager.get_page(config)
+    assert browser_manager.is_pooled(page)
+    await browser_manager.release_page(page)
+    assert not page.closed
+    again, _ = await browser_manager.get_page(config)
+    assert again is page
+    await browser_manager.release_page(again)
+
+    session_page, _ = await browser_manager.get_page(CrawlerRunConfig(session_id="s1"))
+    assert not browser_manager.is_pooled(session_page)
+    assert len(contexts) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_page_without_pool_closes_pages(manager):
+    """Without a pool every crawl gets a new page that release_page closes."""
+    browser_manager, _ = manager()
+    page, _ = await browser_manager.get_page(CrawlerRunConfig())
+    assert not browser_manager.is_pooled(page)
+    await browser_manager.release_page(page)
+    assert page.closed
+
+
+@pytest.mark.asyncio
+async def test_context_recycling(manager):
+    """A context is replaced after max_navigations_per_context pages and closed once drained."""
+    browser_manager, contexts = manager(page_pool_size=1, max_navigations_per_context=2)
+    config = CrawlerRunConfig()
+
+    first, _ = await browser_manager.get_page(config)
+    await browser_manager.release_page(first)
+    second, _ = await browser_manager.get_page(config)
+
+    third, context = await browser_manager.get_page(config)
+    assert context is contexts[1]
+    assert not contexts[0].closed  # `second` is still in use
+
+    await browser_manager.release_page(second)
+    assert contexts[0].closed
+    assert second.closed
+    assert not browser_manager._retired_pools
+    await browser_manager.release_page(third)
+    assert not contexts[1].closed
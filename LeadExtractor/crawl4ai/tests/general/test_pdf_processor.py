@@ -0,0 +1,120 @@
+"""
+Tests for NaivePDFProcessorStrategy's parallel page processing, on generated PDFs.
+"""
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+pytest.importorskip("pypdf")
+
+from crawl4ai.processors.pdf import processor  # noqa: E402
+from crawl4ai.processors.pdf.processor import NaivePDFProcessorStrategy  # noqa: E402
+
+
+def write_pdf(path, pages, image_every=0):
+    """A PDF with a few lines of text and a link per page, and an image every `image_every` pages."""
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    pixels = zlib.compress(bytes(range(48)) * 16)  # 16x16 RGB
+    objects.append(
+        b"<< /Type /XObject /Subtype /Image /Width 16 /Height 16 /ColorSpace /DeviceRGB "
+        b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>\nstream\n" % len(pixels) + pixels + b"\nendstream"
+    )
+    kids = []
+    for number in range(1, pages + 1):
+        text = b"BT /F1 10 Tf 12 TL 50 750 Td (Page %d first line) Tj T* (Page %d second line) Tj ET" % (number, number)
+        image = image_every and number % image_every == 0
+        if image:
+            text += b" q 32 0 0 32 400 600 cm /Im1 Do Q"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(text) + text + b"\nendstream")
+        objects.append(b"<< /Type /Annot /Subtype /Link /Rect [0 0 10 10] /A << /S /URI /URI (https://example.com/%d) >> >>" % number)
+        xobjects = b" /XObject << /Im1 4 0 R >>" if image else b""
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >>%s >> /Annots [%d 0 R] >>"
+            % (len(objects) - 1, xobjects, len(objects))
+        )
+        kids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+    return path
+
+
+@pytest.fixture
+def several_cpus(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+
+
+def test_process_batch_matches_sequential(tmp_path, several_cpus, monkeypatch):
+    pools = []
+
+    def counting_pool(*args, **kwargs):
+        pools.append(kwargs["max_workers"])
+        return ProcessPoolExecutor(*args, **kwargs)
+
+    monkeypatch.setattr(processor, "ProcessPoolExecutor", counting_pool)
+    pdf_path = write_pdf(tmp_path / "doc.pdf", 60)
+    sequential = NaivePDFProcessorStrategy(extract_images=False).process(pdf_path)
+    parallel = NaivePDFProcessorStrategy(extract_images=False, batch_size=3).process_batch(pdf_path)
+
+    assert pools == [3]
+
+    assert parallel.metadata.pages == 60
+    assert [page.page_number for page in parallel.pages] == list(range(1, 61))
+    assert [page.raw_text for page in parallel.pages] == [page.raw_text for page in sequential.pages]
+    assert [page.markdown for page in parallel.pages] == [page.markdown for page in sequential.pages]
+    assert parallel.pages[41].links == ["https://example.com/42"]
+    assert "Page 42 second line" in parallel.pages[41].raw_text
+
+
+def test_iter_pages_streams_in_order_and_can_stop_early(tmp_path, several_cpus):
+    pdf_path = write_pdf(tmp_path / "doc.pdf", 100)
+    strategy = NaivePDFProcessorStrategy(extract_images=False, batch_size=2)
+
+    pages = strategy.iter_pages(pdf_path)
+    first = [next(pages).page_number for _ in range(5)]
+    pages.close()  # Shuts the workers down
+    assert first == [1, 2, 3, 4, 5]
+
+    numbers = [page.page_number for page in strategy.iter_pages(pdf_path, max_workers=4)]
+    assert numbers == list(range(1, 101))
+
+
+def test_images_are_extracted_in_a_deferred_pass(tmp_path, several_cpus):
+    pdf_path = write_pdf(tmp_path / "doc.pdf", 30, image_every=10)
+    strategy = NaivePDFProcessorStrategy(extract_images=True, batch_size=2)
+
+    # The text pass never decodes images
+    assert all(not page.images for page in strategy.iter_pages(pdf_path))
+
+    images = dict(strategy.iter_page_images(pdf_path, page_numbers=[20, 10, 11]))
+    assert list(images) == [10, 11, 20]
+    assert images[11] == []
+    assert images[10][0]["format"] == "png" and images[10][0]["width"] == 16
+
+    result = strategy.process_batch(pdf_path)
+    assert [page.page_number for page in result.pages if page.images] == [10, 20, 30]
+    reference = NaivePDFProcessorStrategy(extract_images=True).process(pdf_path)
+    assert [page.images for page in result.pages] == [page.images for page in reference.pages]
+
+
+def test_small_documents_skip_the_process_pool(tmp_path, several_cpus, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("No workers should be started")
+
+    monkeypatch.setattr(processor, "ProcessPoolExecutor", no_pool)
+    pdf_path = write_pdf(tmp_path / "doc.pdf", processor.MIN_PAGES_FOR_WORKERS - 1)
+    result = NaivePDFProcessorStrategy(extract_images=False, batch_size=4).process_batch(pdf_path)
+    assert len(result.pages) == processor.MIN_PAGES_FOR_WORKERS - 1
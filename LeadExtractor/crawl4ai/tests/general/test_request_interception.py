@@ -0,0 +1,173 @@
+"""
+Tests for request-interception profiles, using fake routes (no browser needed).
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from crawl4ai.async_configs import CrawlerRunConfig
+from crawl4ai.request_interception import DomainMatcher, InterceptionProfile
+
+PAGE_URL = "https://www.example.com/article"
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, headers=None):
+        self._body = body
+        self.headers = headers or {}
+
+    async def body(self):
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type, navigation=False, body=b""):
+        frame = SimpleNamespace(parent_frame=None)
+        self.request = SimpleNamespace(
+            url=url,
+            resource_type=resource_type,
+            frame=frame,
+            is_navigation_request=lambda: navigation,
+        )
+        self.response = FakeResponse(body)
+        self.outcome = None
+
+    async def abort(self, error_code=None):
+        self.outcome = "abort"
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+    async def fetch(self):
+        return self.response
+
+    async def fulfill(self, response=None):
+        self.outcome = "fulfill"
+
+
+class FakePage:
+    def __init__(self):
+        self.routes = {}
+
+    async def route(self, pattern, handler):
+        self.routes[pattern] = handler
+
+    async def unroute(self, pattern, handler):
+        assert self.routes.pop(pattern) is handler
+
+
+async def run(profile, *routes):
+    interceptor = profile.interceptor(PAGE_URL)
+    for route in routes:
+        await interceptor.handle(route)
+    return [route.outcome for route in routes]
+
+
+def test_domain_matcher_matches_subdomains_only():
+    matcher = DomainMatcher(["example.com", ".Tracker.io"])
+    assert matcher.matches("example.com")
+    assert matcher.matches("cdn.www.example.com")
+    assert matcher.matches("a.tracker.io")
+    assert not matcher.matches("badexample.com")
+    assert not matcher.matches("example.org")
+    assert not DomainMatcher().matches("example.com")
+
+
+@pytest.mark.asyncio
+async def test_light_preset_blocks_media_and_analytics():
+    profile = InterceptionProfile.preset("light")
+    outcomes = await run(
+        profile,
+        FakeRoute(PAGE_URL, "document", navigation=True),
+        FakeRoute("https://www.example.com/logo.png", "image"),
+        FakeRoute("https://fonts.gstatic.com/a.woff2", "font"),
+        FakeRoute("https://www.google-analytics.com/analytics.js", "script"),
+        FakeRoute("https://cdn.example.net/app.js", "script"),
+        FakeRoute("https://www.example.com/style.css", "stylesheet"),
+    )
+
+    assert outcomes == ["fallback", "abort", "abort", "abort", "fallback", "fallback"]
+    assert profile.stats["requests"] == 5  # the main document is not counted
+    assert profile.stats["requests_blocked"] == 3
+    assert profile.stats["blocked_by_reason"] == {"resource_type": 2, "domain": 1}
+    assert profile.stats["bytes_saved"] > 0
+
+
+@pytest.mark.asyncio
+async def test_first_party_scripts_and_allow_list():
+    profile = InterceptionProfile(
+        block_resource_types=["script"],
+        block_domains=["example.com"],
+        allow_domains=["static.example.com"],
+    )
+    outcomes = await run(
+        profile,
+        FakeRoute("https://static.example.com/app.js", "script"),
+        FakeRoute("https://www.example.com/app.js", "script"),
+        FakeRoute("https://other.org/lib.js", "script"),
+    )
+    # block_domains wins over first-party scripts, allow_domains wins over both
+    assert outcomes == ["fallback", "abort", "abort"]
+
+    profile = InterceptionProfile(block_resource_types=["script"])
+    outcomes = await run(
+        profile,
+        FakeRoute("https://cdn.example.com/app.js", "script"),
+        FakeRoute("https://other.org/lib.js", "script"),
+    )
+    assert outcomes == ["fallback", "abort"]
+
+
+@pytest.mark.asyncio
+async def test_max_body_size():
+    profile = InterceptionProfile(max_body_size=1000)
+    big = FakeRoute("https://www.example.com/huge.bin", "fetch", body=b"x" * 5000)
+    small = FakeRoute("https://www.example.com/small.json", "fetch", body=b"{}")
+    header = FakeRoute("https://www.example.com/video.mp4", "media")
+    header.response.headers = {"content-length": "2000000"}
+
+    assert await run(profile, big, small, header) == ["abort", "fulfill", "abort"]
+    assert profile.stats["bytes_saved"] == 5000 + 2000000
+    assert profile.stats["blocked_by_reason"] == {"body_size": 2}
+
+
+@pytest.mark.asyncio
+async def test_max_body_size_leaves_routing_to_other_handlers():
+    profile = InterceptionProfile(max_body_size=1000)
+    interceptor = profile.interceptor(PAGE_URL, fallback_routes=True)
+    route = FakeRoute("https://www.example.com/photo.jpg", "image", body=b"x" * 10)
+
+    async def fetch():
+        raise AssertionError("fetched although other handlers must see the request")
+
+    route.fetch = fetch
+    await interceptor.handle(route)
+    assert route.outcome == "fallback"
+    assert profile.stats["requests_blocked"] == 0
+
+
+@pytest.mark.asyncio
+async def test_install_and_uninstall():
+    page = FakePage()
+    interceptor = InterceptionProfile.preset("text").interceptor(PAGE_URL)
+    await interceptor.install(page)
+    assert "**/*" in page.routes
+    await interceptor.uninstall(page)
+    await interceptor.uninstall(page)
+    assert not page.routes
+
+
+def test_crawler_run_config_accepts_profiles():
+    assert CrawlerRunConfig().interception_profile is None
+    assert CrawlerRunConfig(interception_profile="no_analytics").interception_profile.name == "no_analytics"
+    config = CrawlerRunConfig(interception_profile={"block_resource_types": ["image"], "max_body_size": 10})
+    assert config.interception_profile.max_body_size == 10
+
+    # Clones share the profile, and with it the stats
+    assert config.clone(stream=True).interception_profile is config.interception_profile
+
+    restored = CrawlerRunConfig.load(config.dump())
+    assert restored.interception_profile.to_dict() == config.interception_profile.to_dict()
+
+    with pytest.raises(ValueError):
+        CrawlerRunConfig(interception_profile="unknown")
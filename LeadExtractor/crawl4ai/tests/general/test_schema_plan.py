@@ -0,0 +1,133 @@
+"""
+Tests for compiled schema plans: same results as the dict-walking extraction, and extract_many.
+"""
+import pickle
+
+import pytest
+
+from crawl4ai.extraction_strategy import (
+    JsonCssExtractionStrategy,
+    JsonLxmlExtractionStrategy,
+)
+
+
+def page(n):
+    extras = "".join(
+        f'<div class="product" data-sku="x{j}"><h2 class="title">Extra {j}</h2></div>' for j in range(3)
+    )
+    return f"""
+    <html><body>
+      <div class="product" data-sku="sku-{n}">
+        <h2 class="title">Product {n}</h2>
+        <span class="price">${10 * n}.99</span>
+        <a class="link" href="/p/{n}">more</a>
+        <div class="details"><span class="brand">Brand {n}</span></div>
+        <ul class="tags"><li>new</li><li>tag {n}</li></ul>
+        <div class="review"><b class="rating">{n}</b><p>Review {n}</p></div>
+        <div class="review"><b class="rating">{n + 1}</b><p>Other {n}</p></div>
+      </div>
+      {extras}
+    </body></html>
+    """
+
+
+PAGES = [page(n) for n in range(1, 7)]
+
+SCHEMA = {
+    "name": "products",
+    "baseSelector": "div.product",
+    "baseFields": [{"name": "sku", "type": "attribute", "attribute": "data-sku"}],
+    "fields": [
+        {"name": "title", "selector": "h2.title", "type": "text", "transform": "uppercase"},
+        {"name": "price", "selector": ".price", "type": "regex", "pattern": r"\$(\d+)"},
+        {"name": "link", "selector": "a.link", "type": "attribute", "attribute": "href"},
+        {"name": "missing", "selector": ".nothing", "type": "text", "default": "n/a"},
+        {"name": "details", "selector": ".details", "type": "nested",
+         "fields": [{"name": "brand", "selector": ".brand", "type": "text"}]},
+        {"name": "tags", "selector": "ul.tags li", "type": "list",
+         "fields": [{"name": "tag", "type": "text"}]},
+        {"name": "reviews", "selector": ".review", "type": "nested_list",
+         "fields": [
+             {"name": "rating", "selector": ".rating", "type": "text"},
+             {"name": "body", "selector": "p", "type": "html"},
+         ]},
+        {"name": "label", "type": "computed", "expression": "title + ' / ' + str(price)"},
+        {"name": "broken", "type": "computed", "expression": "undefined_name", "default": "none"},
+    ],
+}
+
+STRATEGIES = [
+    lambda schema: JsonCssExtractionStrategy(schema),
+    lambda schema: JsonCssExtractionStrategy(schema, use_soup=True),
+    lambda schema: JsonLxmlExtractionStrategy(schema),
+]
+
+
+@pytest.mark.parametrize("make", STRATEGIES)
+def test_plan_matches_uncompiled_extraction(make):
+    strategy = make(SCHEMA)
+    for html in PAGES:
+        compiled = strategy.extract("", html)
+        assert compiled == strategy._extract_uncompiled(strategy._parse_html(html))
+    assert len(compiled) == 4
+    assert compiled[0]["title"] == "PRODUCT 6"
+    assert compiled[0]["missing"] == "n/a"
+    assert compiled[0]["broken"] == "none"
+    assert compiled[0]["reviews"][1]["rating"] == "7"
+    assert compiled[1] == {"sku": "x0", "title": "EXTRA 0", "missing": "n/a", "details": {},
+                           "tags": [], "reviews": [], "broken": "none"}
+
+
+def test_plan_is_reused_and_rebuilt_on_schema_change():
+    strategy = JsonCssExtractionStrategy(SCHEMA)
+    strategy.extract("", PAGES[0])
+    plan = strategy._plan
+    strategy.extract("", PAGES[1])
+    assert strategy._plan is plan
+
+    strategy.schema = {"baseSelector": "h2.title", "fields": [{"name": "t", "type": "text"}]}
+    assert strategy.extract("", PAGES[0])[0] == {"t": "Product 1"}
+    assert strategy._plan is not plan
+
+    # Changed in place: a stale plan would leave the new field out
+    plan = strategy._plan
+    strategy.schema["fields"].append({"name": "u", "type": "text"})
+    assert strategy.extract("", PAGES[0])[0] == {"t": "Product 1", "u": "Product 1"}
+    assert strategy._plan is not plan
+
+
+def test_function_fields_and_overrides():
+    schema = {
+        "baseSelector": "div.product",
+        "fields": [
+            {"name": "title", "selector": "h2.title", "type": "text"},
+            {"name": "length", "type": "computed", "function": lambda item: len(item["title"])},
+        ],
+    }
+    assert JsonCssExtractionStrategy(schema).extract("", PAGES[0])[0]["length"] == 9
+
+    class Custom(JsonCssExtractionStrategy):
+        def _extract_single_field(self, element, field):
+            return "custom"
+
+    strategy = Custom(schema)
+    assert strategy._get_plan() is None
+    assert strategy.extract("", PAGES[0])[0]["title"] == "custom"
+
+
+def test_base_field_errors_propagate():
+    schema = dict(SCHEMA, baseFields=[{"name": "bad", "type": "regex", "pattern": "("}])
+    for make in STRATEGIES:
+        with pytest.raises(Exception):
+            make(schema).extract("", PAGES[0])
+
+
+@pytest.mark.parametrize("make", [STRATEGIES[0], STRATEGIES[2]])
+def test_extract_many_in_process_pool(make):
+    strategy = make(SCHEMA)
+    serial = strategy.extract_many(PAGES)
+    assert serial == [strategy.extract("", html) for html in PAGES]
+    assert strategy.extract_many(PAGES, urls="https://example.com", max_workers=2, chunksize=2) == serial
+
+    clone = pickle.loads(pickle.dumps(strategy))
+    assert clone.extract("", PAGES[3]) == serial[3]
@@ -0,0 +1,206 @@
+"""
+Tests for the SQLite cache store of AsyncUrlSeeder (head results and sitemap URL lists).
+"""
+import threading
+
+import httpx
+import pytest
+
+from crawl4ai.async_configs import SeedingConfig
+from crawl4ai.async_url_seeder import AsyncUrlSeeder
+from crawl4ai.seeder_cache import SeederCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_batched_and_expired(tmp_path):
+    clock = Clock()
+    cache = SeederCache(tmp_path / "seeder.db", batch_size=3, clock=clock)
+    cache.put("head", "https://a.com/1", {"url": "https://a.com/1", "status": "valid"})
+    cache.put("head", "https://a.com/2", {"url": "https://a.com/2", "status": "valid"})
+    # Buffered entries are visible before they're committed
+    assert cache.get("head", "https://a.com/1", max_age=60)["status"] == "valid"
+    other = SeederCache(tmp_path / "seeder.db", clock=clock)
+    assert other.get("head", "https://a.com/1", max_age=60) is None
+
+    cache.put("live", "https://a.com/1", {"status": "not_valid"})
+    assert other.get("head", "https://a.com/1", max_age=60) is not None  # Third write committed the batch
+
+    urls = [f"https://a.com/{i}" for i in range(1, 1200)]
+    for url in urls[2:]:
+        cache.put("head", url, {"url": url})
+    found = cache.get_many("head", urls + ["https://b.com/"], max_age=60)
+    assert set(found) == set(urls)
+    assert cache.get("live", "https://a.com/1", max_age=60) == {"status": "not_valid"}
+
+    clock.now += 61
+    assert cache.get_many("head", urls, max_age=60) == {}
+    assert len(cache.get_many("head", urls, max_age=3600)) == len(urls)
+    cache.close()
+    other.close()
+
+
+def test_sitemap_list_validity(tmp_path):
+    clock = Clock()
+    cache = SeederCache(tmp_path / "seeder.db", batch_size=4, clock=clock)
+    assert cache.get_sitemap("sitemap_a.com_x", ttl_hours=24) is None
+
+    writer = cache.sitemap_writer("sitemap_a.com_x")
+    for i in range(10):
+        writer.add(f"https://a.com/{i}")
+    assert writer.finish("https://a.com/sitemap.xml", "2024-01-01") == 10
+    expected = [f"https://a.com/{i}" for i in range(10)]
+    assert cache.get_sitemap("sitemap_a.com_x", ttl_hours=24) == expected
+    assert cache.sitemap_lastmod("sitemap_a.com_x", ttl_hours=24) == "2024-01-01"
+    assert cache.sitemap_lastmod("sitemap_b.com_x", ttl_hours=24) is None
+
+    # A newer lastmod invalidates the list, unless lastmod validation is off
+    assert cache.get_sitemap("sitemap_a.com_x", 24, True, "2024-02-01") is None
+    assert cache.get_sitemap("sitemap_a.com_x", 24, False, "2024-02-01") == expected
+
+    # An interrupted refetch leaves the list as it was
+    writer = cache.sitemap_writer("sitemap_a.com_x")
+    for i in range(6):
+        writer.add(f"https://a.com/new-{i}")
+    writer.discard()
+    assert cache.get_sitemap("sitemap_a.com_x", ttl_hours=24) == expected
+
+    clock.now += 25 * 3600
+    assert cache.get_sitemap("sitemap_a.com_x", ttl_hours=24) is None
+    assert cache.sitemap_lastmod("sitemap_a.com_x", ttl_hours=24) is None
+    assert cache.get_sitemap("sitemap_a.com_x", ttl_hours=0) == expected
+
+    writer = cache.sitemap_writer("sitemap_a.com_x")
+    writer.add("https://a.com/only")
+    writer.finish("https://a.com/sitemap.xml", None)
+    assert cache.get_sitemap("sitemap_a.com_x", ttl_hours=24) == ["https://a.com/only"]
+    rows = cache._connect().execute("SELECT COUNT(*) FROM sitemap_urls").fetchone()[0]
+    assert rows == 1
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_head_results_cached_across_runs(tmp_path):
+    fetched = []
+
+    async def fetch_head(url, timeout):
+        fetched.append(url)
+        return True, f"<head><title>{url}</title></head>", url
+
+    urls = [f"https://example.com/articles/page-{i}" for i in range(40)]
+    for run in range(2):
+        seeder = AsyncUrlSeeder(base_directory=tmp_path, cache_root=tmp_path / "cache")
+        seeder._fetch_head = fetch_head
+        results = await seeder.extract_head_for_urls(urls, concurrency=4)
+        assert sorted(r["head_data"]["title"] for r in results) == sorted(urls)
+        await seeder.close()
+    assert len(fetched) == 40  # The second run was served from the cache
+
+    seeder = AsyncUrlSeeder(base_directory=tmp_path, cache_root=tmp_path / "cache")
+    seeder._fetch_head = fetch_head
+    seeder.force = True
+    seeder._cache.batch_size = 2
+    connect, threads = seeder._cache._connect, set()
+
+    def record_thread():  # Every database access, including the commits of full batches
+        threads.add(threading.get_ident())
+        return connect()
+
+    seeder._cache._connect = record_thread
+    await seeder.extract_head_for_urls(urls[:5], concurrency=2)
+    assert threads and threading.get_ident() not in threads  # Off the event loop
+    await seeder.close()
+    assert len(fetched) == 45
+
+
+def urlset(urls):
+    entries = "".join(f"<url><loc>{u}</loc></url>" for u in urls)
+    return f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'
+
+
+@pytest.mark.asyncio
+async def test_sitemap_urls_cached_with_force_and_ttl(tmp_path):
+    requests = []
+    pages = {
+        f"/sitemap-{c}.xml": [f"https://example.com/section-{c}/article-{i}" for i in range(10)]
+        for c in range(3)
+    }
+    index = "".join(f"<sitemap><loc>https://example.com{path}</loc></sitemap>" for path in pages)
+
+    async def handle(request):
+        path = request.url.path
+        requests.append(path)
+        if path == "/sitemap.xml":
+            return httpx.Response(200, text=f"<sitemapindex>{index}</sitemapindex>")
+        if path in pages:
+            return httpx.Response(200, text=urlset(pages[path]))
+        return httpx.Response(404)
+
+    async def run(**config):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+        seeder = AsyncUrlSeeder(client=client, base_directory=tmp_path, cache_root=tmp_path / "cache")
+        seeder.index_id = "CC-TEST"
+        results = await seeder.urls("example.com", SeedingConfig(source="sitemap", **config))
+        await seeder.close()
+        await client.aclose()
+        return sorted(r["url"] for r in results)
+
+    everything = sorted(url for urls in pages.values() for url in urls)
+    assert await run() == everything
+    # Served from the cache: the child sitemaps aren't fetched again
+    assert await run() == everything
+    assert requests.count("/sitemap-0.xml") == 1
+
+    pages["/sitemap-0.xml"].append("https://example.com/section-0/added")
+    assert len(await run(force=True)) == 31
+    assert len(await run()) == 31  # The forced fetch refreshed the cache
+    assert requests.count("/sitemap-0.xml") == 2
+
+
+@pytest.mark.asyncio
+async def test_sitemap_downloaded_whole_only_to_revalidate(tmp_path):
+    gets = []
+    urls = [f"https://example.com/article-{i}" for i in range(20)]
+    lastmod = ["2024-01-01"]
+
+    async def handle(request):
+        if request.url.path != "/sitemap.xml":
+            return httpx.Response(404)
+        if request.method == "GET":
+            gets.append(request.url.path)
+        entries = "".join(f"<url><loc>{u}</loc><lastmod>{lastmod[0]}</lastmod></url>" for u in urls)
+        return httpx.Response(200, text=f"<urlset>{entries}</urlset>")
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+        seeder = AsyncUrlSeeder(client=client, base_directory=tmp_path, cache_root=tmp_path / "cache")
+        seeder.index_id = "CC-TEST"
+        results = await seeder.urls("example.com", SeedingConfig(source="sitemap"))
+        cache = SeederCache(tmp_path / "cache" / "seeder.db")
+        await seeder.close()
+        await client.aclose()
+        return sorted(r["url"] for r in results), cache
+
+    # Nothing cached: one streamed download, whose lastmod is stored with the list
+    found, cache = await run()
+    assert found == sorted(urls) and gets == ["/sitemap.xml"]
+    (key,) = [row[0] for row in cache._connect().execute("SELECT key FROM sitemaps")]
+    assert cache.sitemap_lastmod(key, ttl_hours=24) == "2024-01-01"
+
+    # Cached: the sitemap is downloaded to read its lastmod, the list is reused
+    found, _ = await run()
+    assert found == sorted(urls) and len(gets) == 2
+
+    # A newer lastmod: the download made for the check is parsed, not fetched again
+    lastmod[0] = "2024-02-01"
+    urls.append("https://example.com/added")
+    found, cache = await run()
+    assert found == sorted(urls) and len(gets) == 3
+    assert cache.sitemap_lastmod(key, ttl_hours=24) == "2024-02-01"
+    cache.close()
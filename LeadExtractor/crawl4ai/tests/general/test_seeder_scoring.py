@@ -0,0 +1,122 @@
+"""
+Tests for AsyncUrlSeeder's incremental BM25 scoring, with head fetching faked (no network).
+"""
+import importlib.machinery
+import importlib.util
+import random
+
+import numpy as np
+import pytest
+
+import crawl4ai.async_url_seeder as async_url_seeder
+from crawl4ai.async_configs import SeedingConfig
+from crawl4ai.async_url_seeder import AsyncUrlSeeder
+from crawl4ai.bm25 import BM25Index
+
+
+def _load_rank_bm25():
+    """The installed rank_bm25, even if another test module stubbed it in sys.modules."""
+    spec = importlib.machinery.PathFinder.find_spec("rank_bm25")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+BM25Okapi = _load_rank_bm25().BM25Okapi
+
+WORDS = "python crawler tutorial async guide news sport premier league highlights docs api".split()
+
+
+def make_pages(count, seed=3):
+    rng = random.Random(seed)
+    pages = {}
+    for i in range(count):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6)))
+        description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12)))
+        pages[f"https://example.com/articles/page-{i}"] = (
+            f"<head><title>{title}</title>"
+            f'<meta name="description" content="{description}"></head>'
+        )
+    # A page without head text is scored by its URL
+    pages["https://example.com/python-crawler-tutorial"] = "<head></head>"
+    return pages
+
+
+@pytest.fixture
+def seeder(tmp_path):
+    seeder = AsyncUrlSeeder(base_directory=tmp_path, cache_root=tmp_path / "cache")
+    pages = make_pages(120)
+
+    async def fetch_head(url, timeout):
+        return True, pages[url], url
+
+    seeder._fetch_head = fetch_head
+    seeder.pages = pages
+    return seeder
+
+
+def test_index_matches_rank_bm25():
+    rng = random.Random(5)
+    query = ["python", "crawler", "python", "missing"]
+    index = BM25Index(query)
+    corpus = []
+    for _ in range(1500):
+        document = [rng.choice(WORDS) for _ in range(rng.randint(0, 15))]
+        corpus.append(document)
+        index.add(document)
+        if len(corpus) in (1, 10, 1500):
+            assert index.scores() == pytest.approx(BM25Okapi(corpus).get_scores(query))
+
+    scores = index.scores()
+    best = index.top_k(10)
+    assert list(scores[best]) == sorted(scores, reverse=True)[:10]
+
+
+@pytest.mark.asyncio
+async def test_scores_equal_a_single_pass(seeder):
+    config = SeedingConfig(query="python crawler tutorial", concurrency=8)
+    results = await seeder.extract_head_for_urls(list(seeder.pages), config=config, concurrency=8)
+
+    scored = [r for r in results if r["head_data"].get("title")]
+    documents = [seeder._extract_text_context(r["head_data"]).lower().split() for r in scored]
+    expected = BM25Okapi(documents).get_scores("python crawler tutorial".split())
+    expected = (expected - expected.min()) / (expected.max() - expected.min())
+    assert [r["relevance_score"] for r in scored] == pytest.approx(list(expected))
+
+    scores = [r["relevance_score"] for r in results]
+    assert scores == sorted(scores, reverse=True)
+    url_scored = next(r for r in results if r["url"].endswith("python-crawler-tutorial"))
+    assert url_scored["relevance_score"] == seeder._calculate_url_relevance_score(
+        "python crawler tutorial", url_scored["url"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_reports_top_k_while_fetching(seeder, monkeypatch):
+    monkeypatch.setattr(async_url_seeder, "SEED_TOP_K_INTERVAL", 25)
+    reports = []
+
+    async def on_top_k(top):
+        reports.append(top)
+
+    config = SeedingConfig(query="premier league highlights", top_k=5, on_top_k=on_top_k)
+    results = await seeder.extract_head_for_urls(list(seeder.pages), config=config, concurrency=4)
+
+    assert len(results) == 5
+    # Reports every 25 scored heads, then the final one
+    assert len(reports) == 120 // 25 + 1
+    assert all(len(top) == 5 for top in reports)
+    assert [r["url"] for r in reports[-1]] == [r["url"] for r in results]
+    assert all(
+        np.all(np.diff([r["relevance_score"] for r in top]) <= 0) for top in reports
+    )
+
+
+def test_calculate_bm25_score(seeder):
+    documents = ["python python crawler", "sport news", "guide docs", ""]
+    scores = seeder._calculate_bm25_score("python", documents)
+    expected = BM25Okapi([d.split() for d in documents]).get_scores(["python"])
+    expected = (expected - expected.min()) / (expected.max() - expected.min())
+    assert scores == pytest.approx(list(expected))
+    assert seeder._calculate_bm25_score("python", ["", ""]) == [0.0, 0.0]
+    assert seeder._calculate_bm25_score("python", ["sport", "news"]) == [0.5, 0.5]
@@ -0,0 +1,162 @@
+"""
+Tests for streaming, concurrent sitemap ingestion, served by an httpx mock transport (no network).
+"""
+import asyncio
+import gzip
+
+import httpx
+import pytest
+
+from crawl4ai import async_url_seeder
+from crawl4ai.async_url_seeder import AsyncUrlSeeder, _SitemapStreamParser
+
+
+def urlset(urls):
+    entries = "".join(f"<url><loc>{u}</loc><lastmod>2024-01-01</lastmod></url>" for u in urls)
+    return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'.encode()
+
+
+def index(children):
+    entries = "".join(f"<sitemap><loc>{c}</loc></sitemap>" for c in children)
+    return f'<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</sitemapindex>'.encode()
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """Response body sent in small chunks, with a pause before each one."""
+
+    def __init__(self, body, server, chunk_size=256):
+        self.body = body
+        self.server = server
+        self.chunk_size = chunk_size
+
+    async def __aiter__(self):
+        self.server.active += 1
+        self.server.peak = max(self.server.peak, self.server.active)
+        try:
+            for start in range(0, len(self.body), self.chunk_size):
+                await asyncio.sleep(0.001)
+                self.server.chunks_sent += 1
+                yield self.body[start:start + self.chunk_size]
+        finally:
+            self.server.active -= 1
+
+
+class SitemapServer:
+    def __init__(self, files):
+        self.files = files
+        self.active = 0
+        self.peak = 0
+        self.chunks_sent = 0
+        self.requests = []
+
+    async def handle(self, request):
+        url = str(request.url)
+        self.requests.append(url)
+        if url not in self.files:
+            return httpx.Response(404)
+        return httpx.Response(200, stream=ChunkedStream(self.files[url], self))
+
+
+def make_seeder(server, tmp_path, concurrency=3):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(server.handle))
+    seeder = AsyncUrlSeeder(client=client, base_directory=tmp_path, cache_root=tmp_path / "cache")
+    seeder._sitemap_concurrency = concurrency
+    return seeder
+
+
+def site(children=12, per_child=200):
+    files = {}
+    child_urls = []
+    for c in range(children):
+        url = f"https://example.com/sitemaps/child-{c}.xml.gz"
+        child_urls.append(url)
+        files[url] = gzip.compress(urlset(f"https://example.com/c{c}/p{i}" for i in range(per_child)))
+    # A nested index and a missing child
+    files["https://example.com/sitemaps/nested.xml"] = index(child_urls[6:] + ["https://example.com/missing.xml"])
+    files["https://example.com/sitemap.xml"] = index(child_urls[:6] + ["https://example.com/sitemaps/nested.xml"])
+    return files
+
+
+@pytest.mark.asyncio
+async def test_index_children_fetched_concurrently_within_limit(tmp_path):
+    server = SitemapServer(site())
+    seeder = make_seeder(server, tmp_path, concurrency=3)
+
+    urls = [u async for u in seeder._iter_sitemap("https://example.com/sitemap.xml")]
+
+    assert sorted(urls) == sorted(f"https://example.com/c{c}/p{i}" for c in range(12) for i in range(200))
+    assert 1 < server.peak <= 3
+    assert "https://example.com/missing.xml" in server.requests
+    await seeder.close()
+
+
+@pytest.mark.asyncio
+async def test_urls_are_yielded_before_downloads_finish(tmp_path):
+    server = SitemapServer(site())
+    seeder = make_seeder(server, tmp_path, concurrency=2)
+    total_chunks = sum((len(body) + 255) // 256 for body in server.files.values())
+
+    stream = seeder._iter_sitemap("https://example.com/sitemap.xml")
+    first = await stream.__anext__()
+    assert first.startswith("https://example.com/c")
+    assert server.chunks_sent < total_chunks / 2
+    await stream.aclose()
+    await seeder.close()
+
+
+@pytest.mark.asyncio
+async def test_stopping_early_with_a_full_queue_leaves_no_task_behind(tmp_path, monkeypatch):
+    monkeypatch.setattr(async_url_seeder, "SITEMAP_QUEUE_BATCHES", 2)
+    server = SitemapServer(site())
+    seeder = make_seeder(server, tmp_path, concurrency=3)
+
+    stream = seeder._iter_sitemap("https://example.com/sitemap.xml")
+    urls = [await stream.__anext__() for _ in range(5)]
+    await asyncio.sleep(0.05)  # Fetches fill the queue and wait for room
+    await asyncio.wait_for(stream.aclose(), timeout=5)
+
+    assert len(urls) == 5
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+    await seeder.close()
+
+
+@pytest.mark.asyncio
+async def test_root_sitemap_streamed_when_nothing_is_cached(tmp_path):
+    body = urlset(f"https://example.com/p{i}" for i in range(2000))
+    server = SitemapServer({"https://example.com/sitemap.xml": body})
+    get = server.handle
+
+    async def handle(request):
+        if request.method == "HEAD":
+            return httpx.Response(200 if str(request.url) in server.files else 404)
+        return await get(request)
+
+    server.handle = handle
+    seeder = make_seeder(server, tmp_path)
+
+    stream = seeder._from_sitemaps("example.com", "*")
+    assert await stream.__anext__() == "https://example.com/p0"
+    # Not downloaded whole for its lastmod first
+    assert server.chunks_sent < (len(body) + 255) // 256 / 2
+    await stream.aclose()
+    await seeder.close()
+
+
+def test_parser_handles_split_chunks_and_gzip():
+    body = gzip.compress(urlset(["/relative", "https://example.com/absolute"]))
+    parser = _SitemapStreamParser("https://example.com/sitemap.xml.gz")
+    items = []
+    for i in range(len(body)):
+        items += parser.feed(body[i:i + 1])
+    items += parser.close()
+    assert items == [("url", "https://example.com/relative"), ("url", "https://example.com/absolute")]
+    assert parser.counts == {"url": 2, "sitemap": 0}
+
+
+def test_parser_yields_while_feeding():
+    parser = _SitemapStreamParser("https://example.com/sitemap.xml")
+    body = urlset(f"https://example.com/p{i}" for i in range(5000))
+    batches = [parser.feed(body[start:start + 4096]) for start in range(0, len(body), 4096)]
+    batches.append(parser.close())
+    assert sum(len(batch) for batch in batches) == 5000
+    assert sum(1 for batch in batches if batch) > len(batches) // 2
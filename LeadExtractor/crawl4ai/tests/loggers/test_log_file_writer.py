@@ -0,0 +1,91 @@
+"""
+Tests for the buffered background log file writer of AsyncLogger / AsyncFileLogger.
+"""
+import os
+import time
+
+from crawl4ai.async_logger import AsyncFileLogger, AsyncLogger, LogFileWriter
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_logger_lines_batched_until_flush(tmp_path):
+    path = tmp_path / "logs" / "crawler.log"
+    logger = AsyncLogger(log_file=str(path), verbose=False)
+    logger._writer.flush_interval = 60
+    for i in range(200):
+        logger.info("Fetched {url} [{i}]", tag="FETCH", params={"url": f"https://example.com/{i}", "i": i})
+
+    time.sleep(0.1)
+    assert not path.exists() or path.stat().st_size == 0  # Still buffered
+
+    logger.flush()
+    lines = read_lines(path)
+    assert len(lines) == 200
+    # Timestamped, markup stripped, in order
+    assert lines[0].startswith("[20") and "[FETCH]... ↓ Fetched https://example.com/0 " in lines[0]
+    assert all(f"example.com/{i} " in line for i, line in enumerate(lines))
+    assert logger._writer._file is not None  # Kept open between batches
+    logger.close()
+    assert logger._writer._file is None
+
+
+def test_written_after_interval_or_size(tmp_path):
+    path = tmp_path / "timed.log"
+    writer = LogFileWriter(str(path), flush_interval=0.05)
+    writer.write("one\n")
+    assert wait_for(lambda: path.exists() and read_lines(path) == ["one"])
+
+    path = tmp_path / "sized.log"
+    writer = LogFileWriter(str(path), flush_interval=60, flush_size=100)
+    for i in range(30):
+        writer.write(f"line {i:03d}\n")  # 9 characters each
+    assert wait_for(lambda: path.exists() and len(read_lines(path)) >= 11)
+    writer.close()
+    assert len(read_lines(path)) == 30
+
+
+def test_rotation_keeps_backups(tmp_path):
+    path = tmp_path / "rotating.log"
+    writer = LogFileWriter(str(path), max_bytes=1000, backup_count=2, flush_size=1)
+    for i in range(300):
+        writer.write(f"message number {i:04d}\n")  # 20 bytes each
+        if i % 10 == 9:
+            writer.flush()
+    writer.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["rotating.log", "rotating.log.1", "rotating.log.2"]
+    for name in os.listdir(tmp_path):
+        assert os.path.getsize(tmp_path / name) <= 1000
+    # The newest messages survive, in order across the files
+    lines = read_lines(f"{path}.2") + read_lines(f"{path}.1") + read_lines(path)
+    numbers = [int(line.rsplit(" ", 1)[1]) for line in lines]
+    assert numbers == list(range(numbers[0], 300))
+
+
+def test_file_logger_and_reopen_after_close(tmp_path):
+    path = tmp_path / "file.log"
+    logger = AsyncFileLogger(str(path))
+    logger.info("first", tag="INIT")
+    logger.url_status("https://example.com/page", True, 1.5)
+    logger.close()
+    logger.error("after close")  # Restarts the writer
+    logger.flush()
+
+    lines = read_lines(path)
+    assert lines[0].endswith("[INFO] [INIT] first")
+    assert "[URL_STATUS] [FETCH] https://example.com/page... | Status: SUCCESS | Time: 1.50s" in lines[1]
+    assert lines[2].endswith("[ERROR] [ERROR] after close")
+    logger.close()
@@ -0,0 +1,189 @@
+"""
+Tests for HealthAwareProxyStrategy, driven by a simulated stream of crawl outcomes (no network).
+"""
+import random
+from collections import Counter
+
+import pytest
+
+from crawl4ai.async_configs import CrawlerRunConfig, ProxyConfig
+from crawl4ai.cache_context import CacheMode
+from crawl4ai.async_webcrawler import AsyncWebCrawler
+from crawl4ai.models import AsyncCrawlResponse
+from crawl4ai.proxy_strategy import HealthAwareProxyStrategy, RoundRobinProxyStrategy
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeProxies:
+    """Outcome of a request through each proxy: (failure probability, latency in seconds)."""
+
+    def __init__(self, behaviour, seed=0):
+        self.behaviour = behaviour
+        self.rng = random.Random(seed)
+
+    def outcome(self, proxy):
+        failure_rate, latency = self.behaviour[proxy.server]
+        if self.rng.random() < failure_rate:
+            return False, latency * 10  # Failures end in a timeout
+        return True, latency * self.rng.uniform(0.8, 1.2)
+
+
+async def run(strategy, fake, clock, requests, step=0.1):
+    used = Counter()
+    for _ in range(requests):
+        proxy = await strategy.get_next_proxy()
+        used[proxy.server] += 1
+        success, latency = fake.outcome(proxy)
+        await strategy.report_result(proxy, success, latency)
+        clock.now += step
+    return used
+
+
+def make_proxies(n):
+    return [ProxyConfig(server=f"http://proxy{i}.test:8080") for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_traffic_follows_health_and_latency():
+    proxies = make_proxies(4)
+    fake = FakeProxies({
+        "http://proxy0.test:8080": (0.0, 0.5),
+        "http://proxy1.test:8080": (0.0, 0.5),
+        "http://proxy2.test:8080": (0.0, 2.0),  # Slow
+        "http://proxy3.test:8080": (1.0, 0.5),  # Dead
+    })
+    clock = Clock()
+    strategy = HealthAwareProxyStrategy(proxies, clock=clock, rng=random.Random(1))
+
+    used = await run(strategy, fake, clock, 2000)
+
+    fast = used["http://proxy0.test:8080"] + used["http://proxy1.test:8080"]
+    assert used["http://proxy2.test:8080"] < fast / 4
+    # The dead proxy is quarantined after 3 failures, then only probed with backoff
+    assert used["http://proxy3.test:8080"] < 15
+    stats = strategy.get_stats()
+    assert strategy.is_quarantined(proxies[3])
+    assert stats["http://proxy3.test:8080"].quarantines >= 3
+    assert stats["http://proxy0.test:8080"].latency == pytest.approx(0.5, rel=0.25)
+
+    # Round-robin, for comparison, sends a quarter of the traffic to the dead proxy
+    round_robin = RoundRobinProxyStrategy(proxies)
+    used = await run(round_robin, fake, clock, 2000)
+    assert used["http://proxy3.test:8080"] == 500
+
+
+@pytest.mark.asyncio
+async def test_quarantine_backoff_and_probe_back_in():
+    proxies = make_proxies(2)
+    clock = Clock()
+    strategy = HealthAwareProxyStrategy(
+        proxies, failure_threshold=2, quarantine_base=10, quarantine_max=40, clock=clock
+    )
+    bad = proxies[1]
+    await strategy.report_result(bad, False)
+    assert not strategy.is_quarantined(bad)
+    await strategy.report_result(bad, True, 0.2)  # A success resets the count
+    await strategy.report_result(bad, False)
+    await strategy.report_result(bad, False)
+    assert strategy.is_quarantined(bad)
+
+    # Quarantined: only the healthy proxy is handed out
+    assert {(await strategy.get_next_proxy()).server for _ in range(50)} == {proxies[0].server}
+
+    # Each failed probe doubles the quarantine, up to the maximum
+    for expected in (20, 40, 40):
+        clock.now = strategy.get_stats()[bad.server].quarantined_until
+        assert await strategy.get_next_proxy() is bad  # The probe
+        assert await strategy.get_next_proxy() is proxies[0]  # Only one probe at a time
+        await strategy.report_result(bad, False)
+        assert strategy.get_stats()[bad.server].quarantined_until == clock.now + expected
+
+    clock.now = strategy.get_stats()[bad.server].quarantined_until
+    assert await strategy.get_next_proxy() is bad
+    await strategy.report_result(bad, True, 0.3)
+    assert not strategy.is_quarantined(bad)
+    assert bad.server in {(await strategy.get_next_proxy()).server for _ in range(50)}
+
+
+@pytest.mark.asyncio
+async def test_unreported_probe_is_retried_and_all_quarantined_pool_still_serves():
+    proxies = make_proxies(2)
+    clock = Clock()
+    strategy = HealthAwareProxyStrategy(
+        proxies, failure_threshold=1, quarantine_base=10, probe_timeout=30, clock=clock
+    )
+    for proxy in proxies:
+        await strategy.report_result(proxy, True, 0.1, status_code=429)  # Counted as a failure
+    assert all(strategy.is_quarantined(p) for p in proxies)
+    # Never None, which would crawl without a proxy
+    assert await strategy.get_next_proxy() in proxies
+
+    clock.now += 10
+    probe = await strategy.get_next_proxy()
+    other = await strategy.get_next_proxy()
+    assert probe is not other
+    third = await strategy.get_next_proxy()  # Both are being probed
+    assert third in proxies
+    clock.now += 31
+    assert await strategy.get_next_proxy() in proxies  # The probes were lost, probe again
+
+
+@pytest.mark.asyncio
+async def test_sticky_session_moves_off_quarantined_proxy():
+    proxies = make_proxies(3)
+    clock = Clock()
+    strategy = HealthAwareProxyStrategy(proxies, failure_threshold=1, clock=clock, rng=random.Random(2))
+
+    first = await strategy.get_proxy_for_session("s1")
+    assert await strategy.get_proxy_for_session("s1") is first
+    assert strategy.get_session_proxy("s1") is first
+
+    await strategy.report_result(first, False)
+    moved = await strategy.get_proxy_for_session("s1")
+    assert moved is not first and not strategy.is_quarantined(moved)
+    assert await strategy.get_proxy_for_session("s1") is moved
+    await strategy.release_session("s1")
+    assert strategy.get_active_sessions() == {}
+
+
+class FakeCrawlerStrategy:
+    """Crawler strategy whose fetch fails through one proxy."""
+
+    def __init__(self, dead_server):
+        self.dead_server = dead_server
+
+    async def crawl(self, url, config):
+        if config.proxy_config.server == self.dead_server:
+            raise RuntimeError("net::ERR_PROXY_CONNECTION_FAILED")
+        return AsyncCrawlResponse(html="<html><body>ok</body></html>", response_headers={}, status_code=200)
+
+
+@pytest.mark.asyncio
+async def test_crawler_reports_outcomes(tmp_path, monkeypatch):
+    monkeypatch.setenv("CRAWL4_AI_BASE_DIRECTORY", str(tmp_path))
+    proxies = make_proxies(2)
+    reported = []
+    strategy = HealthAwareProxyStrategy(proxies, failure_threshold=2, rng=random.Random(3))
+    original = strategy.report_result
+
+    async def record(proxy, success, latency=None, status_code=None):
+        reported.append((proxy.server, success, status_code))
+        await original(proxy, success, latency, status_code)
+
+    strategy.report_result = record
+    crawler = AsyncWebCrawler(crawler_strategy=FakeCrawlerStrategy(proxies[1].server))
+    crawler.ready = True  # Nothing to start
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, proxy_rotation_strategy=strategy)
+    results = [await crawler.arun("https://example.com/", config=config) for _ in range(20)]
+
+    assert (proxies[0].server, True, 200) in reported
+    assert (proxies[1].server, False, None) in reported
+    assert strategy.is_quarantined(proxies[1])
+    assert sum(1 for r in results if r.success) > 15
@@ -15,6 +15,7 @@ from api.routes import (
     admin_messages_router,
     admin_users_router,
     admin_payments_router,
+    admin_generation_cache_router,
 )
 
 # Initialize database on import
@@ -53,6 +54,7 @@ def create_api_app() -> FastAPI:
     app.include_router(admin_messages_router)
     app.include_router(admin_users_router)
     app.include_router(admin_payments_router)
+    app.include_router(admin_generation_cache_router)
 
     return app
 
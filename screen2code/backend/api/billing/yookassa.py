@@ -7,7 +7,7 @@ import json
 import base64
 import httpx
 
-from db.sqlite import get_conn
+from db.sqlite import get_conn, invalidate_user_sessions
 
 # ===========================
 # CONFIGURATION
@@ -491,6 +491,7 @@ def update_user_plan(user_id: str, plan: str) -> bool:
             (plan, user_id),
         )
         conn.commit()
+        invalidate_user_sessions(user_id)
         rows_updated = cursor.rowcount
         print(f"[BILLING] ✓ update_user_plan() - successfully updated {rows_updated} rows for user {user_id} to plan '{plan}'")
         return True
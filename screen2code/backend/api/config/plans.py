@@ -7,6 +7,7 @@ PLANS = {
         "allowed_formats": ["html"],
         "description": "30 HTML generations per month",
         "price_cents": 0,
+        "queue_priority": 0,
     },
     "basic": {
         "name": "Basic",
@@ -14,6 +15,7 @@ PLANS = {
         "allowed_formats": ["html", "react"],
         "description": "200 generations per month (HTML + React)",
         "price_cents": 999,  # $9.99 (not implemented)
+        "queue_priority": 10,
     },
     "professional": {
         "name": "Professional",
@@ -21,6 +23,7 @@ PLANS = {
         "allowed_formats": ["html", "react", "vue", "svelte"],
         "description": "1000 generations per month (all formats)",
         "price_cents": 2999,  # $29.99 (not implemented)
+        "queue_priority": 20,
     },
 }
 
@@ -36,6 +39,12 @@ def get_plan_limit(plan_name: str) -> int:
     return plan["limit_generations"]
 
 
+def get_plan_priority(plan_name: str) -> int:
+    """Get generation queue priority for a plan (higher runs first)."""
+    plan = get_plan(plan_name)
+    return plan.get("queue_priority", 0)
+
+
 def is_format_allowed(plan_name: str, format_name: str) -> bool:
     """Check if format is allowed in plan."""
     plan = get_plan(plan_name)
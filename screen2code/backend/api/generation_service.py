@@ -155,9 +155,10 @@ async def trigger_generation(generation_id: str) -> None:
 
         try:
             cursor.execute("""
-                SELECT format, input_type, input_data, instructions
-                FROM api_generations
-                WHERE id = ?
+                SELECT g.format, g.input_type, g.input_data, g.instructions, g.user_id, u.plan
+                FROM api_generations g
+                LEFT JOIN users u ON u.id = g.user_id
+                WHERE g.id = ?
             """, (generation_id,))
 
             row = cursor.fetchone()
@@ -167,7 +168,7 @@ async def trigger_generation(generation_id: str) -> None:
                 # Can't update generation if it doesn't exist
                 return
 
-            format_type, input_type, input_data, instructions = row
+            format_type, input_type, input_data, instructions, user_id, plan = row
 
         finally:
             conn.close()
@@ -201,7 +202,10 @@ async def trigger_generation(generation_id: str) -> None:
             generation_id=generation_id,
             websocket=mock_websocket,
             params=params,
-            websocket_already_accepted=True  # Mock websocket doesn't need accept
+            websocket_already_accepted=True,  # Mock websocket doesn't need accept
+            user_id=user_id,
+            plan=plan or "free",
+            source="api",  # Re-created as DatabaseWebSocket if the job outlives this process
         )
 
         await enqueue_generation(job)
@@ -12,6 +12,7 @@ from .user import router as user_router
 from .admin.messages import router as admin_messages_router
 from .admin.users import router as admin_users_router
 from .admin.payments import router as admin_payments_router
+from .admin.generation_cache import router as admin_generation_cache_router
 
 __all__ = [
     "health_router",
@@ -26,4 +27,5 @@ __all__ = [
     "admin_messages_router",
     "admin_users_router",
     "admin_payments_router",
+    "admin_generation_cache_router",
 ]
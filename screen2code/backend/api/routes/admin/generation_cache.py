@@ -0,0 +1,27 @@
+"""Admin endpoints for the generation cache."""
+
+from fastapi import APIRouter, Depends
+from api.admin_auth import get_admin_user
+from db import run_db
+from gen_cache.generation_cache import get_cache_stats
+
+router = APIRouter(prefix="/api/admin/generation-cache", tags=["admin"])
+
+
+@router.get("")
+async def get_generation_cache_stats(admin: dict = Depends(get_admin_user)):
+    """
+    Get generation cache statistics.
+
+    Returns:
+    {
+        "enabled": true,
+        "hits": 12,          # since this process started
+        "misses": 30,
+        "stores": 28,
+        "hitRate": 0.2857,
+        "entries": 154,      # rows in generation_cache
+        "totalHits": 97      # hits recorded on stored entries
+    }
+    """
+    return await run_db(get_cache_stats)
@@ -5,7 +5,7 @@ from api.admin_auth import get_admin_user
 from api.billing.yookassa import PACKAGES
 import sqlite3
 from pydantic import BaseModel
-from db import get_conn as get_db
+from db import get_conn as get_db, invalidate_user_sessions
 
 router = APIRouter(prefix="/api/admin/users", tags=["admin"])
 
@@ -144,6 +144,7 @@ async def change_user_plan(
         )
 
         conn.commit()
+        invalidate_user_sessions(request.userId)
 
         return {"success": True}
 
@@ -210,6 +211,7 @@ async def disable_user(
         )
 
         conn.commit()
+        invalidate_user_sessions(request.userId)
 
         return {"success": True}
 
@@ -269,6 +271,7 @@ async def reset_user_limits(
         )
 
         conn.commit()
+        invalidate_user_sessions(user_id)
 
         print(f"[ADMIN] Successfully reset usage for user {user_id}")
 
@@ -337,6 +340,7 @@ async def set_user_usage(
         )
 
         conn.commit()
+        invalidate_user_sessions(user_id)
 
         return {"success": True}
 
@@ -27,6 +27,20 @@ ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", None)
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", None)
 OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL", None)
 
+# Generation queue
+# Number of generations processed concurrently and per-user concurrency cap
+GENERATION_WORKERS = int(os.environ.get("GENERATION_WORKERS", "4"))
+GENERATION_MAX_PER_USER = int(os.environ.get("GENERATION_MAX_PER_USER", "1"))
+
+# Generation cache
+# Identical prompt (screenshot + stack + model + prompt version) replays the stored completion
+GENERATION_CACHE_ENABLED = os.environ.get("GENERATION_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+GENERATION_CACHE_TTL_HOURS = float(os.environ.get("GENERATION_CACHE_TTL_HOURS", "168"))
+
+# Video input
+# Drop frames that look the same as the previous kept frame (fewer images in the prompt)
+VIDEO_DEDUPE_FRAMES = os.environ.get("VIDEO_DEDUPE_FRAMES", "").lower() in ("true", "1", "yes")
+
 # Image generation (optional)
 REPLICATE_API_KEY = os.environ.get("REPLICATE_API_KEY", None)
 
@@ -13,7 +13,10 @@ from .sqlite import (
     save_generation_variant,
     get_generation_variants,
     hash_api_key,
+    invalidate_user_sessions,
 )
+from .pool import run_db, close_pools
+from .write_batcher import get_write_batcher
 
 __all__ = [
     "init_db",
@@ -29,4 +32,8 @@ __all__ = [
     "save_generation_variant",
     "get_generation_variants",
     "hash_api_key",
+    "invalidate_user_sessions",
+    "run_db",
+    "close_pools",
+    "get_write_batcher",
 ]
@@ -0,0 +1,141 @@
+"""Pooled SQLite connections and a thread executor for running DB calls off the event loop."""
+import asyncio
+import functools
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Idle connections kept open per database file
+POOL_MAX_IDLE = int(os.environ.get("DB_POOL_MAX_IDLE", "8"))
+
+# Threads running blocking DB calls for async code
+DB_EXECUTOR_WORKERS = int(os.environ.get("DB_EXECUTOR_WORKERS", "4"))
+
+# Per-connection prepared statement cache (sqlite3 reuses compiled statements by SQL text)
+STATEMENT_CACHE_SIZE = 256
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3 connection that returns itself to its pool on close().
+
+    Existing code keeps the `conn = get_conn() ... conn.close()` pattern,
+    but the connection (and its compiled statement cache) is reused.
+    """
+
+    pool: Optional["ConnectionPool"] = None
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            super().close()
+
+    def close_for_real(self) -> None:
+        """Close the underlying SQLite handle"""
+        self.pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections to one database file"""
+
+    def __init__(self, db_path: str, max_idle: int = POOL_MAX_IDLE):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> PooledConnection:
+        """Open a new connection with per-connection PRAGMAs applied once"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30.0,
+            check_same_thread=False,
+            factory=PooledConnection,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA synchronous=NORMAL;")
+        cursor.execute("PRAGMA busy_timeout=30000;")
+        cursor.close()
+        conn.pool = self
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """Take an idle connection or open a new one"""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        """Return a connection to the pool (uncommitted work is rolled back, like close())"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close_for_real()
+            return
+
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close_for_real()
+
+    def close_all(self) -> None:
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close_for_real()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """Get (or create) the connection pool for a database file"""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = ConnectionPool(db_path)
+            _pools[db_path] = pool
+        return pool
+
+
+def close_pools() -> None:
+    """Close idle connections of all pools (on shutdown)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used for blocking DB calls"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+    return _executor
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking DB function in the DB thread pool without blocking the event loop.
+
+    Example:
+        await run_db(update_generation, generation_id=gen_id, status="processing")
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(func, *args, **kwargs))
@@ -1,16 +1,26 @@
 """SQLite database module with idempotent schema initialization - SINGLE DATABASE."""
 import sqlite3
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import hashlib
 import uuid
 from datetime import datetime, timedelta
 
+from .pool import get_pool
+
 # Database configuration - SINGLE SOURCE OF TRUTH
 DB_DIR = Path(__file__).parent.parent / "data"
 DB_PATH = DB_DIR / "app.db"
 
+# Session lookups run on every HTTP request / WebSocket connection - cache them briefly.
+# Entries are invalidated on logout and when the user's plan/limits change.
+SESSION_CACHE_TTL_SECONDS = 30.0
+_session_cache: Dict[str, Tuple[float, dict]] = {}
+_session_cache_lock = threading.Lock()
+
 
 def get_db_path() -> Path:
     """Get the database path."""
@@ -18,30 +28,22 @@ def get_db_path() -> Path:
 
 
 def get_conn() -> sqlite3.Connection:
-    """Get a connection to the SQLite database (for UI generations)."""
+    """Get a pooled connection to the SQLite database (for UI generations).
+
+    conn.close() returns the connection to the pool.
+    """
     DB_DIR.mkdir(exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH), timeout=30.0, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_pool(str(DB_PATH)).acquire()
 
 
 def get_api_conn() -> sqlite3.Connection:
     """Get a connection to the SQLite database (for API generations).
 
     SAME DATABASE as get_conn(), just a semantic alias for API code.
+    WAL mode is set once by init_db(); busy_timeout/synchronous are set
+    once per pooled connection.
     """
-    DB_DIR.mkdir(exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH), timeout=30.0, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-
-    # Enable WAL mode for concurrent access
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA journal_mode=WAL;")
-    cursor.execute("PRAGMA synchronous=NORMAL;")
-    cursor.execute("PRAGMA busy_timeout=30000;")
-    cursor.close()
-
-    return conn
+    return get_conn()
 
 
 def hash_api_key(key: str) -> str:
@@ -321,6 +323,35 @@ def init_db() -> None:
             )
         """)
 
+        # Create generation_jobs table (durable generation queue, survives restarts)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS generation_jobs (
+                generation_id TEXT PRIMARY KEY,
+                user_id TEXT,
+                priority INTEGER NOT NULL DEFAULT 0,
+                source TEXT NOT NULL DEFAULT 'ws',
+                params TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                enqueued_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                FOREIGN KEY (user_id) REFERENCES users(id)
+            )
+        """)
+
+        # Create generation_cache table (completions keyed by prompt content, see gen_cache)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS generation_cache (
+                cache_key TEXT PRIMARY KEY,
+                stack TEXT NOT NULL,
+                model TEXT NOT NULL,
+                code TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0,
+                last_hit_at TEXT
+            )
+        """)
+
         # Create usage_events table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS usage_events (
@@ -453,6 +484,18 @@ def init_db() -> None:
             ON generation_variants(generation_id)
         """)
 
+        # Queue indexes
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_generation_jobs_status
+            ON generation_jobs(status, priority DESC, enqueued_at)
+        """)
+
+        # Generation cache indexes
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_generation_cache_created
+            ON generation_cache(created_at)
+        """)
+
         # Session indexes
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_sessions_user_id
@@ -862,15 +905,61 @@ def create_session(user_id: str, expiration_days: int = 30) -> str:
         conn.close()
 
 
+def _copy_session(session_dict: dict) -> dict:
+    """Copy cached session data so callers can't mutate the cache"""
+    return {**session_dict, "user": dict(session_dict["user"])}
+
+
+def invalidate_session_cache(session_id: Optional[str] = None) -> None:
+    """Drop one cached session, or all of them if session_id is None."""
+    with _session_cache_lock:
+        if session_id is None:
+            _session_cache.clear()
+        else:
+            _session_cache.pop(session_id, None)
+
+
+def invalidate_user_sessions(user_id: str) -> None:
+    """Drop cached sessions of a user (call after changing plan, limits or disabled flag)."""
+    with _session_cache_lock:
+        stale = [
+            session_id
+            for session_id, (_, session_dict) in _session_cache.items()
+            if session_dict["user_id"] == user_id
+        ]
+        for session_id in stale:
+            del _session_cache[session_id]
+
+
 def get_session(session_id: str) -> Optional[dict]:
     """
     Get session data and user info by session ID.
     Returns None if session not found or expired.
 
+    Results are cached for SESSION_CACHE_TTL_SECONDS.
+
     Returns:
         dict: {id, user_id, created_at, expires_at} + user data from users table
         None: if session not found or expired
     """
+    with _session_cache_lock:
+        cached = _session_cache.get(session_id)
+    if cached is not None:
+        cached_until, session_dict = cached
+        if time.monotonic() < cached_until and session_dict["expires_at"] > datetime.utcnow().isoformat():
+            return _copy_session(session_dict)
+        invalidate_session_cache(session_id)
+
+    session_dict = _load_session(session_id)
+    if session_dict is not None:
+        with _session_cache_lock:
+            _session_cache[session_id] = (time.monotonic() + SESSION_CACHE_TTL_SECONDS, session_dict)
+        return _copy_session(session_dict)
+    return None
+
+
+def _load_session(session_id: str) -> Optional[dict]:
+    """Read session + user data from the database."""
     conn = get_conn()
     cursor = conn.cursor()
 
@@ -928,6 +1017,7 @@ def delete_session(session_id: str) -> None:
     try:
         cursor.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
         conn.commit()
+        invalidate_session_cache(session_id)
         print(f"[DB] Deleted session {session_id}")
 
     except Exception as e:
@@ -947,6 +1037,7 @@ def cleanup_expired_sessions() -> int:
         now = datetime.utcnow().isoformat()
         cursor.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
         conn.commit()
+        invalidate_session_cache()
         count = cursor.rowcount
         print(f"[DB] Cleaned up {count} expired sessions")
         return count
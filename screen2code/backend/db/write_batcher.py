@@ -0,0 +1,179 @@
+"""Write-behind batching for high-frequency generation status and variant updates."""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from .pool import run_db
+from . import sqlite as sqlite_db
+
+# How long updates are collected before they are written in one transaction
+FLUSH_INTERVAL_SECONDS = 0.05
+
+
+class GenerationWriteBatcher:
+    """
+    Collects update_generation / save_generation_variant calls from the event loop
+    and writes them in a single transaction on the DB thread pool.
+
+    Updates to the same generation (or variant) are coalesced - the last value of
+    each field wins, the same result as running the calls one after another.
+    Variants are written before generation status, so a "completed" generation
+    always has its variant rows.
+
+    Outside a running event loop the calls are written through synchronously.
+    """
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL_SECONDS):
+        self.flush_interval = flush_interval
+        self._generation_updates: Dict[str, Dict[str, Any]] = {}
+        self._variant_saves: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    def update_generation(
+        self,
+        generation_id: str,
+        status: Optional[str] = None,
+        error_message: Optional[str] = None,
+    ) -> None:
+        """Queue a UI generation metadata update (same arguments as db.update_generation)"""
+        fields = {}
+        if status is not None:
+            fields["status"] = status
+        if error_message is not None:
+            fields["error_message"] = error_message
+        if not fields:
+            return
+
+        self._generation_updates.setdefault(generation_id, {}).update(fields)
+        self._schedule_flush()
+
+    def save_generation_variant(
+        self,
+        generation_id: str,
+        variant_index: int,
+        model: str,
+        status: str,
+        html: Optional[str] = None,
+        error_message: Optional[str] = None,
+        duration_ms: Optional[int] = None,
+    ) -> None:
+        """Queue a variant upsert (same arguments as db.save_generation_variant)"""
+        self._variant_saves[(generation_id, variant_index)] = {
+            "model": model,
+            "status": status,
+            "html": html,
+            "error_message": error_message,
+            "duration_ms": duration_ms,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Start a delayed flush, or write through if there is no event loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(*self._take_pending())
+            return
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        # Keep going while updates arrive during a write
+        while self._generation_updates or self._variant_saves:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def _take_pending(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[Tuple[str, int], Dict[str, Any]]]:
+        generation_updates, self._generation_updates = self._generation_updates, {}
+        variant_saves, self._variant_saves = self._variant_saves, {}
+        return generation_updates, variant_saves
+
+    async def flush(self) -> None:
+        """Write all pending updates now"""
+        # Batches are written one at a time, in the order they were taken
+        async with self._get_flush_lock():
+            generation_updates, variant_saves = self._take_pending()
+            if not generation_updates and not variant_saves:
+                return
+
+            try:
+                await run_db(self._write, generation_updates, variant_saves)
+            except Exception as e:
+                print(f"[DB] Error flushing batched generation writes: {e}")
+
+    def _get_flush_lock(self) -> asyncio.Lock:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    def _write(
+        self,
+        generation_updates: Dict[str, Dict[str, Any]],
+        variant_saves: Dict[Tuple[str, int], Dict[str, Any]],
+    ) -> None:
+        """Write a batch in one transaction (runs on the DB thread pool)"""
+        if not generation_updates and not variant_saves:
+            return
+
+        conn = sqlite_db.get_conn()
+        cursor = conn.cursor()
+
+        try:
+            if variant_saves:
+                cursor.executemany("""
+                    INSERT INTO generation_variants
+                    (generation_id, variant_index, model, status, html, error_message, duration_ms, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (generation_id, variant_index) DO UPDATE SET
+                        model = excluded.model,
+                        status = excluded.status,
+                        html = excluded.html,
+                        error_message = excluded.error_message,
+                        duration_ms = excluded.duration_ms
+                """, [
+                    (
+                        generation_id,
+                        variant_index,
+                        fields["model"],
+                        fields["status"],
+                        fields["html"],
+                        fields["error_message"],
+                        fields["duration_ms"],
+                        fields["created_at"],
+                    )
+                    for (generation_id, variant_index), fields in variant_saves.items()
+                ])
+
+            for generation_id, fields in generation_updates.items():
+                # Fixed column order keeps the SQL text (and its prepared statement) stable
+                columns = [column for column in ("status", "error_message") if column in fields]
+                cursor.execute(
+                    f"UPDATE generations SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?",
+                    [fields[column] for column in columns] + [generation_id],
+                )
+
+            conn.commit()
+            print(
+                f"[DB] Flushed {len(variant_saves)} variant(s) and "
+                f"{len(generation_updates)} generation update(s)"
+            )
+
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+_write_batcher: Optional[GenerationWriteBatcher] = None
+
+
+def get_write_batcher() -> GenerationWriteBatcher:
+    """Get the global write batcher"""
+    global _write_batcher
+    if _write_batcher is None:
+        _write_batcher = GenerationWriteBatcher()
+    return _write_batcher
@@ -8,11 +8,28 @@ from models import (
 from prompts import assemble_prompt
 from prompts.types import Stack
 from openai.types.chat import ChatCompletionMessageParam
+from db import run_db
+from gen_cache.generation_cache import (
+    generation_cache_key,
+    get_cached_completion,
+    save_cached_completion,
+)
 
 
-async def generate_code_for_image(image_url: str, stack: Stack, model: Llm) -> str:
+async def generate_code_for_image(
+    image_url: str, stack: Stack, model: Llm, attempt_idx: int = 0
+) -> str:
     prompt_messages = assemble_prompt(image_url, stack)
-    return await generate_code_core(prompt_messages, model)
+
+    # Reruns of the same eval input reuse the completion; each attempt is cached separately
+    cache_key = generation_cache_key(prompt_messages, stack, model.value, attempt=attempt_idx)
+    cached_code = await run_db(get_cached_completion, cache_key)
+    if cached_code is not None:
+        return cached_code
+
+    code = await generate_code_core(prompt_messages, model)
+    await run_db(save_cached_completion, cache_key, stack, model.value, code)
+    return code
 
 
 async def generate_code_core(
@@ -8,6 +8,7 @@ from prompts.types import Stack
 from .core import generate_code_for_image
 from .utils import image_to_data_url
 from .config import EVALS_DIR
+from gen_cache.generation_cache import get_cache_stats
 
 
 async def generate_code_and_time(
@@ -26,7 +27,7 @@ async def generate_code_and_time(
     start_time = time.perf_counter()
     try:
         content = await generate_code_for_image(
-            image_url=image_url, stack=stack, model=model
+            image_url=image_url, stack=stack, model=model, attempt_idx=attempt_idx
         )
         end_time = time.perf_counter()
         duration = end_time - start_time
@@ -175,6 +176,12 @@ async def run_image_evals(
         except Exception as e:
             print(f"Error writing timing file {timing_file_path}: {e}")
 
+    cache_stats = get_cache_stats()
+    print(
+        f"Generation cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es), "
+        f"hit rate {cache_stats['hitRate']:.0%}"
+    )
+
     # Write log for failed tasks
     if failed_tasks_log:
         failed_log_path = os.path.join(output_subfolder, "failed_tasks.txt")
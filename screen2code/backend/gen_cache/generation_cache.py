@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from openai.types.chat import ChatCompletionMessageParam
+
+from config import GENERATION_CACHE_ENABLED, GENERATION_CACHE_TTL_HOURS
+from db import get_conn
+from llm import Completion
+
+# Content-addressed cache of LLM completions, stored in the generation_cache table.
+# The key covers everything that determines the completion: the prompt messages
+# (system prompt text, history, screenshots by hash), the stack and the model.
+# Re-submits, repair retries of the same input and eval reruns replay the stored
+# completion instead of calling the model again.
+
+# Bump to invalidate every cached completion (e.g. after changing post-processing
+# that runs before a completion is stored)
+PROMPT_CACHE_VERSION = 1
+
+# Replayed completions are streamed to the client in chunks of this many characters
+REPLAY_CHUNK_SIZE = 256
+
+# Hits/misses of this process since startup
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0}
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _normalize_content(content: Any) -> Any:
+    """Replace image data URLs with their hash so the key stays small"""
+    if not isinstance(content, list):
+        return content
+
+    normalized = []
+    for part in content:
+        if isinstance(part, dict) and part.get("type") == "image_url":
+            url = part["image_url"]["url"]
+            normalized.append({"type": "image_url", "image_sha256": _hash_text(url)})
+        else:
+            normalized.append(part)
+    return normalized
+
+
+def generation_cache_key(
+    prompt_messages: List[ChatCompletionMessageParam],
+    stack: str,
+    model_name: str,
+    attempt: int = 0,
+) -> str:
+    """Cache key for a prompt: screenshot hashes, prompt text, stack, model and prompt version.
+
+    attempt separates deliberate repeated samples of the same prompt (eval runs with n > 1).
+    """
+    payload = {
+        "version": PROMPT_CACHE_VERSION,
+        "stack": stack,
+        "model": model_name,
+        "attempt": attempt,
+        "messages": [
+            {"role": message["role"], "content": _normalize_content(message.get("content"))}
+            for message in prompt_messages
+        ],
+    }
+    return _hash_text(json.dumps(payload, sort_keys=True, default=str))
+
+
+def get_cached_completion(cache_key: str) -> Optional[str]:
+    """Return the cached completion code, or None on a miss (or when the cache is disabled)"""
+    if not GENERATION_CACHE_ENABLED:
+        return None
+
+    min_created_at = (datetime.utcnow() - timedelta(hours=GENERATION_CACHE_TTL_HOURS)).isoformat()
+
+    conn = get_conn()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            SELECT code FROM generation_cache
+            WHERE cache_key = ? AND created_at >= ?
+        """, (cache_key, min_created_at))
+        row = cursor.fetchone()
+        if row is not None:
+            cursor.execute("""
+                UPDATE generation_cache
+                SET hit_count = hit_count + 1, last_hit_at = ?
+                WHERE cache_key = ?
+            """, (datetime.utcnow().isoformat(), cache_key))
+            conn.commit()
+    except Exception as e:
+        print(f"[CACHE] Lookup failed: {e}")
+        return None
+    finally:
+        conn.close()
+
+    if row is None:
+        _stats["misses"] += 1
+        return None
+
+    _stats["hits"] += 1
+    print(f"[CACHE] Hit {cache_key[:12]}... (hit rate {_hit_rate():.0%})")
+    return row[0]
+
+
+def save_cached_completion(cache_key: str, stack: str, model_name: str, code: str) -> None:
+    """Store a completion (replaces an expired entry with the same key)"""
+    if not GENERATION_CACHE_ENABLED or not code:
+        return
+
+    conn = get_conn()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            INSERT OR REPLACE INTO generation_cache
+            (cache_key, stack, model, code, created_at, hit_count)
+            VALUES (?, ?, ?, ?, ?, 0)
+        """, (cache_key, stack, model_name, code, datetime.utcnow().isoformat()))
+        conn.commit()
+        _stats["stores"] += 1
+    except Exception as e:
+        print(f"[CACHE] Store failed: {e}")
+    finally:
+        conn.close()
+
+
+def delete_expired_cache_entries() -> int:
+    """Delete entries older than the TTL. Returns the number of deleted rows."""
+    min_created_at = (datetime.utcnow() - timedelta(hours=GENERATION_CACHE_TTL_HOURS)).isoformat()
+
+    conn = get_conn()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("DELETE FROM generation_cache WHERE created_at < ?", (min_created_at,))
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+
+def _hit_rate() -> float:
+    lookups = _stats["hits"] + _stats["misses"]
+    return _stats["hits"] / lookups if lookups else 0.0
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of this process plus totals from the table"""
+    conn = get_conn()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT COUNT(*), COALESCE(SUM(hit_count), 0) FROM generation_cache")
+        entries, total_hits = cursor.fetchone()
+    finally:
+        conn.close()
+
+    return {
+        "enabled": GENERATION_CACHE_ENABLED,
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "stores": _stats["stores"],
+        "hitRate": round(_hit_rate(), 4),
+        "entries": entries,
+        "totalHits": total_hits,
+    }
+
+
+def reset_cache_stats() -> None:
+    """Reset the per-process counters"""
+    for name in _stats:
+        _stats[name] = 0
+
+
+async def replay_completion(
+    code: str,
+    callback: Callable[[str], Awaitable[None]],
+) -> Completion:
+    """Stream a cached completion through the same callback a live model would use"""
+    start_time = asyncio.get_running_loop().time()
+
+    for i in range(0, len(code), REPLAY_CHUNK_SIZE):
+        await callback(code[i : i + REPLAY_CHUNK_SIZE])
+        # Let other tasks (and the websocket writer) run between chunks
+        await asyncio.sleep(0)
+
+    return {"duration": asyncio.get_running_loop().time() - start_time, "code": code}
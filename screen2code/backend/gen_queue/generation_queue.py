@@ -1,25 +1,62 @@
 import asyncio
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, List, Optional
 
-# Global generation queue - processes one generation at a time
-generation_queue: asyncio.Queue = None  # Will be initialized on startup
+from db import get_conn, update_generation, run_db
+from api.config.plans import get_plan_priority
 
+# Durable generation queue backed by the generation_jobs table in app.db.
+# Job rows survive restarts; live WebSocket objects can't be persisted, so they
+# are kept in memory and re-created (or detached) for jobs recovered on startup.
 
-def init_queue() -> asyncio.Queue:
-    """Initialize the global generation queue"""
-    global generation_queue
-    if generation_queue is None:
-        generation_queue = asyncio.Queue()
-    return generation_queue
+# Live WebSockets of jobs enqueued by this process, keyed by generation_id
+_live_websockets: Dict[str, Any] = {}
 
+# Set whenever a job is enqueued or a running job finishes (may unblock a user)
+_job_available: asyncio.Event = None  # Will be initialized on first use
 
-def get_queue() -> asyncio.Queue:
-    """Get the generation queue"""
-    global generation_queue
-    if generation_queue is None:
-        generation_queue = asyncio.Queue()
-    return generation_queue
+# How long an idle worker sleeps before re-checking the table on its own
+POLL_INTERVAL_SECONDS = 1.0
+
+
+def _get_event() -> asyncio.Event:
+    """Get the wakeup event for idle workers"""
+    global _job_available
+    if _job_available is None:
+        _job_available = asyncio.Event()
+    return _job_available
+
+
+def _notify_workers() -> None:
+    """Wake up idle workers"""
+    _get_event().set()
+
+
+class DetachedWebSocket:
+    """
+    WebSocket stand-in for UI jobs recovered after a restart.
+
+    The browser connection is gone, but the pipeline still saves the result
+    to generation_variants, so the generation shows up in history.
+    """
+
+    def __init__(self, generation_id: str):
+        self.generation_id = generation_id
+        self.cookies: Dict[str, str] = {}
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_json(self, data: Dict[str, Any]) -> None:
+        pass
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+    async def receive_json(self) -> Dict[str, str]:
+        raise NotImplementedError("receive_json not supported for detached generations")
 
 
 @dataclass
@@ -29,43 +66,297 @@ class GenerationJob:
     websocket: Any  # FastAPI WebSocket
     params: Dict[str, str]
     websocket_already_accepted: bool = False  # Flag if WebSocket was already accepted by handler
+    user_id: Optional[str] = None
+    plan: str = "free"
+    source: str = "ws"  # "ws" (UI WebSocket) or "api" (REST API, DatabaseWebSocket)
+    priority: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        self.priority = get_plan_priority(self.plan)
 
     def __repr__(self) -> str:
-        return f"GenerationJob(id={self.generation_id[:8]}...)"
+        return f"GenerationJob(id={self.generation_id[:8]}..., priority={self.priority})"
+
+
+def init_queue() -> int:
+    """Initialize the durable generation queue.
+
+    Jobs left "running" by a previous process were interrupted and are put back
+    in the queue. Returns the number of jobs waiting to be processed.
+    """
+    conn = get_conn()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            UPDATE generation_jobs
+            SET status = 'queued', started_at = NULL
+            WHERE status = 'running'
+        """)
+        requeued = cursor.rowcount
+        conn.commit()
+
+        cursor.execute("SELECT COUNT(*) FROM generation_jobs WHERE status = 'queued'")
+        pending = cursor.fetchone()[0]
+        print(f"[QUEUE] Initialized: {pending} pending job(s), {requeued} recovered from interrupted run")
+        return pending
+
+    finally:
+        conn.close()
+
+
+def _order_queued_jobs(queued_rows: List[Any], running_per_user: Dict[str, int]) -> List[Any]:
+    """Order queued jobs by plan priority, then round-robin across users.
+
+    A user's n-th waiting job (counting jobs already running) goes behind every
+    other user's (n-1)-th job of the same priority, so one user submitting many
+    generations can't starve everybody else.
+    """
+    seen_per_user: Dict[str, int] = dict(running_per_user)
+    keyed = []
+    for index, row in enumerate(queued_rows):
+        user_key = row["user_id"] or f"anonymous:{row['generation_id']}"
+        user_rank = seen_per_user.get(user_key, 0)
+        seen_per_user[user_key] = user_rank + 1
+        keyed.append(((-row["priority"], user_rank, index), row))
+
+    keyed.sort(key=lambda item: item[0])
+    return [row for _, row in keyed]
+
+
+def _load_queue_state(cursor) -> tuple[List[Any], Dict[str, int]]:
+    """Load queued rows (FIFO) and running job counts per user"""
+    cursor.execute("""
+        SELECT generation_id, user_id, priority, source, params
+        FROM generation_jobs
+        WHERE status = 'queued'
+        ORDER BY enqueued_at, rowid
+    """)
+    queued_rows = cursor.fetchall()
+
+    cursor.execute("""
+        SELECT user_id, COUNT(*)
+        FROM generation_jobs
+        WHERE status = 'running' AND user_id IS NOT NULL
+        GROUP BY user_id
+    """)
+    running_per_user = {row[0]: row[1] for row in cursor.fetchall()}
+
+    return queued_rows, running_per_user
+
+
+def claim_next_job(max_per_user: int) -> Optional[GenerationJob]:
+    """Atomically move the next eligible job from "queued" to "running".
+
+    Jobs of users that already have max_per_user running generations are skipped.
+    Returns None if nothing is eligible right now.
+    """
+    conn = get_conn()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        queued_rows, running_per_user = _load_queue_state(cursor)
+
+        for row in _order_queued_jobs(queued_rows, running_per_user):
+            user_id = row["user_id"]
+            if user_id and running_per_user.get(user_id, 0) >= max_per_user:
+                continue
+
+            cursor.execute("""
+                UPDATE generation_jobs
+                SET status = 'running', started_at = ?
+                WHERE generation_id = ? AND status = 'queued'
+            """, (datetime.utcnow().isoformat(), row["generation_id"]))
+            if cursor.rowcount == 0:
+                continue
+
+            conn.commit()
+            return _job_from_row(row)
+
+        conn.commit()
+        return None
+
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _job_from_row(row: Any) -> GenerationJob:
+    """Build a job from a claimed row, re-attaching its WebSocket"""
+    generation_id = row["generation_id"]
+    websocket = _live_websockets.pop(generation_id, None)
+
+    if websocket is None:
+        if row["source"] == "api":
+            # Lazy import to avoid circular dependencies
+            from api.generation_service import DatabaseWebSocket
+
+            websocket = DatabaseWebSocket(generation_id)
+        else:
+            print(f"[QUEUE] Client of {generation_id} is gone, running detached (result goes to history)")
+            websocket = DetachedWebSocket(generation_id)
+
+    job = GenerationJob(
+        generation_id=generation_id,
+        websocket=websocket,
+        params=json.loads(row["params"]),
+        websocket_already_accepted=True,
+        user_id=row["user_id"],
+        source=row["source"],
+    )
+    job.priority = row["priority"]
+    return job
+
+
+def _insert_job(job: GenerationJob) -> None:
+    """Persist a queued job"""
+    conn = get_conn()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            INSERT OR REPLACE INTO generation_jobs
+            (generation_id, user_id, priority, source, params, status, enqueued_at)
+            VALUES (?, ?, ?, ?, ?, 'queued', ?)
+        """, (
+            job.generation_id,
+            job.user_id,
+            job.priority,
+            job.source,
+            json.dumps(job.params),
+            datetime.utcnow().isoformat(),
+        ))
+        conn.commit()
+    finally:
+        conn.close()
 
 
 async def enqueue_generation(job: GenerationJob) -> None:
     """Add a generation job to the queue"""
-    queue = get_queue()
-    await queue.put(job)
+    await run_db(_insert_job, job)
+
+    _live_websockets[job.generation_id] = job.websocket
     print(f"[QUEUE] Enqueued {job}")
 
+    _notify_workers()
+    await broadcast_queue_positions()
+
+
+async def wait_for_generation(max_per_user: int) -> GenerationJob:
+    """Wait for next eligible generation job (blocking)"""
+    event = _get_event()
+
+    while True:
+        job = await run_db(claim_next_job, max_per_user)
+        if job is not None:
+            return job
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout=POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        event.clear()
+
+
+def mark_job_done(job: GenerationJob, status: str = "done") -> None:
+    """Mark a job as finished ("done", "failed" or "cancelled")"""
+    conn = get_conn()
+    cursor = conn.cursor()
 
-async def dequeue_generation() -> Optional[GenerationJob]:
-    """Get next generation job from the queue"""
-    queue = get_queue()
     try:
-        job = queue.get_nowait()
-        return job
-    except asyncio.QueueEmpty:
-        return None
+        cursor.execute("""
+            UPDATE generation_jobs
+            SET status = ?, finished_at = ?
+            WHERE generation_id = ?
+        """, (status, datetime.utcnow().isoformat(), job.generation_id))
+        conn.commit()
+    finally:
+        conn.close()
 
+    print(f"[QUEUE] Finished {job} status={status}")
 
-async def wait_for_generation() -> GenerationJob:
-    """Wait for next generation job (blocking)"""
-    queue = get_queue()
-    job = await queue.get()
-    return job
 
+async def finish_job(job: GenerationJob, status: str = "done") -> None:
+    """Mark a job as finished and wake idle workers"""
+    await run_db(mark_job_done, job, status)
+
+    # A finished job may free a per-user slot. The event belongs to the loop,
+    # so it is set here rather than on the DB thread.
+    _notify_workers()
+
+
+def cancel_queued_generation(generation_id: str) -> bool:
+    """Cancel a job that hasn't started yet. Returns True if it was still queued."""
+    conn = get_conn()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            UPDATE generation_jobs
+            SET status = 'cancelled', finished_at = ?
+            WHERE generation_id = ? AND status = 'queued'
+        """, (datetime.utcnow().isoformat(), generation_id))
+        conn.commit()
+        cancelled = cursor.rowcount > 0
+    finally:
+        conn.close()
+
+    if cancelled:
+        _live_websockets.pop(generation_id, None)
+        try:
+            update_generation(generation_id=generation_id, status="cancelled")
+        except Exception as e:
+            print(f"[QUEUE] Failed to update cancelled generation {generation_id}: {e}")
+        print(f"[QUEUE] Cancelled queued generation {generation_id}")
+
+    return cancelled
 
-def mark_job_done(job: GenerationJob) -> None:
-    """Mark a job as done in the queue"""
-    queue = get_queue()
-    queue.task_done()
-    print(f"[QUEUE] Completed {job}")
+
+def get_queue_positions() -> Dict[str, int]:
+    """Get 1-based queue position of every waiting job, in dispatch order"""
+    conn = get_conn()
+    cursor = conn.cursor()
+
+    try:
+        queued_rows, running_per_user = _load_queue_state(cursor)
+    finally:
+        conn.close()
+
+    ordered = _order_queued_jobs(queued_rows, running_per_user)
+    return {row["generation_id"]: position for position, row in enumerate(ordered, start=1)}
+
+
+async def broadcast_queue_positions() -> None:
+    """Push current queue position to every waiting client connected to this process"""
+    if not _live_websockets:
+        return
+
+    positions = await run_db(get_queue_positions)
+    for generation_id, websocket in list(_live_websockets.items()):
+        position = positions.get(generation_id)
+        if position is None:
+            continue
+        try:
+            await websocket.send_json({
+                "type": "status",
+                "value": f"Queued for processing (position {position})...",
+                "variantIndex": 0,
+            })
+        except Exception:
+            # Client is gone - the handler cancels the job on disconnect
+            pass
 
 
 def queue_size() -> int:
     """Get current queue size"""
-    queue = get_queue()
-    return queue.qsize()
+    conn = get_conn()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT COUNT(*) FROM generation_jobs WHERE status = 'queued'")
+        return cursor.fetchone()[0]
+    finally:
+        conn.close()
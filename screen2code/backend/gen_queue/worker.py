@@ -1,141 +1,184 @@
 import asyncio
-from typing import Optional
+from typing import Dict, List, Optional, Set
 
-from gen_queue.generation_queue import wait_for_generation, mark_job_done, GenerationJob
-from db import update_generation
+from gen_queue.generation_queue import (
+    wait_for_generation,
+    finish_job,
+    cancel_queued_generation,
+    broadcast_queue_positions,
+    GenerationJob,
+)
+from db import get_write_batcher, run_db
+from config import GENERATION_WORKERS, GENERATION_MAX_PER_USER
+
+# Running generation tasks of this process, keyed by generation_id
+_running_tasks: Dict[str, asyncio.Task] = {}
+
+# Generations whose cancellation was requested while running
+_cancel_requested: Set[str] = set()
 
 
 class GenerationWorker:
     """Processes generation jobs from the queue one at a time"""
 
-    def __init__(self):
+    def __init__(self, worker_id: int = 0, max_per_user: int = GENERATION_MAX_PER_USER):
+        self.worker_id = worker_id
+        self.max_per_user = max_per_user
         self.is_running = False
         self.current_job: Optional[GenerationJob] = None
 
     async def start(self) -> None:
         """Start the worker loop"""
         self.is_running = True
-        print("[WORKER] Generation worker started")
+        print(f"[WORKER {self.worker_id}] Generation worker started")
 
         while self.is_running:
             try:
                 # Wait for next job
-                job = await wait_for_generation()
+                job = await wait_for_generation(self.max_per_user)
                 self.current_job = job
 
-                print(f"[WORKER] Processing {job}")
-                print(f"[DEBUG] Worker: received job with generation_id={job.generation_id}")
+                print(f"[WORKER {self.worker_id}] Processing {job}")
+
+                # Queue moved - let waiting clients know their new position
+                await broadcast_queue_positions()
 
                 # Update status to processing
                 try:
-                    update_generation(
+                    get_write_batcher().update_generation(
                         generation_id=job.generation_id,
                         status="processing",
                     )
                 except Exception as e:
-                    print(f"[WORKER] Failed to update status to processing: {e}")
+                    print(f"[WORKER {self.worker_id}] Failed to update status to processing: {e}")
 
-                # Execute the generation pipeline
+                # Run the job in its own task so it can be cancelled without stopping the worker
+                task = asyncio.create_task(self._run_job(job))
+                _running_tasks[job.generation_id] = task
                 try:
-                    # Lazy import to avoid circular dependencies
-                    from routes.generate_code import Pipeline, WebSocketSetupMiddleware, ParameterExtractionMiddleware, StatusBroadcastMiddleware, PromptCreationMiddleware, CodeGenerationMiddleware, PostProcessingMiddleware
-
-                    pipeline = Pipeline()
-                    pipeline.use(WebSocketSetupMiddleware())
-                    pipeline.use(ParameterExtractionMiddleware())
-                    pipeline.use(StatusBroadcastMiddleware())
-                    pipeline.use(PromptCreationMiddleware())
-                    pipeline.use(CodeGenerationMiddleware())
-                    pipeline.use(PostProcessingMiddleware())
-
-                    # Execute pipeline with job websocket and pre-provided parameters
-                    print(f"[DEBUG] Worker: passing generation_id={job.generation_id} to pipeline")
-                    await pipeline.execute(
-                        job.websocket,
-                        params=job.params,
-                        websocket_already_accepted=job.websocket_already_accepted,
-                        generation_id=job.generation_id
-                    )
-
-                    # Pipeline handles status updates and failures internally via mark_failed()
-                    # Just mark job as done in queue
-                    mark_job_done(job)
+                    await asyncio.wait({task})
+                finally:
+                    _running_tasks.pop(job.generation_id, None)
 
-                except asyncio.CancelledError:
-                    # Job was cancelled - silent exit
+                if task.cancelled() or job.generation_id in _cancel_requested:
+                    _cancel_requested.discard(job.generation_id)
                     try:
-                        update_generation(
+                        get_write_batcher().update_generation(
                             generation_id=job.generation_id,
                             status="cancelled",
                         )
                     except:
                         pass
-                    try:
-                        mark_job_done(job)
-                    except:
-                        pass
-
-                except Exception as e:
-                    # Job failed - log error message without traceback
-                    print(f"[WORKER] Unexpected error in job {job.generation_id}: {e}")
-
-                    try:
-                        update_generation(
-                            generation_id=job.generation_id,
-                            status="failed",
-                            error_message=f"Unexpected error: {str(e)}",
-                        )
-                    except Exception as db_error:
-                        print(f"[WORKER] Failed to update error status: {db_error}")
-
-                    try:
-                        mark_job_done(job)
-                    except:
-                        pass
+                    await finish_job(job, status="cancelled")
+                elif task.exception() is not None:
+                    await finish_job(job, status="failed")
+                else:
+                    # Pipeline handles status updates and failures internally via mark_failed()
+                    await finish_job(job)
 
-                finally:
-                    self.current_job = None
+                self.current_job = None
 
             except asyncio.CancelledError:
                 # Worker cancelled - exit gracefully (silent)
                 self.is_running = False
+                if self.current_job is not None:
+                    task = _running_tasks.pop(self.current_job.generation_id, None)
+                    if task is not None:
+                        task.cancel()
                 break
             except Exception as e:
                 # Unexpected error in main loop - log without traceback
-                print(f"[WORKER] Unexpected error in main loop: {e}")
+                print(f"[WORKER {self.worker_id}] Unexpected error in main loop: {e}")
+                self.current_job = None
                 await asyncio.sleep(1)  # Brief pause before retrying
 
+    async def _run_job(self, job: GenerationJob) -> None:
+        """Execute the generation pipeline for one job"""
+        try:
+            # Lazy import to avoid circular dependencies
+            from routes.generate_code import Pipeline, WebSocketSetupMiddleware, ParameterExtractionMiddleware, StatusBroadcastMiddleware, PromptCreationMiddleware, CodeGenerationMiddleware, PostProcessingMiddleware
+
+            pipeline = Pipeline()
+            pipeline.use(WebSocketSetupMiddleware())
+            pipeline.use(ParameterExtractionMiddleware())
+            pipeline.use(StatusBroadcastMiddleware())
+            pipeline.use(PromptCreationMiddleware())
+            pipeline.use(CodeGenerationMiddleware())
+            pipeline.use(PostProcessingMiddleware())
+
+            # Execute pipeline with job websocket and pre-provided parameters
+            await pipeline.execute(
+                job.websocket,
+                params=job.params,
+                websocket_already_accepted=job.websocket_already_accepted,
+                generation_id=job.generation_id,
+                user_id=job.user_id,
+            )
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as e:
+            # Job failed - log error message without traceback
+            print(f"[WORKER {self.worker_id}] Unexpected error in job {job.generation_id}: {e}")
+
+            try:
+                get_write_batcher().update_generation(
+                    generation_id=job.generation_id,
+                    status="failed",
+                    error_message=f"Unexpected error: {str(e)}",
+                )
+            except Exception as db_error:
+                print(f"[WORKER {self.worker_id}] Failed to update error status: {db_error}")
+            raise
+
     async def stop(self) -> None:
         """Stop the worker"""
-        print("[WORKER] Stopping worker...")
+        print(f"[WORKER {self.worker_id}] Stopping worker...")
         self.is_running = False
 
 
-# Global worker instance
-_worker: Optional[GenerationWorker] = None
+# Global worker instances
+_workers: List[GenerationWorker] = []
 
 
-def get_worker() -> GenerationWorker:
-    """Get or create the global worker instance"""
-    global _worker
-    if _worker is None:
-        _worker = GenerationWorker()
-    return _worker
+def get_workers() -> List[GenerationWorker]:
+    """Get or create the global worker instances"""
+    if not _workers:
+        for worker_id in range(max(1, GENERATION_WORKERS)):
+            _workers.append(GenerationWorker(worker_id=worker_id))
+    return _workers
 
 
 async def start_worker() -> None:
-    """Start the global worker"""
-    worker = get_worker()
-    await worker.start()
+    """Start the global workers (GENERATION_WORKERS concurrent generations)"""
+    workers = get_workers()
+    print(f"[WORKER] Starting {len(workers)} generation worker(s), max {GENERATION_MAX_PER_USER} per user")
+    await asyncio.gather(*(worker.start() for worker in workers))
 
 
 async def stop_worker() -> None:
-    """Stop the global worker"""
-    worker = get_worker()
-    await worker.stop()
+    """Stop the global workers"""
+    for worker in get_workers():
+        await worker.stop()
+
+
+async def cancel_generation(generation_id: str) -> bool:
+    """Cancel a queued or running generation. Returns True if something was cancelled."""
+    if await run_db(cancel_queued_generation, generation_id):
+        await broadcast_queue_positions()
+        return True
+
+    task = _running_tasks.get(generation_id)
+    if task is not None and not task.done():
+        print(f"[WORKER] Cancelling running generation {generation_id}")
+        _cancel_requested.add(generation_id)
+        task.cancel()
+        return True
+
+    return False
 
 
-def get_current_job() -> Optional[GenerationJob]:
-    """Get the currently processing job"""
-    worker = get_worker()
-    return worker.current_job
+def get_current_jobs() -> List[GenerationJob]:
+    """Get the currently processing jobs"""
+    return [worker.current_job for worker in get_workers() if worker.current_job is not None]
@@ -1,40 +1,108 @@
+import asyncio
 import base64
+import hashlib
 import io
+import os
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
 from PIL import Image
 
 CLAUDE_IMAGE_MAX_SIZE = 5 * 1024 * 1024
 CLAUDE_MAX_IMAGE_DIMENSION = 7990
 
+# JPEG quality range searched when the image has to be compressed
+MAX_JPEG_QUALITY = 95
+MIN_JPEG_QUALITY = 10
 
-# Process image so it meets Claude requirements
-def process_image(image_data_url: str) -> tuple[str, str]:
+# Base64 prefix decoded to read image dimensions without decoding the whole image
+HEADER_PROBE_BASE64_CHARS = 64 * 1024
 
-    # Extract bytes and media type from base64 data URL
-    media_type = image_data_url.split(";")[0].split(":")[1]
-    base64_data = image_data_url.split(",")[1]
-    image_bytes = base64.b64decode(base64_data)
+# Processes used for resize/re-encode so large screenshots don't stall the event loop
+IMAGE_PROCESS_WORKERS = int(os.environ.get("IMAGE_PROCESS_WORKERS", "2"))
 
-    img = Image.open(io.BytesIO(image_bytes))
+# Processed images kept by content hash (retries and variants reuse them)
+PROCESSED_IMAGE_CACHE_SIZE = 32
 
-    # Check if image is under max dimensions and size
-    is_under_dimension_limit = (
-        img.width < CLAUDE_MAX_IMAGE_DIMENSION
-        and img.height < CLAUDE_MAX_IMAGE_DIMENSION
-    )
-    is_under_size_limit = len(base64_data) <= CLAUDE_IMAGE_MAX_SIZE
+_processed_cache: "OrderedDict[str, tuple[str, str]]" = OrderedDict()
+_processed_cache_lock = threading.Lock()
+_process_pool: Optional[ProcessPoolExecutor] = None
 
-    # If image is under both limits, no processing needed
-    if is_under_dimension_limit and is_under_size_limit:
-        print("[CLAUDE IMAGE PROCESSING] no processing needed")
-        return (media_type, base64_data)
 
+def _base64_size(num_bytes: int) -> int:
+    """Length of the base64 encoding of num_bytes bytes (without encoding them)"""
+    return 4 * ((num_bytes + 2) // 3)
+
+
+def _split_data_url(image_data_url: str) -> tuple[str, str]:
+    """Split a data URL into (media_type, base64_data)"""
+    header, _, base64_data = image_data_url.partition(",")
+    media_type = header.split(";")[0].split(":")[1]
+    return media_type, base64_data
+
+
+def _read_dimensions(base64_data: str) -> tuple[int, int]:
+    """Read width/height from the image header, decoding as little as possible"""
+    probe_length = min(len(base64_data), HEADER_PROBE_BASE64_CHARS) // 4 * 4
+    try:
+        with Image.open(io.BytesIO(base64.b64decode(base64_data[:probe_length]))) as img:
+            return img.size
+    except Exception:
+        # Header didn't fit in the probe (e.g. large EXIF block) - decode everything
+        with Image.open(io.BytesIO(base64.b64decode(base64_data))) as img:
+            return img.size
+
+
+def _encode_jpeg(img: Image.Image, quality: int) -> bytes:
+    output = io.BytesIO()
+    img.save(output, format="JPEG", quality=quality)
+    return output.getvalue()
+
+
+def _compress_to_limit(img: Image.Image, max_base64_size: int) -> tuple[bytes, int]:
+    """Encode as JPEG at the highest quality whose base64 size fits the limit.
+
+    Binary search over quality: at most ~7 encodes instead of stepping down by 5
+    (up to 17 encodes). Falls back to the lowest quality if nothing fits.
+    """
+    best = _encode_jpeg(img, MAX_JPEG_QUALITY)
+    if _base64_size(len(best)) <= max_base64_size:
+        return best, MAX_JPEG_QUALITY
+
+    low, high = MIN_JPEG_QUALITY, MAX_JPEG_QUALITY - 1
+    best_quality = None
+    while low <= high:
+        quality = (low + high) // 2
+        encoded = _encode_jpeg(img, quality)
+        if _base64_size(len(encoded)) <= max_base64_size:
+            best, best_quality = encoded, quality
+            low = quality + 1
+        else:
+            high = quality - 1
+
+    if best_quality is None:
+        best_quality = MIN_JPEG_QUALITY
+        best = _encode_jpeg(img, best_quality)
+    return best, best_quality
+
+
+def _process_image_data(base64_data: str) -> tuple[str, str]:
+    """Resize and re-encode an image so it meets Claude requirements.
+
+    Runs in a worker process: takes and returns base64 so the event loop
+    process never decodes or encodes the image itself.
+    """
     # Time image processing
     start_time = time.time()
 
+    img = Image.open(io.BytesIO(base64.b64decode(base64_data)))
+
     # Check if either dimension exceeds 7900px (Claude disallows >= 8000px)
     # Resize image if needed
-    if not is_under_dimension_limit:
+    if img.width >= CLAUDE_MAX_IMAGE_DIMENSION or img.height >= CLAUDE_MAX_IMAGE_DIMENSION:
         # Calculate the new dimensions while maintaining aspect ratio
         if img.width > img.height:
             new_width = CLAUDE_MAX_IMAGE_DIMENSION
@@ -52,29 +120,109 @@ def process_image(image_data_url: str) -> tuple[str, str]:
     # Convert and compress as JPEG
     # We always compress as JPEG (95% at the least) even when we resize and the original image
     # is under the size limit.
-    quality = 95
-    output = io.BytesIO()
     img = img.convert("RGB")  # Ensure image is in RGB mode for JPEG conversion
-    img.save(output, format="JPEG", quality=quality)
-
-    # Reduce quality until image is under max size
-    while (
-        len(base64.b64encode(output.getvalue())) > CLAUDE_IMAGE_MAX_SIZE
-        and quality > 10
-    ):
-        output = io.BytesIO()
-        img.save(output, format="JPEG", quality=quality)
-        quality -= 5
+    output, quality = _compress_to_limit(img, CLAUDE_IMAGE_MAX_SIZE)
+    new_base64_data = base64.b64encode(output).decode("utf-8")
 
     # Log so we know it was modified
-    old_size = len(base64_data)
-    new_size = len(base64.b64encode(output.getvalue()))
     print(
-        f"[CLAUDE IMAGE PROCESSING] image size updated: old size = {old_size} bytes, new size = {new_size} bytes"
+        f"[CLAUDE IMAGE PROCESSING] image size updated: old size = {len(base64_data)} bytes, "
+        f"new size = {len(new_base64_data)} bytes, quality = {quality}"
     )
 
-    end_time = time.time()
-    processing_time = end_time - start_time
+    processing_time = time.time() - start_time
     print(f"[CLAUDE IMAGE PROCESSING] processing time: {processing_time:.2f} seconds")
 
-    return ("image/jpeg", base64.b64encode(output.getvalue()).decode("utf-8"))
+    return ("image/jpeg", new_base64_data)
+
+
+def _needs_processing(base64_data: str) -> bool:
+    """Check the size limit (no decoding) and the dimension limit (header only)"""
+    if len(base64_data) > CLAUDE_IMAGE_MAX_SIZE:
+        return True
+    width, height = _read_dimensions(base64_data)
+    return width >= CLAUDE_MAX_IMAGE_DIMENSION or height >= CLAUDE_MAX_IMAGE_DIMENSION
+
+
+def _cache_key(base64_data: str) -> str:
+    return hashlib.sha256(base64_data.encode("ascii")).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[tuple[str, str]]:
+    with _processed_cache_lock:
+        result = _processed_cache.get(key)
+        if result is not None:
+            _processed_cache.move_to_end(key)
+        return result
+
+
+def _check_cache(base64_data: str) -> tuple[str, Optional[tuple[str, str]], bool]:
+    """Return (cache key, cached result, needs processing) - hashes and reads the header"""
+    key = _cache_key(base64_data)
+    cached = _cache_get(key)
+    if cached is not None:
+        return key, cached, False
+    return key, None, _needs_processing(base64_data)
+
+
+def _cache_set(key: str, result: tuple[str, str]) -> None:
+    with _processed_cache_lock:
+        _processed_cache[key] = result
+        _processed_cache.move_to_end(key)
+        while len(_processed_cache) > PROCESSED_IMAGE_CACHE_SIZE:
+            _processed_cache.popitem(last=False)
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=IMAGE_PROCESS_WORKERS)
+    return _process_pool
+
+
+def shutdown_image_pool() -> None:
+    """Stop the image worker processes (called on app shutdown)"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+# Process image so it meets Claude requirements
+def process_image(image_data_url: str) -> tuple[str, str]:
+    """Return (media_type, base64_data) for an image data URL, processing it in-process if needed."""
+    media_type, base64_data = _split_data_url(image_data_url)
+
+    key, cached, needs_processing = _check_cache(base64_data)
+    if cached is not None:
+        return cached
+
+    if not needs_processing:
+        print("[CLAUDE IMAGE PROCESSING] no processing needed")
+        result = (media_type, base64_data)
+    else:
+        result = _process_image_data(base64_data)
+
+    _cache_set(key, result)
+    return result
+
+
+async def process_image_async(image_data_url: str) -> tuple[str, str]:
+    """Same as process_image, with resize/re-encode done in the image process pool."""
+    media_type, base64_data = _split_data_url(image_data_url)
+
+    # Hashing a large screenshot and reading its header would stall the loop;
+    # a thread is enough (hashlib releases the GIL) and avoids pickling the data
+    key, cached, needs_processing = await asyncio.to_thread(_check_cache, base64_data)
+    if cached is not None:
+        return cached
+
+    if not needs_processing:
+        print("[CLAUDE IMAGE PROCESSING] no processing needed")
+        result = (media_type, base64_data)
+    else:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(_get_process_pool(), _process_image_data, base64_data)
+
+    _cache_set(key, result)
+    return result
@@ -9,9 +9,12 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from routes import screenshot, generate_code, home, evals, history
-from db import init_db
+from db import init_db, get_write_batcher, close_pools
 from gen_queue.generation_queue import init_queue
 from gen_queue.worker import start_worker
+from gen_cache.generation_cache import delete_expired_cache_entries
+from image_processing.utils import shutdown_image_pool
+from video.utils import shutdown_video_pool
 import time
 
 # Import API routes
@@ -28,6 +31,7 @@ from api.routes import (
     admin_messages_router,
     admin_users_router,
     admin_payments_router,
+    admin_generation_cache_router,
 )
 from api.routes.oauth import router as oauth_router
 from api.routes.auth import router as auth_router
@@ -36,9 +40,12 @@ from config import ALLOWED_ORIGINS
 # Initialize database - SINGLE DATABASE for UI + API + ADMIN
 init_db()
 
-# Initialize queue
+# Initialize queue (re-queues jobs interrupted by a previous shutdown)
 init_queue()
 
+# Drop generation cache entries past their TTL
+delete_expired_cache_entries()
+
 # Global worker task
 worker_task: asyncio.Task = None
 
@@ -53,7 +60,7 @@ async def lifespan(app: FastAPI):
 
     # Startup
     print("[APP] Starting application...")
-    print("[APP] Starting generation worker...")
+    print("[APP] Starting generation workers...")
     worker_task = asyncio.create_task(start_worker())
 
     yield
@@ -71,7 +78,13 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             # Worker exited with error - log but don't crash shutdown
             print(f"[APP] Worker error during shutdown: {e}")
-    print("[APP] Generation worker stopped")
+    print("[APP] Generation workers stopped")
+
+    # Write out pending batched generation updates before exiting
+    await get_write_batcher().flush()
+    close_pools()
+    shutdown_image_pool()
+    shutdown_video_pool()
 
 
 app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None, lifespan=lifespan)
@@ -122,6 +135,7 @@ app.include_router(user_router)
 app.include_router(admin_messages_router)
 app.include_router(admin_users_router)
 app.include_router(admin_payments_router)
+app.include_router(admin_generation_cache_router)
 
 # Add OAuth routes
 app.include_router(oauth_router)
@@ -6,7 +6,7 @@ from anthropic import AsyncAnthropic
 from openai.types.chat import ChatCompletionMessageParam
 from config import IS_DEBUG_ENABLED
 from debug.DebugFileWriter import DebugFileWriter
-from image_processing.utils import process_image
+from image_processing.utils import process_image, process_image_async
 from utils import pprint_prompt
 from llm import Completion, Llm
 import main as main_module
@@ -58,6 +58,26 @@ def convert_openai_messages_to_claude(
     return system_prompt, claude_messages
 
 
+async def preprocess_message_images(messages: List[ChatCompletionMessageParam]) -> None:
+    """
+    Process every image in the messages off the event loop.
+
+    Results land in the image_processing cache, so the process_image calls
+    made by convert_openai_messages_to_claude afterwards are cache hits.
+    """
+    image_data_urls = []
+    for message in messages:
+        content_parts = message.get("content")
+        if not isinstance(content_parts, list):
+            continue
+        for content in content_parts:
+            if content.get("type") == "image_url":  # type: ignore
+                image_data_urls.append(cast(str, content["image_url"]["url"]))  # type: ignore
+
+    if image_data_urls:
+        await asyncio.gather(*(process_image_async(url) for url in image_data_urls))
+
+
 async def stream_claude_response(
     messages: List[ChatCompletionMessageParam],
     api_key: str,
@@ -78,6 +98,8 @@ async def stream_claude_response(
     # Translate OpenAI messages to Claude messages
 
     # Convert OpenAI format messages to Claude format
+    # (images are resized/compressed in the image process pool first)
+    await preprocess_message_images(messages)
     system_prompt, claude_messages = convert_openai_messages_to_claude(messages)
 
     response = ""
@@ -2,13 +2,13 @@ import asyncio
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from typing import Callable, Awaitable
-from fastapi import APIRouter, WebSocket
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import openai
 import uuid
 from codegen.utils import extract_html_content, validate_react_output, validate_vue_output
-from db import update_generation, get_conn
+from db import get_conn, get_write_batcher, invalidate_user_sessions, run_db
+from db.sqlite import get_session
 from api.config.plans import get_plan_limit
-from datetime import datetime
 
 # Import shutdown flag from main
 import main as main_module
@@ -40,6 +40,12 @@ from models import (
 )
 from fs_logging.core import write_logs
 from mock_llm import mock_completion
+from gen_cache.generation_cache import (
+    generation_cache_key,
+    get_cached_completion,
+    save_cached_completion,
+    replay_completion,
+)
 from typing import (
     Any,
     Callable,
@@ -71,8 +77,8 @@ from prompts.claude_prompts import VIDEO_PROMPT
 from prompts.types import Stack, PromptContent
 
 # from utils import pprint_prompt
-from ws.constants import APP_ERROR_WEB_SOCKET_CODE  # type: ignore
-from db import save_generation, update_generation, save_generation_variant
+from ws.constants import APP_ERROR_WEB_SOCKET_CODE, USER_CLOSE_WEB_SOCKET_CODE  # type: ignore
+from db import save_generation
 
 
 router = APIRouter()
@@ -121,7 +127,7 @@ class PipelineContext:
         """Mark generation as failed without crashing - graceful error handling"""
         print(f"[PIPELINE] Generation {self.generation_id} marked as failed: {error_message}")
         try:
-            update_generation(
+            get_write_batcher().update_generation(
                 generation_id=self.generation_id,
                 status="failed",
                 error_message=error_message,
@@ -153,7 +159,7 @@ class Pipeline:
         self.middlewares.append(middleware)
         return self
 
-    async def execute(self, websocket: WebSocket, params: Dict[str, str] = None, websocket_already_accepted: bool = False, generation_id: str = None) -> None:
+    async def execute(self, websocket: WebSocket, params: Dict[str, str] = None, websocket_already_accepted: bool = False, generation_id: str = None, user_id: str = None) -> None:
         """Execute the pipeline with the given WebSocket
 
         Args:
@@ -161,6 +167,7 @@ class Pipeline:
             params: Optional pre-provided parameters (from queue worker)
             websocket_already_accepted: Flag if WebSocket was already accepted by handler
             generation_id: Generation ID from handler (if not provided, generate new one)
+            user_id: User ID already resolved by the queue (if not provided, read from session)
         """
         try:
             # If generation_id not provided, create new one (for backwards compatibility)
@@ -170,9 +177,10 @@ class Pipeline:
             else:
                 print(f"[PIPELINE] Using provided generation_id={generation_id}")
 
-            # Extract user_id from session
-            user = get_user_from_session(websocket)
-            user_id = user.get("id") if user else None
+            # Extract user_id from session (unless the queue already knows it)
+            if user_id is None:
+                user = await run_db(get_user_from_session, websocket)
+                user_id = user.get("id") if user else None
 
             context = PipelineContext(websocket=websocket, generation_id=generation_id, user_id=user_id, websocket_already_accepted=websocket_already_accepted)
             print(f"[DEBUG] PipelineContext created with generation_id={context.generation_id}, user_id={context.user_id}")
@@ -663,15 +671,23 @@ class ParallelGenerationStage:
         self.prompt_messages = prompt_messages
         self.params = params
 
-        # Create tasks with indices
-        # Since we have only ACTIVE_VARIANT_INDEX (2) active, it becomes local_index 0 in UI
-        tasks = self._create_generation_tasks(
-            variant_models,
-            prompt_messages,
-            params,
-            local_index=0,  # First (and only) active variant
-            real_index=ACTIVE_VARIANT_INDEX,  # Real index in DB
-        )
+        # Identical prompt + stack + model was generated before - replay it instead of calling the model
+        cache_key = generation_cache_key(prompt_messages, self.stack, variant_models[0].value)
+        cached_code = await run_db(get_cached_completion, cache_key)
+
+        if cached_code is not None:
+            print(f"[CACHE] Replaying cached completion for generation {self.generation_id}")
+            tasks = [replay_completion(cached_code, lambda x: self._process_chunk(x, 0))]
+        else:
+            # Create tasks with indices
+            # Since we have only ACTIVE_VARIANT_INDEX (2) active, it becomes local_index 0 in UI
+            tasks = self._create_generation_tasks(
+                variant_models,
+                prompt_messages,
+                params,
+                local_index=0,  # First (and only) active variant
+                real_index=ACTIVE_VARIANT_INDEX,  # Real index in DB
+            )
 
         # Dictionary to track variant tasks and their status
         variant_tasks: Dict[int, asyncio.Task[Completion]] = {}
@@ -691,7 +707,9 @@ class ParallelGenerationStage:
             model_idx = real_index if real_index < len(variant_models) else 0
             variant_processors.append(
                 self._process_variant_completion(
-                    local_index, real_index, task, variant_models[0], image_cache, variant_completions  # Pass both indices: local_index for UI, real_index for DB
+                    local_index, real_index, task, variant_models[0], image_cache, variant_completions,  # Pass both indices: local_index for UI, real_index for DB
+                    cache_key=cache_key,
+                    from_cache=cached_code is not None,
                 )
             )
 
@@ -940,12 +958,16 @@ class ParallelGenerationStage:
         model: Llm,
         image_cache: Dict[str, str],
         variant_completions: Dict[int, str],
+        cache_key: str | None = None,
+        from_cache: bool = False,
     ):
         """Process a single variant completion including image generation
 
         Args:
             local_index: Index in active variants array (0-based for UI/WebSocket)
             real_index: Real historical variant index (ACTIVE_VARIANT_INDEX for DB)
+            cache_key: Generation cache key the (valid) completion is stored under
+            from_cache: Completion was replayed from the cache (already validated)
         """
         try:
             completion = await task
@@ -955,7 +977,8 @@ class ParallelGenerationStage:
 
             # ✅ VALIDATION AND RETRY FOR REACT/VUE
             # Only validate for react_tailwind and vue_tailwind stacks
-            needs_validation = self.stack in ["react_tailwind", "vue_tailwind"]
+            needs_validation = self.stack in ["react_tailwind", "vue_tailwind"] and not from_cache
+            is_valid = True
 
             if needs_validation:
                 # Validate the output
@@ -995,6 +1018,7 @@ class ParallelGenerationStage:
                         if retry_valid:
                             print(f"[VALIDATION] Retry succeeded for {self.stack}")
                             html_result = retry_html  # Use retry result
+                            is_valid = True
                         else:
                             print(f"[VALIDATION] Retry also failed. Using original result as fallback.")
                             # Keep original html_result (don't crash, preserve UX)
@@ -1006,11 +1030,15 @@ class ParallelGenerationStage:
 
             variant_completions[local_index] = html_result
 
+            # Only outputs that passed validation are worth replaying
+            if cache_key and not from_cache and is_valid:
+                await run_db(save_cached_completion, cache_key, self.stack, model.value, html_result)
+
             # 🔧 FIXED: Save variant immediately to generation_variants table
             # This captures individual variant results independent of WebSocket
             try:
                 extracted_html = extract_html_content(html_result)
-                save_generation_variant(
+                get_write_batcher().save_generation_variant(
                     generation_id=self.generation_id,
                     variant_index=real_index,
                     model=model.value,
@@ -1026,7 +1054,7 @@ class ParallelGenerationStage:
             # Variant data is already saved in generation_variants table
             # Update the main generation metadata to mark completion
             try:
-                update_generation(
+                get_write_batcher().update_generation(
                     generation_id=self.generation_id,
                     status="completed",
                 )
@@ -1069,7 +1097,7 @@ class ParallelGenerationStage:
 
             # 🔧 FIXED: Save error to generation_variants so it's persisted
             try:
-                save_generation_variant(
+                get_write_batcher().save_generation_variant(
                     generation_id=self.generation_id,
                     variant_index=real_index,
                     model=model.value,
@@ -1112,7 +1140,8 @@ class WebSocketSetupMiddleware(Middleware):
         # we have a record with the generation_id for tracking purposes
         if not context.websocket_already_accepted:
             try:
-                save_generation(
+                await run_db(
+                    save_generation,
                     status="started",
                     generation_id=context.generation_id,
                     user_id=context.user_id,
@@ -1378,31 +1407,20 @@ def get_user_from_session(websocket: WebSocket) -> dict | None:
             print(f"[WS:AUTH] WARNING: No session_id in cookies")
             return None
 
-        conn = get_conn()
-        cursor = conn.cursor()
-
-        # Get session and user data
-        now = datetime.utcnow().isoformat()
-        cursor.execute("""
-            SELECT u.id, u.email, u.plan, u.used_generations, u.disabled
-            FROM sessions s
-            JOIN users u ON s.user_id = u.id
-            WHERE s.id = ? AND s.expires_at > ?
-        """, (session_id, now))
-
-        row = cursor.fetchone()
-        conn.close()
+        # Cached session + user lookup (see db.sqlite.get_session)
+        session = get_session(session_id)
 
-        if not row:
+        if not session:
             print(f"[WS:AUTH] Session not found or expired for session_id={repr(session_id)}")
             return None
 
+        user = session["user"]
         user_dict = {
-            "id": row[0],
-            "email": row[1],
-            "plan": row[2],
-            "used_generations": row[3],
-            "disabled": bool(row[4]),
+            "id": user["id"],
+            "email": user["email"],
+            "plan": user["plan"],
+            "used_generations": user["used_generations"],
+            "disabled": user["disabled"],
         }
         print(f"[WS:AUTH] SUCCESS: Found user id={repr(user_dict['id'])} for session_id={repr(session_id)}")
         return user_dict
@@ -1422,7 +1440,7 @@ async def check_generation_limits(
     IMPORTANT: WebSocket requires valid authentication.
     If user is not authenticated, returns False with error message.
     """
-    user = get_user_from_session(websocket)
+    user = await run_db(get_user_from_session, websocket)
 
     if not user:
         # No user/session = authentication required
@@ -1446,20 +1464,27 @@ async def check_generation_limits(
 async def increment_user_generations(websocket: WebSocket) -> None:
     """Increment used_generations for user after successful generation."""
     try:
-        user = get_user_from_session(websocket)
+        user = await run_db(get_user_from_session, websocket)
         if not user:
             return
 
-        conn = get_conn()
-        cursor = conn.cursor()
+        def _increment(user_id: str) -> None:
+            conn = get_conn()
+            cursor = conn.cursor()
 
-        cursor.execute(
-            "UPDATE users SET used_generations = used_generations + 1 WHERE id = ?",
-            (user["id"],),
-        )
+            try:
+                cursor.execute(
+                    "UPDATE users SET used_generations = used_generations + 1 WHERE id = ?",
+                    (user_id,),
+                )
+                conn.commit()
+            finally:
+                conn.close()
 
-        conn.commit()
-        conn.close()
+            # Cached sessions carry used_generations (checked against plan limits)
+            invalidate_user_sessions(user_id)
+
+        await run_db(_increment, user["id"])
         print(f"[WS] Incremented generations for user {user['id']}")
     except Exception as e:
         print(f"[WS] Error incrementing generations: {e}")
@@ -1468,7 +1493,8 @@ async def increment_user_generations(websocket: WebSocket) -> None:
 @router.websocket("/generate-code")
 async def stream_code(websocket: WebSocket):
     """Handle WebSocket code generation requests using a queue"""
-    from gen_queue.generation_queue import enqueue_generation, GenerationJob
+    from gen_queue.generation_queue import enqueue_generation, cancel_queued_generation, broadcast_queue_positions, GenerationJob
+    from gen_queue.worker import cancel_generation
     from db import save_generation
     import uuid
 
@@ -1494,7 +1520,7 @@ async def stream_code(websocket: WebSocket):
     generation_id = str(uuid.uuid4().hex[:16])
 
     # Get authenticated user - MANDATORY
-    user = get_user_from_session(websocket)
+    user = await run_db(get_user_from_session, websocket)
     if not user:
         print(f"[WS] Rejected: No authenticated user")
         await websocket.send_json({
@@ -1518,7 +1544,8 @@ async def stream_code(websocket: WebSocket):
 
     # Save generation with authenticated user
     print(f"[HISTORY][WRITE] generation_id={generation_id} user_id={user_id} (from WebSocket /generate-code)")
-    save_generation(
+    await run_db(
+        save_generation,
         status="queued",
         generation_id=generation_id,
         user_id=user_id,
@@ -1535,10 +1562,25 @@ async def stream_code(websocket: WebSocket):
         websocket=websocket,
         params=params,
         websocket_already_accepted=True,
+        user_id=user_id,
+        plan=user.get("plan") or "free",
     )
 
     await enqueue_generation(job)
 
-    # Keep connection alive
-    while True:
-        await asyncio.sleep(0.1)
+    # Keep connection alive until the client goes away.
+    # {"type": "cancel"} or closing with USER_CLOSE_WEB_SOCKET_CODE cancels the generation;
+    # any other disconnect only drops it from the queue if it hasn't started yet.
+    try:
+        while True:
+            message = await websocket.receive_json()
+            if isinstance(message, dict) and message.get("type") == "cancel":
+                await cancel_generation(generation_id)
+    except WebSocketDisconnect as e:
+        if e.code == USER_CLOSE_WEB_SOCKET_CODE:
+            await cancel_generation(generation_id)
+        elif await run_db(cancel_queued_generation, generation_id):
+            await broadcast_queue_positions()
+    except Exception:
+        # Socket closed by the pipeline after completion - nothing to cancel
+        pass
@@ -0,0 +1,164 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+import db.sqlite as sqlite_db
+from db import (
+    init_db,
+    get_conn,
+    save_generation,
+    get_generation,
+    get_generation_variants,
+    invalidate_user_sessions,
+    run_db,
+)
+from db.sqlite import create_session, get_session, delete_session
+from db.write_batcher import GenerationWriteBatcher
+
+
+@pytest.fixture(autouse=True)
+def temp_db(tmp_path, monkeypatch):
+    """Point the database module at a throwaway app.db"""
+    monkeypatch.setattr(sqlite_db, "DB_DIR", tmp_path)
+    monkeypatch.setattr(sqlite_db, "DB_PATH", tmp_path / "app.db")
+    sqlite_db.invalidate_session_cache()
+    init_db()
+
+
+def create_user(user_id="user-1", plan="free"):
+    conn = get_conn()
+    now = datetime.utcnow().isoformat()
+    conn.execute(
+        "INSERT INTO users (id, email, plan, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+        (user_id, f"{user_id}@example.com", plan, now, now),
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestConnectionPool:
+    """Test cases for pooled SQLite connections."""
+
+    def test_close_returns_connection_to_pool(self):
+        """Test that close() keeps the connection open for reuse."""
+        conn = get_conn()
+        conn.close()
+        assert get_conn() is conn
+
+    def test_uncommitted_work_is_rolled_back(self):
+        """Test that a returned connection doesn't leak an open transaction."""
+        save_generation(status="queued", generation_id="gen-1")
+
+        conn = get_conn()
+        conn.execute("UPDATE generations SET status = 'failed' WHERE id = 'gen-1'")
+        conn.close()
+
+        assert get_generation("gen-1")["status"] == "queued"
+
+    def test_run_db_runs_off_loop(self):
+        """Test that run_db returns the result of the blocking call."""
+        save_generation(status="queued", generation_id="gen-1")
+        generation = asyncio.run(run_db(get_generation, "gen-1"))
+        assert generation["status"] == "queued"
+
+
+class TestSessionCache:
+    """Test cases for cached session lookups."""
+
+    def test_session_is_cached(self):
+        """Test that repeated lookups don't hit the database."""
+        create_user()
+        session_id = create_session("user-1")
+        assert get_session(session_id)["user"]["plan"] == "free"
+
+        conn = get_conn()
+        conn.execute("UPDATE users SET plan = 'basic' WHERE id = 'user-1'")
+        conn.commit()
+        conn.close()
+
+        assert get_session(session_id)["user"]["plan"] == "free"
+
+    def test_invalidate_user_sessions(self):
+        """Test that user changes are visible after invalidation."""
+        create_user()
+        session_id = create_session("user-1")
+        get_session(session_id)
+
+        conn = get_conn()
+        conn.execute("UPDATE users SET plan = 'basic' WHERE id = 'user-1'")
+        conn.commit()
+        conn.close()
+        invalidate_user_sessions("user-1")
+
+        assert get_session(session_id)["user"]["plan"] == "basic"
+
+    def test_deleted_session_is_not_served_from_cache(self):
+        """Test that logout invalidates the cached session."""
+        create_user()
+        session_id = create_session("user-1")
+        get_session(session_id)
+
+        delete_session(session_id)
+        assert get_session(session_id) is None
+
+    def test_cached_session_cannot_be_mutated(self):
+        """Test that callers get a copy of the cached data."""
+        create_user()
+        session_id = create_session("user-1")
+        get_session(session_id)["user"]["plan"] = "professional"
+        assert get_session(session_id)["user"]["plan"] == "free"
+
+
+class TestGenerationWriteBatcher:
+    """Test cases for batched generation writes."""
+
+    def test_updates_are_coalesced(self):
+        """Test that the last status wins and variants are upserted."""
+        save_generation(status="queued", generation_id="gen-1")
+
+        async def run():
+            batcher = GenerationWriteBatcher(flush_interval=0.01)
+            batcher.update_generation("gen-1", status="processing")
+            batcher.save_generation_variant("gen-1", 2, "gpt-4.1", "done", html="<html></html>")
+            batcher.update_generation("gen-1", status="completed")
+
+            # Nothing is written until the flush
+            assert get_generation("gen-1")["status"] == "queued"
+            await batcher.flush()
+
+        asyncio.run(run())
+
+        assert get_generation("gen-1")["status"] == "completed"
+        variants = get_generation_variants("gen-1")
+        assert [(v["variant_index"], v["status"], v["html"]) for v in variants] == [
+            (2, "done", "<html></html>")
+        ]
+
+    def test_delayed_flush(self):
+        """Test that queued writes are flushed on their own."""
+        save_generation(status="queued", generation_id="gen-1")
+
+        async def run():
+            batcher = GenerationWriteBatcher(flush_interval=0.01)
+            batcher.update_generation("gen-1", status="failed", error_message="boom")
+            await asyncio.sleep(0.2)
+
+        asyncio.run(run())
+
+        generation = get_generation("gen-1")
+        assert generation["status"] == "failed"
+        assert generation["error_message"] == "boom"
+
+    def test_write_through_without_event_loop(self):
+        """Test that sync callers are written immediately."""
+        save_generation(status="queued", generation_id="gen-1")
+
+        batcher = GenerationWriteBatcher()
+        batcher.save_generation_variant("gen-1", 2, "gpt-4.1", "failed", error_message="boom")
+        batcher.save_generation_variant("gen-1", 2, "gpt-4.1", "done", html="<p></p>")
+
+        variants = get_generation_variants("gen-1")
+        assert [(v["status"], v["html"], v["error_message"]) for v in variants] == [
+            ("done", "<p></p>", None)
+        ]
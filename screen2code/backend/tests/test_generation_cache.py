@@ -0,0 +1,118 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import db.sqlite as sqlite_db
+import gen_cache.generation_cache as generation_cache
+from db import init_db, get_conn
+from gen_cache.generation_cache import (
+    delete_expired_cache_entries,
+    generation_cache_key,
+    get_cache_stats,
+    get_cached_completion,
+    replay_completion,
+    save_cached_completion,
+)
+
+
+@pytest.fixture(autouse=True)
+def temp_db(tmp_path, monkeypatch):
+    """Point the database module at a throwaway app.db"""
+    monkeypatch.setattr(sqlite_db, "DB_DIR", tmp_path)
+    monkeypatch.setattr(sqlite_db, "DB_PATH", tmp_path / "app.db")
+    monkeypatch.setattr(generation_cache, "GENERATION_CACHE_ENABLED", True)
+    generation_cache.reset_cache_stats()
+    init_db()
+
+
+def make_messages(image_url="data:image/png;base64,AAAA", text="Generate code"):
+    return [
+        {"role": "system", "content": "You are an expert developer"},
+        {
+            "role": "user",
+            "content": [
+                {"type": "image_url", "image_url": {"url": image_url, "detail": "high"}},
+                {"type": "text", "text": text},
+            ],
+        },
+    ]
+
+
+class TestGenerationCacheKey:
+    """Test cases for content-addressed cache keys."""
+
+    def test_same_prompt_same_key(self):
+        """Test that identical inputs map to the same key."""
+        assert generation_cache_key(make_messages(), "html_tailwind", "gpt-4.1") == (
+            generation_cache_key(make_messages(), "html_tailwind", "gpt-4.1")
+        )
+
+    def test_key_covers_all_inputs(self):
+        """Test that image, prompt text, stack, model and attempt change the key."""
+        base = generation_cache_key(make_messages(), "html_tailwind", "gpt-4.1")
+        assert base != generation_cache_key(
+            make_messages(image_url="data:image/png;base64,BBBB"), "html_tailwind", "gpt-4.1"
+        )
+        assert base != generation_cache_key(make_messages(text="Other"), "html_tailwind", "gpt-4.1")
+        assert base != generation_cache_key(make_messages(), "react_tailwind", "gpt-4.1")
+        assert base != generation_cache_key(make_messages(), "html_tailwind", "gpt-4o")
+        assert base != generation_cache_key(make_messages(), "html_tailwind", "gpt-4.1", attempt=1)
+
+    def test_prompt_version_changes_key(self, monkeypatch):
+        """Test that bumping the prompt version invalidates old keys."""
+        base = generation_cache_key(make_messages(), "html_tailwind", "gpt-4.1")
+        monkeypatch.setattr(generation_cache, "PROMPT_CACHE_VERSION", 2)
+        assert base != generation_cache_key(make_messages(), "html_tailwind", "gpt-4.1")
+
+
+class TestGenerationCache:
+    """Test cases for storing and replaying completions."""
+
+    def test_miss_then_hit(self):
+        """Test that a stored completion is returned and counted."""
+        key = generation_cache_key(make_messages(), "html_tailwind", "gpt-4.1")
+        assert get_cached_completion(key) is None
+
+        save_cached_completion(key, "html_tailwind", "gpt-4.1", "<html></html>")
+        assert get_cached_completion(key) == "<html></html>"
+
+        stats = get_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+        assert stats["hitRate"] == 0.5
+        assert (stats["entries"], stats["totalHits"]) == (1, 1)
+
+    def test_expired_entries_are_ignored(self):
+        """Test that entries past the TTL miss and are pruned."""
+        key = generation_cache_key(make_messages(), "html_tailwind", "gpt-4.1")
+        save_cached_completion(key, "html_tailwind", "gpt-4.1", "<html></html>")
+
+        conn = get_conn()
+        old = (datetime.utcnow() - timedelta(days=30)).isoformat()
+        conn.execute("UPDATE generation_cache SET created_at = ?", (old,))
+        conn.commit()
+        conn.close()
+
+        assert get_cached_completion(key) is None
+        assert delete_expired_cache_entries() == 1
+
+    def test_disabled_cache(self, monkeypatch):
+        """Test that nothing is stored or served when disabled."""
+        monkeypatch.setattr(generation_cache, "GENERATION_CACHE_ENABLED", False)
+        key = generation_cache_key(make_messages(), "html_tailwind", "gpt-4.1")
+        save_cached_completion(key, "html_tailwind", "gpt-4.1", "<html></html>")
+        assert get_cached_completion(key) is None
+        assert get_cache_stats()["entries"] == 0
+
+    def test_replay_streams_chunks(self, monkeypatch):
+        """Test that a replayed completion streams like a live one."""
+        monkeypatch.setattr(generation_cache, "REPLAY_CHUNK_SIZE", 4)
+        chunks = []
+
+        async def callback(chunk):
+            chunks.append(chunk)
+
+        completion = asyncio.run(replay_completion("<html></html>", callback))
+        assert completion["code"] == "<html></html>"
+        assert "".join(chunks) == "<html></html>"
+        assert len(chunks) == 4
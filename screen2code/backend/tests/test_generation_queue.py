@@ -0,0 +1,167 @@
+import asyncio
+import threading
+
+import pytest
+
+import db.sqlite as sqlite_db
+from db import init_db, save_generation, get_generation
+from gen_queue import generation_queue
+from gen_queue.generation_queue import (
+    GenerationJob,
+    DetachedWebSocket,
+    enqueue_generation,
+    finish_job,
+    claim_next_job,
+    cancel_queued_generation,
+    get_queue_positions,
+    init_queue,
+    mark_job_done,
+    queue_size,
+)
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+
+@pytest.fixture(autouse=True)
+def temp_db(tmp_path, monkeypatch):
+    """Point the database module at a throwaway app.db"""
+    monkeypatch.setattr(sqlite_db, "DB_DIR", tmp_path)
+    monkeypatch.setattr(sqlite_db, "DB_PATH", tmp_path / "app.db")
+    monkeypatch.setattr(generation_queue, "_live_websockets", {})
+    init_db()
+
+
+def enqueue(generation_id, user_id, plan="free", websocket=None):
+    job = GenerationJob(
+        generation_id=generation_id,
+        websocket=websocket or FakeWebSocket(),
+        params={"generatedCodeConfig": "html_tailwind"},
+        websocket_already_accepted=True,
+        user_id=user_id,
+        plan=plan,
+    )
+    asyncio.run(enqueue_generation(job))
+    return job
+
+
+class TestGenerationQueue:
+    """Test cases for the durable generation queue."""
+
+    def test_fifo_for_single_user(self):
+        """Test that one user's jobs are dispatched in submission order."""
+        enqueue("gen-1", "user-a")
+        enqueue("gen-2", "user-a")
+
+        assert claim_next_job(max_per_user=2).generation_id == "gen-1"
+        assert claim_next_job(max_per_user=2).generation_id == "gen-2"
+        assert claim_next_job(max_per_user=2) is None
+
+    def test_round_robin_between_users(self):
+        """Test that a user with many jobs doesn't starve other users."""
+        enqueue("a-1", "user-a")
+        enqueue("a-2", "user-a")
+        enqueue("a-3", "user-a")
+        enqueue("b-1", "user-b")
+
+        assert list(get_queue_positions()) == ["a-1", "b-1", "a-2", "a-3"]
+
+    def test_priority_by_plan(self):
+        """Test that paid plans are dispatched first."""
+        enqueue("free-1", "user-a", plan="free")
+        enqueue("basic-1", "user-b", plan="basic")
+        enqueue("pro-1", "user-c", plan="professional")
+
+        assert claim_next_job(max_per_user=1).generation_id == "pro-1"
+        assert claim_next_job(max_per_user=1).generation_id == "basic-1"
+        assert claim_next_job(max_per_user=1).generation_id == "free-1"
+
+    def test_per_user_concurrency_cap(self):
+        """Test that a user at the cap is skipped until a job finishes."""
+        enqueue("a-1", "user-a")
+        enqueue("a-2", "user-a")
+
+        first = claim_next_job(max_per_user=1)
+        assert first.generation_id == "a-1"
+        assert claim_next_job(max_per_user=1) is None
+
+        mark_job_done(first)
+        assert claim_next_job(max_per_user=1).generation_id == "a-2"
+
+    def test_claim_reattaches_live_websocket(self):
+        """Test that a claimed job gets back the WebSocket it was enqueued with."""
+        websocket = FakeWebSocket()
+        enqueue("gen-1", "user-a", websocket=websocket)
+
+        job = claim_next_job(max_per_user=1)
+        assert job.websocket is websocket
+        assert job.params == {"generatedCodeConfig": "html_tailwind"}
+        assert job.user_id == "user-a"
+
+    def test_cancel_queued_job(self):
+        """Test that a queued job can be cancelled and is never dispatched."""
+        save_generation(status="queued", generation_id="gen-1", user_id="user-a")
+        enqueue("gen-1", "user-a")
+
+        assert cancel_queued_generation("gen-1") is True
+        assert cancel_queued_generation("gen-1") is False
+        assert get_generation("gen-1")["status"] == "cancelled"
+        assert claim_next_job(max_per_user=1) is None
+
+    def test_queue_position_updates(self):
+        """Test that waiting clients are told their queue position."""
+        first = FakeWebSocket()
+        enqueue("gen-1", "user-a", websocket=first)
+        enqueue("gen-2", "user-b")
+
+        assert first.sent[-1]["value"] == "Queued for processing (position 1)..."
+
+    def test_interrupted_jobs_survive_restart(self):
+        """Test that running and queued jobs are recovered by init_queue."""
+        enqueue("gen-1", "user-a")
+        enqueue("gen-2", "user-b")
+        claim_next_job(max_per_user=1)
+
+        # Simulate a restart: in-memory WebSockets are lost
+        generation_queue._live_websockets.clear()
+        assert init_queue() == 2
+        assert queue_size() == 2
+
+        job = claim_next_job(max_per_user=1)
+        assert job.generation_id == "gen-1"
+        assert isinstance(job.websocket, DetachedWebSocket)
+
+    def test_finished_job_wakes_waiting_worker(self, monkeypatch):
+        """Test that a worker waiting on a capped user wakes when a job finishes."""
+        set_from = []
+
+        class RecordingEvent(asyncio.Event):
+            def set(self):
+                set_from.append(threading.get_ident())
+                super().set()
+
+        # Only the wakeup may end the wait within the test's timeout
+        monkeypatch.setattr(generation_queue, "POLL_INTERVAL_SECONDS", 30)
+        monkeypatch.setattr(generation_queue, "_job_available", None)
+        enqueue("a-1", "user-a")
+        enqueue("a-2", "user-a")
+
+        async def scenario():
+            generation_queue._job_available = RecordingEvent()
+            first = claim_next_job(max_per_user=1)
+            waiter = asyncio.create_task(generation_queue.wait_for_generation(1))
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+
+            await finish_job(first)
+            job = await asyncio.wait_for(waiter, timeout=5)
+            return job, threading.get_ident()
+
+        job, loop_thread = asyncio.run(scenario())
+        assert job.generation_id == "a-2"
+        assert set_from == [loop_thread]
@@ -0,0 +1,104 @@
+import asyncio
+import base64
+import io
+import os
+import threading
+
+from PIL import Image
+
+import image_processing.utils as image_utils
+from image_processing.utils import process_image, process_image_async
+
+
+def make_data_url(width, height, format="PNG", noise=False):
+    if noise:
+        img = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    else:
+        img = Image.new("RGB", (width, height), (200, 100, 50))
+    output = io.BytesIO()
+    img.save(output, format=format)
+    media_type = f"image/{format.lower()}"
+    return f"data:{media_type};base64,{base64.b64encode(output.getvalue()).decode('utf-8')}"
+
+
+class TestProcessImage:
+    """Test cases for Claude image preprocessing."""
+
+    def setup_method(self):
+        image_utils._processed_cache.clear()
+
+    def test_small_image_is_passed_through(self):
+        """Test that an image within limits is returned unchanged."""
+        data_url = make_data_url(100, 50)
+        media_type, base64_data = process_image(data_url)
+        assert media_type == "image/png"
+        assert base64_data == data_url.split(",", 1)[1]
+
+    def test_oversized_dimension_is_resized(self):
+        """Test that images at the dimension limit are scaled down as JPEG."""
+        data_url = make_data_url(8000, 100)
+        media_type, base64_data = process_image(data_url)
+        assert media_type == "image/jpeg"
+        with Image.open(io.BytesIO(base64.b64decode(base64_data))) as img:
+            assert img.width == image_utils.CLAUDE_MAX_IMAGE_DIMENSION
+            assert img.height < 100
+
+    def test_compressed_to_size_limit(self, monkeypatch):
+        """Test that the chosen JPEG quality fits the size limit."""
+        monkeypatch.setattr(image_utils, "CLAUDE_IMAGE_MAX_SIZE", 200 * 1024)
+        data_url = make_data_url(400, 400, noise=True)
+        assert len(data_url) > image_utils.CLAUDE_IMAGE_MAX_SIZE
+
+        media_type, base64_data = process_image(data_url)
+        assert media_type == "image/jpeg"
+        assert len(base64_data) <= image_utils.CLAUDE_IMAGE_MAX_SIZE
+
+    def test_highest_fitting_quality_is_chosen(self):
+        """Test that the binary search picks the best quality under the limit."""
+        img = Image.frombytes("RGB", (200, 200), os.urandom(200 * 200 * 3))
+        limit = image_utils._base64_size(len(image_utils._encode_jpeg(img, 60)))
+
+        output, quality = image_utils._compress_to_limit(img, limit)
+        assert quality >= 60
+        assert image_utils._base64_size(len(output)) <= limit
+        if quality < image_utils.MAX_JPEG_QUALITY:
+            next_size = len(image_utils._encode_jpeg(img, quality + 1))
+            assert image_utils._base64_size(next_size) > limit
+
+    def test_results_are_cached(self, monkeypatch):
+        """Test that the same image is only processed once."""
+        data_url = make_data_url(8000, 100)
+        first = process_image(data_url)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("image processed twice")
+
+        monkeypatch.setattr(image_utils, "_process_image_data", fail)
+        assert process_image(data_url) == first
+        assert asyncio.run(process_image_async(data_url)) == first
+
+    def test_async_matches_sync(self):
+        """Test that the process pool path returns the same result."""
+        data_url = make_data_url(100, 8000)
+        async_result = asyncio.run(process_image_async(data_url))
+        image_utils._processed_cache.clear()
+        assert process_image(data_url) == async_result
+
+    def test_async_hashes_off_the_loop(self, monkeypatch):
+        """Test that the cache key and size check don't run on the event loop."""
+        threads = []
+        check_cache = image_utils._check_cache
+
+        def recording_check(base64_data):
+            threads.append(threading.get_ident())
+            return check_cache(base64_data)
+
+        monkeypatch.setattr(image_utils, "_check_cache", recording_check)
+
+        async def run():
+            return await process_image_async(make_data_url(100, 50)), threading.get_ident()
+
+        (media_type, _), loop_thread = asyncio.run(run())
+        assert media_type == "image/png"
+        assert len(threads) == 1
+        assert threads[0] != loop_thread
@@ -0,0 +1,95 @@
+import asyncio
+import base64
+import importlib
+import sys
+
+import imageio_ffmpeg
+import numpy as np
+import pytest
+from PIL import Image
+
+import video.utils as video_utils
+from video.utils import (
+    _sample_timestamps,
+    assemble_claude_prompt_video,
+    dedupe_frames,
+    split_video_into_screenshots,
+)
+
+
+@pytest.fixture(autouse=True)
+def real_moviepy(monkeypatch):
+    """Use the real moviepy even if another test module replaced it with a mock"""
+    for name in ("moviepy", "moviepy.editor"):
+        if name in sys.modules and not hasattr(sys.modules[name], "__file__"):
+            monkeypatch.delitem(sys.modules, name)
+    moviepy_editor = importlib.import_module("moviepy.editor")
+    monkeypatch.setattr(video_utils, "VideoFileClip", moviepy_editor.VideoFileClip)
+
+
+def make_video_data_url(tmp_path, num_frames, fps=10, num_scenes=None):
+    """Build an mp4 data URL; the frame changes every num_frames/num_scenes frames"""
+    num_scenes = num_scenes or num_frames
+    frames_per_scene = max(1, num_frames // num_scenes)
+    path = tmp_path / "video.mp4"
+    writer = imageio_ffmpeg.write_frames(str(path), (64, 64), fps=fps, macro_block_size=1)
+    writer.send(None)
+    for i in range(num_frames):
+        scene = i // frames_per_scene
+        frame = np.zeros((64, 64, 3), dtype=np.uint8)
+        # Vertical stripe moves per scene so perceptual hashes differ
+        column = (scene * 8) % 56
+        frame[:, column : column + 8, :] = 255
+        writer.send(frame.tobytes())
+    writer.close()
+
+    return "data:video/mp4;base64," + base64.b64encode(path.read_bytes()).decode("utf-8")
+
+
+class TestSampleTimestamps:
+    """Test cases for frame timestamp selection."""
+
+    def test_evenly_spaced(self):
+        """Test that timestamps cover the clip from the start."""
+        assert _sample_timestamps(10.0, 30, 5) == [0.0, 2.0, 4.0, 6.0, 8.0]
+
+    def test_short_clip_has_fewer_frames(self):
+        """Test that a clip with few frames isn't oversampled."""
+        timestamps = _sample_timestamps(0.3, 10, 20)
+        assert len(timestamps) == 3
+        assert all(t <= 0.3 - 1 / 10 for t in timestamps)
+
+
+class TestSplitVideo:
+    """Test cases for seek-based frame sampling."""
+
+    def test_samples_target_number_of_frames(self, tmp_path):
+        """Test that a long video yields TARGET_NUM_SCREENSHOTS frames."""
+        data_url = make_video_data_url(tmp_path, num_frames=100)
+        images = split_video_into_screenshots(data_url)
+        assert len(images) == video_utils.TARGET_NUM_SCREENSHOTS
+        assert all(image.size == (64, 64) for image in images)
+
+    def test_dedupe_drops_static_frames(self, tmp_path):
+        """Test that near-identical frames are removed."""
+        data_url = make_video_data_url(tmp_path, num_frames=100, num_scenes=4)
+        images = split_video_into_screenshots(data_url, dedupe=True)
+        assert len(images) == 4
+
+    def test_dedupe_keeps_distinct_frames(self):
+        """Test that different frames are all kept."""
+        black = Image.new("RGB", (32, 32))
+        half = Image.new("RGB", (32, 32))
+        half.paste((255, 255, 255), (0, 0, 16, 32))
+        assert dedupe_frames([black, half, black]) == [black, half, black]
+
+    def test_assemble_prompt(self, tmp_path, monkeypatch):
+        """Test that the worker process path builds Claude image messages."""
+        monkeypatch.setattr(video_utils, "DEBUG", False)
+        data_url = make_video_data_url(tmp_path, num_frames=30)
+
+        messages = asyncio.run(assemble_claude_prompt_video(data_url))
+        content = messages[0]["content"]
+        assert len(content) == video_utils.TARGET_NUM_SCREENSHOTS
+        assert content[0]["source"]["media_type"] == "image/jpeg"
+        video_utils.shutdown_video_pool()
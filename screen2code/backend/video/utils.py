@@ -1,14 +1,17 @@
 # Extract HTML content from the completion string
+import asyncio
 import base64
 import io
 import mimetypes
 import os
 import tempfile
 import uuid
-from typing import Any, Union, cast
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional, Union
 from moviepy.editor import VideoFileClip  # type: ignore
 from PIL import Image
-import math
+
+from config import VIDEO_DEDUPE_FRAMES
 
 
 DEBUG = True
@@ -16,30 +19,32 @@ TARGET_NUM_SCREENSHOTS = (
     20  # Should be max that Claude supports (20) - reduce to save tokens on testing
 )
 
+# Frames whose difference hashes differ in at most this many bits count as duplicates
+DEDUPE_HASH_DISTANCE = 4
 
-async def assemble_claude_prompt_video(video_data_url: str) -> list[Any]:
-    images = split_video_into_screenshots(video_data_url)
+_video_process_pool: Optional[ProcessPoolExecutor] = None
 
-    # Save images to tmp if we're debugging
-    if DEBUG:
-        save_images_to_tmp(images)
+
+async def assemble_claude_prompt_video(video_data_url: str) -> list[Any]:
+    # Decoding and JPEG encoding run in a worker process, off the event loop
+    loop = asyncio.get_running_loop()
+    frames = await loop.run_in_executor(
+        _get_video_process_pool(),
+        _video_to_jpeg_frames,
+        video_data_url,
+        VIDEO_DEDUPE_FRAMES,
+        DEBUG,
+    )
 
     # Validate number of images
-    print(f"Number of frames extracted from video: {len(images)}")
-    if len(images) > 20:
-        print(f"Too many screenshots: {len(images)}")
+    print(f"Number of frames extracted from video: {len(frames)}")
+    if len(frames) > 20:
+        print(f"Too many screenshots: {len(frames)}")
         raise ValueError("Too many screenshots extracted from video")
 
     # Convert images to the message format for Claude
     content_messages: list[dict[str, Union[dict[str, str], str]]] = []
-    for image in images:
-
-        # Convert Image to buffer
-        buffered = io.BytesIO()
-        image.save(buffered, format="JPEG")
-
-        # Encode bytes as base64
-        base64_data = base64.b64encode(buffered.getvalue()).decode("utf-8")
+    for base64_data in frames:
         media_type = "image/jpeg"
 
         content_messages.append(
@@ -61,8 +66,75 @@ async def assemble_claude_prompt_video(video_data_url: str) -> list[Any]:
     ]
 
 
+def _get_video_process_pool() -> ProcessPoolExecutor:
+    global _video_process_pool
+    if _video_process_pool is None:
+        _video_process_pool = ProcessPoolExecutor(max_workers=1)
+    return _video_process_pool
+
+
+def shutdown_video_pool() -> None:
+    """Stop the video worker process (called on app shutdown)"""
+    global _video_process_pool
+    if _video_process_pool is not None:
+        _video_process_pool.shutdown(wait=False, cancel_futures=True)
+        _video_process_pool = None
+
+
+def _video_to_jpeg_frames(video_data_url: str, dedupe: bool, debug: bool) -> list[str]:
+    """Sample frames and encode them as base64 JPEG (runs in the video worker process)"""
+    images = split_video_into_screenshots(video_data_url, dedupe=dedupe)
+
+    # Save images to tmp if we're debugging
+    if debug:
+        save_images_to_tmp(images)
+
+    frames = []
+    for image in images:
+        buffered = io.BytesIO()
+        image.save(buffered, format="JPEG")
+        frames.append(base64.b64encode(buffered.getvalue()).decode("utf-8"))
+    return frames
+
+
+def _sample_timestamps(duration: float, fps: float, num_frames: int) -> list[float]:
+    """Evenly spaced timestamps starting at 0, one per sampled frame"""
+    total_frames = max(1, int(duration * fps))
+    num_frames = max(1, min(num_frames, total_frames))
+    # Stay one frame short of the end - seeking to `duration` returns no frame
+    last_frame_time = max(0.0, duration - 1.0 / fps)
+    step = duration / num_frames
+    return [min(i * step, last_frame_time) for i in range(num_frames)]
+
+
+def _difference_hash(image: Image.Image) -> int:
+    """64-bit perceptual difference hash (dHash) of an image"""
+    small = image.convert("L").resize((9, 8), Image.Resampling.BILINEAR)
+    pixels = small.tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def dedupe_frames(images: list[Image.Image], max_distance: int = DEDUPE_HASH_DISTANCE) -> list[Image.Image]:
+    """Drop frames that are near-identical to the previous kept frame"""
+    kept: list[Image.Image] = []
+    last_hash: Optional[int] = None
+    for image in images:
+        frame_hash = _difference_hash(image)
+        if last_hash is not None and bin(frame_hash ^ last_hash).count("1") <= max_distance:
+            continue
+        kept.append(image)
+        last_hash = frame_hash
+    return kept
+
+
 # Returns a list of images/frame (RGB format)
-def split_video_into_screenshots(video_data_url: str) -> list[Image.Image]:
+def split_video_into_screenshots(video_data_url: str, dedupe: bool = False) -> list[Image.Image]:
     target_num_screenshots = TARGET_NUM_SCREENSHOTS
 
     # Decode the base64 URL to get the video bytes
@@ -76,28 +148,25 @@ def split_video_into_screenshots(video_data_url: str) -> list[Image.Image]:
         print(temp_video_file.name)
         temp_video_file.write(video_bytes)
         temp_video_file.flush()
-        clip = VideoFileClip(temp_video_file.name)
-        images: list[Image.Image] = []
-        total_frames = cast(int, clip.reader.nframes)  # type: ignore
-
-        # Calculate frame skip interval by dividing total frames by the target number of screenshots
-        # Ensuring a minimum skip of 1 frame
-        frame_skip = max(1, math.ceil(total_frames / target_num_screenshots))
-
-        # Iterate over each frame in the clip
-        for i, frame in enumerate(clip.iter_frames()):
-            # Save every nth frame
-            if i % frame_skip == 0:
-                frame_image = Image.fromarray(frame)  # type: ignore
-                images.append(frame_image)
-                # Ensure that we don't capture more than the desired number of frames
-                if len(images) >= target_num_screenshots:
-                    break
-
-        # Close the video file to release resources
-        clip.close()
-
-        return images
+        clip = VideoFileClip(temp_video_file.name, audio=False)
+
+        try:
+            # Seek straight to each target timestamp instead of decoding every frame;
+            # ffmpeg restarts at the nearest keyframe for long jumps
+            images: list[Image.Image] = [
+                Image.fromarray(clip.get_frame(t))  # type: ignore
+                for t in _sample_timestamps(clip.duration, clip.fps, target_num_screenshots)
+            ]
+        finally:
+            # Close the video file to release resources
+            clip.close()
+
+    if dedupe:
+        deduped = dedupe_frames(images)
+        print(f"Deduped video frames: {len(images)} -> {len(deduped)}")
+        images = deduped
+
+    return images
 
 
 # Save a list of PIL images to a random temporary directory
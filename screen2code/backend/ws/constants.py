@@ -1,2 +1,3 @@
 # WebSocket protocol (RFC 6455) allows for the use of custom close codes in the range 4000-4999
 APP_ERROR_WEB_SOCKET_CODE = 4332
+USER_CLOSE_WEB_SOCKET_CODE = 4333